@@ -0,0 +1,59 @@
+"""
+Benchmark for enumerating and counting the valid moves of a network with
+`phylox.rearrangement.move.all_valid_moves` (as Move objects and as tuples)
+and `phylox.rearrangement.move.count_valid_moves`.
+
+Usage: python benchmarks/bench_all_valid_moves.py --leaves 50 --reticulations 10 --networks 5
+"""
+
+import argparse
+import time
+
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.move import all_valid_moves, count_valid_moves
+from phylox.rearrangement.movetype import MoveType
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark move enumeration.")
+    parser.add_argument("--leaves", type=int, default=50)
+    parser.add_argument("--reticulations", type=int, default=10)
+    parser.add_argument("--networks", type=int, default=5)
+    return parser.parse_args()
+
+
+def time_it(name, function, networks):
+    start = time.perf_counter()
+    number_of_moves = sum(function(network) for network in networks)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<35} {elapsed:8.3f}s ({number_of_moves} moves)")
+
+
+def main():
+    args = parse_args()
+    networks = [
+        generate_network_random_tree_child_sequence(
+            args.leaves, args.reticulations, seed=seed
+        )
+        for seed in range(args.networks)
+    ]
+    for move_type in [MoveType.RSPR, MoveType.VERT]:
+        time_it(
+            f"{move_type.name}, Move objects",
+            lambda network: len(list(all_valid_moves(network, move_type))),
+            networks,
+        )
+        time_it(
+            f"{move_type.name}, tuples",
+            lambda network: len(list(all_valid_moves(network, move_type, as_tuples=True))),
+            networks,
+        )
+        time_it(
+            f"{move_type.name}, count_valid_moves",
+            lambda network: count_valid_moves(network, move_type),
+            networks,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark for the exact rearrangement distance searches `RearrangementProblem.solve_depth_first`
+and `RearrangementProblem.solve_bidirectional`.
+
+The second network of each problem is obtained from the first by a number of random moves,
+so the distance is at most that number.
+Reports the distances, the total time, and the search statistics.
+
+Usage: python benchmarks/bench_exact_distance.py --leaves 8 --reticulations 2 --moves 3 --move-type TAIL --problems 3 --methods bidirectional depth_first --workers 4
+"""
+
+import argparse
+import random
+import time
+
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.move import all_valid_moves, apply_move
+from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark exact distances.")
+    parser.add_argument("--leaves", type=int, default=8)
+    parser.add_argument("--reticulations", type=int, default=2)
+    parser.add_argument("--moves", type=int, default=3)
+    parser.add_argument("--move-type", default="TAIL", choices=[t.name for t in MoveType])
+    parser.add_argument("--problems", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        default=["bidirectional", "depth_first"],
+        choices=["bidirectional", "depth_first"],
+    )
+    return parser.parse_args()
+
+
+def random_problem(args, move_type, rng):
+    network1 = generate_network_random_tree_child_sequence(
+        args.leaves, args.reticulations, seed=rng.randrange(2**32)
+    )
+    network2 = network1
+    for _ in range(args.moves):
+        moves = list(all_valid_moves(network2, move_type))
+        network2 = apply_move(network2, rng.choice(moves))
+    return RearrangementProblem(network1, network2, move_type)
+
+
+def main():
+    args = parse_args()
+    move_type = MoveType[args.move_type]
+    rng = random.Random(args.seed)
+    for _ in range(args.problems):
+        problem = random_problem(args, move_type, rng)
+        for method in args.methods:
+            start = time.perf_counter()
+            if method == "bidirectional":
+                solution = problem.solve_bidirectional()
+            else:
+                solution = problem.solve_depth_first(
+                    show_bounds=False, workers=args.workers
+                )
+            elapsed = time.perf_counter() - start
+            statistics = problem.search_statistics
+            print(
+                f"{method:<14} distance {len(solution)}: {elapsed:8.3f}s, "
+                f"{statistics['nodes_visited']} visited, "
+                f"{statistics['nodes_expanded']} expanded, "
+                f"{statistics['nodes_per_second']:.1f} expanded per second"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark for the Green Line heuristics `RearrangementProblem.heuristic_green_line`,
+`RearrangementProblem.heuristic_green_line_random` and
+`RearrangementProblem.heuristic_green_line_best_of` on pairs of random tree-child networks.
+
+Reports the time of each heuristic and the length of the sequence it finds.
+
+Usage: python benchmarks/bench_green_line.py --leaves 500 1000 2000 --reticulations-per-leaf 0.1 --move-type TAIL
+"""
+
+import argparse
+import time
+
+import networkx as nx
+
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the Green Line heuristics.")
+    parser.add_argument("--leaves", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--reticulations-per-leaf", type=float, default=0.1)
+    parser.add_argument("--move-type", default="TAIL", choices=["TAIL", "RSPR"])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        default=["green_line", "green_line_random"],
+        choices=["green_line", "green_line_random", "green_line_best_of"],
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    move_type = MoveType[args.move_type]
+    for leaves in args.leaves:
+        reticulations = int(args.reticulations_per_leaf * leaves)
+        network1 = generate_network_random_tree_child_sequence(
+            leaves, reticulations, seed=args.seed
+        )
+        network2 = generate_network_random_tree_child_sequence(
+            leaves, reticulations, seed=args.seed + 1
+        )
+        # use different node names in the two networks
+        offset = max(network1.nodes) + 1
+        network2 = nx.relabel_nodes(network2, {node: node + offset for node in network2})
+        problem = RearrangementProblem(network1, network2, move_type)
+        for method in args.methods:
+            start = time.perf_counter()
+            if method == "green_line":
+                sequence = problem.heuristic_green_line()
+            elif method == "green_line_random":
+                sequence = problem.heuristic_green_line_random(seed=args.seed)
+            else:
+                sequence, _ = problem.heuristic_green_line_best_of(
+                    repeats=args.repeats, workers=args.workers, seed=args.seed
+                )
+            elapsed = time.perf_counter() - start
+            print(
+                f"{leaves} leaves, {reticulations} reticulations, {method:<18} "
+                f"{elapsed:8.3f}s, sequence of length {len(sequence)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for `phylox.isomorphism.is_isomorphic` on the kind of calls made by the exact distance search:
+all networks one tail move away from a network are compared to a fixed target network.
+
+Reports the total time of is_isomorphic and the fraction of the calls rejected by each invariant layer.
+
+Usage: python benchmarks/bench_is_isomorphic.py --leaves 10 --reticulations 3 --networks 20
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.isomorphism import is_isomorphic
+from phylox.isomorphism.base import _invariants
+from phylox.rearrangement.exact_distance.base import all_valid_moves
+from phylox.rearrangement.move import apply_move
+from phylox.rearrangement.movetype import MoveType
+
+LAYERS = [
+    "sizes",
+    "reticulation number",
+    "degrees",
+    "labels",
+    "leaf depths",
+    "blobs",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark is_isomorphic.")
+    parser.add_argument("--leaves", type=int, default=10)
+    parser.add_argument("--reticulations", type=int, default=3)
+    parser.add_argument("--networks", type=int, default=20)
+    return parser.parse_args()
+
+
+def rejecting_layer(network1, network2):
+    for layer, (invariant1, invariant2) in enumerate(
+        zip(_invariants(network1), _invariants(network2))
+    ):
+        if invariant1 != invariant2:
+            return LAYERS[layer]
+    return "canonical form"
+
+
+def main():
+    args = parse_args()
+    pairs = []
+    for seed in range(args.networks):
+        network = generate_network_random_tree_child_sequence(
+            args.leaves, args.reticulations, seed=seed
+        )
+        target = generate_network_random_tree_child_sequence(
+            args.leaves, args.reticulations, seed=seed + args.networks
+        )
+        for move in all_valid_moves(network, MoveType.TAIL):
+            pairs.append((apply_move(network, move), target))
+
+    start = time.perf_counter()
+    isomorphic = sum(is_isomorphic(network, target) for network, target in pairs)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(pairs)} calls, {isomorphic} isomorphic, {elapsed:.3f}s, "
+        f"{1e6 * elapsed / len(pairs):.0f} microseconds per call"
+    )
+    layers = Counter(rejecting_layer(network, target) for network, target in pairs)
+    for layer in LAYERS + ["canonical form"]:
+        print(f"  decided by {layer:<20} {layers[layer] / len(pairs):6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark for the lower bounds of `phylox.rearrangement.exact_distance.lower_bounds`,
+and for `RearrangementProblem.solve_ida_star`, which uses them, against plain iterative deepening
+(`RearrangementProblem.solve_depth_first`).
+
+The second network of each problem is obtained from the first by a number of random moves,
+so the distance is at most that number.
+Reports the distance, the lower bound of the pair of networks, and for both searches the time
+and the number of expanded networks.
+
+Usage: python benchmarks/bench_lower_bounds.py --leaves 7 --reticulations 2 --moves 3 --move-type TAIL --problems 5
+"""
+
+import argparse
+import random
+import time
+
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.exact_distance.lower_bounds import lower_bound
+from phylox.rearrangement.move import all_valid_moves, apply_move
+from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark lower bounds and IDA*.")
+    parser.add_argument("--leaves", type=int, default=7)
+    parser.add_argument("--reticulations", type=int, default=2)
+    parser.add_argument("--moves", type=int, default=3)
+    parser.add_argument("--move-type", default="TAIL", choices=[t.name for t in MoveType])
+    parser.add_argument("--problems", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
+def random_problem(args, move_type, rng):
+    network1 = generate_network_random_tree_child_sequence(
+        args.leaves, args.reticulations, seed=rng.randrange(2**32)
+    )
+    network2 = network1
+    for _ in range(args.moves):
+        moves = list(all_valid_moves(network2, move_type))
+        network2 = apply_move(network2, rng.choice(moves))
+    return RearrangementProblem(network1, network2, move_type)
+
+
+def main():
+    args = parse_args()
+    move_type = MoveType[args.move_type]
+    rng = random.Random(args.seed)
+    totals = {"depth_first": [0, 0.0], "ida_star": [0, 0.0]}
+    for _ in range(args.problems):
+        problem = random_problem(args, move_type, rng)
+        start = time.perf_counter()
+        bound = lower_bound(problem.network1, problem.network2, move_type)
+        bound_time = time.perf_counter() - start
+        results = []
+        for method in totals:
+            start = time.perf_counter()
+            if method == "depth_first":
+                solution = problem.solve_depth_first(show_bounds=False)
+            else:
+                solution = problem.solve_ida_star(show_bounds=False)
+            elapsed = time.perf_counter() - start
+            expanded = problem.search_statistics["nodes_expanded"]
+            totals[method][0] += expanded
+            totals[method][1] += elapsed
+            results.append(f"{method} {elapsed:8.3f}s {expanded:7d} expanded")
+        print(
+            f"distance {len(solution)}, bound {bound} ({1000 * bound_time:.1f}ms): "
+            + ", ".join(results)
+        )
+    for method, (expanded, elapsed) in totals.items():
+        print(f"total {method:<12} {elapsed:8.3f}s {expanded:8d} expanded")
+
+
+if __name__ == "__main__":
+    main()
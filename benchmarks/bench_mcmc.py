@@ -0,0 +1,110 @@
+"""
+Benchmark for `phylox.generators.mcmc.sample_mcmc_networks`,
+which applies the proposed moves in place and undoes the ones that are not accepted.
+
+Reports the number of steps per second for horizontal moves only and for horizontal and vertical moves,
+with and without the symmetry correction.
+With --chains, also runs `phylox.generators.mcmc.sample_mcmc_networks_parallel` with that many chains,
+and reports the time and the convergence diagnostics.
+
+Usage: python benchmarks/bench_mcmc.py --leaves 50 200 --reticulations-per-leaf 0.2 --steps 5000 --chains 4 --workers 4
+"""
+
+import argparse
+import time
+
+from phylox.generators.mcmc import sample_mcmc_networks, sample_mcmc_networks_parallel
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.movetype import MoveType
+
+MOVE_TYPE_PROBABILITIES = {
+    "horizontal": {MoveType.TAIL: 0.5, MoveType.HEAD: 0.5},
+    "all": {
+        MoveType.TAIL: 0.4,
+        MoveType.HEAD: 0.4,
+        MoveType.VPLU: 0.1,
+        MoveType.VMIN: 0.1,
+    },
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the MCMC sampler.")
+    parser.add_argument("--leaves", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--reticulations-per-leaf", type=float, default=0.2)
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chains", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--samples", type=int, default=50)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    for leaves in args.leaves:
+        reticulations = int(args.reticulations_per_leaf * leaves)
+        network = generate_network_random_tree_child_sequence(
+            leaves, reticulations, seed=args.seed
+        )
+        for name, move_type_probabilities in MOVE_TYPE_PROBABILITIES.items():
+            for correct_symmetries in [False, True]:
+                start = time.perf_counter()
+                sample_mcmc_networks(
+                    network,
+                    move_type_probabilities,
+                    restriction_map=lambda nw: nw.reticulation_number
+                    <= 2 * reticulations,
+                    correct_symmetries=correct_symmetries,
+                    burn_in=args.steps,
+                    number_of_samples=1,
+                    seed=args.seed,
+                )
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{leaves} leaves, {reticulations} reticulations, {name:<10} "
+                    f"correct_symmetries={correct_symmetries!s:<5} "
+                    f"{args.steps / elapsed:10.0f} steps per second"
+                )
+        if args.chains:
+            time_parallel(args, network, reticulations)
+
+
+def time_parallel(args, network, reticulations):
+    thin = max(1, args.steps // args.samples)
+    start = time.perf_counter()
+    _, statistics = sample_mcmc_networks_parallel(
+        network,
+        MOVE_TYPE_PROBABILITIES["all"],
+        n_chains=args.chains,
+        workers=args.workers,
+        restriction_map=_RestrictReticulations(2 * reticulations),
+        correct_symmetries=False,
+        warmup=args.steps,
+        thin=thin,
+        number_of_samples=args.samples,
+        seed=args.seed,
+    )
+    elapsed = time.perf_counter() - start
+    steps = sum(chain["steps"] for chain in statistics["chains"])
+    print(
+        f"{args.chains} chains, {args.workers} workers: {elapsed:8.3f}s, "
+        f"{steps / elapsed:10.0f} steps per second"
+    )
+    for name, diagnostics in statistics["diagnostics"].items():
+        print(
+            f"  {name:<20} r_hat {diagnostics['r_hat']:6.3f}, ess {diagnostics['ess']:8.1f}"
+        )
+
+
+class _RestrictReticulations(object):
+    # a picklable restriction map
+    def __init__(self, maximum):
+        self.maximum = maximum
+
+    def __call__(self, network):
+        return network.reticulation_number <= self.maximum
+
+
+if __name__ == "__main__":
+    main()
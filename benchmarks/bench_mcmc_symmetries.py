@@ -0,0 +1,99 @@
+"""
+Benchmark for `phylox.isomorphism.count_automorphisms`, the bottleneck of
+`phylox.generators.mcmc.sample_mcmc_networks` with correct_symmetries=True,
+which counts the automorphisms of the current and the proposed network in every step.
+
+Reports the time per count on random tree-child networks and on a highly symmetric network,
+and the time per MCMC step with and without the symmetry correction.
+
+Usage: python benchmarks/bench_mcmc_symmetries.py --leaves 30 --reticulations 5 --steps 2000
+"""
+
+import argparse
+import time
+
+from phylox import DiNetwork
+from phylox.generators.mcmc import sample_mcmc_networks
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.isomorphism import count_automorphisms
+from phylox.rearrangement.movetype import MoveType
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark automorphism counting.")
+    parser.add_argument("--leaves", type=int, default=30)
+    parser.add_argument("--reticulations", type=int, default=5)
+    parser.add_argument("--networks", type=int, default=50)
+    parser.add_argument("--blobs", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=2000)
+    return parser.parse_args()
+
+
+def symmetric_network(number_of_blobs):
+    """
+    A root with number_of_blobs identical unlabelled children that are each the root of a blob with one reticulation,
+    so the network has number_of_blobs! * 2^number_of_blobs automorphisms.
+    """
+    network = DiNetwork()
+    network.add_edge("root", "top")
+    for blob in range(number_of_blobs):
+        b = 10 * blob
+        network.add_edges_from(
+            [("top", b), (b, b + 1), (b, b + 2), (b + 1, b + 3), (b + 2, b + 3)]
+        )
+        network.add_edges_from([(b + 1, b + 4), (b + 2, b + 5), (b + 3, b + 6)])
+    return network
+
+
+def time_counts(name, networks):
+    start = time.perf_counter()
+    for network in networks:
+        count_automorphisms(network)
+        count_automorphisms(network, ignore_labels=True)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<45} {1e6 * elapsed / (2 * len(networks)):10.0f} microseconds per count")
+
+
+def time_mcmc(args, correct_symmetries):
+    network = generate_network_random_tree_child_sequence(
+        args.leaves, args.reticulations, seed=1
+    )
+    start = time.perf_counter()
+    sample_mcmc_networks(
+        network,
+        {MoveType.TAIL: 0.5, MoveType.HEAD: 0.5},
+        correct_symmetries=correct_symmetries,
+        burn_in=args.steps,
+        number_of_samples=1,
+        seed=1,
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{f'mcmc, correct_symmetries={correct_symmetries}':<45} "
+        f"{1e6 * elapsed / args.steps:10.0f} microseconds per step"
+    )
+
+
+def main():
+    args = parse_args()
+    networks = [
+        generate_network_random_tree_child_sequence(
+            args.leaves, args.reticulations, seed=seed
+        )
+        for seed in range(args.networks)
+    ]
+    time_counts(
+        f"random tree-child ({args.leaves} leaves, {args.reticulations} retics)",
+        networks,
+    )
+    network = symmetric_network(args.blobs)
+    start = time.perf_counter()
+    count = count_automorphisms(network)
+    elapsed = time.perf_counter() - start
+    print(f"{f'symmetric ({args.blobs} blobs)':<45} {elapsed:10.3f}s, {count} automorphisms")
+    time_mcmc(args, correct_symmetries=False)
+    time_mcmc(args, correct_symmetries=True)
+
+
+if __name__ == "__main__":
+    main()
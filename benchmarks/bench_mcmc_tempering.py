@@ -0,0 +1,128 @@
+"""
+Benchmark for `phylox.generators.mcmc.sample_mcmc_networks_tempered`
+against `phylox.generators.mcmc.sample_mcmc_networks`.
+
+Both sample tree-child networks with at most a given number of reticulations, with horizontal and vertical moves.
+The replicas of the tempered sampler only have to respect the maximum number of reticulations,
+and the cold replica gives the samples.
+Reports the effective sample size (see `phylox.generators.mcmc.diagnostics.effective_sample_size`)
+of the reticulation number and the number of cherries of the samples per CPU second,
+including the CPU time of worker processes, and the exchange rates of the tempered sampler.
+
+Usage: python benchmarks/bench_mcmc_tempering.py --leaves 10 20 --max-reticulations 6 --samples 400 --burn-in 50
+"""
+
+import argparse
+import math
+import os
+
+from phylox.classes.dinetwork import is_tree_child
+from phylox.generators.mcmc import (
+    effective_sample_size,
+    network_summaries,
+    sample_mcmc_networks,
+    sample_mcmc_networks_tempered,
+)
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.movetype import MoveType
+
+MOVE_TYPE_PROBABILITIES = {
+    MoveType.TAIL: 0.3,
+    MoveType.HEAD: 0.3,
+    MoveType.VPLU: 0.2,
+    MoveType.VMIN: 0.2,
+}
+SUMMARIES = ["reticulation_number", "cherries"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the tempered MCMC sampler.")
+    parser.add_argument("--leaves", type=int, nargs="+", default=[10, 20])
+    parser.add_argument("--max-reticulations", type=int, default=6)
+    parser.add_argument("--samples", type=int, default=400)
+    parser.add_argument("--burn-in", type=int, default=50)
+    parser.add_argument("--swap-every", type=int, default=10)
+    parser.add_argument(
+        "--inverse-temperatures", type=float, nargs="+", default=[math.inf, 2.0, 1.0]
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
+def cpu_time():
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def main():
+    args = parse_args()
+    for leaves in args.leaves:
+        network = generate_network_random_tree_child_sequence(leaves, 0, seed=args.seed)
+        restriction = _TreeChildWithMaximum(args.max_reticulations)
+        start = cpu_time()
+        samples = sample_mcmc_networks(
+            network,
+            MOVE_TYPE_PROBABILITIES,
+            restriction_map=restriction,
+            correct_symmetries=False,
+            burn_in=args.burn_in,
+            number_of_samples=args.samples,
+            seed=args.seed,
+        )
+        report(f"{leaves} leaves, plain", samples, cpu_time() - start)
+        start = cpu_time()
+        samples, statistics = sample_mcmc_networks_tempered(
+            network,
+            MOVE_TYPE_PROBABILITIES,
+            inverse_temperatures=args.inverse_temperatures,
+            restriction_map=is_tree_child,
+            support_map=_MaximumReticulations(args.max_reticulations),
+            correct_symmetries=False,
+            burn_in=args.burn_in,
+            swap_every=args.swap_every,
+            number_of_samples=args.samples,
+            workers=args.workers,
+            seed=args.seed,
+        )
+        report(
+            f"{leaves} leaves, tempered ({len(args.inverse_temperatures)} replicas)",
+            samples,
+            cpu_time() - start,
+        )
+        for swaps in statistics["swaps"]:
+            print(
+                f"  exchanges {swaps['inverse_temperatures']}: "
+                f"{swaps['acceptance_rate']:.3f} of {swaps['proposed']}"
+            )
+        print(
+            "  round trips per replica: "
+            f"{[replica['round_trips'] for replica in statistics['replicas']]}"
+        )
+
+
+def report(name, samples, elapsed):
+    summaries = [network_summaries(sample) for sample in samples]
+    line = f"{name:<36} {elapsed:8.2f} CPU s"
+    for summary in SUMMARIES:
+        ess = effective_sample_size([[values[summary] for values in summaries]])
+        line += f", {summary} ess {ess:7.1f} ({ess / elapsed:7.1f} per CPU s)"
+    print(line)
+
+
+class _MaximumReticulations(object):
+    # a picklable support map
+    def __init__(self, maximum):
+        self.maximum = maximum
+
+    def __call__(self, network):
+        return network.reticulation_number <= self.maximum
+
+
+class _TreeChildWithMaximum(_MaximumReticulations):
+    def __call__(self, network):
+        return super().__call__(network) and is_tree_child(network)
+
+
+if __name__ == "__main__":
+    main()
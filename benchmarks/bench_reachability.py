@@ -0,0 +1,52 @@
+"""
+Benchmark for enumerating all valid moves of a network,
+with and without a `phylox.rearrangement.reachability.ReachabilityIndex` attached to the network.
+
+Usage: python benchmarks/bench_reachability.py --leaves 30 --reticulations 5 --networks 5
+"""
+
+import argparse
+import time
+
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.move import all_valid_moves
+from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.reachability import ReachabilityIndex
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark move enumeration.")
+    parser.add_argument("--leaves", type=int, default=30)
+    parser.add_argument("--reticulations", type=int, default=5)
+    parser.add_argument("--networks", type=int, default=5)
+    return parser.parse_args()
+
+
+def time_enumeration(name, networks, move_type):
+    start = time.perf_counter()
+    number_of_moves = sum(
+        len(list(all_valid_moves(network, move_type))) for network in networks
+    )
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40} {elapsed:8.3f}s ({number_of_moves} moves)")
+
+
+def main():
+    args = parse_args()
+    networks = [
+        generate_network_random_tree_child_sequence(
+            args.leaves, args.reticulations, seed=seed
+        )
+        for seed in range(args.networks)
+    ]
+    for move_type in [MoveType.RSPR, MoveType.VPLU]:
+        time_enumeration(f"{move_type.name}, without index", networks, move_type)
+        for network in networks:
+            ReachabilityIndex.attach(network)
+        time_enumeration(f"{move_type.name}, with index", networks, move_type)
+        for network in networks:
+            ReachabilityIndex.detach(network)
+
+
+if __name__ == "__main__":
+    main()
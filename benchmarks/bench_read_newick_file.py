@@ -0,0 +1,82 @@
+"""
+Benchmark for reading a file with many Newick strings.
+
+Compares parsing the strings one at a time with `DiNetwork.from_newick`
+to `phylox.io.read_newick_file` with and without worker processes.
+
+Usage: python benchmarks/bench_read_newick_file.py --networks 2000 --leaves 50 --reticulations 5 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from phylox import DiNetwork
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.io import read_newick_file
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark reading Newick files.")
+    parser.add_argument("--networks", type=int, default=2000)
+    parser.add_argument("--leaves", type=int, default=50)
+    parser.add_argument("--reticulations", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    return parser.parse_args()
+
+
+def write_file(path, number_of_networks, leaves, reticulations):
+    with open(path, "w") as file:
+        for seed in range(number_of_networks):
+            network = generate_network_random_tree_child_sequence(
+                leaves, reticulations, seed=seed
+            )
+            file.write(network.newick() + "\n")
+
+
+def time_it(name, function, number_of_networks):
+    start = time.perf_counter()
+    networks = function()
+    elapsed = time.perf_counter() - start
+    assert len(networks) == number_of_networks
+    print(f"{name:<40} {elapsed:8.3f}s {number_of_networks / elapsed:10.0f} networks/s")
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "networks.nwk")
+        write_file(path, args.networks, args.leaves, args.reticulations)
+        print(f"file size: {os.path.getsize(path) / 1e6:.1f} MB")
+
+        def per_string_loop():
+            with open(path) as file:
+                strings = file.read().split(";")
+            return [DiNetwork.from_newick(s + ";") for s in strings if s.strip()]
+
+        time_it("per-string loop", per_string_loop, args.networks)
+        time_it(
+            "read_newick_file (serial)",
+            lambda: list(read_newick_file(path)),
+            args.networks,
+        )
+        time_it(
+            "read_newick_file (serial, compact)",
+            lambda: list(read_newick_file(path, compact=True)),
+            args.networks,
+        )
+        time_it(
+            f"read_newick_file ({args.workers} workers)",
+            lambda: list(read_newick_file(path, workers=args.workers)),
+            args.networks,
+        )
+        time_it(
+            f"read_newick_file ({args.workers} workers, compact)",
+            lambda: list(read_newick_file(path, workers=args.workers, compact=True)),
+            args.networks,
+        )
+
+
+if __name__ == "__main__":
+    main()
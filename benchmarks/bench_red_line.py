@@ -0,0 +1,70 @@
+"""
+Benchmark for the Red Line heuristics `RearrangementProblem.heuristic_red_line`
+and `RearrangementProblem.heuristic_red_line_random`, which find head move sequences,
+against the Green Line heuristics `RearrangementProblem.heuristic_green_line`
+and `RearrangementProblem.heuristic_green_line_random`, which find rSPR move sequences,
+on pairs of random tree-child networks.
+
+Reports the time of each heuristic and the length of the sequence it finds.
+
+Usage: python benchmarks/bench_red_line.py --leaves 500 1000 2000 --reticulations-per-leaf 0.1
+"""
+
+import argparse
+import time
+
+import networkx as nx
+
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+
+METHODS = {
+    "red_line": (MoveType.HEAD, "heuristic_red_line"),
+    "red_line_random": (MoveType.HEAD, "heuristic_red_line_random"),
+    "green_line": (MoveType.RSPR, "heuristic_green_line"),
+    "green_line_random": (MoveType.RSPR, "heuristic_green_line_random"),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Red Line heuristics against the Green Line heuristics."
+    )
+    parser.add_argument("--leaves", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--reticulations-per-leaf", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--methods", nargs="+", default=list(METHODS), choices=list(METHODS)
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    for leaves in args.leaves:
+        reticulations = max(1, int(args.reticulations_per_leaf * leaves))
+        network1 = generate_network_random_tree_child_sequence(
+            leaves, reticulations, seed=args.seed
+        )
+        network2 = generate_network_random_tree_child_sequence(
+            leaves, reticulations, seed=args.seed + 1
+        )
+        # use different node names in the two networks
+        offset = max(network1.nodes) + 1
+        network2 = nx.relabel_nodes(network2, {node: node + offset for node in network2})
+        for method in args.methods:
+            move_type, heuristic = METHODS[method]
+            problem = RearrangementProblem(network1, network2, move_type)
+            kwargs = {"seed": args.seed} if method.endswith("random") else {}
+            start = time.perf_counter()
+            sequence = getattr(problem, heuristic)(**kwargs)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{leaves} leaves, {reticulations} reticulations, {method:<18} "
+                f"{elapsed:8.3f}s, sequence of length {len(sequence)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,2 @@
 from phylox.dinetwork import *
+from phylox.compactnetwork import CompactNetwork
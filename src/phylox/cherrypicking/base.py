@@ -186,7 +186,6 @@ def is_second_in_reducible_pair(network, x):
 def reduce_pair(network, x, y, inplace=False, nodes_by_label=False):
     """
     Reduces the reducible pair (x,y) in the network.
-    Note: Cache of network properties is not updated.
 
     Parameters
     ----------
@@ -246,7 +245,6 @@ def reduce_pair(network, x, y, inplace=False, nodes_by_label=False):
         network.remove_edge(py, px)
         suppress_node(network, px)
         suppress_node(network, py)
-    network._clear_cached()
     return network, cherry_type
 
 
@@ -311,11 +309,8 @@ def add_pair(network, x, y, height=[1, 1], inplace=False, nodes_by_label=False):
             weight=LENGTH_ATTR,
         )
         if nodes_by_label:
-            network.label_to_node_dict[x] = node_x
-            network.label_to_node_dict[y] = node_y
-            network.nodes[node_x][LABEL_ATTR] = x
-            network.nodes[node_y][LABEL_ATTR] = y
-        network._clear_cached()
+            network.add_node(node_x, **{LABEL_ATTR: x})
+            network.add_node(node_y, **{LABEL_ATTR: y})
         return network
 
     node_y = network.label_to_node_dict.get(y) if nodes_by_label else y
@@ -367,9 +362,7 @@ def add_pair(network, x, y, height=[1, 1], inplace=False, nodes_by_label=False):
             length=height_goal_x,
         )
         if nodes_by_label:
-            network.nodes[node_x][LABEL_ATTR] = x
-            network.label_to_node_dict[x] = node_x
-        network._clear_cached()
+            network.add_node(node_x, **{LABEL_ATTR: x})
         return network
 
     # x is already in the network, so create a reticulate cherry (x,y)
@@ -385,7 +378,6 @@ def add_pair(network, x, y, height=[1, 1], inplace=False, nodes_by_label=False):
             length=height_goal_x - length_incoming_x,
         )
         # network[parent_node_x][node_x]["no_of_trees"] += len(red_trees)
-        network._clear_cached()
         return network
 
     # create a new reticulation vertex above x to attach the hybrid arc to
@@ -410,7 +402,6 @@ def add_pair(network, x, y, height=[1, 1], inplace=False, nodes_by_label=False):
             ),  # "no_of_trees": len(red_trees)
         ]
     )
-    network._clear_cached()
     return network
 
 
@@ -548,5 +539,4 @@ class CherryPickingMixin:
             add_pair(
                 network, *pair, height=height, inplace=True, nodes_by_label=label_leaves
             )
-        network._clear_cached()
         return network
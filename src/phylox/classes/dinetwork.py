@@ -72,10 +72,7 @@ def is_orchard(network):
     # make a copy and fix a root edge
     network_copy = deepcopy(network)
     if network_copy.out_degree(root) > 1:
-        new_node = -1
-        while new_node in network_copy.nodes:
-            new_node -= 1
-        network_copy.add_edge(new_node, root)
+        network_copy.add_edge(network_copy.find_unused_node(), root)
     leaves = network_copy.leaves
 
     # try to reduce the network copy
@@ -0,0 +1,712 @@
+"""
+A module containing a compact, read-only representation of a phylogenetic network: `phylox.CompactNetwork`.
+
+A `phylox.DiNetwork` stores each node and edge in Python dictionaries, which is convenient for editing a network, but costly for large networks.
+The `phylox.CompactNetwork` stores the same network in compressed sparse row (CSR) format using NumPy arrays:
+for each node, the children and parents are stored as consecutive slices of an index array.
+Labels and edge lengths are stored as separate columns.
+
+A compact network cannot be modified.
+Use `phylox.DiNetwork.to_compact` and `phylox.CompactNetwork.to_dinetwork` to convert between the two representations.
+
+The compact network implements the read-only part of the interface of `phylox.DiNetwork`
+(e.g., `nodes`, `in_degree`, `out_degree`, `successors`, `predecessors`, `is_leaf`),
+so it can be passed to read-only functions such as `phylox.classes.dinetwork.is_binary`,
+`phylox.classes.dinetwork.is_tree_child`, `phylox.classes.dinetwork.is_stack_free`,
+`phylox.networkproperties.properties.count_reducible_pairs`,
+`phylox.networkproperties.properties.blob_properties`
+and `phylox.networkproperties.properties.b2_balance`.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from phylox.constants import LABEL_ATTR, LENGTH_ATTR
+
+INDEX_DTYPE = np.int32
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+def _csr(keys, values, number_of_nodes):
+    """
+    Groups the values by key (stable) and returns the offsets and grouped values.
+    """
+    order = np.argsort(keys, kind="stable")
+    counts = np.bincount(keys, minlength=number_of_nodes)
+    offsets = np.zeros(number_of_nodes + 1, dtype=INDEX_DTYPE)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets, values[order].astype(INDEX_DTYPE), order
+
+
+class _CompactNodeView(Mapping):
+    """
+    A read-only view of the nodes of a compact network and their attributes.
+    Mimics the `networkx` node view: iterating gives the nodes,
+    and indexing with a node gives a dictionary with its attributes.
+    """
+
+    def __init__(self, network):
+        self._network = network
+
+    def __iter__(self):
+        return iter(self._network)
+
+    def __len__(self):
+        return len(self._network)
+
+    def __contains__(self, node):
+        return node in self._network
+
+    def __getitem__(self, node):
+        return self._network._node_attributes(self._network.index(node))
+
+    def __call__(self, data=False):
+        if not data:
+            return self
+        return [(node, self[node]) for node in self]
+
+
+class CompactNetwork:
+    """
+    A frozen, array-based representation of a directed phylogenetic network.
+
+    The nodes are numbered 0, ..., n-1 internally; `node_ids` holds the original node names.
+    The children of the node with index i are `children[child_offsets[i]:child_offsets[i+1]]`,
+    and its parents are `parents[parent_offsets[i]:parent_offsets[i+1]]`.
+    The edges are numbered in the order of the `children` array,
+    so the length of the i-th edge is `lengths[i]` (NaN if the edge has no length).
+
+    Usually, a compact network is created with `phylox.DiNetwork.to_compact`
+    or `phylox.CompactNetwork.from_edges`.
+
+    :param node_ids: array with the name of each node.
+    :param child_offsets: int32 array of length n+1 with the offsets of the children of each node.
+    :param children: int32 array with the indices of the children of each node.
+    :param parent_offsets: int32 array of length n+1 with the offsets of the parents of each node.
+    :param parents: int32 array with the indices of the parents of each node.
+    :param parent_edges: int32 array with, for each entry of parents, the index of the corresponding edge.
+    :param label_nodes: int32 array with the indices of the labelled nodes.
+    :param label_values: array with the labels of the nodes in label_nodes.
+    :param lengths: float64 array with the length of each edge.
+    :param node_attrs: dictionary mapping node indices to any other node attributes.
+    :param edge_attrs: dictionary mapping edge indices to any other edge attributes.
+    :param graph_attrs: dictionary with graph attributes.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> network = DiNetwork(
+    ...     edges=[(0, 1), (1, 2), (1, 3), (2, 3), (2, 4), (3, 5)],
+    ...     labels=[(4, "a"), (5, "b")],
+    ... )
+    >>> compact = network.to_compact()
+    >>> sorted(compact.leaves)
+    [4, 5]
+    >>> compact.reticulations
+    {3}
+    >>> compact.reticulation_number
+    1
+    >>> compact.to_dinetwork().edges == network.edges
+    True
+    """
+
+    def __init__(
+        self,
+        node_ids,
+        child_offsets,
+        children,
+        parent_offsets,
+        parents,
+        parent_edges,
+        label_nodes=None,
+        label_values=None,
+        lengths=None,
+        node_attrs=None,
+        edge_attrs=None,
+        graph_attrs=None,
+    ):
+        number_of_edges = len(children)
+        self.node_ids = _read_only(np.asarray(node_ids))
+        self.child_offsets = _read_only(np.asarray(child_offsets, dtype=INDEX_DTYPE))
+        self.children = _read_only(np.asarray(children, dtype=INDEX_DTYPE))
+        self.parent_offsets = _read_only(np.asarray(parent_offsets, dtype=INDEX_DTYPE))
+        self.parents = _read_only(np.asarray(parents, dtype=INDEX_DTYPE))
+        self.parent_edges = _read_only(np.asarray(parent_edges, dtype=INDEX_DTYPE))
+        self.out_degrees = _read_only(np.diff(self.child_offsets))
+        self.in_degrees = _read_only(np.diff(self.parent_offsets))
+        label_nodes = np.asarray([] if label_nodes is None else label_nodes, dtype=INDEX_DTYPE)
+        values = np.empty(len(label_nodes), dtype=object)
+        values[:] = [] if label_values is None else list(label_values)
+        # sort the labels by node, if a node has multiple labels the last one is kept
+        order = np.argsort(label_nodes, kind="stable")
+        label_nodes, values = label_nodes[order], values[order]
+        keep = np.ones(len(label_nodes), dtype=bool)
+        keep[:-1] = label_nodes[:-1] != label_nodes[1:]
+        self.label_nodes = _read_only(label_nodes[keep])
+        self.label_values = _read_only(values[keep])
+        if lengths is None:
+            lengths = np.full(number_of_edges, np.nan)
+        self.lengths = _read_only(np.asarray(lengths, dtype=np.float64))
+        self.node_attrs = node_attrs or {}
+        self.edge_attrs = edge_attrs or {}
+        self.graph = graph_attrs or {}
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False) and not name.startswith("_"):
+            raise AttributeError("A CompactNetwork cannot be modified.")
+        super().__setattr__(name, value)
+
+    def __setstate__(self, state):
+        # arrays are writeable again after unpickling, e.g., when sent between processes
+        for value in state.values():
+            if isinstance(value, np.ndarray):
+                _read_only(value)
+        self.__dict__.update(state)
+
+    @classmethod
+    def from_edges(cls, edges, nodes=None, labels=None, lengths=None):
+        """
+        Creates a compact network from a list of edges.
+
+        :param edges: a list of edges (u, v) or (u, v, attrs) of the network, where attrs is a dictionary of edge attributes.
+        :param nodes: a list of nodes of the network, nodes that are not in an edge are added.
+        :param labels: a list of tuples of the form (node, label).
+        :param lengths: a list with the length of each edge (None for no length), in the order of edges.
+            If not given, the lengths are taken from the edge attributes.
+        :return: a compact network.
+
+        :example:
+        >>> from phylox.compactnetwork import CompactNetwork
+        >>> network = CompactNetwork.from_edges(
+        ...     [(0, 1), (1, 2), (1, 3)],
+        ...     labels=[(2, "a"), (3, "b")],
+        ...     lengths=[None, 0.5, 1.5],
+        ... )
+        >>> network.roots
+        {0}
+        >>> network.label_to_node_dict == {"a": 2, "b": 3}
+        True
+        """
+        node_index = {}
+        node_ids = []
+        for node in nodes or []:
+            if node not in node_index:
+                node_index[node] = len(node_ids)
+                node_ids.append(node)
+        sources = np.empty(len(edges), dtype=np.int64)
+        targets = np.empty(len(edges), dtype=np.int64)
+        edge_lengths = None
+        edge_attrs = {}
+        for i, edge in enumerate(edges):
+            u, v = edge[0], edge[1]
+            for node in (u, v):
+                if node not in node_index:
+                    node_index[node] = len(node_ids)
+                    node_ids.append(node)
+            sources[i] = node_index[u]
+            targets[i] = node_index[v]
+            if len(edge) > 2 and edge[2]:
+                data = dict(edge[2])
+                if LENGTH_ATTR in data:
+                    length = data.pop(LENGTH_ATTR)
+                    if lengths is None:
+                        if edge_lengths is None:
+                            edge_lengths = np.full(len(edges), np.nan)
+                        edge_lengths[i] = length
+                if data:
+                    edge_attrs[i] = data
+        if lengths is not None:
+            edge_lengths = np.array(
+                [np.nan if length is None else length for length in lengths],
+                dtype=np.float64,
+            )
+        label_nodes, label_values = [], []
+        for node, label in labels or []:
+            if node not in node_index:
+                node_index[node] = len(node_ids)
+                node_ids.append(node)
+            label_nodes.append(node_index[node])
+            label_values.append(label)
+        return cls._from_index_arrays(
+            _node_id_array(node_ids),
+            sources,
+            targets,
+            label_nodes=label_nodes,
+            label_values=label_values,
+            lengths=edge_lengths,
+            edge_attrs=edge_attrs,
+        )
+
+    @classmethod
+    def from_dinetwork(cls, network):
+        """
+        Creates a compact network from a phylox.DiNetwork.
+        All node, edge and graph attributes are kept.
+
+        :param network: a phylogenetic network phylox.DiNetwork.
+        :return: a compact network.
+        """
+        node_ids = list(network.nodes)
+        node_index = {node: i for i, node in enumerate(node_ids)}
+        number_of_edges = network.number_of_edges()
+        sources = np.empty(number_of_edges, dtype=np.int64)
+        targets = np.empty(number_of_edges, dtype=np.int64)
+        lengths = np.full(number_of_edges, np.nan)
+        edge_attrs = {}
+        for i, (u, v, data) in enumerate(network.edges(data=True)):
+            sources[i] = node_index[u]
+            targets[i] = node_index[v]
+            if data:
+                data = dict(data)
+                if LENGTH_ATTR in data:
+                    lengths[i] = data.pop(LENGTH_ATTR)
+                if data:
+                    edge_attrs[i] = data
+        label_nodes, label_values, node_attrs = [], [], {}
+        for i, (node, data) in enumerate(network.nodes(data=True)):
+            if not data:
+                continue
+            data = dict(data)
+            if LABEL_ATTR in data:
+                label_nodes.append(i)
+                label_values.append(data.pop(LABEL_ATTR))
+            if data:
+                node_attrs[i] = data
+        return cls._from_index_arrays(
+            _node_id_array(node_ids),
+            sources,
+            targets,
+            label_nodes=label_nodes,
+            label_values=label_values,
+            lengths=lengths,
+            node_attrs=node_attrs,
+            edge_attrs=edge_attrs,
+            graph_attrs=dict(network.graph),
+        )
+
+    @classmethod
+    def _from_index_arrays(cls, node_ids, sources, targets, lengths=None, edge_attrs=None, **kwargs):
+        number_of_nodes = len(node_ids)
+        child_offsets, children, edge_order = _csr(sources, targets, number_of_nodes)
+        # the edges are numbered in the order of the children array
+        edge_of_order = np.empty(len(sources), dtype=np.int64)
+        edge_of_order[edge_order] = np.arange(len(sources))
+        parent_offsets, parents, parent_order = _csr(
+            targets[edge_order], sources[edge_order], number_of_nodes
+        )
+        if lengths is not None:
+            lengths = lengths[edge_order]
+        if edge_attrs:
+            edge_attrs = {int(edge_of_order[i]): data for i, data in edge_attrs.items()}
+        return cls(
+            node_ids,
+            child_offsets,
+            children,
+            parent_offsets,
+            parents,
+            parent_order,
+            lengths=lengths,
+            edge_attrs=edge_attrs,
+            **kwargs,
+        )
+
+    def to_dinetwork(self):
+        """
+        Converts the compact network to a phylox.DiNetwork.
+
+        :return: a phylogenetic network phylox.DiNetwork.
+
+        :example:
+        >>> from phylox import DiNetwork
+        >>> network = DiNetwork(
+        ...     edges=[(0, 1), (1, 2, {"length": 1.0}), (1, 3)],
+        ...     labels=[(2, "a"), (3, "b")],
+        ... )
+        >>> copy = network.to_compact().to_dinetwork()
+        >>> copy.edges(data=True)
+        OutEdgeDataView([(0, 1, {}), (1, 2, {'length': 1.0}), (1, 3, {})])
+        >>> copy.nodes(data=True)
+        NodeDataView({0: {}, 1: {}, 2: {'label': 'a'}, 3: {'label': 'b'}})
+        """
+        from phylox.dinetwork import DiNetwork
+
+        network = DiNetwork()
+        network.graph.update(self.graph)
+        node_ids = self.node_ids.tolist()
+        network.add_nodes_from(
+            (node_ids[i], self._node_attributes(i)) for i in range(len(node_ids))
+        )
+        sources = np.repeat(np.arange(len(node_ids)), self.out_degrees).tolist()
+        targets = self.children.tolist()
+        network.add_edges_from(
+            (node_ids[sources[i]], node_ids[targets[i]], self._edge_attributes(i))
+            for i in range(len(targets))
+        )
+        return network
+
+    def _node_attributes(self, i):
+        attributes = dict(self.node_attrs.get(i, {}))
+        position = np.searchsorted(self.label_nodes, i)
+        if position < len(self.label_nodes) and self.label_nodes[position] == i:
+            attributes[LABEL_ATTR] = self.label_values[position]
+        return attributes
+
+    def _edge_attributes(self, i):
+        attributes = {}
+        if not np.isnan(self.lengths[i]):
+            attributes[LENGTH_ATTR] = float(self.lengths[i])
+        attributes.update(self.edge_attrs.get(i, {}))
+        return attributes
+
+    # Sizes and node lookup
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __iter__(self):
+        return iter(self.node_ids.tolist())
+
+    def __contains__(self, node):
+        try:
+            self.index(node)
+        except KeyError:
+            return False
+        return True
+
+    def number_of_nodes(self):
+        """
+        Returns the number of nodes of the network.
+
+        :return: the number of nodes.
+        """
+        return len(self.node_ids)
+
+    def number_of_edges(self):
+        """
+        Returns the number of edges of the network.
+
+        :return: the number of edges.
+        """
+        return len(self.children)
+
+    def index(self, node):
+        """
+        Returns the internal index of a node.
+
+        :param node: a node of the network.
+        :return: the index of the node in the arrays of the network.
+        """
+        if not hasattr(self, "_node_index"):
+            node_ids = self.node_ids
+            if node_ids.dtype.kind in "iu" and np.array_equal(
+                node_ids, np.arange(len(node_ids))
+            ):
+                self._node_index = None
+            else:
+                self._node_index = {node: i for i, node in enumerate(node_ids.tolist())}
+        if self._node_index is None:
+            if isinstance(node, (int, np.integer)) and 0 <= node < len(self.node_ids):
+                return int(node)
+            raise KeyError(node)
+        return self._node_index[node]
+
+    def _nodes_of(self, indices):
+        return self.node_ids[indices].tolist()
+
+    @property
+    def nodes(self):
+        """
+        Returns a read-only view of the nodes of the network.
+        Iterating over it gives the nodes,
+        indexing it with a node gives a dictionary with the node attributes.
+
+        :return: a view of the nodes.
+        """
+        return _CompactNodeView(self)
+
+    @property
+    def edges(self):
+        """
+        Returns the list of edges of the network.
+
+        :return: a list of edges (u, v).
+        """
+        sources = np.repeat(self.node_ids, self.out_degrees).tolist()
+        return list(zip(sources, self._nodes_of(self.children)))
+
+    # Local structure
+
+    def in_degree(self, node):
+        """
+        Returns the in-degree of a node.
+
+        :param node: a node in the network.
+        :return: the in-degree of the node.
+        """
+        return int(self.in_degrees[self.index(node)])
+
+    def out_degree(self, node):
+        """
+        Returns the out-degree of a node.
+
+        :param node: a node in the network.
+        :return: the out-degree of the node.
+        """
+        return int(self.out_degrees[self.index(node)])
+
+    def successors(self, node):
+        """
+        Returns an iterator over the children of a node.
+
+        :param node: a node in the network.
+        :return: an iterator over the children of the node.
+        """
+        i = self.index(node)
+        return iter(
+            self._nodes_of(self.children[self.child_offsets[i] : self.child_offsets[i + 1]])
+        )
+
+    def predecessors(self, node):
+        """
+        Returns an iterator over the parents of a node.
+
+        :param node: a node in the network.
+        :return: an iterator over the parents of the node.
+        """
+        i = self.index(node)
+        return iter(
+            self._nodes_of(self.parents[self.parent_offsets[i] : self.parent_offsets[i + 1]])
+        )
+
+    def has_edge(self, u, v):
+        """
+        Checks whether the network has the edge (u, v).
+
+        :param u: a node.
+        :param v: a node.
+        :return: a boolean value.
+        """
+        try:
+            i, j = self.index(u), self.index(v)
+        except KeyError:
+            return False
+        return bool(
+            np.any(self.children[self.child_offsets[i] : self.child_offsets[i + 1]] == j)
+        )
+
+    def child(self, node, exclude=[]):
+        """
+        Finds a child node of a node.
+
+        :param node: a node of the network.
+        :param exclude: a set of nodes of the network.
+        :return: a child of node that is not in the set of nodes exclude.
+        """
+        for c in self.successors(node):
+            if c not in exclude:
+                return c
+        return None
+
+    def parent(self, node, exclude=[]):
+        """
+        Finds a parent of a node.
+
+        :param node: a node of the network.
+        :param exclude: a set of nodes of the network.
+        :return: a parent of node that is not in the set of nodes exclude.
+        """
+        for p in self.predecessors(node):
+            if p not in exclude:
+                return p
+        return None
+
+    # Node types, as boolean arrays over all nodes
+
+    @property
+    def leaf_mask(self):
+        """
+        Boolean array indicating for each node whether it is a leaf.
+        """
+        return (self.out_degrees == 0) & (self.in_degrees > 0)
+
+    @property
+    def root_mask(self):
+        """
+        Boolean array indicating for each node whether it is a root.
+        """
+        return self.in_degrees == 0
+
+    @property
+    def reticulation_mask(self):
+        """
+        Boolean array indicating for each node whether it is a reticulation.
+        """
+        return (self.out_degrees <= 1) & (self.in_degrees > 1)
+
+    @property
+    def tree_node_mask(self):
+        """
+        Boolean array indicating for each node whether it is a tree node.
+        """
+        return (self.out_degrees > 1) & (self.in_degrees <= 1)
+
+    @property
+    def leaves(self):
+        """
+        Returns the set of leaves of the network.
+
+        :return: the set of leaves of the network.
+        """
+        return set(self._nodes_of(np.flatnonzero(self.leaf_mask)))
+
+    @property
+    def roots(self):
+        """
+        Returns the set of roots of the network.
+
+        :return: the set of roots of the network.
+        """
+        return set(self._nodes_of(np.flatnonzero(self.root_mask)))
+
+    @property
+    def reticulations(self):
+        """
+        Returns the set of reticulations of the network.
+
+        :return: the set of reticulations of the network.
+        """
+        return set(self._nodes_of(np.flatnonzero(self.reticulation_mask)))
+
+    @property
+    def reticulation_number(self):
+        """
+        Returns the number of reticulations of the network,
+        i.e., the sum over all nodes of the in-degree minus one.
+
+        :return: the reticulation number of the network.
+        """
+        return int(np.maximum(self.in_degrees.astype(np.int64) - 1, 0).sum())
+
+    def is_leaf(self, node):
+        """
+        Checks whether a node is a leaf.
+        I.e., whether it has out-degree = 0 and in-degree > 0.
+
+        :param node: a node in the network.
+        :return: a boolean value.
+        """
+        i = self.index(node)
+        return bool(self.out_degrees[i] == 0 and self.in_degrees[i] > 0)
+
+    def is_reticulation(self, node):
+        """
+        Checks whether a node is a reticulation.
+        I.e., whether it has in-degree > 1 and out-degree <= 1.
+
+        :param node: a node in the network.
+        :return: a boolean value.
+        """
+        i = self.index(node)
+        return bool(self.out_degrees[i] <= 1 and self.in_degrees[i] > 1)
+
+    def is_root(self, node):
+        """
+        Checks whether a node is a root.
+        I.e., whether it has in-degree = 0.
+
+        :param node: a node in the network.
+        :return: a boolean value.
+        """
+        return bool(self.in_degrees[self.index(node)] == 0)
+
+    def is_tree_node(self, node):
+        """
+        Checks whether a node is a tree node.
+        I.e., whether it has in-degree <= 1 and out-degree > 1.
+
+        :param node: a node in the network.
+        :return: a boolean value.
+        """
+        i = self.index(node)
+        return bool(self.out_degrees[i] > 1 and self.in_degrees[i] <= 1)
+
+    # Labels
+
+    @property
+    def labels(self):
+        """
+        Returns the dictionary mapping labels to lists of nodes.
+
+        :return: the dictionary mapping labels to lists of nodes.
+        """
+        labels = {}
+        for node, label in zip(self._nodes_of(self.label_nodes), self.label_values.tolist()):
+            labels.setdefault(label, []).append(node)
+        return labels
+
+    @property
+    def label_to_node_dict(self):
+        """
+        Returns the dictionary mapping labels to nodes.
+
+        :return: the dictionary mapping labels to nodes.
+        """
+        return dict(zip(self.label_values.tolist(), self._nodes_of(self.label_nodes)))
+
+    def to_undirected(self):
+        """
+        Returns the underlying undirected graph of the network as a networkx.Graph.
+
+        :return: a networkx.Graph.
+        """
+        import networkx as nx
+
+        graph = nx.Graph()
+        graph.add_nodes_from(self)
+        graph.add_edges_from(self.edges)
+        return graph
+
+    def nbytes(self):
+        """
+        Returns the number of bytes used by the arrays of the network.
+
+        :return: the number of bytes.
+        """
+        return sum(
+            array.nbytes
+            for array in [
+                self.node_ids,
+                self.child_offsets,
+                self.children,
+                self.parent_offsets,
+                self.parents,
+                self.parent_edges,
+                self.out_degrees,
+                self.in_degrees,
+                self.label_nodes,
+                self.label_values,
+                self.lengths,
+            ]
+        )
+
+
+def _node_id_array(node_ids):
+    """
+    Stores integer node names in an integer array, and other node names in an object array.
+    """
+    if all(
+        isinstance(node, (int, np.integer)) and not isinstance(node, bool)
+        for node in node_ids
+    ):
+        try:
+            return np.array(node_ids, dtype=np.int64)
+        except OverflowError:
+            pass
+    array = np.empty(len(node_ids), dtype=object)
+    array[:] = node_ids
+    return array
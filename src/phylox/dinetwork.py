@@ -7,6 +7,8 @@ Note that not all methods in this package handle these different types of networ
 """
 
 
+import math
+import numbers
 import random
 
 from copy import deepcopy
@@ -114,6 +116,20 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
     :param kwargs: additional keyword arguments.
     """
 
+    #: If True, the cached node sets and label indices are compared to a full rescan
+    #: of the network after every modification (see `DiNetwork.validate_cache`).
+    #: This is slow, and only meant for debugging.
+    debug_cache = False
+
+    _cached_properties = (
+        "_leaves",
+        "_reticulations",
+        "_roots",
+        "_reticulation_number",
+        "_labels",
+        "_label_to_node_dict",
+    )
+
     def __init__(self, *args, **kwargs):
         edges = kwargs.get("edges", [])
         super().__init__(edges, *args, **kwargs)
@@ -125,20 +141,319 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
     def _clear_cached(self):
         """
         Clears all cached properties of the network.
+        The caches are kept up to date when the network is modified,
+        so this is only needed after modifying node attributes directly,
+        e.g., with `network.nodes[node][LABEL_ATTR] = label`.
 
         :return: None
         """
-        for attr in [
-            "_leaves",
-            "_reticulations",
-            "_roots",
-            "_reticulation_number",
-            "_labels",
-            "_label_to_node_dict",
-        ]:
+        for attr in self._cached_properties:
             if hasattr(self, attr):
                 delattr(self, attr)
 
+    def _has_cached_properties(self):
+        """
+        Checks whether any cached property (including the next unused node) has been computed.
+        If not, nodes and edges can be added without updating the caches.
+
+        :return: True if any cached property is set, False otherwise.
+        """
+        return (
+            "_next_unused_node" in self.__dict__
+            or "_reachability_index" in self.__dict__
+            or any(attr in self.__dict__ for attr in self._cached_properties)
+        )
+
+    def validate_cache(self):
+        """
+        Checks that all cached properties of the network are equal to the
+        properties computed from scratch.
+
+        :return: None
+        :raises AssertionError: if a cached property is not up to date.
+
+        :example:
+        >>> from phylox import DiNetwork
+        >>> network = DiNetwork(edges=[(0, 1), (1, 2), (1, 3)])
+        >>> network.leaves
+        {2, 3}
+        >>> network.remove_node(3)
+        >>> network.validate_cache()
+        >>> network.leaves
+        {2}
+        """
+        labels = {}
+        for node, data in self.nodes(data=True):
+            if LABEL_ATTR in data:
+                labels.setdefault(data[LABEL_ATTR], []).append(node)
+        expected = {
+            "_leaves": lambda: {node for node in self.nodes if self.is_leaf(node)},
+            "_roots": lambda: {node for node in self.nodes if self.is_root(node)},
+            "_reticulations": lambda: {
+                node for node in self.nodes if self.is_reticulation(node)
+            },
+            "_reticulation_number": lambda: sum(
+                [max(self.in_degree(node) - 1, 0) for node in self.nodes]
+            ),
+            "_labels": lambda: labels,
+            "_label_to_node_dict": lambda: {
+                label: nodes[-1] for label, nodes in labels.items()
+            },
+        }
+        for attr, compute in expected.items():
+            if attr in self.__dict__:
+                value = compute()
+                if self.__dict__[attr] != value:
+                    raise AssertionError(
+                        f"Cached {attr} is {self.__dict__[attr]}, expected {value}."
+                    )
+
+    def _check_cache(self):
+        if self.debug_cache:
+            self.validate_cache()
+
+    def _update_cached_node_types(self, nodes):
+        """
+        Updates the cached sets of leaves, roots and reticulations for the given nodes.
+        """
+        leaves = self.__dict__.get("_leaves")
+        roots = self.__dict__.get("_roots")
+        reticulations = self.__dict__.get("_reticulations")
+        for node in nodes:
+            if node in self._node:
+                in_degree = len(self._pred[node])
+                out_degree = len(self._succ[node])
+            else:
+                in_degree = out_degree = None
+            if leaves is not None:
+                if out_degree == 0 and in_degree > 0:
+                    leaves.add(node)
+                else:
+                    leaves.discard(node)
+            if roots is not None:
+                if in_degree == 0:
+                    roots.add(node)
+                else:
+                    roots.discard(node)
+            if reticulations is not None:
+                if out_degree is not None and out_degree <= 1 and in_degree > 1:
+                    reticulations.add(node)
+                else:
+                    reticulations.discard(node)
+
+    def _cache_label(self, node, label):
+        """
+        Adds a labelled node to the cached label indices.
+        """
+        labels = self.__dict__.get("_labels")
+        label_to_node_dict = self.__dict__.get("_label_to_node_dict")
+        if labels is not None:
+            nodes = labels.setdefault(label, [])
+            nodes.append(node)
+            if len(nodes) > 1:
+                # several nodes with the same label, keep them in the order of the network
+                nodes_with_label = set(nodes)
+                nodes[:] = [v for v in self._node if v in nodes_with_label]
+            if label_to_node_dict is not None:
+                label_to_node_dict[label] = nodes[-1]
+        elif label_to_node_dict is not None:
+            if label in label_to_node_dict:
+                label_to_node_dict[label] = [
+                    v
+                    for v, data in self._node.items()
+                    if LABEL_ATTR in data and data[LABEL_ATTR] == label
+                ][-1]
+            else:
+                label_to_node_dict[label] = node
+
+    def _uncache_label(self, node, label):
+        """
+        Removes a node with a label from the cached label indices.
+        """
+        labels = self.__dict__.get("_labels")
+        label_to_node_dict = self.__dict__.get("_label_to_node_dict")
+        remaining = []
+        if labels is not None and label in labels:
+            labels[label].remove(node)
+            remaining = labels[label]
+            if not remaining:
+                del labels[label]
+        elif labels is None and label_to_node_dict is not None:
+            remaining = [
+                v
+                for v, data in self._node.items()
+                if v != node and LABEL_ATTR in data and data[LABEL_ATTR] == label
+            ]
+        if label_to_node_dict is not None and label_to_node_dict.get(label) == node:
+            if remaining:
+                label_to_node_dict[label] = remaining[-1]
+            else:
+                del label_to_node_dict[label]
+
+    def add_node(self, node_for_adding, **attr):
+        """
+        Adds a node to the network, or updates the attributes of an existing node.
+        Keeps the cached properties of the network up to date.
+        See `networkx.DiGraph.add_node`.
+        """
+        new_node = node_for_adding not in self._node
+        if not new_node and LABEL_ATTR in attr:
+            node_data = self._node[node_for_adding]
+            if LABEL_ATTR in node_data:
+                self._uncache_label(node_for_adding, node_data[LABEL_ATTR])
+        super().add_node(node_for_adding, **attr)
+        if new_node:
+            self._update_cached_node_types([node_for_adding])
+            if "_next_unused_node" in self.__dict__:
+                self._reserve_node(node_for_adding)
+            if "_reachability_index" in self.__dict__:
+                self._reachability_index._mark_changed(node_for_adding)
+        if LABEL_ATTR in attr:
+            self._cache_label(node_for_adding, attr[LABEL_ATTR])
+        self._check_cache()
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        """
+        Adds multiple nodes to the network.
+        Keeps the cached properties of the network up to date.
+        See `networkx.DiGraph.add_nodes_from`.
+        """
+        if not self._has_cached_properties():
+            super().add_nodes_from(nodes_for_adding, **attr)
+            return
+        for n in nodes_for_adding:
+            try:
+                n not in self._node
+                node_attr = attr
+            except TypeError:
+                n, node_data = n
+                node_attr = dict(attr)
+                node_attr.update(node_data)
+            self.add_node(n, **node_attr)
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        """
+        Adds an edge to the network, or updates the attributes of an existing edge.
+        Keeps the cached properties of the network up to date.
+        See `networkx.DiGraph.add_edge`.
+        """
+        u, v = u_of_edge, v_of_edge
+        new_edge = u not in self._succ or v not in self._succ[u]
+        if new_edge and "_next_unused_node" in self.__dict__:
+            for node in (u, v):
+                if node not in self._node:
+                    self._reserve_node(node)
+        super().add_edge(u, v, **attr)
+        if new_edge:
+            if "_reticulation_number" in self.__dict__ and len(self._pred[v]) > 1:
+                self._reticulation_number += 1
+            self._update_cached_node_types([u, v])
+            if "_reachability_index" in self.__dict__:
+                self._reachability_index._mark_changed(u)
+                self._reachability_index._mark_changed(v)
+        self._check_cache()
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        """
+        Adds multiple edges to the network.
+        Keeps the cached properties of the network up to date.
+        See `networkx.DiGraph.add_edges_from`.
+        """
+        if not self._has_cached_properties():
+            super().add_edges_from(ebunch_to_add, **attr)
+            return
+        for e in ebunch_to_add:
+            ne = len(e)
+            if ne == 3:
+                u, v, edge_data = e
+            elif ne == 2:
+                u, v = e
+                edge_data = {}
+            else:
+                raise nx.NetworkXError(f"Edge tuple {e} must be a 2-tuple or 3-tuple.")
+            edge_attr = dict(attr)
+            edge_attr.update(edge_data)
+            self.add_edge(u, v, **edge_attr)
+
+    def remove_edge(self, u, v):
+        """
+        Removes an edge from the network.
+        Keeps the cached properties of the network up to date.
+        See `networkx.DiGraph.remove_edge`.
+        """
+        super().remove_edge(u, v)
+        if "_reticulation_number" in self.__dict__ and len(self._pred[v]) > 0:
+            self._reticulation_number -= 1
+        self._update_cached_node_types([u, v])
+        if "_reachability_index" in self.__dict__:
+            self._reachability_index._mark_changed(u)
+        self._check_cache()
+
+    def remove_edges_from(self, ebunch):
+        """
+        Removes multiple edges from the network, edges that are not in the network are ignored.
+        Keeps the cached properties of the network up to date.
+        See `networkx.DiGraph.remove_edges_from`.
+        """
+        for e in ebunch:
+            u, v = e[:2]
+            if u in self._succ and v in self._succ[u]:
+                self.remove_edge(u, v)
+
+    def remove_node(self, n):
+        """
+        Removes a node and its incident edges from the network.
+        Keeps the cached properties of the network up to date.
+        See `networkx.DiGraph.remove_node`.
+        """
+        if n not in self._node:
+            super().remove_node(n)
+        parents = list(self._pred[n])
+        children = list(self._succ[n])
+        if "_reticulation_number" in self.__dict__:
+            self._reticulation_number -= max(len(parents) - 1, 0) + sum(
+                [1 for child in children if len(self._pred[child]) > 1]
+            )
+        if LABEL_ATTR in self._node[n]:
+            self._uncache_label(n, self._node[n][LABEL_ATTR])
+        super().remove_node(n)
+        self._update_cached_node_types([n] + parents + children)
+        if "_reachability_index" in self.__dict__:
+            self._reachability_index._mark_removed(n)
+            for parent in parents:
+                self._reachability_index._mark_changed(parent)
+        self._check_cache()
+
+    def remove_nodes_from(self, nodes):
+        """
+        Removes multiple nodes from the network, nodes that are not in the network are ignored.
+        Keeps the cached properties of the network up to date.
+        See `networkx.DiGraph.remove_nodes_from`.
+        """
+        for n in list(nodes):
+            if n in self._node:
+                self.remove_node(n)
+
+    def clear(self):
+        """
+        Removes all nodes and edges from the network, and clears the cached properties.
+        See `networkx.DiGraph.clear`.
+        """
+        super().clear()
+        self._clear_cached()
+        if "_reachability_index" in self.__dict__:
+            self._reachability_index._mark_all_changed()
+
+    def clear_edges(self):
+        """
+        Removes all edges from the network, and clears the cached properties.
+        See `networkx.DiGraph.clear_edges`.
+        """
+        super().clear_edges()
+        self._clear_cached()
+        if "_reachability_index" in self.__dict__:
+            self._reachability_index._mark_all_changed()
+
     @classmethod
     def from_newick(cls, newick, add_root_edge=False):
         """
@@ -155,12 +470,10 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
         if not add_root_edge:
             return network
 
-        for root in network.roots:
+        for root in list(network.roots):
             if network.out_degree(root) > 1:
                 new_root = network.find_unused_node()
                 network.add_edges_from([(new_root, root, {LENGTH_ATTR: 0})])
-                root = new_root
-        network._clear_cached()
         return network
 
 
@@ -189,7 +502,7 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
     def label_to_node_dict(self):
         """
         Returns the dictionary mapping labels to nodes.
-        Uses a cached property if available.
+        Uses a cached property, which is kept up to date when the network is modified.
 
         :return: the dictionary mapping labels to nodes.
         """
@@ -201,7 +514,7 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
     def leaves(self):
         """
         Returns the set of leaves of the network.
-        Uses a cached property if available.
+        Uses a cached property, which is kept up to date when the network is modified.
 
         :return: the set of leaves of the network.
         """
@@ -219,11 +532,11 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
     def reticulations(self):
         """
         Returns the set of reticulations of the network.
-        Uses a cached property if available.
+        Uses a cached property, which is kept up to date when the network is modified.
 
         :return: the set of reticulations of the network.
         """
-        if not hasattr(self, "_retculations"):
+        if not hasattr(self, "_reticulations"):
             self._set_reticulations()
         return self._reticulations
 
@@ -240,7 +553,7 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
     def roots(self):
         """
         Returns the set of roots of the network.
-        Uses a cached property if available.
+        Uses a cached property, which is kept up to date when the network is modified.
 
         :return: the set of roots of the network.
         """
@@ -252,7 +565,7 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
     def reticulation_number(self):
         """
         Returns the number of reticulations of the network.
-        Uses a cached property if available.
+        Uses a cached property, which is kept up to date when the network is modified.
 
         :return: the number of reticulations of the network.
         """
@@ -283,7 +596,7 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
         """
         Returns the dictionary mapping labels to lists of nodes.
         Use this instead of label_to_node_dict if there are multiple nodes with the same label.
-        Uses a cached property if available.
+        Uses a cached property, which is kept up to date when the network is modified.
 
         :return: the dictionary mapping labels to lists of nodes.
         """
@@ -383,14 +696,55 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
 
         return dinetwork_to_extended_newick(self, simple=simple)
 
-    def find_unused_node(self, exclude=[]):
+    def to_compact(self):
+        """
+        Returns a compact, read-only copy of the network.
+        See `phylox.compactnetwork.CompactNetwork`.
+
+        :return: a phylox.CompactNetwork.
+
+        :example:
+        >>> from phylox import DiNetwork
+        >>> network = DiNetwork(edges=[(0, 1), (1, 2), (1, 3)])
+        >>> compact = network.to_compact()
+        >>> compact.leaves
+        {2, 3}
+        """
+        from phylox.compactnetwork import CompactNetwork
+
+        return CompactNetwork.from_dinetwork(self)
+
+    def _set_next_unused_node(self):
+        """
+        Sets the next unused node as a cached property:
+        the largest negative integer that is smaller than all numerical nodes of the network.
+        The cached value only decreases: it is lowered when a node is added,
+        but not raised when a node is removed.
+
+        :return: the next unused node.
+        """
+        self._next_unused_node = -1
+        for node in self._node:
+            self._reserve_node(node)
+        return self._next_unused_node
+
+    def _reserve_node(self, node):
+        """
+        Makes sure the node is never returned by `find_unused_node`.
+        """
+        if isinstance(node, numbers.Real) and node <= self._next_unused_node:
+            self._next_unused_node = math.floor(node) - 1
+
+    def find_unused_node(self, exclude=()):
         """
         Find an unused node in the network.
+        Consecutive calls return the same node, unless it is added to the network or excluded;
+        use `DiNetwork.allocate_nodes` to get several unused nodes at once.
 
         Parameters
         ----------
-        exclude : list
-            A list of additional nodes to exclude from the search.
+        exclude : set or list
+            A collection of additional nodes to exclude from the search.
 
         Returns
         -------
@@ -407,8 +761,49 @@ class DiNetwork(nx.DiGraph, CherryPickingMixin):
         >>> network.find_unused_node(exclude=[-1])
         -2
         """
+        if not hasattr(self, "_next_unused_node"):
+            self._set_next_unused_node()
+        new_node = self._next_unused_node
+        if exclude:
+            if not isinstance(exclude, (set, frozenset, dict)):
+                exclude = set(exclude)
+            while new_node in exclude:
+                new_node -= 1
+        return new_node
 
-        new_node = -1
-        while new_node in self.nodes or new_node in exclude:
+    def allocate_nodes(self, k, exclude=()):
+        """
+        Find k unused nodes in the network, and reserve them,
+        so that they are not returned by later calls to `find_unused_node` or `allocate_nodes`.
+
+        Parameters
+        ----------
+        k : int
+            The number of nodes to allocate.
+        exclude : set or list
+            A collection of additional nodes to exclude from the search.
+
+        Returns
+        -------
+        list
+            The list of k unused nodes.
+
+        Examples
+        --------
+        >>> from phylox import DiNetwork
+        >>> network = DiNetwork(edges=[(0, 1), (1, 2), (1, 3)])
+        >>> network.allocate_nodes(3)
+        [-1, -2, -3]
+        >>> network.find_unused_node()
+        -4
+        """
+        if not isinstance(exclude, (set, frozenset, dict)):
+            exclude = set(exclude)
+        new_nodes = []
+        new_node = self.find_unused_node()
+        while len(new_nodes) < k:
+            if new_node not in exclude:
+                new_nodes.append(new_node)
             new_node -= 1
-        return new_node
\ No newline at end of file
+        self._next_unused_node = new_node
+        return new_nodes
@@ -243,7 +243,7 @@ def generate_network_lgt(leaves_goal, retics_goal, wint, wext, seed=None):
         return network
     # if the goal was 1 leaf, join the two leaves
     unused_node = _last_node(network)
-    for leaf in network.leaves:
+    for leaf in list(network.leaves):
         leaf_parent = network.parent(leaf)
         network.remove_node(leaf)
         network.add_edge(leaf_parent, unused_node)
@@ -291,7 +291,7 @@ def generate_network_lgt_conditional(n, k, prob_lgt, wint=1, wext=1, max_tries=1
                 network._set_leaves()
                 return network
             unused_node = _last_node(network)
-            for leaf in network.leaves:
+            for leaf in list(network.leaves):
                 leaf_parent = network.parent(leaf)
                 network.remove_node(leaf)
                 network.add_edge(leaf_parent, unused_node)
@@ -1 +1,4 @@
 from .base import *
+from .diagnostics import *
+from .sinks import *
+from .tempering import *
@@ -1,14 +1,23 @@
 import os
+import pickle
+import random
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import networkx as nx
 import numpy as np
 from networkx.utils.decorators import np_random_state
 
 from phylox.exceptions import InvalidMoveDefinitionException, InvalidMoveException
+from phylox.generators.mcmc.diagnostics import (
+    convergence_diagnostics,
+    network_summaries,
+)
 from phylox.isomorphism import count_automorphisms
 from phylox.rearrangement.invertsequence import from_edge
-from phylox.rearrangement.move import Move, apply_move
+from phylox.rearrangement.move import EdgeIndex, Move, apply_move_inplace, undo_move
 from phylox.rearrangement.movetype import MoveType
 
 
@@ -20,6 +29,9 @@ def acceptance_probability(
     number_of_leaves=None,
     current_reticulation_number=None,
     symmetries=False,
+    number_of_edges=None,
+    automorphisms=None,
+    result_automorphisms=None,
 ):
     """
     Computes the acceptance probability of a move.
@@ -31,48 +43,235 @@ def acceptance_probability(
     :param number_of_leaves: the number of leaves in the network.
     :param current_reticulation_number: the current number of reticulations in the network.
     :param symmetries: whether to correct for symmetries.
+    :param number_of_edges: the number of edges of the network before the move.
+        If None, it is computed from the number of leaves and reticulations, assuming the network is binary with a root of out-degree 1.
+    :param automorphisms: the number of automorphisms of the network before the move, if known.
+    :param result_automorphisms: the number of automorphisms of the network after the move, if known.
     :return: the acceptance probability of the move.
+
+    :example:
+    >>> from phylox.generators.mcmc import acceptance_probability
+    >>> from phylox.rearrangement.move import Move
+    >>> from phylox.rearrangement.movetype import MoveType
+    >>> move = Move(move_type=MoveType.VMIN, removed_edge=(2, 3))
+    >>> probabilities = {MoveType.VPLU: 0.5, MoveType.VMIN: 0.5}
+    >>> acceptance_probability(None, None, move, probabilities, number_of_edges=9)
+    0.25
+    >>> acceptance_probability(
+    ...     None, None, move, probabilities, number_of_edges=9,
+    ...     symmetries=True, automorphisms=1, result_automorphisms=2,
+    ... )
+    0.125
     """
-    current_reticulation_number = (
-        current_reticulation_number or network.reticulation_number
-    )
-    number_of_leaves = number_of_leaves or len(network.leaves)
+    if number_of_edges is None:
+        if current_reticulation_number is None:
+            current_reticulation_number = network.reticulation_number
+        if number_of_leaves is None:
+            number_of_leaves = len(network.leaves)
+        number_of_edges = 2 * number_of_leaves + 3 * current_reticulation_number - 1
     p = 0
     if move.move_type in [MoveType.TAIL, MoveType.HEAD]:
         p = 1
-    if move.move_type == MoveType.VPLU:
-        no_edges_network = float(
-            2 * number_of_leaves + 3 * current_reticulation_number - 1
+    if move.move_type in [MoveType.VPLU, MoveType.VMIN]:
+        # the ratio of the probabilities of proposing the reverse move and the move
+        reverse_move_type = (
+            MoveType.VMIN if move.move_type == MoveType.VPLU else MoveType.VPLU
         )
-        no_edges_network_after = no_edges_network + 3
-        p = (
-            (
-                move_type_probabilities[MoveType.VMIN]
-                / move_type_probabilities[MoveType.VPLU]
-            )
-            * no_edges_network**2
-            / (no_edges_network_after)
-        )
-    if move.move_type == MoveType.VMIN:
-        no_edges_network = float(
-            2 * number_of_leaves + 3 * current_reticulation_number - 1
+        number_of_edges_after = number_of_edges + (
+            3 if move.move_type == MoveType.VPLU else -3
         )
-        no_edges_network_after = no_edges_network - 3
-        if no_edges_network > 3:
+        if number_of_edges_after > 0:
             p = (
                 (
-                    move_type_probabilities[MoveType.VPLU]
-                    / move_type_probabilities[MoveType.VMIN]
+                    move_type_probabilities[reverse_move_type]
+                    / move_type_probabilities[move.move_type]
                 )
-                * no_edges_network
-                / (no_edges_network_after**2)
+                * _neighbourhood_size(move.move_type, number_of_edges)
+                / _neighbourhood_size(reverse_move_type, number_of_edges_after)
             )
     if symmetries:
         # correct for number of representations, i.e., symmetries.
-        p *= count_automorphisms(network) / count_automorphisms(result_network)
+        if automorphisms is None:
+            automorphisms = count_automorphisms(network)
+        if result_automorphisms is None:
+            result_automorphisms = count_automorphisms(result_network)
+        p *= automorphisms / result_automorphisms
     return p
 
 
+def _neighbourhood_size(move_type, number_of_edges):
+    """
+    The number of proposals of a move type in a network with the given number of edges,
+    i.e., the number of ways in which `Move.random_move` chooses the edges of a move of that type.
+    """
+    if move_type in [MoveType.TAIL, MoveType.HEAD]:
+        return float(number_of_edges * (number_of_edges - 1))
+    if move_type == MoveType.VPLU:
+        return float(number_of_edges) ** 2
+    return float(number_of_edges)
+
+
+class _ChainState(object):
+    """
+    The state of a Markov chain of `sample_mcmc_networks`.
+    The network of the chain is modified in place: proposals are applied, and undone if they are not accepted.
+    The state keeps its edges in an EdgeIndex (phylox.rearrangement.move.EdgeIndex) for drawing random edges,
+    which also gives the number of edges used for the acceptance probabilities,
+    and its number of reticulations; both are updated when a move is accepted.
+
+    The number of automorphisms of the network is memoized by a hash of its set of edges,
+    which is updated with each move (Zobrist hashing), so that revisiting a network costs nothing.
+    As the labels of the nodes do not change during the chain, the edges determine the labelled network.
+
+    :param network: a phylogenetic network (phylox.DiNetwork), which is modified by the chain.
+    :param correct_symmetries: whether the number of automorphisms is needed for the acceptance probabilities.
+    :param automorphism_cache_size: the maximum number of memoized automorphism counts.
+    """
+
+    def __init__(self, network, correct_symmetries=True, automorphism_cache_size=100000):
+        self.network = network
+        self.edges = EdgeIndex(network)
+        self.number_of_leaves = len(network.leaves)
+        self.reticulation_number = network.reticulation_number
+        self.available_tree_nodes = set()
+        self.available_reticulations = set()
+        self.correct_symmetries = correct_symmetries
+        self.automorphism_cache_size = automorphism_cache_size
+        self._edge_keys = {}
+        # the hash keys do not depend on the seed of the chain, only on the edges
+        self._key_generator = random.Random(0)
+        self.key = 0
+        for edge in self.edges:
+            self.key ^= self._edge_key(edge)
+        self._automorphisms = {}
+        self.automorphisms = (
+            self._count_automorphisms(self.key) if correct_symmetries else None
+        )
+        # the number of proposed and accepted moves per move type,
+        # and the number of steps in which the network did not change
+        self.proposed = Counter()
+        self.accepted = Counter()
+        self.non_moves = 0
+
+    def __getstate__(self):
+        # the memoized automorphism counts are not sent to other processes
+        state = self.__dict__.copy()
+        state["_automorphisms"] = {}
+        return state
+
+    def statistics(self):
+        """
+        The statistics of the chain.
+
+        :return: a dictionary with the number of steps, the number of non-moves (steps in which the network did not change),
+            and the number of proposed moves, the number of accepted moves, and the acceptance rate per move type.
+            Proposals that do not define a valid move are only counted as non-moves.
+        """
+        return {
+            "steps": sum(self.accepted.values()) + self.non_moves,
+            "non_moves": self.non_moves,
+            "proposed": dict(self.proposed),
+            "accepted": dict(self.accepted),
+            "acceptance_rates": {
+                move_type: self.accepted[move_type] / proposed
+                for move_type, proposed in self.proposed.items()
+            },
+        }
+
+    @property
+    def number_of_edges(self):
+        return len(self.edges)
+
+    def _edge_key(self, edge):
+        key = self._edge_keys.get(edge)
+        if key is None:
+            key = self._edge_keys[edge] = self._key_generator.getrandbits(128)
+        return key
+
+    def _moved_key(self, token):
+        key = self.key
+        for u, v, _ in token.removed_edges:
+            key ^= self._edge_key((u, v))
+        for edge in token.added_edges:
+            key ^= self._edge_key(edge)
+        return key
+
+    def _count_automorphisms(self, key):
+        automorphisms = self._automorphisms.get(key)
+        if automorphisms is None:
+            if len(self._automorphisms) >= self.automorphism_cache_size:
+                self._automorphisms.clear()
+            automorphisms = self._automorphisms[key] = count_automorphisms(
+                self.network
+            )
+        return automorphisms
+
+    def _accepts(self, restriction_map, u, p):
+        """
+        Decides whether a proposed move, which is applied to the network, is accepted,
+        given its acceptance probability p and a uniform random number u.
+        """
+        if u > p:
+            return False
+        # only apply the move if the restriction_map returns True
+        return restriction_map is None or restriction_map(self.network)
+
+    def step(self, move_type_probabilities, restriction_map=None, seed=None):
+        """
+        Proposes a random move, and applies it if it is accepted.
+
+        :param move_type_probabilities: a dictionary mapping MoveTypes to probabilities.
+        :param restriction_map: a boolean function that takes a phylox.DiNetwork as input.
+        :param seed: a numpy random state.
+        :return: the accepted move, or None if the proposal is rejected.
+        """
+        try:
+            move = Move.random_move(
+                self.network,
+                available_tree_nodes=self.available_tree_nodes,
+                available_reticulations=self.available_reticulations,
+                move_type_probabilities=move_type_probabilities,
+                edges=self.edges,
+                seed=seed,
+            )
+            token = apply_move_inplace(self.network, move)
+        except (InvalidMoveException, InvalidMoveDefinitionException):
+            self.non_moves += 1
+            return None
+        self.proposed[move.move_type] += 1
+        result_key = self._moved_key(token)
+        result_automorphisms = (
+            self._count_automorphisms(result_key) if self.correct_symmetries else None
+        )
+        p = acceptance_probability(
+            None,
+            None,
+            move,
+            move_type_probabilities,
+            symmetries=self.correct_symmetries,
+            number_of_edges=self.number_of_edges,
+            automorphisms=self.automorphisms,
+            result_automorphisms=result_automorphisms,
+        )
+        if not self._accepts(restriction_map, seed.random(), p):
+            undo_move(self.network, token)
+            self.non_moves += 1
+            return None
+        self.accepted[move.move_type] += 1
+        self.edges.apply(token)
+        self.key = result_key
+        self.automorphisms = result_automorphisms
+        if move.move_type == MoveType.VPLU:
+            self.reticulation_number += 1
+            self.available_tree_nodes.discard(move.start_node)
+            self.available_reticulations.discard(move.end_node)
+        if move.move_type == MoveType.VMIN:
+            self.reticulation_number -= 1
+            self.available_tree_nodes.add(move.removed_edge[0])
+            self.available_reticulations.add(move.removed_edge[1])
+        return move
+
+
 @np_random_state("seed")
 def sample_mcmc_networks(
     starting_network,
@@ -86,6 +285,8 @@ def sample_mcmc_networks(
 ):
     """
     Samples phylogenetic networks using a Markov-Chain Monte Carlo method.
+    The chain applies each proposed move in place to a single copy of the starting network,
+    and undoes the move if it is not accepted; each sample is a copy of the network of the chain.
 
     :param starting_network: the phylox.DiNetwork used as the starting point of the Markov chain.
     :param move_type_probabilities: a dictionary mapping MoveTypes to probabilities.
@@ -127,62 +328,397 @@ def sample_mcmc_networks(
     >>> all([len(network.leaves)==2 for network in sampled_networks])
     True
     """
+    return list(
+        iter_mcmc_networks(
+            starting_network,
+            move_type_probabilities,
+            restriction_map=restriction_map,
+            correct_symmetries=correct_symmetries,
+            burn_in=burn_in,
+            number_of_samples=number_of_samples,
+            add_root_if_necessary=add_root_if_necessary,
+            seed=seed,
+        )
+    )
+
+
+@np_random_state("seed")
+def iter_mcmc_networks(
+    starting_network,
+    move_type_probabilities,
+    restriction_map=None,
+    correct_symmetries=True,
+    burn_in=1000,
+    number_of_samples=None,
+    add_root_if_necessary=False,
+    seed=None,
+    sinks=(),
+    copy=True,
+    checkpoint_path=None,
+    checkpoint_every=None,
+    resume_from=None,
+):
+    """
+    Samples phylogenetic networks using a Markov-Chain Monte Carlo method (see `sample_mcmc_networks`),
+    yielding each sample as soon as it is drawn.
+
+    Each sample is also written to the given sinks (see `phylox.generators.mcmc.sinks`).
+    The chain can be saved to a checkpoint file, and resumed from it with resume_from:
+    the resumed chain yields the same samples as a chain that is not interrupted,
+    if it is given the same parameters (the starting network and the seed are ignored when resuming).
+    Samples that are written to a sink after the last checkpoint are written again when the chain is resumed.
+
+    :param starting_network: the phylox.DiNetwork used as the starting point of the Markov chain.
+    :param move_type_probabilities: a dictionary mapping MoveTypes to probabilities.
+    :param restriction_map: a boolean function that takes a phylox.DiNetwork as input.
+    :param correct_symmetries: whether to correct for symmetries in the acceptance probability, set to True for uniform distribution.
+    :param burn_in: the number of steps (including rejected proposals) between each sample.
+    :param number_of_samples: the number of networks to sample, including the samples before a checkpoint that is resumed.
+        If None, the generator does not stop.
+    :param add_root_if_necessary: whether to add a root edge to each root if it has out-degree > 1.
+    :param seed: the seed for the random number generator.
+    :param sinks: a list of sinks, e.g., phylox.generators.mcmc.sinks.NewickSink, to which each sample is written.
+        The sinks are flushed, but not closed, when the generator stops.
+    :param copy: if False, the network of the chain itself is yielded instead of a copy,
+        it must not be modified and it changes when the next sample is drawn.
+    :param checkpoint_path: a path to which the state of the chain is saved,
+        every checkpoint_every samples and when the generator stops.
+    :param checkpoint_every: the number of samples between two checkpoints.
+    :param resume_from: a path of a checkpoint from which the chain is resumed.
+    :return: an iterator of phylox.DiNetwork objects.
+
+    :example:
+    >>> import io
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.movetype import MoveType
+    >>> from phylox.generators.mcmc import iter_mcmc_networks, NewickSink
+    >>> starting_network = DiNetwork(
+    ...     edges=((0, 1), (1, 2), (1, 3), (3, 4), (3, 5)),
+    ...     labels=((2, "A"), (4, "B"), (5, "C")),
+    ... )
+    >>> output = io.StringIO()
+    >>> samples = iter_mcmc_networks(
+    ...     starting_network,
+    ...     {MoveType.TAIL: 0.5, MoveType.HEAD: 0.5},
+    ...     burn_in=10,
+    ...     sinks=[NewickSink(output)],
+    ...     seed=1,
+    ... )
+    >>> for sample in samples:
+    ...     if len(output.getvalue().splitlines()) == 5:
+    ...         break
+    >>> len(sample.leaves)
+    3
+    """
+    if resume_from is not None:
+        with open(resume_from, "rb") as file:
+            checkpoint = pickle.load(file)
+        chain = checkpoint["chain"]
+        _set_random_state(seed, checkpoint["random_state"])
+        samples = checkpoint["samples"]
+    else:
+        network = _starting_network(starting_network, add_root_if_necessary)
+        chain = _ChainState(network, correct_symmetries=correct_symmetries)
+        samples = 0
+
+    def save_checkpoint():
+        for sink in sinks:
+            sink.flush()
+        if checkpoint_path is not None:
+            _save_checkpoint(checkpoint_path, chain, seed, samples)
+
+    try:
+        while number_of_samples is None or samples < number_of_samples:
+            for _ in range(burn_in):
+                chain.step(
+                    move_type_probabilities, restriction_map=restriction_map, seed=seed
+                )
+            samples += 1
+            for sink in sinks:
+                sink.write(chain.network)
+            if checkpoint_every and samples % checkpoint_every == 0:
+                save_checkpoint()
+            yield chain.network.copy() if copy else chain.network
+    except GeneratorExit:
+        # the generator is closed after a sample
+        save_checkpoint()
+        raise
+    save_checkpoint()
+
+
+def _save_checkpoint(path, chain, seed, samples):
+    """
+    Saves the state of a chain of iter_mcmc_networks, replacing the file at once.
+    """
+    checkpoint = {
+        "chain": chain,
+        "random_state": _get_random_state(seed),
+        "samples": samples,
+    }
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        pickle.dump(checkpoint, file)
+    os.replace(temporary_path, path)
+
+
+def _get_random_state(seed):
+    if isinstance(seed, np.random.Generator):
+        return seed.bit_generator.state
+    return seed.get_state()
+
+
+def _set_random_state(seed, state):
+    if isinstance(seed, np.random.Generator):
+        seed.bit_generator.state = state
+    else:
+        seed.set_state(state)
+
+
+def _starting_network(starting_network, add_root_if_necessary=False):
+    """
+    Copies the starting network of a chain, and adds a root edge to each root with out-degree > 1 if necessary.
+    """
     network = starting_network.copy()
-    current_reticulation_number = network.reticulation_number
-    number_of_leaves = len(network.leaves)
     if add_root_if_necessary:
-        for root in network.roots:
+        for root in list(network.roots):
             if network.out_degree(root) > 1:
                 new_root = network.find_unused_node()
                 network.add_edges_from([(new_root, root)])
                 root = new_root
         roots = network._set_roots()
-    available_reticulations = set()
-    available_tree_nodes = set()
+    return network
 
-    sample = []
 
-    for _ in range(number_of_samples):
-        non_moves = 0
-        for _ in range(burn_in):
-            try:
-                move = Move.random_move(
-                    network,
-                    available_tree_nodes=available_tree_nodes,
-                    available_reticulations=available_reticulations,
-                    move_type_probabilities=move_type_probabilities,
-                    seed=seed,
-                )
-                result_network = apply_move(network, move)
-            except (InvalidMoveException, InvalidMoveDefinitionException) as e:
-                non_moves += 1
-                continue
-            if seed.random() > acceptance_probability(
-                network,
-                result_network,
-                move,
-                move_type_probabilities,
-                number_of_leaves=number_of_leaves,
-                current_reticulation_number=current_reticulation_number,
-                symmetries=correct_symmetries,
-            ):
-                non_moves += 1
-                continue
-            # only apply the move if the restrinction_map returns True
-            if not (restriction_map is None or restriction_map(result_network)):
-                non_moves += 1
+def sample_mcmc_networks_parallel(
+    starting_network,
+    move_type_probabilities,
+    n_chains=4,
+    workers=None,
+    restriction_map=None,
+    correct_symmetries=True,
+    warmup=1000,
+    thin=1000,
+    number_of_samples=1,
+    add_root_if_necessary=False,
+    seed=None,
+    summaries=network_summaries,
+    check_every=None,
+    r_hat_threshold=None,
+    ess_threshold=None,
+    callback=None,
+):
+    """
+    Samples phylogenetic networks with several independent Markov chains (see `sample_mcmc_networks`),
+    optionally in a pool of processes, and computes convergence diagnostics of the chains.
+
+    Each chain first takes warmup steps, which are discarded, and then takes a sample every thin steps.
+    The chains are run in rounds of check_every samples per chain.
+    After each round, the R-hat and the effective sample size of each summary of the samples are computed
+    (see `phylox.generators.mcmc.diagnostics.convergence_diagnostics`),
+    and the sampling stops early if all summaries pass the given thresholds.
+    The seeds of the chains are spawned from one numpy.random.SeedSequence,
+    so the samples of each chain do not depend on the number of workers or on check_every.
+    All chains start from the same network, so the diagnostics only show that the chains mix
+    if the warmup is long enough for the chains to move away from the starting network.
+    With workers, the restriction map and the summaries function are passed to the worker processes,
+    so they must be picklable unless the processes are forked.
+
+    :param starting_network: the phylox.DiNetwork used as the starting point of each Markov chain.
+    :param move_type_probabilities: a dictionary mapping MoveTypes to probabilities.
+    :param n_chains: the number of chains.
+    :param workers: the number of worker processes. If None or 1, the chains are run in the current process.
+    :param restriction_map: a boolean function that takes a phylox.DiNetwork as input.
+    :param correct_symmetries: whether to correct for symmetries in the acceptance probability, set to True for uniform distribution.
+    :param warmup: the number of steps (including rejected proposals) of each chain before the first sample,
+        the networks of which are not used for the samples and the diagnostics.
+    :param thin: the number of steps (including rejected proposals) between each sample, and before the first sample after the warmup.
+    :param number_of_samples: the maximum number of networks to sample per chain.
+    :param add_root_if_necessary: whether to add a root edge to each root if it has out-degree > 1.
+    :param seed: a seed for the numpy.random.SeedSequence of the chains.
+    :param summaries: a function that maps a network to a dictionary of scalar summaries, used for the diagnostics.
+    :param check_every: the number of samples per chain between two checks of the diagnostics.
+        If None, the diagnostics are only computed at the end.
+    :param r_hat_threshold: a float, stop early when the R-hat of each summary is at most this value, e.g., 1.01.
+    :param ess_threshold: a float, stop early when the effective sample size of each summary is at least this value.
+    :param callback: a function that is called with (chain, network) for each sample, as soon as it is available.
+        With workers, the order of the chains in these calls may vary.
+    :return: a tuple (samples, statistics), where samples is a list with the list of sampled networks of each chain,
+        and statistics is a dictionary with the statistics of each chain (see `_ChainState.statistics`) and its seed,
+        the summaries of the samples per chain, the diagnostics of the last check, the number of samples per chain,
+        whether the chains stopped early, and the total time.
+
+    :example:
+    >>> from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+    >>> from phylox.generators.mcmc import sample_mcmc_networks_parallel
+    >>> from phylox.rearrangement.movetype import MoveType
+    >>> starting_network = generate_network_random_tree_child_sequence(5, 1, seed=1)
+    >>> samples, statistics = sample_mcmc_networks_parallel(
+    ...     starting_network,
+    ...     {MoveType.TAIL: 0.5, MoveType.HEAD: 0.5},
+    ...     n_chains=3,
+    ...     warmup=20,
+    ...     thin=10,
+    ...     number_of_samples=8,
+    ...     seed=1,
+    ... )
+    >>> [len(chain_samples) for chain_samples in samples]
+    [8, 8, 8]
+    >>> sorted(statistics["diagnostics"])
+    ['b2_balance', 'cherries', 'level', 'reticulate_cherries', 'reticulation_number']
+    >>> statistics["diagnostics"]["reticulation_number"]["r_hat"]
+    1.0
+    """
+    if check_every is None or check_every <= 0:
+        check_every = number_of_samples
+    seeds = [
+        int(child.generate_state(1)[0])
+        for child in np.random.SeedSequence(seed).spawn(n_chains)
+    ]
+    network = _starting_network(starting_network, add_root_if_necessary)
+    chains = [
+        (
+            _ChainState(network.copy(), correct_symmetries=correct_symmetries),
+            np.random.RandomState(chain_seed),
+        )
+        for chain_seed in seeds
+    ]
+    settings = {
+        "move_type_probabilities": move_type_probabilities,
+        "restriction_map": restriction_map,
+        "thin": thin,
+        "summaries": summaries,
+    }
+    samples = [[] for _ in range(n_chains)]
+    chain_summaries = [[] for _ in range(n_chains)]
+    statistics = {
+        "chains": [],
+        "summaries": {},
+        "diagnostics": {},
+        "samples_per_chain": 0,
+        "stopped_early": False,
+        "elapsed_time": 0.0,
+    }
+    start_time = time.time()
+
+    def rounds(executor):
+        # yields (chain, chain_state, samples, summaries) for each chain in each round
+        while statistics["samples_per_chain"] < number_of_samples:
+            batch = min(check_every, number_of_samples - statistics["samples_per_chain"])
+            batch_warmup = warmup if statistics["samples_per_chain"] == 0 else 0
+            if executor is None:
+                for index, chain in enumerate(chains):
+                    yield (index,) + _mcmc_batch(
+                        chain, batch, settings, warmup=batch_warmup
+                    )
+            else:
+                futures = {
+                    executor.submit(
+                        _mcmc_batch, chain, batch, warmup=batch_warmup
+                    ): index
+                    for index, chain in enumerate(chains)
+                }
+                for future in as_completed(futures):
+                    yield (futures[future],) + future.result()
+            statistics["samples_per_chain"] += batch
+            yield None
+
+    def run(executor):
+        for result in rounds(executor):
+            if result is None:
+                # the end of a round
+                if _check_diagnostics(
+                    chain_summaries, statistics, r_hat_threshold, ess_threshold
+                ) and statistics["samples_per_chain"] < number_of_samples:
+                    statistics["stopped_early"] = True
+                    return
                 continue
-            if move.move_type in [MoveType.TAIL, MoveType.HEAD]:
-                network = result_network
-            if move.move_type == MoveType.VPLU:
-                current_reticulation_number += 1
-                available_tree_nodes.discard(move.start_node)
-                available_reticulations.discard(move.end_node)
-                network = result_network
-            if move.move_type == MoveType.VMIN:
-                current_reticulation_number -= 1
-                available_tree_nodes.add(move.removed_edge[0])
-                available_reticulations.add(move.removed_edge[1])
-                network = result_network
-        sample.append(network)
-    return sample
+            index, chain, batch_samples, batch_summaries = result
+            chains[index] = chain
+            samples[index].extend(batch_samples)
+            chain_summaries[index].extend(batch_summaries)
+            if callback is not None:
+                for sample in batch_samples:
+                    callback(index, sample)
+
+    if workers is None or workers <= 1:
+        run(None)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_mcmc_worker,
+            initargs=(settings,),
+        ) as executor:
+            run(executor)
+
+    for (chain, _), chain_seed in zip(chains, seeds):
+        statistics["chains"].append(dict(chain.statistics(), seed=chain_seed))
+    statistics["summaries"] = {
+        name: [[values[name] for values in chain] for chain in chain_summaries]
+        for name in (chain_summaries[0][0] if chain_summaries[0] else {})
+    }
+    statistics["elapsed_time"] = time.time() - start_time
+    return samples, statistics
+
+
+def _check_diagnostics(chain_summaries, statistics, r_hat_threshold, ess_threshold):
+    """
+    Computes the diagnostics of the summaries of the samples so far, and stores them in the statistics.
+
+    :return: True if a threshold is given and the diagnostics of all summaries pass the thresholds.
+    """
+    if len(chain_summaries[0]) < 4:
+        return False
+    statistics["diagnostics"] = convergence_diagnostics(
+        {
+            name: [[values[name] for values in chain] for chain in chain_summaries]
+            for name in chain_summaries[0][0]
+        }
+    )
+    if r_hat_threshold is None and ess_threshold is None:
+        return False
+    return all(
+        (r_hat_threshold is None or diagnostics["r_hat"] <= r_hat_threshold)
+        and (ess_threshold is None or diagnostics["ess"] >= ess_threshold)
+        for diagnostics in statistics["diagnostics"].values()
+    )
+
+
+_mcmc_worker = {}
+
+
+def _init_mcmc_worker(settings):
+    """
+    Stores the settings of the chains in a worker process of sample_mcmc_networks_parallel.
+    """
+    _mcmc_worker["settings"] = settings
+
+
+def _mcmc_batch(chain, number_of_samples, settings=None, warmup=0):
+    """
+    Runs a chain of sample_mcmc_networks_parallel for a number of samples.
+
+    :param chain: a tuple (chain_state, random_state).
+    :param warmup: the number of steps before the first sample of the batch, in addition to the thinning.
+    :return: a tuple (chain, samples, summaries), with the chain after sampling.
+    """
+    if settings is None:
+        settings = _mcmc_worker["settings"]
+    chain_state, random_state = chain
+
+    def steps(number_of_steps):
+        for _ in range(number_of_steps):
+            chain_state.step(
+                settings["move_type_probabilities"],
+                restriction_map=settings["restriction_map"],
+                seed=random_state,
+            )
+
+    steps(warmup)
+    samples = []
+    summaries = []
+    for _ in range(number_of_samples):
+        steps(settings["thin"])
+        sample = chain_state.network.copy()
+        samples.append(sample)
+        summaries.append(settings["summaries"](sample))
+    return chain, samples, summaries
@@ -0,0 +1,170 @@
+"""
+Convergence diagnostics for Markov-Chain Monte Carlo samples of phylogenetic networks.
+
+The diagnostics are computed on scalar summaries of the sampled networks (see `network_summaries`),
+using the split potential scale reduction factor (R-hat) and the effective sample size (ESS)
+as described in the Stan reference manual (Gelman et al., Bayesian Data Analysis, 3rd edition).
+"""
+
+import numpy as np
+
+from phylox.networkproperties.properties import b2_balance, count_reducible_pairs, level
+
+
+def network_summaries(network):
+    """
+    Computes scalar summaries of a network, for checking whether Markov chains mix.
+
+    :param network: a phylogenetic network (phylox.DiNetwork) with a single root.
+    :return: a dictionary with the reticulation number, the level, the B_2 balance,
+        and the numbers of cherries and reticulated cherries of the network.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.generators.mcmc.diagnostics import network_summaries
+    >>> network = DiNetwork(
+    ...     edges=[(0, 1), (1, 2), (1, 3), (2, 4), (2, 5), (3, 6), (3, 7)],
+    ... )
+    >>> network_summaries(network)
+    {'reticulation_number': 0, 'level': 0, 'b2_balance': 2.0, 'cherries': 2.0, 'reticulate_cherries': 0}
+    """
+    reducible_pairs = count_reducible_pairs(network)
+    return {
+        "reticulation_number": network.reticulation_number,
+        "level": level(network),
+        "b2_balance": b2_balance(network),
+        "cherries": reducible_pairs["cherries"],
+        "reticulate_cherries": reducible_pairs["reticulate_cherries"],
+    }
+
+
+def _split_chains(chains):
+    """
+    Splits each chain in two halves, dropping the middle draw of chains with an odd length.
+    """
+    chains = np.asarray(chains, dtype=float)
+    half = chains.shape[1] // 2
+    return np.concatenate([chains[:, :half], chains[:, -half:]])
+
+
+def potential_scale_reduction(chains):
+    """
+    Computes the split potential scale reduction factor (R-hat) of a scalar quantity sampled by several chains.
+    Values close to 1 indicate that the chains sample from the same distribution;
+    a common threshold is 1.01.
+    If the quantity is constant in all chains, the R-hat is 1.
+
+    :param chains: a list of chains of equal length (at least 4), each a list of values of the quantity.
+    :return: a float.
+
+    :example:
+    >>> import numpy as np
+    >>> from phylox.generators.mcmc.diagnostics import potential_scale_reduction
+    >>> rng = np.random.default_rng(1)
+    >>> bool(potential_scale_reduction(rng.normal(size=(4, 1000))) < 1.01)
+    True
+    >>> bool(potential_scale_reduction(rng.normal(size=(4, 1000)) + np.arange(4)[:, None]) > 1.5)
+    True
+    """
+    chains = _split_chains(chains)
+    length = chains.shape[1]
+    within = chains.var(axis=1, ddof=1).mean()
+    between = length * chains.mean(axis=1).var(ddof=1)
+    if within == 0:
+        return 1.0 if between == 0 else float("inf")
+    var_plus = (length - 1) / length * within + between / length
+    return float(np.sqrt(var_plus / within))
+
+
+def _autocovariance(chain):
+    """
+    Computes the autocovariances of a chain for all lags, with the fast Fourier transform.
+    """
+    length = len(chain)
+    centered = chain - chain.mean()
+    size = 1 << (2 * length - 1).bit_length()
+    transform = np.fft.rfft(centered, n=size)
+    return np.fft.irfft(transform * np.conjugate(transform), n=size)[:length] / length
+
+
+def effective_sample_size(chains):
+    """
+    Computes the effective sample size of a scalar quantity sampled by several chains,
+    from the autocorrelations of the split chains, truncated with Geyer's initial monotone sequence.
+    If the quantity is constant in all chains, the effective sample size is the number of draws.
+
+    :param chains: a list of chains of equal length (at least 4), each a list of values of the quantity.
+    :return: a float.
+
+    :example:
+    >>> import numpy as np
+    >>> from phylox.generators.mcmc.diagnostics import effective_sample_size
+    >>> rng = np.random.default_rng(1)
+    >>> independent = rng.normal(size=(4, 1000))
+    >>> bool(3000 < effective_sample_size(independent) < 5000)
+    True
+    >>> correlated = np.cumsum(independent, axis=1)
+    >>> bool(effective_sample_size(correlated) < 100)
+    True
+    """
+    chains = _split_chains(chains)
+    number_of_chains, length = chains.shape
+    draws = number_of_chains * length
+    autocovariance = np.array([_autocovariance(chain) for chain in chains])
+    mean_variance = autocovariance[:, 0].mean() * length / (length - 1)
+    var_plus = mean_variance * (length - 1) / length
+    if number_of_chains > 1:
+        var_plus += chains.mean(axis=1).var(ddof=1)
+    if var_plus == 0:
+        return float(draws)
+
+    def autocorrelation(lag):
+        return 1 - (mean_variance - autocovariance[:, lag].mean()) / var_plus
+
+    rho = np.zeros(length)
+    rho[0] = 1.0
+    rho_even = 1.0
+    rho_odd = rho[1] = autocorrelation(1)
+    # sum the autocorrelations in pairs, as long as the sum of a pair is positive
+    lag = 1
+    while lag < length - 3 and rho_even + rho_odd > 0:
+        rho_even = autocorrelation(lag + 1)
+        rho_odd = autocorrelation(lag + 2)
+        if rho_even + rho_odd >= 0:
+            rho[lag + 1] = rho_even
+            rho[lag + 2] = rho_odd
+        lag += 2
+    max_lag = lag - 2
+    if rho_even > 0:
+        rho[max_lag + 1] = rho_even
+    # make the sums of the pairs monotone
+    lag = 1
+    while lag <= max_lag - 2:
+        if rho[lag + 1] + rho[lag + 2] > rho[lag - 1] + rho[lag]:
+            rho[lag + 1] = rho[lag + 2] = (rho[lag - 1] + rho[lag]) / 2
+        lag += 2
+    tau = -1 + 2 * rho[: max_lag + 1].sum() + rho[max_lag + 1 : max_lag + 2].sum()
+    tau = max(tau, 1 / np.log10(draws))
+    return float(draws / tau)
+
+
+def convergence_diagnostics(summaries):
+    """
+    Computes the R-hat and the effective sample size of each summary of the samples of several chains.
+
+    :param summaries: a dictionary mapping the name of each summary to a list of chains of equal length (at least 4),
+        each a list of values of the summary for the samples of the chain.
+    :return: a dictionary mapping the name of each summary to a dictionary with keys "r_hat" and "ess".
+
+    :example:
+    >>> from phylox.generators.mcmc.diagnostics import convergence_diagnostics
+    >>> convergence_diagnostics({"reticulation_number": [[1, 1, 1, 1], [1, 1, 1, 1]]})
+    {'reticulation_number': {'r_hat': 1.0, 'ess': 8.0}}
+    """
+    return {
+        name: {
+            "r_hat": potential_scale_reduction(chains),
+            "ess": effective_sample_size(chains),
+        }
+        for name, chains in summaries.items()
+    }
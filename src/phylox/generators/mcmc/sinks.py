@@ -0,0 +1,104 @@
+"""
+Sinks that write the samples of a Markov chain to a file while the chain is running,
+see `phylox.generators.mcmc.iter_mcmc_networks`.
+
+A sink has a method `write(network)`, which is called for each sample,
+and methods `flush()` and `close()`.
+"""
+
+from phylox.isomorphism import network_hash
+from phylox.newick_parser import write_extended_newick
+
+
+class NewickSink(object):
+    """
+    Writes each network to a file as an extended Newick string without edge parameters, one network per line.
+    The file can be read with `phylox.io.read_newick_file`.
+
+    :param file: a path, or a file object opened for writing text (which is not closed by the sink).
+    :param flush_every: the number of networks after which the file is flushed.
+    :param mode: the mode in which a path is opened; use "a" to append to an existing file, e.g., when resuming a chain.
+
+    :example:
+    >>> import io
+    >>> from phylox import DiNetwork
+    >>> from phylox.generators.mcmc.sinks import NewickSink
+    >>> output = io.StringIO()
+    >>> sink = NewickSink(output)
+    >>> sink.write(DiNetwork(edges=[(0, 1), (0, 2)], labels=[(1, "A"), (2, "B")]))
+    >>> output.getvalue()
+    '(A,B);\\n'
+    """
+
+    def __init__(self, file, flush_every=100, mode="w"):
+        if isinstance(file, str):
+            self.file = open(file, mode)
+            self._owns_file = True
+        else:
+            self.file = file
+            self._owns_file = False
+        self.flush_every = flush_every
+        self.count = 0
+
+    def _write(self, network):
+        write_extended_newick(network, self.file, simple=True)
+
+    def write(self, network):
+        """
+        Writes a network, and flushes the file every flush_every networks.
+
+        :param network: a phylogenetic network (phylox.DiNetwork).
+        :return: void
+        """
+        self._write(network)
+        self.file.write("\n")
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        """
+        Flushes the file, and closes it if it was opened by the sink.
+        """
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class HashSink(NewickSink):
+    """
+    Writes the canonical hash of each network to a file, one hash per line,
+    e.g., to count the number of distinct networks that are sampled (see `phylox.isomorphism.network_hash`).
+
+    :param file: a path, or a file object opened for writing text (which is not closed by the sink).
+    :param flush_every: the number of networks after which the file is flushed.
+    :param mode: the mode in which a path is opened; use "a" to append to an existing file, e.g., when resuming a chain.
+    :param ignore_labels: if True, the labels of the networks are ignored.
+
+    :example:
+    >>> import io
+    >>> from phylox import DiNetwork
+    >>> from phylox.generators.mcmc.sinks import HashSink
+    >>> output = io.StringIO()
+    >>> sink = HashSink(output)
+    >>> sink.write(DiNetwork(edges=[(0, 1), (0, 2)], labels=[(1, "A"), (2, "B")]))
+    >>> len(output.getvalue())
+    33
+    """
+
+    def __init__(self, file, flush_every=100, mode="w", ignore_labels=False):
+        super().__init__(file, flush_every=flush_every, mode=mode)
+        self.ignore_labels = ignore_labels
+
+    def _write(self, network):
+        self.file.write(network_hash(network, ignore_labels=self.ignore_labels))
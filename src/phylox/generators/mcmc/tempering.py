@@ -0,0 +1,352 @@
+"""
+Replica exchange Markov-Chain Monte Carlo (parallel tempering) for phylogenetic networks.
+
+Each replica is a Markov chain as in `phylox.generators.mcmc.sample_mcmc_networks`,
+which samples from the distribution proportional to exp(-inverse_temperature * energy(network)),
+relative to the distribution of `sample_mcmc_networks` without restriction map.
+The cold replica has inverse temperature infinity (temperature 0), so it only accepts networks with energy 0,
+which are the networks that satisfy the restriction map;
+the hotter replicas may leave the restricted set of networks, at a cost that decreases with the temperature.
+Replicas at neighbouring temperatures exchange their networks, which lets the cold replica
+move between parts of the restricted set of networks that are hard to connect with moves inside it.
+"""
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from phylox.generators.mcmc.base import (
+    _ChainState,
+    _init_mcmc_worker,
+    _mcmc_worker,
+    _starting_network,
+)
+
+
+class _TemperedChainState(_ChainState):
+    """
+    The state of a replica of `sample_mcmc_networks_tempered`:
+    a chain (see `_ChainState`) that also keeps track of its inverse temperature and of the energy of its network.
+
+    :param network: a phylogenetic network (phylox.DiNetwork), which is modified by the chain.
+    :param inverse_temperature: a non-negative float, or math.inf.
+    :param energy: a function that maps a network to a non-negative number.
+    :param correct_symmetries: whether the number of automorphisms is needed for the acceptance probabilities.
+    """
+
+    def __init__(self, network, inverse_temperature, energy, correct_symmetries=True):
+        super().__init__(network, correct_symmetries=correct_symmetries)
+        self.inverse_temperature = inverse_temperature
+        self.energy_function = energy
+        self.energy = energy(network)
+        self._proposed_energy = self.energy
+
+    def _accepts(self, restriction_map, u, p):
+        """
+        Checks the restriction map, and accepts the move with probability
+        min(1, p * exp(-inverse_temperature * (energy after the move - energy before the move))).
+        """
+        if not (restriction_map is None or restriction_map(self.network)):
+            return False
+        energy = self.energy_function(self.network)
+        if p == 0 or u > p * _boltzmann_factor(
+            self.inverse_temperature, energy - self.energy
+        ):
+            return False
+        self._proposed_energy = energy
+        return True
+
+    def step(self, move_type_probabilities, restriction_map=None, seed=None):
+        move = super().step(
+            move_type_probabilities, restriction_map=restriction_map, seed=seed
+        )
+        if move is not None:
+            self.energy = self._proposed_energy
+        return move
+
+
+def _boltzmann_factor(inverse_temperature, increase):
+    """
+    Computes exp(-inverse_temperature * increase), which is 0 for an increase and infinite for a decrease
+    of the energy if the inverse temperature is infinite.
+    """
+    if increase == 0:
+        return 1.0
+    if inverse_temperature == math.inf:
+        return 0.0 if increase > 0 else math.inf
+    exponent = -inverse_temperature * increase
+    return math.exp(exponent) if exponent < 700 else math.inf
+
+
+def swap_probability(inverse_temperature1, energy1, inverse_temperature2, energy2):
+    """
+    Computes the probability of exchanging the networks of two replicas in replica exchange MCMC.
+
+    :param inverse_temperature1: the inverse temperature of the first replica, a non-negative float or math.inf.
+    :param energy1: the energy of the network of the first replica.
+    :param inverse_temperature2: the inverse temperature of the second replica, a non-negative float or math.inf.
+    :param energy2: the energy of the network of the second replica.
+    :return: a float, min(1, exp((inverse_temperature1 - inverse_temperature2) * (energy1 - energy2))).
+
+    :example:
+    >>> import math
+    >>> from phylox.generators.mcmc import swap_probability
+    >>> swap_probability(math.inf, 0, 1.0, 0)
+    1.0
+    >>> swap_probability(math.inf, 0, 1.0, 1)
+    0.0
+    >>> round(swap_probability(2.0, 1, 1.0, 2), 4)
+    0.3679
+    """
+    if energy1 == energy2 or inverse_temperature1 == inverse_temperature2:
+        return 1.0
+    exponent = (inverse_temperature1 - inverse_temperature2) * (energy1 - energy2)
+    return math.exp(min(0.0, exponent))
+
+
+class RestrictionEnergy(object):
+    """
+    The energy of a network for replica exchange MCMC: 0 if the network satisfies the restriction map, and 1 otherwise.
+    It is picklable if the restriction map is, so it can be used with worker processes.
+
+    :param restriction_map: a boolean function that takes a phylox.DiNetwork as input.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.generators.mcmc import RestrictionEnergy
+    >>> energy = RestrictionEnergy(lambda network: network.reticulation_number == 0)
+    >>> energy(DiNetwork(edges=[(0, 1), (1, 2), (1, 3)]))
+    0
+    """
+
+    def __init__(self, restriction_map=None):
+        self.restriction_map = restriction_map
+
+    def __call__(self, network):
+        if self.restriction_map is None or self.restriction_map(network):
+            return 0
+        return 1
+
+
+def sample_mcmc_networks_tempered(
+    starting_network,
+    move_type_probabilities,
+    inverse_temperatures=(math.inf, 4.0, 2.0, 1.0),
+    restriction_map=None,
+    energy=None,
+    support_map=None,
+    correct_symmetries=True,
+    burn_in=1000,
+    swap_every=100,
+    number_of_samples=1,
+    add_root_if_necessary=False,
+    workers=None,
+    seed=None,
+):
+    """
+    Samples phylogenetic networks with replica exchange Markov-Chain Monte Carlo (parallel tempering).
+
+    There is one replica for each inverse temperature, each a Markov chain as in `sample_mcmc_networks`,
+    applying the moves in place to its own copy of the starting network.
+    The replica at inverse temperature b samples networks proportionally to exp(-b * energy(network)).
+    The samples are taken from the replica at the first inverse temperature, normally math.inf,
+    which then samples the same distribution as `sample_mcmc_networks` with the restriction map.
+    All replicas take swap_every steps, after which the networks of the replicas at neighbouring temperatures are exchanged,
+    with probability `swap_probability`, alternating between the even and odd pairs of neighbouring temperatures.
+    With workers, the replicas take their steps in a pool of processes;
+    the replicas are sent to the worker processes in each round, without their memoized automorphism counts,
+    so swap_every should not be too small.
+    The seeds of the replicas and the swaps are spawned from one numpy.random.SeedSequence,
+    so the samples do not depend on the number of workers.
+
+    :param starting_network: the phylox.DiNetwork used as the starting point of each replica.
+    :param move_type_probabilities: a dictionary mapping MoveTypes to probabilities.
+    :param inverse_temperatures: a decreasing sequence of inverse temperatures, non-negative floats or math.inf.
+    :param restriction_map: a boolean function that takes a phylox.DiNetwork as input, the restriction of the sampled networks.
+    :param energy: a function that maps a network to a non-negative number, which is 0 exactly for the networks that satisfy the restriction map.
+        If None, the energy is 0 for networks that satisfy the restriction map and 1 otherwise (see `RestrictionEnergy`).
+        A larger energy for networks that are further from satisfying the restriction map helps the hotter replicas to return.
+    :param support_map: a boolean function that takes a phylox.DiNetwork as input, a restriction for all replicas,
+        e.g., a maximum reticulation number, so that the hotter replicas do not add reticulations indefinitely.
+    :param correct_symmetries: whether to correct for symmetries in the acceptance probability, set to True for uniform distribution.
+    :param burn_in: the number of steps (including rejected proposals) of each replica between each sample.
+    :param swap_every: the number of steps of each replica between two rounds of exchanges.
+    :param number_of_samples: the number of networks to sample.
+    :param add_root_if_necessary: whether to add a root edge to each root if it has out-degree > 1.
+    :param workers: the number of worker processes. If None or 1, the replicas are run in the current process.
+    :param seed: a seed for the numpy.random.SeedSequence of the replicas and the exchanges.
+    :return: a tuple (samples, statistics), where samples is a list of phylox.DiNetwork objects,
+        and statistics is a dictionary with the statistics of each replica (see `_ChainState.statistics`),
+        with its seed, its number of exchanges, its number of round trips from the coldest to the hottest temperature and back,
+        and its final inverse temperature; the number of proposed and accepted exchanges for each pair of neighbouring temperatures;
+        and the total time.
+
+    :example:
+    >>> import math
+    >>> from phylox.classes.dinetwork import is_tree_child
+    >>> from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+    >>> from phylox.generators.mcmc import sample_mcmc_networks_tempered
+    >>> from phylox.rearrangement.movetype import MoveType
+    >>> starting_network = generate_network_random_tree_child_sequence(5, 1, seed=1)
+    >>> samples, statistics = sample_mcmc_networks_tempered(
+    ...     starting_network,
+    ...     {MoveType.TAIL: 0.3, MoveType.HEAD: 0.3, MoveType.VPLU: 0.2, MoveType.VMIN: 0.2},
+    ...     inverse_temperatures=[math.inf, 1.0],
+    ...     restriction_map=is_tree_child,
+    ...     support_map=lambda network: network.reticulation_number <= 3,
+    ...     burn_in=20,
+    ...     swap_every=5,
+    ...     number_of_samples=10,
+    ...     seed=1,
+    ... )
+    >>> len(samples), all(is_tree_child(network) for network in samples)
+    (10, True)
+    >>> [swaps["inverse_temperatures"] for swaps in statistics["swaps"]]
+    [(inf, 1.0)]
+    """
+    inverse_temperatures = list(inverse_temperatures)
+    if any(
+        hotter > colder
+        for colder, hotter in zip(inverse_temperatures, inverse_temperatures[1:])
+    ):
+        raise ValueError("The inverse temperatures must be decreasing.")
+    if energy is None:
+        energy = RestrictionEnergy(restriction_map)
+    n_replicas = len(inverse_temperatures)
+    seed_sequences = np.random.SeedSequence(seed).spawn(n_replicas + 1)
+    seeds = [int(child.generate_state(1)[0]) for child in seed_sequences]
+    swap_random_state = np.random.RandomState(seeds.pop())
+    network = _starting_network(starting_network, add_root_if_necessary)
+    replicas = [
+        (
+            _TemperedChainState(
+                network.copy(),
+                inverse_temperature,
+                energy,
+                correct_symmetries=correct_symmetries,
+            ),
+            np.random.RandomState(replica_seed),
+        )
+        for inverse_temperature, replica_seed in zip(inverse_temperatures, seeds)
+    ]
+    settings = {
+        "move_type_probabilities": move_type_probabilities,
+        "restriction_map": support_map,
+    }
+    # the replica at each temperature, and the last extreme temperature visited by each replica
+    order = list(range(n_replicas))
+    last_extreme = ["cold"] + [None] * (n_replicas - 1)
+    replica_swaps = [0] * n_replicas
+    round_trips = [0] * n_replicas
+    swaps_proposed = [0] * (n_replicas - 1)
+    swaps_accepted = [0] * (n_replicas - 1)
+    rounds = 0
+    samples = []
+    start_time = time.time()
+
+    def exchange():
+        for index in range(rounds % 2, n_replicas - 1, 2):
+            colder, hotter = order[index], order[index + 1]
+            swaps_proposed[index] += 1
+            probability = swap_probability(
+                inverse_temperatures[index],
+                replicas[colder][0].energy,
+                inverse_temperatures[index + 1],
+                replicas[hotter][0].energy,
+            )
+            if swap_random_state.random_sample() >= probability:
+                continue
+            swaps_accepted[index] += 1
+            order[index], order[index + 1] = hotter, colder
+            for replica in [colder, hotter]:
+                replica_swaps[replica] += 1
+        for index, replica in enumerate(order):
+            replicas[replica][0].inverse_temperature = inverse_temperatures[index]
+        if last_extreme[order[0]] == "hot":
+            round_trips[order[0]] += 1
+        last_extreme[order[0]] = "cold"
+        if n_replicas > 1:
+            last_extreme[order[-1]] = "hot"
+
+    def run(executor):
+        nonlocal rounds
+        for _ in range(number_of_samples):
+            remaining = burn_in
+            while remaining > 0:
+                steps = min(swap_every, remaining) if swap_every else remaining
+                if executor is None:
+                    for index, replica in enumerate(replicas):
+                        replicas[index] = _tempered_steps(replica, steps, settings)
+                else:
+                    futures = [
+                        executor.submit(_tempered_steps, replica, steps)
+                        for replica in replicas
+                    ]
+                    replicas[:] = [future.result() for future in futures]
+                exchange()
+                rounds += 1
+                remaining -= steps
+            samples.append(replicas[order[0]][0].network.copy())
+
+    if workers is None or workers <= 1:
+        run(None)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_mcmc_worker,
+            initargs=(settings,),
+        ) as executor:
+            run(executor)
+
+    statistics = {
+        "inverse_temperatures": inverse_temperatures,
+        "replicas": [
+            dict(
+                replica.statistics(),
+                seed=replica_seed,
+                swaps=replica_swaps[index],
+                round_trips=round_trips[index],
+                inverse_temperature=replica.inverse_temperature,
+            )
+            for index, ((replica, _), replica_seed) in enumerate(zip(replicas, seeds))
+        ],
+        "swaps": [
+            {
+                "inverse_temperatures": (
+                    inverse_temperatures[index],
+                    inverse_temperatures[index + 1],
+                ),
+                "proposed": swaps_proposed[index],
+                "accepted": swaps_accepted[index],
+                "acceptance_rate": (
+                    swaps_accepted[index] / swaps_proposed[index]
+                    if swaps_proposed[index]
+                    else 0.0
+                ),
+            }
+            for index in range(n_replicas - 1)
+        ],
+        "elapsed_time": time.time() - start_time,
+    }
+    return samples, statistics
+
+
+def _tempered_steps(replica, steps, settings=None):
+    """
+    Runs a replica of sample_mcmc_networks_tempered for a number of steps.
+
+    :param replica: a tuple (chain_state, random_state).
+    :return: the replica after the steps.
+    """
+    if settings is None:
+        settings = _mcmc_worker["settings"]
+    chain_state, random_state = replica
+    for _ in range(steps):
+        chain_state.step(
+            settings["move_type_probabilities"],
+            restriction_map=settings["restriction_map"],
+            seed=random_state,
+        )
+    return replica
@@ -3,7 +3,7 @@ from enum import Enum
 
 from networkx.utils.decorators import np_random_state, py_random_state
 
-from phylox.rearrangement.move import Move, apply_move
+from phylox.rearrangement.move import Move, apply_move_inplace
 from phylox.rearrangement.movetype import MoveType
 
 
@@ -178,7 +178,7 @@ def network_from_tree(tree, reticulations, method, seed=None):
     while reticulations > 0:
         try:
             move = add_edge_method(network, seed=seed)
-            network = apply_move(network, move)
+            apply_move_inplace(network, move)
             reticulations -= 1
         except:
             pass
@@ -0,0 +1,175 @@
+"""
+A module for reading many phylogenetic networks from a file at once.
+
+A file may contain any number of (extended) Newick strings, each terminated by a `;`.
+The file is memory-mapped and split into networks without loading it as a whole,
+and the networks can be parsed by a pool of worker processes.
+"""
+
+import mmap
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from phylox.dinetwork import DiNetwork
+from phylox.newick_parser import extended_newick_to_compactnetwork
+
+# characters that change the state of the splitter: a network ends at a `;`
+# that is not inside a quoted label or a comment.
+_SPLIT_PATTERN = re.compile(rb"[;'\[\]]")
+_NON_WHITESPACE = re.compile(rb"\S")
+
+
+def _split_newick_buffer(buffer):
+    """
+    Finds the byte ranges of the Newick strings in a buffer.
+    The strings are separated by a `;` outside quoted labels and comments.
+    Ranges that contain only whitespace are skipped.
+
+    :param buffer: a bytes-like object, e.g., a memory-mapped file.
+    :return: an iterator of tuples (start, end) of byte positions, the end includes the `;`.
+    """
+    start = 0
+    in_quote = False
+    in_comment = False
+    for match in _SPLIT_PATTERN.finditer(buffer):
+        character = match.group()
+        if in_comment:
+            in_comment = character != b"]"
+        elif character == b"'":
+            in_quote = not in_quote
+        elif in_quote:
+            continue
+        elif character == b"[":
+            in_comment = True
+        elif character == b";":
+            end = match.end()
+            if _NON_WHITESPACE.search(buffer, start, end - 1):
+                yield start, end
+            start = end
+    if _NON_WHITESPACE.search(buffer, start, len(buffer)):
+        yield start, len(buffer)
+
+
+def _parse_newick(newick, compact=False, add_root_edge=False):
+    """
+    Parses one Newick string to a DiNetwork or a CompactNetwork.
+    """
+    if compact and not add_root_edge:
+        return extended_newick_to_compactnetwork(newick)
+    network = DiNetwork.from_newick(newick, add_root_edge=add_root_edge)
+    if compact:
+        return network.to_compact()
+    return network
+
+
+def _parse_ranges(path, ranges, compact=False, add_root_edge=False, encoding="utf-8"):
+    """
+    Parses the Newick strings at the given byte ranges of a file.
+
+    :note: This function is run by the worker processes of read_newick_file,
+      which memory-map the file themselves so that only the ranges are sent to them.
+    """
+    with open(path, "rb") as file, _map_file(file) as buffer:
+        return [
+            _parse_newick(
+                buffer[start:end].decode(encoding),
+                compact=compact,
+                add_root_edge=add_root_edge,
+            )
+            for start, end in ranges
+        ]
+
+
+def _map_file(file):
+    """
+    Memory-maps a file for reading, empty files are mapped to an empty buffer.
+    """
+    if file.seek(0, 2) == 0:
+        return memoryview(b"")
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _batches(iterable, size):
+    """
+    Groups the items of an iterable in lists of the given size (the last list may be shorter).
+    """
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+def read_newick_file(
+    path,
+    workers=None,
+    compact=False,
+    add_root_edge=False,
+    batch_size=256,
+    encoding="utf-8",
+):
+    """
+    Reads all (extended) Newick strings from a file.
+    The networks are yielded lazily, in the order in which they appear in the file.
+
+    The file is memory-mapped and split on each `;` that is not in a quoted label or a comment,
+    so the strings may span multiple lines, and multiple strings may be on one line.
+    With more than one worker, batches of strings are parsed in a pool of processes.
+    At most two batches per worker are parsed ahead of the networks that have been consumed.
+
+    :param path: the path to the file.
+    :param workers: the number of worker processes. If None or 1, the strings are parsed in the current process.
+    :param compact: whether to return the networks as phylox.CompactNetwork instead of phylox.DiNetwork.
+    :param add_root_edge: whether to add a root edge of length 0 to each network, see `phylox.DiNetwork.from_newick`.
+    :param batch_size: the number of strings parsed by a worker at a time.
+    :param encoding: the encoding of the file.
+    :return: an iterator of phylogenetic networks.
+
+    :example:
+    >>> import os, tempfile
+    >>> from phylox.io import read_newick_file
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     path = os.path.join(directory, "networks.nwk")
+    ...     with open(path, "w") as file:
+    ...         _ = file.write("((a,b),c);\\n(a,(b)#H1,(#H1,c));\\n")
+    ...     networks = list(read_newick_file(path))
+    >>> [network.reticulation_number for network in networks]
+    [0, 1]
+    """
+    if workers is None or workers <= 1:
+        return _read_newick_file_serial(path, compact, add_root_edge, encoding)
+    return _read_newick_file_parallel(
+        path, workers, compact, add_root_edge, batch_size, encoding
+    )
+
+
+def _read_newick_file_serial(path, compact, add_root_edge, encoding):
+    with open(path, "rb") as file, _map_file(file) as buffer:
+        for start, end in _split_newick_buffer(buffer):
+            yield _parse_newick(
+                buffer[start:end].decode(encoding),
+                compact=compact,
+                add_root_edge=add_root_edge,
+            )
+
+
+def _read_newick_file_parallel(path, workers, compact, add_root_edge, batch_size, encoding):
+    with open(path, "rb") as file, _map_file(file) as buffer, ProcessPoolExecutor(
+        max_workers=workers
+    ) as executor:
+        batches = _batches(_split_newick_buffer(buffer), batch_size)
+        futures = deque(
+            executor.submit(_parse_ranges, path, batch, compact, add_root_edge, encoding)
+            for batch in islice(batches, 2 * workers)
+        )
+        while futures:
+            networks = futures.popleft().result()
+            for batch in islice(batches, 1):
+                futures.append(
+                    executor.submit(
+                        _parse_ranges, path, batch, compact, add_root_edge, encoding
+                    )
+                )
+            yield from networks
@@ -1,52 +1,32 @@
 """
 A module for checking isomorphism between phylogenetic networks and counting automorphisms of phylogenetic networks.
 
-Currently mostly uses the networkx isomorphism checker, extended with some specifics for phylogenetic networks 
-such as labels and partial isomorphisms.
+Before two networks are compared, a sequence of cheap invariants is checked (numbers of nodes and edges,
+reticulation number, degrees, labels, depths of the leaves, and blobs), which rejects most non-isomorphic pairs.
+The remaining pairs are compared by their canonical forms (see `phylox.isomorphism.canonical`),
+or, when a partial isomorphism is given, with the networkx isomorphism checker,
+extended with some specifics for phylogenetic networks such as labels and partial isomorphisms.
 """
 
-from copy import deepcopy
+from collections import Counter
 
-import networkx as nx
+from networkx.algorithms.isomorphism import DiGraphMatcher
 
 from phylox.constants import LABEL_ATTR
+from phylox.isomorphism.canonical import _count_automorphisms, canonical_form
+from phylox.networkproperties.properties import blob_properties
 
 #: The node attribute used to store the isometry label of a node.
+#: Deprecated: no longer used, as the networks are not relabelled for isomorphism checks; will be removed in a future release.
 ISOMETRY_LABEL_ATTR = "isometry_label"
 #: The prefix used for isometry labels.
+#: Deprecated: no longer used, will be removed in a future release.
 ISOMETRY_LABEL_PREFIX = "isometry_label_prefix_"
 #: The prefix used for automorphism labels.
+#: Deprecated: no longer used, will be removed in a future release.
 AUTOMORPHISM_LABEL_PREFIX = "automorphism_label_prefix_"
 
 
-# Checks whether the nodes with the given attributes have the same label
-def _same_isometry_labels(node1_attributes, node2_attributes):
-    """
-    Checks whether two nodes have the same label
-
-    :param node1_attributes: the attributes of a node
-    :param node2_attributes: the attributes of a node
-    :return: True if the isometry label attribute ISOMETRY_LABEL_ATTR is the same, False otherwise.
-    """
-    return node1_attributes.get(ISOMETRY_LABEL_ATTR) == node2_attributes.get(
-        ISOMETRY_LABEL_ATTR
-    )
-
-
-# Checks whether the nodes with the given attributes have the same label
-def _same_isometry_labels_and_labels(node1_attributes, node2_attributes):
-    """
-    Checks whether two nodes have the same label
-
-    :param node1_attributes: the attributes of a node
-    :param node2_attributes: the attributes of a node
-    :return: True if the isometry label attribute ISOMETRY_LABEL_ATTR is the same, False otherwise.
-    """
-    return node1_attributes.get(ISOMETRY_LABEL_ATTR) == node2_attributes.get(
-        ISOMETRY_LABEL_ATTR
-    ) and node1_attributes.get(LABEL_ATTR) == node2_attributes.get(LABEL_ATTR)
-
-
 # Checks whether two networks are labeled isomorpgic
 def is_isomorphic(network1, network2, partial_isomorphism=None, ignore_labels=False):
     """
@@ -54,6 +34,8 @@ def is_isomorphic(network1, network2, partial_isomorphism=None, ignore_labels=Fa
 
     :param network1: a phylogenetic network, i.e., a DAG with leaf labels stored as the node attribute LABEL_ATTR.
     :param network2: a phylogenetic network, i.e., a DAG with leaf labels stored as the node attribute LABEL_ATTR.
+    :param partial_isomorphism: a list of pairs (node1, node2) that have to be mapped to each other.
+    :param ignore_labels: if True, the labels of the nodes are ignored.
     :return: True if the networks are labeled isomorphic, False otherwise.
 
     :example:
@@ -74,68 +56,116 @@ def is_isomorphic(network1, network2, partial_isomorphism=None, ignore_labels=Fa
     >>> is_isomorphic(network1, network2, partial_isomorphism=[(4,6)], ignore_labels=True)
     False
     """
-    nw1 = deepcopy(network1)
-    nw2 = deepcopy(network2)
-
-    same_labels = _same_isometry_labels_and_labels
-    if ignore_labels:
-        same_labels = _same_isometry_labels
-
     partial_isomorphism = partial_isomorphism or []
-    for i, corr in enumerate(partial_isomorphism):
-        if not same_labels(nw1.nodes[corr[0]], nw2.nodes[corr[1]]):
+    if not ignore_labels:
+        for node1, node2 in partial_isomorphism:
+            if network1.nodes[node1].get(LABEL_ATTR) != network2.nodes[node2].get(
+                LABEL_ATTR
+            ):
+                return False
+
+    for invariant1, invariant2 in zip(
+        _invariants(network1, ignore_labels), _invariants(network2, ignore_labels)
+    ):
+        if invariant1 != invariant2:
             return False
-        nw1.nodes[corr[0]][ISOMETRY_LABEL_ATTR] = f"{ISOMETRY_LABEL_PREFIX}{i}"
-        nw2.nodes[corr[1]][ISOMETRY_LABEL_ATTR] = f"{ISOMETRY_LABEL_PREFIX}{i}"
 
-    return nx.is_isomorphic(nw1, nw2, node_match=same_labels)
+    if not partial_isomorphism:
+        return canonical_form(network1, ignore_labels=ignore_labels) == canonical_form(
+            network2, ignore_labels=ignore_labels
+        )
+    matcher = _PhylogeneticNetworkMatcher(
+        network1, network2, partial_isomorphism, ignore_labels=ignore_labels
+    )
+    return matcher.is_isomorphic()
+
+
+def _invariants(network, ignore_labels=False):
+    """
+    Computes isomorphism invariants of a network, from cheap to expensive.
+    Networks with a different value for any of the invariants are not isomorphic.
+    The invariants are computed lazily, so that the expensive ones are only computed
+    if the cheap ones are equal for the networks that are compared.
+
+    :param network: a phylogenetic network.
+    :param ignore_labels: if True, the labels of the nodes are not used.
+    :return: a generator of invariants.
+    """
+    yield len(network), network.number_of_edges()
+    yield network.reticulation_number
+    yield Counter(
+        zip(
+            (degree for _, degree in network.in_degree),
+            (degree for _, degree in network.out_degree),
+        )
+    )
+    if not ignore_labels:
+        yield Counter(label for _, label in network.nodes(data=LABEL_ATTR))
+    yield _leaf_depth_profile(network, ignore_labels)
+    yield sorted(blob_properties(network))
 
 
-def _count_automorphisms(
-    network,
-    ignore_labels=False,
-    partial_isomorphism=None,
-    nodes_available=None,
-    nodes_to_do=None,
-):
+def _leaf_depth_profile(network, ignore_labels=False):
     """
-    Determines the number of automorphisms of a network.
+    Computes the multiset of (label, length of a shortest root-leaf path, length of a longest root-leaf path)
+    of the leaves of a network.
+    """
+    shortest = {}
+    longest = {}
+    remaining_parents = {}
+    queue = []
+    for node, in_degree in network.in_degree:
+        remaining_parents[node] = in_degree
+        if in_degree == 0:
+            shortest[node] = longest[node] = 0
+            queue.append(node)
+    successors = network.succ
+    for node in queue:
+        depths = shortest[node] + 1, longest[node] + 1
+        for child in successors[node]:
+            if child in shortest:
+                if depths[0] < shortest[child]:
+                    shortest[child] = depths[0]
+                if depths[1] > longest[child]:
+                    longest[child] = depths[1]
+            else:
+                shortest[child], longest[child] = depths
+            remaining_parents[child] -= 1
+            if remaining_parents[child] == 0:
+                queue.append(child)
+    labels = network.nodes(data=LABEL_ATTR)
+    return Counter(
+        (
+            None if ignore_labels else labels[leaf],
+            shortest.get(leaf),
+            longest.get(leaf),
+        )
+        for leaf in network.leaves
+    )
 
-    An implementation of the algorithm described in
-    "A note on the graph isomorphism counting problem" by
-    Rudolf Matheson in 1979.
 
-    :param network: a phylox.DiNetwork phylogenetic network, i.e., a DAG with leaf labels.
-    :param ignore_labels: if True, the automorphisms are counted without considering the labels of the nodes.
-    :param partial_isomorphism: a partial isomorphism between the network and itself.
-    :param nodes_available: the nodes that are available to be matched.
-    :param nodes_to_do: the nodes that still need to be matched.
-    :return: the number of automorphisms of the network.
+class _PhylogeneticNetworkMatcher(DiGraphMatcher):
+    """
+    A networkx VF2 matcher for phylogenetic networks that respects labels and a partial isomorphism.
+    The partial isomorphism is read from a dictionary, so the networks are not copied or modified.
     """
-    nodes_available = nodes_available or []
-    nodes_to_do = nodes_to_do if nodes_to_do is not None else set(network.nodes())
-    same_labels = _same_isometry_labels_and_labels
-    if ignore_labels:
-        same_labels = _same_isometry_labels
-
-    number_of_automorphisms = 1
-    while nodes_to_do:
-        node_pair_to_remove = partial_isomorphism.pop()
-        node_to_remove = node_pair_to_remove[0]
-        nodes_to_do.remove(node_to_remove)
-        matches = 1
-        for try_to_match_node in nodes_available:
-            if is_isomorphic(
-                network,
-                network,
-                partial_isomorphism=partial_isomorphism
-                + [(node_to_remove, try_to_match_node)],
-                ignore_labels=ignore_labels,
-            ):
-                matches += 1
-        number_of_automorphisms *= matches
-        nodes_available.append(node_to_remove)
-    return number_of_automorphisms
+
+    def __init__(self, network1, network2, partial_isomorphism=None, ignore_labels=False):
+        super().__init__(network1, network2)
+        self.fixed = dict(partial_isomorphism or [])
+        self.fixed_inverse = {node2: node1 for node1, node2 in self.fixed.items()}
+        self.ignore_labels = ignore_labels
+
+    def semantic_feasibility(self, G1_node, G2_node):
+        if (G1_node in self.fixed or G2_node in self.fixed_inverse) and self.fixed.get(
+            G1_node
+        ) != G2_node:
+            return False
+        if self.ignore_labels:
+            return True
+        return self.G1.nodes[G1_node].get(LABEL_ATTR) == self.G2.nodes[G2_node].get(
+            LABEL_ATTR
+        )
 
 
 def count_automorphisms(network, ignore_labels=False):
@@ -158,9 +188,4 @@ def count_automorphisms(network, ignore_labels=False):
     >>> count_automorphisms(network, ignore_labels=False)
     2
     """
-    partial_isomorphism = [(a, a) for a in network.nodes()]
-    return _count_automorphisms(
-        network,
-        ignore_labels=ignore_labels,
-        partial_isomorphism=partial_isomorphism,
-    )
+    return _count_automorphisms(network, ignore_labels=ignore_labels)
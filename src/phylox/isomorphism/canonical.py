@@ -0,0 +1,462 @@
+"""
+A module for computing canonical forms of phylogenetic networks.
+
+Two networks have the same canonical form if and only if they are isomorphic,
+where the labels (node attribute LABEL_ATTR) have to be preserved unless labels are ignored.
+Hence, the canonical form (or its hash) can be used to deduplicate or count networks with sets and dictionaries.
+
+The canonical form is computed in two parts.
+The pendant subtrees of the network (subtrees without reticulations, attached to the rest of the network by a single edge)
+are encoded bottom-up, as in the tree isomorphism algorithm of Aho, Hopcroft and Ullman.
+The remaining nodes, the core of the network, consist of the reticulations and their ancestors.
+The core is ordered canonically by colour refinement followed by individualization-refinement,
+where the search tree is pruned with the automorphisms that are found along the way, as in McKay's algorithm.
+"""
+
+import hashlib
+import math
+from collections import Counter
+
+from phylox.constants import LABEL_ATTR
+
+
+def canonical_form(network, ignore_labels=False):
+    """
+    Computes a canonical form of a network:
+    a string that is the same for two networks if and only if they are isomorphic.
+
+    :param network: a phylogenetic network, i.e., a DAG with leaf labels stored as the node attribute LABEL_ATTR.
+    :param ignore_labels: if True, the labels of the nodes are ignored.
+    :return: a string.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.isomorphism import canonical_form
+    >>> network1 = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,3),(2,4),(3,5)],
+    ...     labels=[(4, "A"), (5, "B")],
+    ... )
+    >>> network2 = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,3),(2,5),(3,6)],
+    ...     labels=[(5, "B"), (6, "A")],
+    ... )
+    >>> canonical_form(network1) == canonical_form(network2)
+    False
+    >>> canonical_form(network1, ignore_labels=True) == canonical_form(network2, ignore_labels=True)
+    True
+    """
+    return _canonical_form(network, ignore_labels=ignore_labels)
+
+
+def network_hash(network, ignore_labels=False):
+    """
+    Computes a hash of the canonical form of a network.
+    Isomorphic networks have the same hash,
+    and the probability that two non-isomorphic networks have the same hash is negligible.
+
+    :param network: a phylogenetic network, i.e., a DAG with leaf labels stored as the node attribute LABEL_ATTR.
+    :param ignore_labels: if True, the labels of the nodes are ignored.
+    :return: a string with a hexadecimal hash of 32 characters.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.isomorphism import network_hash
+    >>> network1 = DiNetwork(edges=[(0, 1), (0, 2)], labels=[(1, "A"), (2, "B")])
+    >>> network2 = DiNetwork(edges=[(5, 3), (5, 4)], labels=[(3, "B"), (4, "A")])
+    >>> network_hash(network1) == network_hash(network2)
+    True
+    """
+    form = _canonical_form(network, ignore_labels=ignore_labels)
+    return hashlib.blake2b(form.encode(), digest_size=16).hexdigest()
+
+
+def _canonical_form(network, ignore_labels=False, node_colours=None):
+    """
+    Computes the canonical form of a network.
+
+    :param network: a phylogenetic network.
+    :param ignore_labels: if True, the labels of the nodes are ignored.
+    :param node_colours: a dictionary with additional colours for some nodes,
+      isomorphisms have to map each node to a node with the same colour.
+    :return: a string.
+    """
+    decomposition = _Decomposition(network, ignore_labels, node_colours)
+    search = _CanonicalSearch(
+        decomposition.core_colours,
+        decomposition.core_children,
+        decomposition.core_parents,
+    )
+    search.run()
+    return repr(
+        (
+            decomposition.pendant_table,
+            decomposition.pendant_roots,
+            decomposition.core_keys,
+            search.best_certificate,
+        )
+    )
+
+
+def _count_automorphisms(network, ignore_labels=False):
+    """
+    Computes the number of automorphisms of a network.
+
+    The automorphisms of the core are counted with the individualization-refinement search.
+    Each automorphism of the core extends to the pendant subtrees in the same number of ways:
+    the product, over all groups of k isomorphic pendant subtrees with the same parent, of k! times
+    the number of automorphisms of the subtree to the power k.
+
+    :param network: a phylogenetic network.
+    :param ignore_labels: if True, the labels of the nodes are ignored.
+    :return: the number of automorphisms of the network.
+    """
+    decomposition = _Decomposition(network, ignore_labels)
+    search = _CanonicalSearch(
+        decomposition.core_colours,
+        decomposition.core_children,
+        decomposition.core_parents,
+    )
+    search.run()
+    size = search.automorphism_group_size()
+
+    pendant_automorphisms = []
+    for _, children in decomposition.pendant_table:
+        pendant_automorphisms.append(_multiset_automorphisms(children, pendant_automorphisms))
+    for _, pendant_children in decomposition.core_keys:
+        size *= _multiset_automorphisms(pendant_children, pendant_automorphisms)
+    size *= _multiset_automorphisms(decomposition.pendant_roots, pendant_automorphisms)
+    return size
+
+
+def _multiset_automorphisms(pendant_ids, pendant_automorphisms):
+    """
+    Computes the number of automorphisms of a set of pendant subtrees with the given ids.
+    """
+    size = 1
+    for pendant_id, multiplicity in Counter(pendant_ids).items():
+        size *= math.factorial(multiplicity) * pendant_automorphisms[pendant_id] ** multiplicity
+    return size
+
+
+class _Decomposition:
+    """
+    Splits a network in its pendant subtrees and its core.
+
+    Each pendant subtree gets an integer id, such that two pendant subtrees have the same id
+    if and only if they are isomorphic. The ids are ordered by height and then by
+    (label, ids of the children), so they do not depend on the names of the nodes.
+    The pendant_table lists (label, ids of children) for each id, so that the ids are meaningful
+    when comparing networks.
+
+    Each core node gets a key (label, ids of its pendant children), and the initial colour of a core node
+    is the rank of its key.
+    """
+
+    def __init__(self, network, ignore_labels=False, node_colours=None):
+        succ = network._succ
+        nodes = list(succ)
+        index = {node: i for i, node in enumerate(nodes)}
+        number_of_nodes = len(nodes)
+        children = [[index[child] for child in succ[node]] for node in nodes]
+        parents = [[] for _ in range(number_of_nodes)]
+        for i, node_children in enumerate(children):
+            for child in node_children:
+                parents[child].append(i)
+
+        if ignore_labels:
+            labels = [None] * number_of_nodes
+        else:
+            node_data = network._node
+            labels = [node_data[node].get(LABEL_ATTR) for node in nodes]
+        if node_colours is None:
+            colours = [None] * number_of_nodes
+        else:
+            colours = [node_colours.get(node) for node in nodes]
+        keys = [
+            (
+                "" if label is None else repr(label),
+                "" if colour is None else repr(colour),
+            )
+            for label, colour in zip(labels, colours)
+        ]
+
+        # visit the nodes bottom-up
+        remaining_children = [len(node_children) for node_children in children]
+        order = [i for i in range(number_of_nodes) if remaining_children[i] == 0]
+        for i in order:
+            for parent in parents[i]:
+                remaining_children[parent] -= 1
+                if remaining_children[parent] == 0:
+                    order.append(parent)
+        if len(order) != number_of_nodes:
+            raise ValueError("The network contains a directed cycle.")
+
+        pendant = [False] * number_of_nodes
+        height = [0] * number_of_nodes
+        for i in order:
+            if len(parents[i]) <= 1 and all(pendant[child] for child in children[i]):
+                pendant[i] = True
+                if children[i]:
+                    height[i] = 1 + max(height[child] for child in children[i])
+
+        pendant_by_height = {}
+        for i in order:
+            if pendant[i]:
+                pendant_by_height.setdefault(height[i], []).append(i)
+        pendant_id = [None] * number_of_nodes
+        self.pendant_table = []
+        for h in sorted(pendant_by_height):
+            level = pendant_by_height[h]
+            level_keys = [
+                (keys[i], tuple(sorted(pendant_id[child] for child in children[i])))
+                for i in level
+            ]
+            first_id = len(self.pendant_table)
+            self.pendant_table += sorted(set(level_keys))
+            ids = {
+                key: first_id + rank
+                for rank, key in enumerate(self.pendant_table[first_id:])
+            }
+            for i, key in zip(level, level_keys):
+                pendant_id[i] = ids[key]
+        self.pendant_table = tuple(self.pendant_table)
+        self.pendant_roots = tuple(
+            sorted(pendant_id[i] for i in range(number_of_nodes) if pendant[i] and not parents[i])
+        )
+
+        core = [i for i in range(number_of_nodes) if not pendant[i]]
+        core_index = {i: k for k, i in enumerate(core)}
+        core_keys = [
+            (
+                keys[i],
+                tuple(
+                    sorted(pendant_id[child] for child in children[i] if pendant[child])
+                ),
+            )
+            for i in core
+        ]
+        ranks = {key: rank for rank, key in enumerate(sorted(set(core_keys)))}
+        self.core_nodes = [nodes[i] for i in core]
+        self.core_colours = [ranks[key] for key in core_keys]
+        self.core_keys = tuple(sorted(core_keys))
+        self.core_children = [
+            [core_index[child] for child in children[i] if not pendant[child]]
+            for i in core
+        ]
+        self.core_parents = [[core_index[parent] for parent in parents[i]] for i in core]
+
+
+def _refine(colours, children, parents):
+    """
+    Refines a colouring until it is equitable: nodes with the same colour have
+    the same number of children and parents of each colour.
+    The colours are ranks, and the order of the existing colours is kept,
+    so the result only depends on the structure of the network, not on the names of the nodes.
+
+    :param colours: a list with the colour (rank) of each node.
+    :param children: a list with the list of children of each node.
+    :param parents: a list with the list of parents of each node.
+    :return: a list with the refined colour of each node.
+    """
+    number_of_colours = len(set(colours))
+    while number_of_colours < len(colours):
+        keys = [
+            (
+                colours[i],
+                tuple(sorted([colours[child] for child in children[i]])),
+                tuple(sorted([colours[parent] for parent in parents[i]])),
+            )
+            for i in range(len(colours))
+        ]
+        ranks = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+        if len(ranks) == number_of_colours:
+            break
+        colours = [ranks[key] for key in keys]
+        number_of_colours = len(ranks)
+    return colours
+
+
+def _individualize(colours, node):
+    """
+    Gives a node a colour of its own, directly before the other nodes of its old colour.
+    """
+    keys = [(colour, i != node) for i, colour in enumerate(colours)]
+    ranks = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+    return [ranks[key] for key in keys]
+
+
+class _SearchNode:
+    """
+    A node of the search tree of _CanonicalSearch: an equitable colouring
+    obtained by individualizing the nodes in path.
+    """
+
+    def __init__(self, colours, path):
+        self.colours = colours
+        self.path = path
+        # the first non-singleton cell is split next
+        cells = {}
+        for i, colour in enumerate(colours):
+            cells.setdefault(colour, []).append(i)
+        self.cell = next(cells[colour] for colour in sorted(cells) if len(cells[colour]) > 1)
+        self.position = 0
+        self.tried = []
+        self.orbits = None
+        self.number_of_generators = -1
+
+
+class _CanonicalSearch:
+    """
+    Individualization-refinement search for a canonical ordering of a vertex-coloured directed graph.
+
+    Each leaf of the search tree is a discrete colouring, i.e., an ordering of the nodes.
+    The certificate of a leaf is the sorted list of edges in terms of the positions of the nodes,
+    and the canonical ordering is a leaf with the smallest certificate.
+
+    Whenever two leaves have the same certificate, the map between them is an automorphism.
+    The automorphisms are used to skip children of a search node that are in the same orbit as
+    a child that has been explored, and to jump back to the path of the leaf with the same certificate,
+    because the subtree containing the new leaf is the image of a subtree that has been explored.
+    """
+
+    def __init__(self, colours, children, parents):
+        self.colours = colours
+        self.children = children
+        self.parents = parents
+        self.edges = [(u, v) for u, node_children in enumerate(children) for v in node_children]
+        self.generators = []
+        self.first_path = None
+        self.first_order = None
+        self.first_certificate = None
+        self.best_path = None
+        self.best_order = None
+        self.best_certificate = None
+        self.first_path_cells = []
+
+    def run(self):
+        colours = _refine(self.colours, self.children, self.parents)
+        if len(set(colours)) == len(colours):
+            self._leaf(colours, [])
+            return
+        stack = [_SearchNode(colours, [])]
+        while stack:
+            search_node = stack[-1]
+            if search_node.position == len(search_node.cell):
+                stack.pop()
+                continue
+            node = search_node.cell[search_node.position]
+            search_node.position += 1
+            if search_node.tried and self._in_explored_orbit(search_node, node):
+                continue
+            search_node.tried.append(node)
+            path = search_node.path + [node]
+            colours = _refine(
+                _individualize(search_node.colours, node), self.children, self.parents
+            )
+            if len(set(colours)) < len(colours):
+                stack.append(_SearchNode(colours, path))
+                continue
+            first_leaf = self.first_certificate is None
+            jump_path = self._leaf(colours, path)
+            if first_leaf:
+                self.first_path_cells = [search_node.cell for search_node in stack]
+            if jump_path is not None:
+                while stack and stack[-1].path != jump_path[: len(stack[-1].path)]:
+                    stack.pop()
+
+    def automorphism_group_size(self):
+        """
+        Computes the size of the automorphism group from the automorphisms found by the search
+        (call run first).
+        The size is the product, over the nodes of the search tree on the path to the first leaf,
+        of the size of the orbit of the individualized node under the automorphisms that fix the path so far.
+
+        :return: the number of automorphisms of the coloured graph.
+        """
+        size = 1
+        for level, cell in enumerate(self.first_path_cells):
+            path = self.first_path[:level]
+            orbits = _orbits(
+                len(self.colours),
+                [
+                    automorphism
+                    for automorphism in self.generators
+                    if all(automorphism[i] == i for i in path)
+                ],
+            )
+            size *= sum(1 for node in cell if orbits[node] == orbits[cell[0]])
+        return size
+
+    def _leaf(self, colours, path):
+        """
+        Processes a leaf of the search tree.
+
+        :return: the path of an earlier leaf with the same certificate, or None.
+        """
+        order = [0] * len(colours)
+        for i, colour in enumerate(colours):
+            order[colour] = i
+        certificate = tuple(sorted([(colours[u], colours[v]) for u, v in self.edges]))
+        if self.first_certificate is None:
+            self.first_path = self.best_path = path
+            self.first_order = self.best_order = order
+            self.first_certificate = self.best_certificate = certificate
+            return None
+        if certificate == self.first_certificate:
+            self._add_automorphism(self.first_order, order)
+            return self.first_path
+        if certificate == self.best_certificate:
+            self._add_automorphism(self.best_order, order)
+            return self.best_path
+        if certificate < self.best_certificate:
+            self.best_path = path
+            self.best_order = order
+            self.best_certificate = certificate
+        return None
+
+    def _add_automorphism(self, order1, order2):
+        automorphism = list(range(len(order1)))
+        for i, j in zip(order1, order2):
+            automorphism[i] = j
+        self.generators.append(automorphism)
+
+    def _in_explored_orbit(self, search_node, node):
+        """
+        Checks whether a node is in the same orbit as a node that has been tried at the search node,
+        under the group generated by the automorphisms found so far that fix the path of the search node.
+        """
+        if search_node.number_of_generators != len(self.generators):
+            search_node.number_of_generators = len(self.generators)
+            search_node.orbits = _orbits(
+                len(self.colours),
+                [
+                    automorphism
+                    for automorphism in self.generators
+                    if all(automorphism[i] == i for i in search_node.path)
+                ],
+            )
+        orbits = search_node.orbits
+        return any(orbits[node] == orbits[tried] for tried in search_node.tried)
+
+
+def _orbits(number_of_nodes, generators):
+    """
+    Computes the orbits of the group generated by the given permutations.
+
+    :return: a list with a representative of the orbit of each node.
+    """
+    representative = list(range(number_of_nodes))
+
+    def find(i):
+        while representative[i] != i:
+            representative[i] = representative[representative[i]]
+            i = representative[i]
+        return i
+
+    for automorphism in generators:
+        for i, j in enumerate(automorphism):
+            if i != j:
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    representative[max(ri, rj)] = min(ri, rj)
+    return [find(i) for i in range(number_of_nodes)]
@@ -104,10 +104,16 @@ def level(network):
     ... )
     >>> level(network)
     2
+
+    >>> network = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3)],
+    ... )
+    >>> level(network)
+    0
     """
 
     blobs = blob_properties(network)
-    return max([blob[1] for blob in blobs])
+    return max([blob[1] for blob in blobs], default=0)
 
 
 def b2_balance(network, connect_roots=False):
@@ -135,7 +141,7 @@ def b2_balance(network, connect_roots=False):
     if len(roots) > 1:
         if connect_roots:
             new_root = network.find_unused_node()
-            for root in roots:
+            for root in list(roots):
                 network.add_edge(new_root, root)
         else:
             raise ValueError("Network has more than one root")
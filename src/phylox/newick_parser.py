@@ -6,11 +6,10 @@ If there is just one, it will be read as a branch length.
 If there are three, then the first is the branch length, the second is the bootstrap value, and the third is the inheritance probability along that edge (useful for incoming edges of reticulation nodes).
 """
 
-import json
+import io
 import re
-from copy import deepcopy
 
-from phylox import DiNetwork
+from phylox import CompactNetwork, DiNetwork
 from phylox.constants import LABEL_ATTR, LENGTH_ATTR, PROBABILITY_ATTR, RETIC_PREFIX
 
 
@@ -45,89 +44,138 @@ def dinetwork_to_extended_newick(network, simple=False):
     True
     """
 
-    cut_network = deepcopy(network)
+    output = io.StringIO()
+    write_extended_newick(network, output, simple=simple)
+    return output.getvalue()
 
-    roots = cut_network.roots
-    if len(roots) > 1:
-        raise ValueError("Network has more than one root.")
-    root = roots.pop()
-
-    for retic_id, node in enumerate(
-        [node for node in cut_network.nodes if cut_network.is_reticulation(node)]
-    ):
-        _split_reticulation_node(cut_network, node, retic_id=retic_id)
 
-    has_lengths = any(
-        LENGTH_ATTR in cut_network[parent][child] for parent, child in cut_network.edges
-    )
-    has_bootstraps = any(
-        "bootstrap" in cut_network[parent][child] for parent, child in cut_network.edges
-    )
-    has_probabilities = any(
-        PROBABILITY_ATTR in cut_network[parent][child]
-        for parent, child in cut_network.edges
-    )
+def write_extended_newick(network, handle, simple=False):
+    """
+    Writes a phylogenetic network as an extended Newick string to a file handle,
+    see `dinetwork_to_extended_newick` for the format.
 
-    def node_to_newick(node):
-        node_label = cut_network.nodes[node].get(LABEL_ATTR, "")
+    The network is not copied or modified: each reticulation is written once with its
+    subnetwork (as label#Ri) below the incoming edge with the highest inheritance probability,
+    and as a leaf labelled label#Hi below its other parents.
+    The nodes are visited with an explicit stack, so there is no recursion limit,
+    and the string is written to the handle in chunks.
 
-        if cut_network.is_leaf(node):
-            return node_label
+    :param network: a phylogenetic network, i.e., a phylox DiNetwork.
+    :param handle: a writable text file handle, e.g., an opened file or an io.StringIO.
+    :param simple: Boolean, indicating whether to create a simple newick string without parameters
+    :return: None
 
-        children_strings = []
-        for child in cut_network.successors(node):
-            child_str = str(node_to_newick(child))
-            if (has_bootstraps or has_probabilities) and not simple:
-                length = cut_network[node][child].get(LENGTH_ATTR, "")
-                bootstrap = cut_network[node][child].get("bootstrap", "")
-                probability = cut_network[node][child].get(PROBABILITY_ATTR, "")
-                child_str += f":{length}:{bootstrap}:{probability}"
-            elif has_lengths and not simple:
-                child_str += f":{cut_network[node][child].get(LENGTH_ATTR, '')}"
-            children_strings.append(child_str)
+    :example:
+    >>> import io
+    >>> from phylox import DiNetwork
+    >>> from phylox.newick_parser import write_extended_newick
+    >>> network = DiNetwork(
+    ...     edges=[(0, 1), (0, 2), (1, 3), (2, 3), (1, 4), (2, 5), (3, 6)],
+    ...     labels=((4, "a"), (5, "b"), (6, "c")),
+    ... )
+    >>> output = io.StringIO()
+    >>> write_extended_newick(network, output)
+    >>> output.getvalue()
+    '(((c)#R0,a),(b,#H0));'
+    """
 
-        return "(" + ",".join(children_strings) + ")" + node_label
+    roots = network.roots
+    if len(roots) > 1:
+        raise ValueError("Network has more than one root.")
+    if not roots:
+        raise ValueError("Network has no root.")
+    root = next(iter(roots))
+
+    # side table with the id of each reticulation and the parent below which its subnetwork is written
+    retic_ids = {}
+    tree_parents = {}
+    for node in network.nodes:
+        if network.is_reticulation(node):
+            retic_ids[node] = len(retic_ids)
+            tree_parents[node] = max(
+                network.predecessors(node),
+                key=lambda parent: network[parent][node].get(PROBABILITY_ATTR, 0),
+            )
+
+    edge_format = None
+    if not simple:
+        has_lengths = has_bootstraps_or_probabilities = False
+        for _, _, data in network.edges(data=True):
+            if "bootstrap" in data or PROBABILITY_ATTR in data:
+                has_bootstraps_or_probabilities = True
+                break
+            has_lengths = has_lengths or LENGTH_ATTR in data
+        if has_bootstraps_or_probabilities:
+            edge_format = _edge_attributes_full
+        elif has_lengths:
+            edge_format = _edge_attribute_length
+
+    def node_label(node):
+        label = network.nodes[node].get(LABEL_ATTR)
+        return "" if label is None else _quote_label(str(label))
+
+    parts = []
+    # the stack contains strings, which are written as they are, and tuples (node, hybrid_leaf),
+    # for which the subnetwork rooted at node is written (or only the label#Hi if hybrid_leaf)
+    stack = [";", (root, False)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            if len(parts) >= _WRITE_CHUNK_SIZE:
+                handle.write("".join(parts))
+                parts.clear()
+            continue
+        node, hybrid_leaf = item
+        label = node_label(node)
+        if node in retic_ids:
+            label += ("#H" if hybrid_leaf else "#R") + str(retic_ids[node])
+        if hybrid_leaf or network.out_degree(node) == 0:
+            parts.append(label)
+            continue
+
+        children = []
+        hybrid_children = []
+        for child in network.successors(node):
+            if child in retic_ids and tree_parents[child] != node:
+                hybrid_children.append(child)
+            else:
+                children.append((child, False))
+        # the hybrid leaves are written after the other children, ordered by reticulation id
+        hybrid_children.sort(key=retic_ids.__getitem__)
+        children += [(child, True) for child in hybrid_children]
+
+        parts.append("(")
+        stack.append(")" + label)
+        for i in range(len(children) - 1, -1, -1):
+            if edge_format is not None:
+                stack.append(edge_format(network[node][children[i][0]]))
+            stack.append(children[i])
+            if i > 0:
+                stack.append(",")
+    handle.write("".join(parts))
+
+
+_WRITE_CHUNK_SIZE = 4096
+# characters that cannot be part of an unquoted label
+_QUOTE_PATTERN = re.compile(r"[\s(),:;#\[\]']")
+
+
+def _quote_label(label):
+    """
+    Quotes a label if it contains characters with a special meaning in the Newick format.
+    """
+    if _QUOTE_PATTERN.search(label):
+        return "'" + label.replace("'", "''") + "'"
+    return label
 
-    newick = node_to_newick(root)
-    return newick + ";"
 
+def _edge_attribute_length(data):
+    return f":{data.get(LENGTH_ATTR, '')}"
 
-def _split_reticulation_node(network, node, retic_id):
-    """
-    Splits a reticulation node into multiple nodes.
 
-    :param network: a phylogenetic network, i.e., a phylox DiNetwork.
-    :param node: a node of network, indicating the reticulation node to be split.
-    :return: a phylogenetic network, i.e., a phylox DiNetwork.
-
-    :note: This function is used by dinetwork_to_extended_newick. It modifies the network in place.
-    """
-
-    parents = [
-        (parent, network[parent][node].get(PROBABILITY_ATTR, 0))
-        for parent in network.predecessors(node)
-    ]
-    parents.sort(key=lambda x: -x[1])
-    keep_parent, keep_probability = parents[0]
-    node_label = network.nodes[node].get(LABEL_ATTR, "")
-    network.nodes[node][LABEL_ATTR] = node_label + "#R" + str(retic_id)
-    new_node_label = node_label + "#H" + str(retic_id)
-    for parent, probability in parents[1:]:
-        new_node = network.find_unused_node()
-        network.add_edge(parent, new_node)
-        network.nodes[new_node][LABEL_ATTR] = new_node_label
-
-        length = network[parent][node].get(LENGTH_ATTR)
-        if length is not None:
-            network[parent][new_node][LENGTH_ATTR] = length
-        bootstrap = network[parent][node].get("bootstrap")
-        if bootstrap is not None:
-            network[parent][new_node]["bootstrap"] = bootstrap
-        probability = network[parent][node].get(PROBABILITY_ATTR)
-        if probability is not None:
-            network[parent][new_node][PROBABILITY_ATTR] = probability
-        network.remove_edge(parent, node)
-    return network
+def _edge_attributes_full(data):
+    return f":{data.get(LENGTH_ATTR, '')}:{data.get('bootstrap', '')}:{data.get(PROBABILITY_ATTR, '')}"
 
 
 def extended_newick_to_dinetwork(newick, internal_labels=False):
@@ -136,6 +184,9 @@ def extended_newick_to_dinetwork(newick, internal_labels=False):
     The newick string may or may not have length:bootstrap:probability annotations.
     The newick string may or may not have internal node labels.
     The newick string may or may not have hybrid nodes.
+    Labels may be quoted (e.g., 'label with spaces'), and comments (e.g., [&&NHX:S=human]) are ignored.
+
+    The string is read in a single pass without recursion, so deeply nested networks can be parsed as well.
 
     :param newick: a string in extended Newick format for phylogenetic networks.
     :param internal_labels: a boolean, indicating whether the internal nodes of the network are labeled.
@@ -152,100 +203,201 @@ def extended_newick_to_dinetwork(newick, internal_labels=False):
     1.1
     """
 
+    nodes, edges, labels = _parse_extended_newick(newick)
     network = DiNetwork()
-    network_json = _newick_to_json(newick)[0]
-    network = _json_to_dinetwork(network_json, network=network)
+    node_labels = dict(labels)
+    network.add_nodes_from(
+        (node, {LABEL_ATTR: node_labels[node]}) if node in node_labels else node
+        for node in nodes
+    )
+    network.add_edges_from(edges)
     return network
 
 
-def _newick_to_json(newick):
+def extended_newick_to_compactnetwork(newick, internal_labels=False):
     """
-    Converts a newick string to a json representing the nodes in a nested manner.
+    Converts a Newick string to a phylox CompactNetwork.
+    The string is parsed in the same way as in `extended_newick_to_dinetwork`,
+    but the edges are stored directly in the arrays of a compact network.
 
-    :param newick: a string in newick format for phylogenetic networks.
-    :return: a json representing the nodes in a nested manner.
+    :param newick: a string in extended Newick format for phylogenetic networks.
+    :param internal_labels: a boolean, indicating whether the internal nodes of the network are labeled.
+    :return: a phylogenetic network, i.e., a phylox CompactNetwork.
 
-    :note: This function is used by extended_newick_to_dinetwork. It modifies the network in place.
+    :example:
+    >>> network = extended_newick_to_compactnetwork("((A:1.0,B:2.0)#H1:0.5,(#H1:0.5,C));")
+    >>> network.reticulation_number
+    1
+    >>> sorted(network.labels)
+    ['A', 'B', 'C']
     """
 
-    nested_list = [{"children": [], "label_and_attr": ""}]
-    while newick:
-        character = newick[0]
-        newick = newick[1:]
-        if character == "(":
-            newick, child = _newick_to_json(newick)
-            nested_list[-1]["children"] += child
-        elif character == ")":
-            return newick, nested_list
-        elif character == ",":
-            nested_list += [{"children": [], "label_and_attr": ""}]
-        elif character == ";":
-            pass
+    nodes, edges, labels = _parse_extended_newick(newick)
+    return CompactNetwork.from_edges(edges, nodes=nodes, labels=labels)
+
+
+# runs of characters that can occur in an unquoted label or in an edge attribute
+_LABEL_PATTERN = re.compile(r"[^(),:;#\[]*")
+_VALUE_PATTERN = re.compile(r"[^(),:;\[]*")
+_EDGE_ATTRS = (LENGTH_ATTR, "bootstrap", PROBABILITY_ATTR)
+# a complete token without quotes or comments, e.g., "A#H1:1.1:0.9:0.8"
+_SIMPLE_TOKEN_PATTERN = re.compile(r"([^(),:;#\['\]]*)(?:#([^(),:;\['\]]*))?((?::[^(),:;\['\]]*)*)")
+
+
+def _skip_whitespace_and_comments(newick, i):
+    """
+    Returns the first position from i that is not whitespace or inside a [...] comment.
+    """
+    length = len(newick)
+    while i < length:
+        character = newick[i]
+        if character == "[":
+            end = newick.find("]", i)
+            if end == -1:
+                raise ValueError(f"Unterminated comment at position {i}.")
+            i = end + 1
+        elif character.isspace():
+            i += 1
         else:
-            nested_list[-1]["label_and_attr"] += character
-    return nested_list
+            break
+    return i
 
 
-def _json_to_dinetwork(json, network=None, root_node=None):
+def _read_node_token(newick, i):
     """
-    Converts a json string to a phylox DiNetwork
+    Reads the label, hybrid part and edge attributes of one node, starting at position i.
+    For example, the token "A#H1:1.1:0.9:0.8" is read as
+    ("A", "H1", {"length": 1.1, "bootstrap": 0.9, "probability": 0.8}).
 
-    :param newick_json: a string in json format for phylogenetic networks.
-    :param network: a phylogenetic network, i.e., a phylox DiNetwork.
-    :param root_node: a node of network, indicating the root of the network.
-    :return: a phylogenetic network, i.e., a phylox DiNetwork.
-
-    :note: This function is used by extended_newick_to_dinetwork. It modifies the network in place.
-    """
-    network = network or DiNetwork()
-
-    node_attrs = _label_and_attrs_to_dict(json["label_and_attr"])
-    node = json.get("retic_id") or root_node or network.find_unused_node()
-    network.add_node(node)
-    if LABEL_ATTR in node_attrs:
-        network.nodes[node][LABEL_ATTR] = node_attrs[LABEL_ATTR]
-    for child_dict in json.get("children", []):
-        child_attrs = _label_and_attrs_to_dict(child_dict["label_and_attr"])
-        child_attrs_without_label_and_children = {
-            k: v
-            for k, v in child_attrs.items()
-            if k not in (LABEL_ATTR, "children", "retic_id")
+    :param newick: a string in extended Newick format.
+    :param i: the position in the string where the token starts.
+    :return: a tuple (position after the token, label, hybrid part or None, dictionary of edge attributes).
+    """
+    length = len(newick)
+    match = _SIMPLE_TOKEN_PATTERN.match(newick, i)
+    end = match.end()
+    if end == length or newick[end] in "(),;":
+        label, hybrid, values = match.groups()
+        values = values.split(":")[1:]
+        if len(values) > len(_EDGE_ATTRS):
+            raise ValueError(f"Too many edge attributes before position {end}.")
+        attrs = {
+            attr: float(value) for attr, value in zip(_EDGE_ATTRS, values) if value.strip()
         }
-        child = child_attrs.get("retic_id", network.find_unused_node())
-        network.add_edge(node, child, **child_attrs_without_label_and_children)
-        _json_to_dinetwork(child_dict, network, root_node=child)
-    return network
+        return end, label.strip(), None if hybrid is None else hybrid.strip(), attrs
+
+    i = _skip_whitespace_and_comments(newick, i)
+    if i < length and newick[i] == "'":
+        parts = []
+        i += 1
+        while True:
+            end = newick.find("'", i)
+            if end == -1:
+                raise ValueError(f"Unterminated quoted label at position {i - 1}.")
+            parts.append(newick[i:end])
+            if newick.startswith("''", end):
+                parts.append("'")
+                i = end + 2
+            else:
+                i = end + 1
+                break
+        label = "".join(parts)
+    else:
+        match = _LABEL_PATTERN.match(newick, i)
+        label = match.group().strip()
+        i = match.end()
+    i = _skip_whitespace_and_comments(newick, i)
+
+    hybrid = None
+    if i < length and newick[i] == "#":
+        match = _VALUE_PATTERN.match(newick, i + 1)
+        hybrid = match.group().strip()
+        i = _skip_whitespace_and_comments(newick, match.end())
+
+    values = []
+    while i < length and newick[i] == ":":
+        match = _VALUE_PATTERN.match(newick, i + 1)
+        values.append(match.group().strip())
+        i = _skip_whitespace_and_comments(newick, match.end())
+    if len(values) > len(_EDGE_ATTRS):
+        raise ValueError(f"Too many edge attributes before position {i}.")
+    attrs = {attr: float(value) for attr, value in zip(_EDGE_ATTRS, values) if value}
+    return i, label, hybrid, attrs
+
+
+def _parse_extended_newick(newick):
+    """
+    Parses an extended Newick string in a single pass over the string.
+
+    Each node gets a temporary index the moment it is opened, so that the nodes are numbered in pre-order.
+    The edge to the parent of a node is emitted as soon as its label and attributes have been read.
+    Reticulation nodes are named by their hybrid id (with prefix RETIC_PREFIX), all other nodes
+    are numbered -1, -2, ... in pre-order, like the nodes returned by `DiNetwork.find_unused_node`.
 
+    :param newick: a string in extended Newick format for phylogenetic networks.
+    :return: a tuple (nodes, edges, labels) with a list of nodes, a list of edges (u, v, attrs) and a list of tuples (node, label).
 
-def _label_and_attrs_to_dict(label_and_attrs):
-    """
-    converts the label and attr part of an extended newick string
-    for one node to a dictionary.
-    For example, the string "A:1.1:0.9:0.8" is converted to
-    {"label": "A", "length": 1.1, "bootstrap": 0.9, "probability": 0.8}
-    """
-    attrs_dict = {LABEL_ATTR: label_and_attrs}
-    if ":" in label_and_attrs:
-        label = label_and_attrs.split(":")[0]
-        attrs = label_and_attrs.split(":")[1:]
-        if len(attrs) == 1:
-            attrs_dict = {
-                LABEL_ATTR: label,
-                LENGTH_ATTR: float(attrs[0]),
-            }
-        elif len(attrs) == 3:
-            attrs_dict = {LABEL_ATTR: label}
-            if attrs[0]:
-                attrs_dict[LENGTH_ATTR] = float(attrs[0])
-            if attrs[1]:
-                attrs_dict["bootstrap"] = float(attrs[1])
-            if attrs[2]:
-                attrs_dict[PROBABILITY_ATTR] = float(attrs[2])
-
-    if "#" in attrs_dict[LABEL_ATTR]:
-        label, retic_id = attrs_dict[LABEL_ATTR].split("#")
-        attrs_dict[LABEL_ATTR] = label
-        attrs_dict["retic_id"] = RETIC_PREFIX + retic_id[1:]
-    if LABEL_ATTR in attrs_dict and attrs_dict[LABEL_ATTR] == "":
-        attrs_dict.pop(LABEL_ATTR)
-    return attrs_dict
+    :note: This function is used by extended_newick_to_dinetwork and extended_newick_to_compactnetwork.
+    """
+
+    names = []  # the name of a reticulation node for each temporary index, or None
+    edges = []  # (parent index, child index, attrs)
+    labels = []  # (index, label)
+    stack = []  # indices of the internal nodes whose children are being read
+    expect_node = True  # whether the next token (if any) starts a new node
+
+    length = len(newick)
+    i = _skip_whitespace_and_comments(newick, 0)
+    while i < length:
+        character = newick[i]
+        if character == ";":
+            break
+        if character == "(":
+            if not expect_node:
+                raise ValueError(f"Unexpected '(' at position {i}.")
+            stack.append(len(names))
+            names.append(None)
+            i = _skip_whitespace_and_comments(newick, i + 1)
+            continue
+        if character == "," or character == ")":
+            if not stack:
+                raise ValueError(f"Unexpected '{character}' at position {i}.")
+            if expect_node:
+                # a leaf without label or attributes, e.g., in "(,A)"
+                edges.append((stack[-1], len(names), {}))
+                names.append(None)
+            if character == ",":
+                expect_node = True
+                i = _skip_whitespace_and_comments(newick, i + 1)
+                continue
+            node = stack.pop()
+            i += 1
+        else:
+            if not expect_node:
+                raise ValueError(f"Unexpected character '{character}' at position {i}.")
+            node = len(names)
+            names.append(None)
+        expect_node = False
+        i, label, hybrid, attrs = _read_node_token(newick, i)
+        if hybrid is not None:
+            names[node] = RETIC_PREFIX + hybrid[1:]
+        if label:
+            labels.append((node, label))
+        if stack:
+            edges.append((stack[-1], node, attrs))
+        i = _skip_whitespace_and_comments(newick, i)
+    if stack:
+        raise ValueError("Unbalanced parentheses in Newick string.")
+
+    node_ids = []
+    next_id = -1
+    for name in names:
+        if name is None:
+            node_ids.append(next_id)
+            next_id -= 1
+        else:
+            node_ids.append(name)
+    nodes = list(dict.fromkeys(node_ids))
+    edges = [(node_ids[u], node_ids[v], attrs) for u, v, attrs in edges]
+    labels = [(node_ids[node], label) for node, label in labels]
+    return nodes, edges, labels
@@ -1,9 +1,11 @@
 """
 Exact distance algorithms for rearrangement distances.
 
-This module contains the exact distance algorithms for rearrangement distances.
+This module contains the exact distance algorithms for rearrangement distances,
+and lower bounds for these distances.
 The algorithms are based on the PhD thesis of R. Janssen, 
 "Rearranging Phylogenetic Networks", 2021.
 """
 
 from phylox.rearrangement.exact_distance.base import *
+from phylox.rearrangement.exact_distance.lower_bounds import *
@@ -1,36 +1,88 @@
+import math
+import multiprocessing
+import random
 import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
 
-from phylox.exceptions import NoSolutionException, TimeoutException
-from phylox.isomorphism import is_isomorphic
+from networkx.algorithms.isomorphism import DiGraphMatcher
+
+from phylox.constants import LABEL_ATTR
+from phylox.exceptions import (
+    InvalidMoveException,
+    NoSolutionException,
+    TimeoutException,
+)
+from phylox.isomorphism import is_isomorphic, network_hash
 from phylox.rearrangement.move import (
     Move,
     MoveType,
     all_valid_moves,
-    apply_move_sequence,
+    apply_move,
+    apply_move_inplace,
+    undo_move,
 )
+from phylox.rearrangement.exact_distance.lower_bounds import _TargetLowerBound
+from phylox.rearrangement.reachability import ReachabilityIndex
 
 
 class ExactMethodsMixin(object):
-    def solve_depth_first(self, max_time=False, show_bounds=True):
+    def solve_depth_first(self, max_time=False, show_bounds=True, workers=None, seed=None):
         """
         An implementation of Algorithm 1 from R. Janssen's PhD thesis.
         Uses an iterated Depth First Search to simulate a Breath First Search.
+        A transposition table, keyed by the hash of the canonical form of the networks,
+        is shared between the iterations, so that each network is only expanded again if it
+        is reached with more remaining moves than before.
+        Statistics of the search are stored in `self.search_statistics`.
+
+        With more than one worker, the networks reached with the first one or two moves are the roots of independent subtrees,
+        which are searched by solve_depth_first_bounded in a pool of processes, one depth at a time.
+        When a subtree contains a sequence, the searches of the subtrees after it are stopped,
+        and the sequence of the first subtree that contains one is returned,
+        so the result does not depend on the order in which the workers finish.
 
         :param max_time: a float, a time limit for the function in seconds. If False, no time limit is used, and the function continues until it finds a sequence.
         :param show_bounds: a boolean parameter, if True the current lower bounds are printed to the terminal, used for debugging.
+        :param workers: the number of worker processes. If None or 1, the search runs in the current process.
+        :param seed: a seed for the order in which the subtrees are searched by the workers.
+            If None, the subtrees are searched in the order of all_valid_moves.
+            The length of the returned sequence does not depend on the seed, but the sequence itself may.
         :return: a shortest sequence of moves between the networks if it is found within the time limit, otherwise it returns an integer: a lower bound for the length of the shortest sequence between the networks.
 
         :example:
+        >>> from phylox import DiNetwork
+        >>> from phylox.rearrangement.movetype import MoveType
         >>> from phylox.rearrangement.rearrangementproblem import RearrangementProblem
-
+        >>> network1 = DiNetwork(
+        ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+        ...     labels=[(4, "A"), (5, "B"), (6, "C"), (7, "D")],
+        ... )
+        >>> network2 = DiNetwork(
+        ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+        ...     labels=[(4, "A"), (5, "C"), (6, "B"), (7, "D")],
+        ... )
+        >>> problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        >>> len(problem.solve_depth_first(show_bounds=False))
+        2
+        >>> problem.search_statistics["depth"]
+        2
         """
-        lower_bound = 0
         stop_time = False
         if max_time:
             stop_time = time.time() + max_time
+        if workers is not None and workers > 1:
+            return self._solve_depth_first_parallel(stop_time, show_bounds, workers, seed)
+        lower_bound = 0
+        transposition_table = {}
+        statistics = self._new_search_statistics()
         while True:
             output = self.solve_depth_first_bounded(
-                max_depth=lower_bound, stop_time=stop_time
+                max_depth=lower_bound,
+                stop_time=stop_time,
+                transposition_table=transposition_table,
+                statistics=statistics,
             )
             if type(output) == list:
                 break
@@ -40,37 +92,548 @@ class ExactMethodsMixin(object):
         return output
 
     # Finds a shortest sequence between network1 and network2 using DFS with bounded depth
-    def solve_depth_first_bounded(self, max_depth=0, stop_time=False):
+    def solve_depth_first_bounded(
+        self,
+        max_depth=0,
+        stop_time=False,
+        transposition_table=None,
+        statistics=None,
+        should_stop=None,
+        lower_bound=None,
+        lower_bound_table=None,
+    ):
         """
         A subroutine of Algorithm 1 of R. Janssen's PhD thesis.
         A depth-bounded Depth First Search used to simulate
         a Breath First Search.
 
+        The search applies and undoes the moves on a single copy of network1.
+        A network is not expanded if it is already on the current search path,
+        or if the transposition table shows that it has been expanded before with at least as many remaining moves
+        (which also removes moves that result in isomorphic networks).
+
         :param max_depth: a integer, the maximum depth for the search tree.
         :param stop_time: a float, a time limit for the function in clock time.
             If False, no time limit is used, and the function continues until
             it finds a sequence.
-        :return: a shortest sequence of at most max_depth moves between the
+        :param transposition_table: a dictionary mapping network hashes to the largest number of remaining moves
+            with which the network has been expanded without finding network2.
+            It is updated by the search, and can be reused for a search with a larger max_depth.
+        :param statistics: a dictionary with search statistics to add to,
+            by default a new one is stored in self.search_statistics.
+            The statistics are the depth of the search, the number of networks visited,
+            the number of networks expanded (i.e., whose neighbours were generated),
+            the number of networks not expanded because of the transposition table,
+            the elapsed time in seconds, and the number of networks expanded per second.
+        :param should_stop: a function without arguments that is called after each move.
+            If it returns True, the search is stopped with a TimeoutException.
+        :param lower_bound: a function that takes a network and a keyword argument max_bound,
+            and returns a lower bound for the distance from the network to network2 (which may be capped at max_bound),
+            see `phylox.rearrangement.exact_distance.lower_bounds`.
+            If given, networks whose lower bound is larger than the number of remaining moves are not expanded.
+        :param lower_bound_table: a dictionary mapping network hashes to a tuple (bound, exact)
+            of the computed lower bounds, where exact is False if the bound was capped.
+            It is updated by the search, and can be reused for a search with a larger max_depth.
+        :return: a sequence of at most max_depth moves between the
             networks if it is found before the stop_time, otherwise it returns an False.
+            The sequence is a shortest one if there is no sequence of fewer than max_depth moves.
+        """
+        if transposition_table is None:
+            transposition_table = {}
+        if statistics is None:
+            statistics = self._new_search_statistics()
+        if lower_bound_table is None:
+            lower_bound_table = {}
+        statistics["depth"] = max_depth
+        start_time = time.time()
+
+        network = deepcopy(self.network1)
+        ReachabilityIndex.attach(network)
+        target_hash = network_hash(self.network2)
+        # the frames of the search path: [hash, remaining moves, moves, index of the next move]
+        frames = []
+        on_path = set()
+        tokens = []
+        moves = []
+
+        def enter(remaining):
+            """
+            Checks whether the current network is network2, and otherwise pushes a frame to expand it (if needed).
+            """
+            statistics["nodes_visited"] += 1
+            current_hash = network_hash(network)
+            if current_hash == target_hash and is_isomorphic(network, self.network2):
+                return True
+            if remaining == 0 or current_hash in on_path:
+                return False
+            if transposition_table.get(current_hash, -1) >= remaining:
+                statistics["transposition_hits"] += 1
+                return False
+            if lower_bound is not None:
+                bound, exact = lower_bound_table.get(current_hash, (0, False))
+                if bound <= remaining and not exact:
+                    bound = lower_bound(network, max_bound=remaining + 1)
+                    exact = bound < remaining + 1
+                    lower_bound_table[current_hash] = (bound, exact)
+                if bound > remaining:
+                    statistics["lower_bound_prunes"] += 1
+                    return False
+            statistics["nodes_expanded"] += 1
+            on_path.add(current_hash)
+            frames.append(
+                [
+                    current_hash,
+                    remaining,
+                    list(all_valid_moves(network, self.move_type, as_tuples=True)),
+                    0,
+                ]
+            )
+            return False
+
+        try:
+            if enter(max_depth):
+                return []
+            while frames:
+                frame = frames[-1]
+                current_hash, remaining, children, index = frame
+                if index == len(children):
+                    frames.pop()
+                    on_path.discard(current_hash)
+                    transposition_table[current_hash] = remaining
+                    if tokens:
+                        undo_move(network, tokens.pop())
+                        moves.pop()
+                    continue
+                frame[3] = index + 1
+                move = Move.from_tuple(children[index])
+                tokens.append(apply_move_inplace(network, move))
+                moves.append(move)
+                if enter(remaining - 1):
+                    return list(moves)
+                if frames[-1] is frame:
+                    # the new network is not expanded
+                    undo_move(network, tokens.pop())
+                    moves.pop()
+                if (stop_time and time.time() > stop_time) or (
+                    should_stop is not None and should_stop()
+                ):
+                    raise TimeoutException
+            return False
+        finally:
+            statistics["elapsed_time"] += time.time() - start_time
+            if statistics["elapsed_time"] > 0:
+                statistics["nodes_per_second"] = (
+                    statistics["nodes_expanded"] / statistics["elapsed_time"]
+                )
+            self.search_statistics = statistics
+
+    def solve_ida_star(self, max_time=False, show_bounds=True, lower_bound=None):
+        """
+        Finds a shortest sequence of moves between the networks with IDA*:
+        an iterated depth first search like solve_depth_first, that starts at a lower bound for the distance
+        instead of at 0, and that does not expand networks whose lower bound is larger than the number of remaining moves.
+        The lower bounds of the networks are stored by their hash and reused between the iterations.
+        Statistics of the search, including the current lower bound, are stored in `self.search_statistics`.
+
+        :param max_time: a float, a time limit for the function in seconds. If False, no time limit is used, and the function continues until it finds a sequence.
+        :param show_bounds: a boolean parameter, if True the current lower bounds are printed to the terminal.
+        :param lower_bound: a function that takes a network and a keyword argument max_bound,
+            and returns a lower bound for the distance from the network to network2.
+            By default, `phylox.rearrangement.exact_distance.lower_bounds.lower_bound` is used.
+        :return: a shortest sequence of moves between the networks.
+        :exception: TimeoutException if no sequence is found within the time limit.
+        :exception: NoSolutionException if the lower bound shows that there is no sequence.
+
+        :example:
+        >>> from phylox import DiNetwork
+        >>> from phylox.rearrangement.movetype import MoveType
+        >>> from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+        >>> network1 = DiNetwork(
+        ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+        ...     labels=[(4, "A"), (5, "B"), (6, "C"), (7, "D")],
+        ... )
+        >>> network2 = DiNetwork(
+        ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+        ...     labels=[(4, "A"), (5, "C"), (6, "B"), (7, "D")],
+        ... )
+        >>> problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        >>> len(problem.solve_ida_star(show_bounds=False))
+        2
+        >>> problem.search_statistics["lower_bound"]
+        2
+        """
+        if lower_bound is None:
+            lower_bound = _TargetLowerBound(self.network2, self.move_type)
+        stop_time = False
+        if max_time:
+            stop_time = time.time() + max_time
+        transposition_table = {}
+        lower_bound_table = {}
+        statistics = self._new_search_statistics()
+        depth = lower_bound(self.network1)
+        if depth == math.inf:
+            raise NoSolutionException(
+                "the networks cannot be transformed into each other."
+            )
+        statistics["lower_bound"] = depth
+        if show_bounds:
+            print(depth)
+        while True:
+            output = self.solve_depth_first_bounded(
+                max_depth=depth,
+                stop_time=stop_time,
+                transposition_table=transposition_table,
+                statistics=statistics,
+                lower_bound=lower_bound,
+                lower_bound_table=lower_bound_table,
+            )
+            if type(output) == list:
+                return output
+            depth += 1
+            statistics["lower_bound"] = depth
+            if show_bounds:
+                print(depth)
+
+    def _solve_depth_first_parallel(self, stop_time, show_bounds, workers, seed):
+        """
+        The parallel version of solve_depth_first,
+        in which the subtrees of the first levels of the search are searched by a pool of processes.
+        """
+        statistics = self._new_search_statistics()
+        statistics["subtrees"] = 0
+        self.search_statistics = statistics
+        start_time = time.time()
+        try:
+            subtrees, solution = self._depth_first_subtrees(workers, show_bounds, statistics)
+            if solution is not None:
+                return solution
+            if seed is not None:
+                random.Random(seed).shuffle(subtrees)
+            statistics["subtrees"] = len(subtrees)
+            if not subtrees:
+                raise NoSolutionException(
+                    "the networks cannot be transformed into each other."
+                )
+            split_depth = len(subtrees[0])
+            first_stopped = multiprocessing.Value("q", len(subtrees))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_depth_first_worker,
+                initargs=(self, first_stopped),
+            ) as executor:
+                futures = []
+                try:
+                    depth = split_depth
+                    while True:
+                        depth += 1
+                        statistics["depth"] = depth
+                        first_stopped.value = len(subtrees)
+                        futures = [
+                            executor.submit(
+                                _solve_depth_first_subtree,
+                                index,
+                                prefix,
+                                depth - split_depth,
+                                stop_time,
+                            )
+                            for index, prefix in enumerate(subtrees)
+                        ]
+                        # the sequence of the first subtree that contains one is returned
+                        for prefix, future in zip(subtrees, futures):
+                            status, moves, subtree_statistics = future.result()
+                            for key in [
+                                "nodes_visited",
+                                "nodes_expanded",
+                                "transposition_hits",
+                            ]:
+                                statistics[key] += subtree_statistics[key]
+                            if status == "timeout":
+                                raise TimeoutException
+                            if status == "found":
+                                return [Move.from_tuple(move) for move in prefix] + moves
+                        if show_bounds:
+                            print(depth + 1)
+                finally:
+                    with first_stopped.get_lock():
+                        first_stopped.value = -1
+                    for future in futures:
+                        future.cancel()
+        finally:
+            statistics["elapsed_time"] = time.time() - start_time
+            if statistics["elapsed_time"] > 0:
+                statistics["nodes_per_second"] = (
+                    statistics["nodes_expanded"] / statistics["elapsed_time"]
+                )
+
+    def _depth_first_subtrees(self, workers, show_bounds, statistics):
+        """
+        Returns the roots of the subtrees searched by the workers of solve_depth_first, as sequences of move tuples,
+        or a sequence between the networks if there is one of at most the length of these sequences.
+        The networks reached with one move are used if there are at least 4 per worker,
+        otherwise the networks reached with two moves are used.
+        Networks that are reached earlier (with fewer moves, or with moves earlier in the order) are not used again.
         """
-        # Make a stack and search
-        stack = [[]]
-        while stack:
-            current_moves = stack.pop()
-            current_length = len(current_moves)
-            current_network = apply_move_sequence(self.network1, current_moves)
-            if current_length == max_depth and is_isomorphic(
-                current_network, self.network2
-            ):
-                return current_moves
-            if current_length < max_depth:
-                stack += [
-                    current_moves + [move]
-                    for move in all_valid_moves(current_network, self.move_type)
+        network = deepcopy(self.network1)
+        ReachabilityIndex.attach(network)
+        target_hash = network_hash(self.network2)
+        seen = {network_hash(network)}
+        statistics["nodes_visited"] += 1
+        if network_hash(network) == target_hash and is_isomorphic(network, self.network2):
+            return [], []
+        if show_bounds:
+            print(1)
+        subtrees = [[]]
+        for depth in [1, 2]:
+            if depth == 2 and len(subtrees) >= 4 * workers:
+                break
+            statistics["depth"] = depth
+            new_subtrees = []
+            for prefix in subtrees:
+                tokens = [
+                    apply_move_inplace(network, Move.from_tuple(move)) for move in prefix
                 ]
-            if stop_time and time.time() > stop_time:
-                raise TimeoutException
-        return False
+                statistics["nodes_expanded"] += 1
+                for move in all_valid_moves(network, self.move_type, as_tuples=True):
+                    token = apply_move_inplace(network, Move.from_tuple(move))
+                    statistics["nodes_visited"] += 1
+                    current_hash = network_hash(network)
+                    if current_hash == target_hash and is_isomorphic(
+                        network, self.network2
+                    ):
+                        return [], [Move.from_tuple(m) for m in prefix + [move]]
+                    if current_hash not in seen:
+                        seen.add(current_hash)
+                        new_subtrees.append(prefix + [move])
+                    undo_move(network, token)
+                for token in reversed(tokens):
+                    undo_move(network, token)
+            subtrees = new_subtrees
+            if show_bounds:
+                print(depth + 1)
+        return subtrees, None
+
+    def solve_bidirectional(self, max_time=False, max_states=None):
+        """
+        Finds a shortest sequence of tail, head or rSPR moves between the networks with a bidirectional
+        breadth first search.
+        Two breadth first searches, one from network1 and one from network2, are expanded alternately
+        (the one with the smallest frontier first) until they reach isomorphic networks.
+        Each network is only visited once per search, identified by the hash of its canonical form.
+        The sequence is then the moves from network1 to the meeting point, followed by the inverses of the moves
+        from network2 to the meeting point, renamed to the nodes of the first search with the isomorphism.
+        If the distance is d, this visits roughly the networks within distance d/2 of each of the networks,
+        instead of the networks within distance d of network1.
+        Statistics of the search are stored in `self.search_statistics`.
+
+        :param max_time: a float, a time limit for the function in seconds. If False, no time limit is used.
+        :param max_states: an integer, the maximum number of networks stored by the two searches together.
+            If None, there is no limit.
+        :return: a shortest sequence of moves between the networks.
+        :exception: InvalidMoveException if the move type of the problem is not TAIL, HEAD, or RSPR.
+        :exception: TimeoutException if no sequence is found within the time limit.
+        :exception: NoSolutionException if there is no sequence, or if no sequence is found within the state limit.
+
+        :example:
+        >>> from phylox import DiNetwork
+        >>> from phylox.rearrangement.movetype import MoveType
+        >>> from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+        >>> network1 = DiNetwork(
+        ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+        ...     labels=[(4, "A"), (5, "B"), (6, "C"), (7, "D")],
+        ... )
+        >>> network2 = DiNetwork(
+        ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+        ...     labels=[(4, "A"), (5, "C"), (6, "B"), (7, "D")],
+        ... )
+        >>> problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        >>> solution = problem.solve_bidirectional()
+        >>> len(solution), problem.check_solution(solution)
+        (2, True)
+        """
+        if self.move_type not in [MoveType.TAIL, MoveType.HEAD, MoveType.RSPR]:
+            raise InvalidMoveException(
+                "bidirectional search is only possible with tail, head or rSPR moves."
+            )
+        stop_time = False
+        if max_time:
+            stop_time = time.time() + max_time
+        statistics = self._new_search_statistics()
+        statistics["visited_forward"] = statistics["visited_backward"] = 0
+        self.search_statistics = statistics
+        start_time = time.time()
+
+        # a search is a tuple (visited, frontier, depth),
+        # where visited maps the hash of each visited network to (hash of its parent, move tuple),
+        # and the frontier is a list of (hash, network) of the deepest visited networks.
+        searches = []
+        for network in [self.network1, self.network2]:
+            start_hash = network_hash(network)
+            searches.append(({start_hash: (None, None)}, [(start_hash, network)], 0))
+        if searches[0][1][0][0] == searches[1][1][0][0] and is_isomorphic(
+            self.network1, self.network2
+        ):
+            return []
+        if (
+            len(self.network1) != len(self.network2)
+            or self.network1.number_of_edges() != self.network2.number_of_edges()
+            or Counter(label for _, label in self.network1.nodes(data=LABEL_ATTR))
+            != Counter(label for _, label in self.network2.nodes(data=LABEL_ATTR))
+        ):
+            raise NoSolutionException(
+                "horizontal moves do not change the numbers of nodes and edges, or the labels."
+            )
+
+        try:
+            while True:
+                side = 0 if len(searches[0][1]) <= len(searches[1][1]) else 1
+                visited, frontier, depth = searches[side]
+                other_visited = searches[1 - side][0]
+                if not frontier:
+                    raise NoSolutionException(
+                        "the networks cannot be transformed into each other."
+                    )
+                new_frontier = []
+                meeting = None
+                for current_hash, current_network in frontier:
+                    network = current_network.copy()
+                    ReachabilityIndex.attach(network)
+                    statistics["nodes_expanded"] += 1
+                    for move_tuple in all_valid_moves(
+                        network, self.move_type, as_tuples=True
+                    ):
+                        token = apply_move_inplace(network, Move.from_tuple(move_tuple))
+                        statistics["nodes_visited"] += 1
+                        new_hash = network_hash(network)
+                        if new_hash not in visited:
+                            visited[new_hash] = (current_hash, move_tuple)
+                            new_network = network.copy()
+                            new_frontier.append((new_hash, new_network))
+                            if new_hash in other_visited:
+                                meeting = self._bidirectional_meeting(
+                                    searches, side, new_hash, new_network
+                                )
+                                if meeting is not None:
+                                    return meeting
+                        undo_move(network, token)
+                    if stop_time and time.time() > stop_time:
+                        raise TimeoutException
+                    if max_states and len(visited) + len(other_visited) > max_states:
+                        raise NoSolutionException(
+                            "no sequence found within the state limit, "
+                            f"the distance is at least {searches[0][2] + searches[1][2] + 1}."
+                        )
+                searches[side] = (visited, new_frontier, depth + 1)
+        finally:
+            statistics["depth"] = searches[0][2] + searches[1][2]
+            statistics["visited_forward"] = len(searches[0][0])
+            statistics["visited_backward"] = len(searches[1][0])
+            statistics["elapsed_time"] = time.time() - start_time
+            if statistics["elapsed_time"] > 0:
+                statistics["nodes_per_second"] = (
+                    statistics["nodes_expanded"] / statistics["elapsed_time"]
+                )
+
+    def _bidirectional_meeting(self, searches, side, meeting_hash, meeting_network):
+        """
+        Constructs the sequence of moves through a network that is reached by both searches of solve_bidirectional,
+        or returns None if the networks with the same hash are not isomorphic.
+        """
+        # find the meeting network of the other search, by replaying its moves
+        other_network = self.network2 if side == 0 else self.network1
+        other_moves = self._bidirectional_path(searches[1 - side][0], meeting_hash)
+        for move in other_moves:
+            other_network = apply_move(other_network, move)
+        own_moves = self._bidirectional_path(searches[side][0], meeting_hash)
+        if side == 0:
+            forward_network, forward_moves = meeting_network, own_moves
+            backward_network, backward_moves = other_network, other_moves
+        else:
+            forward_network, forward_moves = other_network, other_moves
+            backward_network, backward_moves = meeting_network, own_moves
+
+        matcher = DiGraphMatcher(
+            backward_network,
+            forward_network,
+            node_match=lambda data1, data2: data1.get(LABEL_ATTR)
+            == data2.get(LABEL_ATTR),
+        )
+        isomorphism = next(matcher.isomorphisms_iter(), None)
+        if isomorphism is None:
+            return None
+        return forward_moves + [
+            move.invert().rename_nodes(isomorphism) for move in reversed(backward_moves)
+        ]
+
+    @staticmethod
+    def _bidirectional_path(visited, end_hash):
+        """
+        Returns the moves from the start of a search of solve_bidirectional to the network with the given hash.
+        """
+        move_tuples = []
+        current_hash = end_hash
+        while visited[current_hash][0] is not None:
+            current_hash, move_tuple = visited[current_hash]
+            move_tuples.append(move_tuple)
+        return [Move.from_tuple(move_tuple) for move_tuple in reversed(move_tuples)]
+
+    @staticmethod
+    def _new_search_statistics():
+        return {
+            "depth": 0,
+            "nodes_visited": 0,
+            "nodes_expanded": 0,
+            "transposition_hits": 0,
+            "lower_bound_prunes": 0,
+            "elapsed_time": 0.0,
+            "nodes_per_second": 0.0,
+        }
+
+
+_depth_first_worker = {}
+
+
+def _init_depth_first_worker(problem, first_stopped):
+    """
+    Stores the problem and the shared index of the first stopped subtree in a worker process of solve_depth_first.
+    """
+    _depth_first_worker["problem"] = problem
+    _depth_first_worker["first_stopped"] = first_stopped
+
+
+def _solve_depth_first_subtree(index, prefix, max_depth, stop_time):
+    """
+    Searches the subtree of solve_depth_first reached with the moves in prefix, up to depth max_depth.
+    The search is stopped when a subtree with a smaller index contains a sequence,
+    and marks the subtrees with a larger index to be stopped if it finds one.
+
+    :return: a tuple (status, moves, statistics),
+        where the status is "found", "done" (no sequence in the subtree), "stopped", or "timeout".
+    """
+    problem = _depth_first_worker["problem"]
+    first_stopped = _depth_first_worker["first_stopped"]
+    statistics = problem._new_search_statistics()
+    if first_stopped.value < index:
+        return "stopped", None, statistics
+    network = deepcopy(problem.network1)
+    for move in prefix:
+        apply_move_inplace(network, Move.from_tuple(move))
+    subproblem = type(problem)(network, problem.network2, problem.move_type)
+    try:
+        moves = subproblem.solve_depth_first_bounded(
+            max_depth=max_depth,
+            stop_time=stop_time,
+            statistics=statistics,
+            should_stop=lambda: first_stopped.value < index,
+        )
+    except TimeoutException:
+        if stop_time and time.time() > stop_time:
+            return "timeout", None, statistics
+        return "stopped", None, statistics
+    if moves is False:
+        return "done", None, statistics
+    with first_stopped.get_lock():
+        first_stopped.value = min(first_stopped.value, index)
+    return "found", moves, statistics
 
 
 # # Finds a shortest sequence between network1 and network2 using BFS
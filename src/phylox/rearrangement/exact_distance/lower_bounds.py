@@ -0,0 +1,464 @@
+"""
+Lower bounds for rearrangement distances, used to prune the exact searches and as anytime bounds.
+
+All bounds are admissible: they are at most the length of a shortest sequence of moves between the networks.
+The agreement forest bound is based on the displayed trees of the networks:
+each tail, head, or vertical move changes each displayed tree by at most one rSPR move,
+so the distance is at least the rSPR distance between a displayed tree of one network
+and the closest displayed tree of the other network.
+"""
+
+import math
+from collections import Counter
+from itertools import product
+
+import networkx as nx
+
+from phylox.constants import LABEL_ATTR
+from phylox.rearrangement.movetype import MoveType
+
+# the leaf above the root of each tree, so that rSPR moves can regraft above the root.
+_ROOT_LEAF = object()
+
+
+def reticulation_number_bound(network1, network2, move_type):
+    """
+    A lower bound based on the reticulation numbers of the networks:
+    each vertical move changes the reticulation number by one, and horizontal moves do not change it.
+
+    :param network1: a phylogenetic network (phylox.DiNetwork).
+    :param network2: a phylogenetic network (phylox.DiNetwork).
+    :param move_type: the type of moves (phylox.rearrangement.movetype.MoveType).
+    :return: a lower bound for the distance, math.inf if there is no sequence of moves between the networks.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.movetype import MoveType
+    >>> from phylox.rearrangement.exact_distance.lower_bounds import reticulation_number_bound
+    >>> network1 = DiNetwork(edges=[(0,1),(1,2),(1,3)])
+    >>> network2 = DiNetwork(edges=[(0,1),(1,2),(1,3),(2,3),(2,4),(3,5)])
+    >>> reticulation_number_bound(network1, network2, MoveType.VERT)
+    1
+    >>> reticulation_number_bound(network1, network2, MoveType.TAIL)
+    inf
+    """
+    difference = network2.reticulation_number - network1.reticulation_number
+    if move_type in [MoveType.VERT, MoveType.ALL]:
+        return abs(difference)
+    if move_type == MoveType.VPLU:
+        return difference if difference >= 0 else math.inf
+    if move_type == MoveType.VMIN:
+        return -difference if difference <= 0 else math.inf
+    return 0 if difference == 0 else math.inf
+
+
+def displayed_trees(network):
+    """
+    Returns the trees displayed by a network, restricted to its labelled leaves.
+    A tree is given as a nested frozenset of labels, e.g., frozenset({"A", frozenset({"B", "C"})}),
+    or as a single label for a tree with one leaf.
+    The number of trees is exponential in the reticulation number of the network.
+
+    :param network: a phylogenetic network (phylox.DiNetwork) with one root.
+    :return: a set of trees.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.exact_distance.lower_bounds import displayed_trees
+    >>> network = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,3),(2,4),(3,5)],
+    ...     labels=[(4, "A"), (5, "B")],
+    ... )
+    >>> displayed_trees(network) == {frozenset({"A", "B"})}
+    True
+    """
+    (root,) = network.roots
+    order = list(reversed(list(nx.topological_sort(network))))
+    reticulations = [node for node in order if network.in_degree(node) > 1]
+    trees = set()
+    for parents in product(*[list(network.predecessors(node)) for node in reticulations]):
+        chosen_parent = dict(zip(reticulations, parents))
+        subtrees = {}
+        for node in order:
+            if network.out_degree(node) == 0:
+                subtrees[node] = network.nodes[node].get(LABEL_ATTR)
+                continue
+            children = [
+                subtrees[child]
+                for child in network.successors(node)
+                if chosen_parent.get(child, node) == node
+                and subtrees[child] is not None
+            ]
+            if not children:
+                subtrees[node] = None
+            elif len(children) == 1:
+                subtrees[node] = children[0]
+            else:
+                subtrees[node] = frozenset(children)
+        trees.add(subtrees[root])
+    return trees
+
+
+def rspr_distance(tree1, tree2, max_distance=None):
+    """
+    Computes the rooted subtree prune and regraft (rSPR) distance between two binary trees on the same labels,
+    as the minimum number of edges to cut to obtain a maximum agreement forest.
+    Uses a bounded search tree with three branches per cut, so the running time is exponential in the distance.
+
+    :param tree1: a binary tree, as returned by displayed_trees.
+    :param tree2: a binary tree, as returned by displayed_trees.
+    :param max_distance: an integer, the distance is only computed if it is at most max_distance.
+        If None, there is no maximum.
+    :return: the rSPR distance between the trees, or max_distance + 1 if the distance is larger than max_distance.
+    :exception: ValueError if the trees do not have the same labels or are not binary.
+
+    :example:
+    >>> from phylox.rearrangement.exact_distance.lower_bounds import rspr_distance
+    >>> tree1 = frozenset({"A", frozenset({"B", frozenset({"C", "D"})})})
+    >>> tree2 = frozenset({"D", frozenset({"B", frozenset({"C", "A"})})})
+    >>> rspr_distance(tree1, tree2)
+    2
+    >>> rspr_distance(tree1, tree2, max_distance=1)
+    2
+    """
+    leaves1, leaves2 = _tree_leaves(tree1), _tree_leaves(tree2)
+    if Counter(leaves1) != Counter(leaves2) or len(set(leaves1)) != len(leaves1):
+        raise ValueError("The trees must have the same labels, and each label only once.")
+    if not (_is_binary(tree1) and _is_binary(tree2)):
+        raise ValueError("The rSPR distance is only computed for binary trees.")
+    if max_distance is None:
+        max_distance = len(leaves1)
+    if tree1 == tree2:
+        return 0
+    for distance in range(1, max_distance + 1):
+        if _agreement_forest_exists(
+            _Forest.from_tree(tree1), _Forest.from_tree(tree2), distance
+        ):
+            return distance
+    return max_distance + 1
+
+
+def displayed_trees_bound(network1, network2):
+    """
+    A lower bound of 1 if one of the networks displays a tree that the other network does not display,
+    and 0 otherwise.
+
+    :param network1: a phylogenetic network (phylox.DiNetwork).
+    :param network2: a phylogenetic network (phylox.DiNetwork).
+    :return: 0 or 1.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.exact_distance.lower_bounds import displayed_trees_bound
+    >>> network1 = DiNetwork(edges=[(0,1),(1,2),(1,3)], labels=[(2, "A"), (3, "B")])
+    >>> network2 = DiNetwork(edges=[(0,1),(1,2),(1,3)], labels=[(2, "B"), (3, "A")])
+    >>> displayed_trees_bound(network1, network2)
+    0
+    """
+    return int(displayed_trees(network1) != displayed_trees(network2))
+
+
+def agreement_forest_bound(network1, network2, move_type=MoveType.RSPR, max_bound=None):
+    """
+    A lower bound based on maximum agreement forests of displayed trees:
+    the maximum, over the trees displayed by network1,
+    of the rSPR distance to the closest tree displayed by network2 (and vice versa, if the moves can be reversed).
+    Pairs of displayed trees that are not binary count as distance 1 if they are different.
+
+    :param network1: a phylogenetic network (phylox.DiNetwork).
+    :param network2: a phylogenetic network (phylox.DiNetwork).
+    :param move_type: the type of moves (phylox.rearrangement.movetype.MoveType).
+    :param max_bound: an integer, the bound is only computed up to this value. If None, there is no maximum.
+    :return: a lower bound for the distance, at most max_bound.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.exact_distance.lower_bounds import agreement_forest_bound
+    >>> network1 = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+    ...     labels=[(4, "A"), (5, "B"), (6, "C"), (7, "D")],
+    ... )
+    >>> network2 = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+    ...     labels=[(4, "A"), (5, "C"), (6, "B"), (7, "D")],
+    ... )
+    >>> agreement_forest_bound(network1, network2)
+    2
+    """
+    return _agreement_forest_bound(
+        displayed_trees(network1),
+        displayed_trees(network2),
+        _is_reversible(move_type),
+        max_bound,
+    )
+
+
+def lower_bound(network1, network2, move_type, max_bound=None):
+    """
+    The best lower bound of this module for the distance between two networks:
+    the maximum of the reticulation number bound and the agreement forest bound.
+
+    :param network1: a phylogenetic network (phylox.DiNetwork).
+    :param network2: a phylogenetic network (phylox.DiNetwork).
+    :param move_type: the type of moves (phylox.rearrangement.movetype.MoveType).
+    :param max_bound: an integer, the agreement forest bound is only computed up to this value.
+        If None, there is no maximum.
+    :return: a lower bound for the distance, math.inf if there is no sequence of moves between the networks.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.movetype import MoveType
+    >>> from phylox.rearrangement.exact_distance.lower_bounds import lower_bound
+    >>> network1 = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+    ...     labels=[(4, "A"), (5, "B"), (6, "C"), (7, "D")],
+    ... )
+    >>> network2 = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+    ...     labels=[(4, "A"), (5, "C"), (6, "B"), (7, "D")],
+    ... )
+    >>> lower_bound(network1, network2, MoveType.TAIL)
+    2
+    """
+    return _TargetLowerBound(network2, move_type)(network1, max_bound=max_bound)
+
+
+class _TargetLowerBound(object):
+    """
+    The function lower_bound for a fixed network2, which computes the displayed trees of network2 only once.
+    """
+
+    def __init__(self, network2, move_type):
+        self.network2 = network2
+        self.move_type = move_type
+        self.labels = _label_counts(network2)
+        self.trees = displayed_trees(network2)
+
+    def __call__(self, network, max_bound=None):
+        if _label_counts(network) != self.labels:
+            return math.inf
+        bound = reticulation_number_bound(network, self.network2, self.move_type)
+        if bound == math.inf or (max_bound is not None and bound >= max_bound):
+            return bound
+        return max(
+            bound,
+            _agreement_forest_bound(
+                displayed_trees(network),
+                self.trees,
+                _is_reversible(self.move_type),
+                max_bound,
+            ),
+        )
+
+
+def _label_counts(network):
+    return Counter(label for _, label in network.nodes(data=LABEL_ATTR))
+
+
+def _is_reversible(move_type):
+    return move_type not in [MoveType.VPLU, MoveType.VMIN]
+
+
+def _agreement_forest_bound(trees1, trees2, reversible, max_bound):
+    if max_bound is None:
+        max_bound = math.inf
+    directions = [(trees1, trees2)]
+    if reversible:
+        directions.append((trees2, trees1))
+    bound = 0
+    for trees, other_trees in directions:
+        for tree in trees - other_trees:
+            # the distance to the closest tree of other_trees, only needed if it is larger than the bound
+            closest = max_bound
+            for other_tree in other_trees:
+                if closest <= bound:
+                    break
+                closest = min(closest, _tree_distance(tree, other_tree, closest - 1))
+            bound = max(bound, closest)
+            if bound >= max_bound:
+                return max_bound
+    return bound
+
+
+def _tree_distance(tree1, tree2, max_distance):
+    if tree1 == tree2:
+        return 0
+    if not (_is_binary(tree1) and _is_binary(tree2)):
+        return 1
+    if max_distance == math.inf:
+        max_distance = None
+    return rspr_distance(tree1, tree2, max_distance=max_distance)
+
+
+def _tree_leaves(tree):
+    leaves = []
+    stack = [tree]
+    while stack:
+        subtree = stack.pop()
+        if isinstance(subtree, frozenset):
+            stack.extend(subtree)
+        else:
+            leaves.append(subtree)
+    return leaves
+
+
+def _is_binary(tree):
+    stack = [tree]
+    while stack:
+        subtree = stack.pop()
+        if isinstance(subtree, frozenset):
+            if len(subtree) != 2:
+                return False
+            stack.extend(subtree)
+    return True
+
+
+class _Forest(object):
+    """
+    A rooted binary forest used to compute agreement forests, with integer nodes.
+    The leaves are identified by keys, which are shared between the two forests of the computation.
+    """
+
+    __slots__ = ["parent", "children", "key", "leaf"]
+
+    def __init__(self, parent, children, key, leaf):
+        self.parent = parent
+        self.children = children
+        self.key = key
+        self.leaf = leaf
+
+    @classmethod
+    def from_tree(cls, tree):
+        forest = cls({}, {}, {}, {})
+        stack = [(frozenset([tree, _ROOT_LEAF]), None)]
+        while stack:
+            subtree, parent = stack.pop()
+            node = len(forest.children)
+            forest.parent[node] = parent
+            forest.children[node] = []
+            if parent is not None:
+                forest.children[parent].append(node)
+            if isinstance(subtree, frozenset):
+                stack.extend((child, node) for child in subtree)
+            else:
+                forest.key[node] = subtree
+                forest.leaf[subtree] = node
+        return forest
+
+    def copy(self):
+        return _Forest(
+            dict(self.parent),
+            {node: list(children) for node, children in self.children.items()},
+            dict(self.key),
+            dict(self.leaf),
+        )
+
+    def cut(self, node):
+        """
+        Cuts the edge above node, and suppresses the former parent of node.
+        """
+        parent = self.parent[node]
+        self.parent[node] = None
+        self.children[parent].remove(node)
+        self._suppress(parent)
+
+    def remove_leaf(self, key):
+        node = self.leaf.pop(key)
+        del self.key[node]
+        parent = self.parent.pop(node)
+        del self.children[node]
+        if parent is not None:
+            self.children[parent].remove(node)
+            self._suppress(parent)
+
+    def contract(self, parent, key):
+        """
+        Replaces parent and its leaf children by a single leaf with the given key.
+        """
+        for child in self.children[parent]:
+            del self.leaf[self.key.pop(child)]
+            del self.parent[child]
+            del self.children[child]
+        self.children[parent] = []
+        self.key[parent] = key
+        self.leaf[key] = parent
+
+    def ancestors(self, node):
+        path = [node]
+        while self.parent[path[-1]] is not None:
+            path.append(self.parent[path[-1]])
+        return path
+
+    def _suppress(self, node):
+        children = self.children[node]
+        if len(children) > 1:
+            return
+        grandparent = self.parent.pop(node)
+        del self.children[node]
+        if grandparent is not None:
+            self.children[grandparent].remove(node)
+        if children:
+            (child,) = children
+            self.parent[child] = grandparent
+            if grandparent is not None:
+                self.children[grandparent].append(child)
+        elif grandparent is not None:
+            self._suppress(grandparent)
+
+
+def _agreement_forest_exists(tree, forest, cuts):
+    """
+    Checks whether an agreement forest of tree and forest can be obtained by cutting at most `cuts` edges of forest,
+    with the branching algorithm for sibling pairs of tree of Whidden, Beiko and Zeh (2013).
+    Modifies tree and forest.
+    """
+    while True:
+        # leaves that are isolated in the forest are finished
+        for key in [
+            key for key, node in forest.leaf.items() if forest.parent[node] is None
+        ]:
+            tree.remove_leaf(key)
+            forest.remove_leaf(key)
+        if len(tree.leaf) <= 1:
+            return True
+        # a sibling pair of leaves a, c of tree
+        for node_a in tree.key:
+            parent = tree.parent[node_a]
+            if parent is not None and all(
+                child in tree.key for child in tree.children[parent]
+            ):
+                break
+        node_c = next(child for child in tree.children[parent] if child != node_a)
+        key_a, key_c = tree.key[node_a], tree.key[node_c]
+        forest_a, forest_c = forest.leaf[key_a], forest.leaf[key_c]
+        if forest.parent[forest_a] == forest.parent[forest_c]:
+            key = object()
+            tree.contract(parent, key)
+            forest.contract(forest.parent[forest_a], key)
+            continue
+        if cuts == 0:
+            return False
+        ancestors_a = forest.ancestors(forest_a)
+        ancestors_c = forest.ancestors(forest_c)
+        branches = [[forest_a], [forest_c]]
+        if ancestors_a[-1] == ancestors_c[-1]:
+            # cut all subtrees pending from the path between a and c
+            common = set(ancestors_a) & set(ancestors_c)
+            path = [node for node in ancestors_a + ancestors_c if node not in common]
+            on_path = set(path)
+            pendant = [
+                child
+                for node in path
+                if node not in (forest_a, forest_c)
+                for child in forest.children[node]
+                if child not in on_path
+            ]
+            if len(pendant) <= cuts:
+                branches.append(pendant)
+        for branch in branches:
+            branch_tree, branch_forest = tree.copy(), forest.copy()
+            for node in branch:
+                branch_forest.cut(node)
+            if _agreement_forest_exists(branch_tree, branch_forest, cuts - len(branch)):
+                return True
+        return False
@@ -4,9 +4,15 @@ The Green Line heuristic is a heuristic to find a sequence of rSPR or tail moves
 The algorithms referred to in the comments are from the R Janssen's PhD thesis, "Rearranging Phylogenetic Networks", 2021.
 """
 
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
 from phylox.rearrangement.heuristics.utils import *
+from phylox.rearrangement.heuristics.utils import _working_copy
 from phylox.rearrangement.movability import check_valid, check_movable
-from phylox.rearrangement.move import Move, apply_move, MoveType, apply_move_sequence
+from phylox.rearrangement.move import Move, apply_move, MoveType
 from phylox.exceptions import InvalidMoveException, InvalidMoveDefinitionException
 from networkx.utils.decorators import py_random_state
 from phylox.classes.dinetwork import is_binary, is_leaf_labeled_single_root_network
@@ -94,7 +100,9 @@ def GL_Case1_Tail(N, Np, up, isom_N_Np, isom_Np_N, randomNodes=False, seed=None)
         # Case1bi: (z,x) is movable
         # Find a reticulation u in N not in the isomorphism yet
         # TODO: Can first check if the other parent of x suffices here, should heuristcally be better
-        u = FindRetic(N, excludedSet=isom_N_Np.keys(), randomNodes=randomNodes)
+        u = FindRetic(
+            N, excludedSet=isom_N_Np.keys(), randomNodes=randomNodes, seed=seed
+        )
         v = N.child(u)
         if v == x:
             return [], [], u, up
@@ -109,14 +117,14 @@ def GL_Case1_Tail(N, Np, up, isom_N_Np, isom_Np_N, randomNodes=False, seed=None)
                 network=N,
             )
             return [move], [], u, up
-        w = Parent(N, u, exclude=[z], randomNodes=randomNodes)
+        w = N.parent(u, exclude=[z], randomNodes=randomNodes, seed=seed)
         move1 = Move(
             move_type=MoveType.TAIL, moving_edge=(z, x), target=(u, v), network=N
         )
         move2 = Move(
             move_type=MoveType.TAIL, moving_edge=(z, v), target=(w, u), origin=(u, x)
         )
-        return [(move1, move2)], [], u, up
+        return [move1, move2], [], u, up
     # Case1bii: (z,x) is not movable
     c = N.parent(z)
     d = N.child(z, exclude=[x])
@@ -352,7 +360,7 @@ class HeuristicDistanceMixin:
             raise Exception(
                 "Green Line heuristic only works for networks with unique labels"
             )
-        if self.network1.labels == self.network2.labels:
+        if set(self.network1.labels) != set(self.network2.labels):
             raise Exception(
                 "Green Line heuristic only works for networks with the same set of labels"
             )
@@ -389,22 +397,20 @@ class HeuristicDistanceMixin:
         # list of (moving_edge,moving_endpoint,from_edge,to_edge)
         seq_from_1 = []
         seq_from_2 = []
-        # TODO keep track of lowest nodes? (Currently, the code does not do this, but it could speed up the code)
 
-        network1 = self.network1
-        network2 = self.network2
+        # keep track of the lowest nodes above the isomorphism,
+        # the moves are applied in place to one copy of each network
+        frontier1 = LowestNodeFrontier(_working_copy(self.network1), isom_1_2)
+        frontier2 = LowestNodeFrontier(_working_copy(self.network2), isom_2_1)
+        network1 = frontier1.network
+        network2 = frontier2.network
 
         # Do the green line algorithm
         while isom_size < goal_size:
             # Find lowest nodes above the isom in the networks:
-            (
-                lowest_tree_node_network1,
-                lowest_retic_network1,
-            ) = LowestReticAndTreeNodeAbove(network1, isom_1_2.keys())
-            (
-                lowest_tree_node_network2,
-                lowest_retic_network2,
-            ) = LowestReticAndTreeNodeAbove(network2, isom_2_1.keys())
+            lowest_retic_network1 = frontier1.lowest_reticulation()
+            lowest_tree_node_network2 = frontier2.lowest_tree_node()
+            lowest_retic_network2 = frontier2.lowest_reticulation()
 
             ######################################
             # Case1: a lowest retic in network1
@@ -461,12 +467,14 @@ class HeuristicDistanceMixin:
                     added_node_network_2,
                 ) = GL_Case3(network1, network2, up, isom_1_2, isom_2_1)
             # Now perform the moves and update the isomorphism
-            isom_1_2[added_node_network_1] = added_node_network_2
-            isom_2_1[added_node_network_2] = added_node_network_1
             seq_from_1 += moves_network_1
             seq_from_2 += moves_network_2
-            network1 = apply_move_sequence(network1, moves_network_1)
-            network2 = apply_move_sequence(network2, moves_network_2)
+            frontier1.apply_move_sequence(moves_network_1)
+            frontier2.apply_move_sequence(moves_network_2)
+            isom_1_2[added_node_network_1] = added_node_network_2
+            isom_2_1[added_node_network_2] = added_node_network_1
+            frontier1.add(added_node_network_1)
+            frontier2.add(added_node_network_2)
             isom_size += 1
 
         # Add the root to the isomorphism, if it was there
@@ -508,22 +516,21 @@ class HeuristicDistanceMixin:
         # list of (moving_edge,moving_endpoint,from_edge,to_edge)
         seq_from_1 = []
         seq_from_2 = []
-        # TODO keep track of lowest nodes? (Currently, the code does not do this, but it could speed up the code)
 
-        network1 = self.network1
-        network2 = self.network2
+        # keep track of the lowest nodes above the isomorphism,
+        # the moves are applied in place to one copy of each network
+        frontier1 = LowestNodeFrontier(_working_copy(self.network1), isom_1_2)
+        frontier2 = LowestNodeFrontier(_working_copy(self.network2), isom_2_1)
+        network1 = frontier1.network
+        network2 = frontier2.network
 
         # Do the green line algorithm
         while isom_size < goal_size:
             # Find all lowest nodes above the isom in the networks:
-            (
-                lowest_tree_node_network1,
-                lowest_retic_network1,
-            ) = LowestReticAndTreeNodeAbove(network1, isom_1_2.keys(), allnodes=True)
-            (
-                lowest_tree_node_network2,
-                lowest_retic_network2,
-            ) = LowestReticAndTreeNodeAbove(network2, isom_2_1.keys(), allnodes=True)
+            lowest_tree_node_network1 = frontier1.lowest_tree_nodes()
+            lowest_retic_network1 = frontier1.lowest_reticulations()
+            lowest_tree_node_network2 = frontier2.lowest_tree_nodes()
+            lowest_retic_network2 = frontier2.lowest_reticulations()
 
             # Construct a list of all lowest nodes in a tuple with the corresponding network (in random order)
             # I.e. If u is a lowest node of network one, it will appear in the list as (u,1)
@@ -667,12 +674,14 @@ class HeuristicDistanceMixin:
                         break
 
             # Now perform the moves and update the isomorphism
-            isom_1_2[added_node_network_1] = added_node_network_2
-            isom_2_1[added_node_network_2] = added_node_network_1
             seq_from_1 += moves_network_1
             seq_from_2 += moves_network_2
-            network1 = apply_move_sequence(network1, moves_network_1)
-            network2 = apply_move_sequence(network2, moves_network_2)
+            frontier1.apply_move_sequence(moves_network_1)
+            frontier2.apply_move_sequence(moves_network_2)
+            isom_1_2[added_node_network_1] = added_node_network_2
+            isom_2_1[added_node_network_2] = added_node_network_1
+            frontier1.add(added_node_network_1)
+            frontier2.add(added_node_network_2)
             isom_size += 1
 
         # Add the root to the isomorphism, if it was there
@@ -683,3 +692,137 @@ class HeuristicDistanceMixin:
         return seq_from_1 + [
             move.invert().rename_nodes(isom_2_1) for move in reversed(seq_from_2)
         ]
+
+    def heuristic_green_line_best_of(
+        self, repeats=100, workers=None, time_limit=None, seed=None, lower_bound=None
+    ):
+        """
+        Runs the random Green Line heuristic (heuristic_green_line_random) a number of times with independent seeds,
+        and returns the shortest sequence found.
+        The seeds of the restarts are spawned from one numpy.random.SeedSequence,
+        and ties are broken by taking the first restart with the shortest sequence,
+        so the result does not depend on the number of workers (unless the time limit is reached).
+
+        :param repeats: the number of restarts.
+        :param workers: the number of worker processes. If None or 1, the restarts are run in the current process.
+        :param time_limit: a float, a time limit in seconds. No new restarts are started after the time limit,
+            but restarts that are running are finished. If None, all restarts are run.
+        :param seed: a seed for the numpy.random.SeedSequence of the restarts.
+        :param lower_bound: an integer, a lower bound for the distance,
+            e.g., from `phylox.rearrangement.exact_distance.lower_bounds.lower_bound`.
+            If a restart finds a sequence of this length, the later restarts are not used.
+        :return: a tuple (sequence, statistics), where sequence is the shortest sequence found (False if none is found),
+            and statistics is a dictionary with a list of dictionaries with the seed, the length of the sequence,
+            and the running time of each restart that is used, the index of the best restart,
+            whether the lower bound is reached, and the total time.
+
+        :example:
+        >>> from phylox import DiNetwork
+        >>> from phylox.rearrangement.movetype import MoveType
+        >>> from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+        >>> network1 = DiNetwork(
+        ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+        ...     labels=[(4, "A"), (5, "B"), (6, "C"), (7, "D")],
+        ... )
+        >>> network2 = DiNetwork(
+        ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+        ...     labels=[(4, "A"), (5, "C"), (6, "B"), (7, "D")],
+        ... )
+        >>> problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        >>> sequence, statistics = problem.heuristic_green_line_best_of(repeats=10, seed=1, lower_bound=2)
+        >>> len(sequence), statistics["reached_lower_bound"], len(statistics["restarts"]) <= 10
+        (2, True, True)
+        """
+        self.check_green_line_requirements()
+        seeds = [
+            int(child.generate_state(1)[0])
+            for child in np.random.SeedSequence(seed).spawn(repeats)
+        ]
+        stop_time = None
+        if time_limit is not None:
+            stop_time = time.time() + time_limit
+        statistics = {
+            "restarts": [],
+            "best_restart": None,
+            "reached_lower_bound": False,
+            "elapsed_time": 0.0,
+        }
+        start_time = time.time()
+        best = False
+
+        def results():
+            if workers is None or workers <= 1:
+                for restart_seed in seeds:
+                    if stop_time is not None and time.time() > stop_time:
+                        return
+                    yield _green_line_restart(restart_seed, self)
+                return
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_green_line_worker,
+                initargs=(self,),
+            ) as executor:
+                futures = [
+                    executor.submit(_green_line_restart, restart_seed, None, stop_time)
+                    for restart_seed in seeds
+                ]
+                try:
+                    for future in futures:
+                        result = future.result()
+                        if result is None:
+                            return
+                        yield result
+                finally:
+                    for future in futures:
+                        future.cancel()
+
+        restarts = results()
+        try:
+            for restart, (sequence, restart_statistics) in enumerate(restarts):
+                statistics["restarts"].append(restart_statistics)
+                if sequence is not False and (
+                    best is False or len(sequence) < len(best)
+                ):
+                    best = sequence
+                    statistics["best_restart"] = restart
+                if (
+                    best is not False
+                    and lower_bound is not None
+                    and len(best) <= lower_bound
+                ):
+                    statistics["reached_lower_bound"] = True
+                    break
+        finally:
+            # stops the workers
+            restarts.close()
+        statistics["elapsed_time"] = time.time() - start_time
+        return best, statistics
+
+
+_green_line_worker = {}
+
+
+def _init_green_line_worker(problem):
+    """
+    Stores the problem in a worker process of heuristic_green_line_best_of.
+    """
+    _green_line_worker["problem"] = problem
+
+
+def _green_line_restart(seed, problem=None, stop_time=None):
+    """
+    One restart of heuristic_green_line_best_of.
+
+    :return: a tuple (sequence, statistics), or None if the restart is not started because of the time limit.
+    """
+    if stop_time is not None and time.time() > stop_time:
+        return None
+    if problem is None:
+        problem = _green_line_worker["problem"]
+    start_time = time.time()
+    sequence = problem.heuristic_green_line_random(seed=seed)
+    return sequence, {
+        "seed": seed,
+        "length": len(sequence) if sequence is not False else None,
+        "elapsed_time": time.time() - start_time,
+    }
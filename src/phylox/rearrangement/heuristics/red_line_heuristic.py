@@ -1,514 +1,568 @@
-# # Code used for cases 1 and 2 in the head move red line algorithm
-# # returns moves1,moves2,addedNode1,addedNode2
-# def RL_Case1(N1, N2, x_1, isom_N1_N2, isom_N2_N1, randomNodes=False):
-#     """
-#     An implementation of Algorithm 7. Finds a sequence of head moves that makes it possible to add the highest tree node x_1 to the up-closed isomrophism.
-
-#     :param N1: a phylogenetic network.
-#     :param N2: a phylogenetic network.
-#     :param x_1: a tree node in N1.
-#     :param isom_N1_N2: a dictionary, containing a partial (up-closed) isomorphism map from N1 to N2. The inverse of isom_N2_N1.
-#     :param isom_N2_N1: a dictionary, containing a partial (up-closed) isomorphism map from N2 to N1. The inverse of isom_N1_N2.
-#     :param randomNodes: a boolean value, determining whether the random version of this algorithm is used.
-#     :return: a list of head moves in N1, a list of head moves in N2, a node of N1, a node of N2. After applying the moves to the networks, the nodes can be added to the up-closed isomorphism.
-#     """
-#     p_1 = Parent(N1, x_1)
-#     p_2 = isom_N1_N2[p_1]
-#     x_2 = Child(N2, p_2, exclude=isom_N2_N1.keys(), randomNodes=randomNodes)
-#     if N2.out_degree(x_2) == 2:
-#         #        print("Case tree")
-#         return [], [], x_1, x_2
-#     elif N2.in_degree(x_2) == 2:
-#         #        print("Case retic")
-#         c_2 = FindTreeNode(N2, excludedSet=isom_N2_N1.keys(), randomNodes=randomNodes)
-#         t_2 = Parent(N2, c_2)
-#         b_2 = Child(N2, c_2, exclude=[x_2], randomNodes=randomNodes)
-#         #        print(x_1,p_1,p_2,x_2,c_2,t_2,b_2)
-#         # TODO: Not in the latex algo, just a minor improvement:
-#         # If the other child $c_2$ of $p_2$ is a retic, then we can add it.
-#         if p_2 == t_2:
-#             return [], [], x_1, c_2
-#         if check_movable(N2, (p_2, x_2), x_2):
-#             q_2 = Parent(N2, x_2, exclude=[p_2])
-#             if x_2 == t_2:
-#                 #                print("(p,x) movable and x=t")
-#                 return [], [((q_2, x_2), x_2, (c_2, b_2))], x_1, c_2
-#             else:
-#                 #                print("(p,x) movable and x!=t")
-#                 return [], [((p_2, x_2), x_2, (t_2, c_2)), ((t_2, x_2), x_2, (c_2, b_2))], x_1, c_2
-#         else:
-#             d_2 = Child(N2, x_2)
-#             z_2 = Parent(N2, x_2, exclude=[p_2])
-#             # Find a leaf with parent not equal to d_2
-#             l_2 = FindLeaf(N2, excludedParents=[d_2], randomNodes=randomNodes)
-#             w_2 = Parent(N2, l_2)
-#             #            print("other")
-#             #            print(d_2,z_2,w_2,l_2)
-#             if l_2 == b_2:  # after the first move, b_2 is not a child of c_2 anymore, so we fix this by taking the other child of c_2 as b_2
-#                 b_2 = Child(N2, c_2, exclude=[l_2, x_2], randomNodes=randomNodes)
-#             if d_2 == t_2:  # i.e., if, after the first move, x_2 is the parent of c_2
-#                 return [], [((z_2, d_2), d_2, (w_2, l_2)), ((z_2, x_2), x_2, (c_2, b_2))], x_1, c_2
-#             else:
-#                 return [], [((z_2, d_2), d_2, (w_2, l_2)), ((p_2, x_2), x_2, (t_2, c_2)),
-#                             ((t_2, x_2), x_2, (c_2, b_2))], x_1, c_2
-#     else:
-#         #        print("Case leaf")
-#         c_2 = FindTreeNode(N2, excludedSet=isom_N2_N1.keys(), randomNodes=randomNodes)
-#         t_2 = Parent(N2, c_2)
-
-#         if p_2 == t_2:
-#             #            print("no move")
-#             return [], [], x_1, c_2
-
-#             # Find a reticulation arc (s_2,r_2) that can be moved to (p_2,x_2)
-#         # No randomness required, because this arc will end up at its original position again.
-#         s_2 = None
-#         r_2 = None
-#         for node in N2.nodes():
-#             if N2.in_degree(node) == 2:
-#                 for parent in N2.predecessors(node):
-#                     if parent != p_2 and check_movable(N2, (parent, node), node):
-#                         s_2 = parent
-#                         r_2 = node
-#             if s_2 != None:
-#                 break
-#         q_2 = Parent(N2, r_2, exclude=[s_2])
-#         w_2 = Child(N2, r_2)
-#         #        print(p_2,x_2,t_2,c_2,s_2,q_2,r_2,w_2)
-#         if r_2 == p_2:
-#             #            print("r=p")
-#             if s_2 == t_2:
-#                 return [], [((q_2, p_2), p_2, (t_2, c_2))], x_1, c_2
-#             elif q_2 == t_2:
-#                 return [], [((s_2, p_2), p_2, (t_2, c_2))], x_1, c_2
-#             else:
-#                 return [], [((s_2, p_2), p_2, (t_2, c_2)), ((t_2, p_2), p_2, (q_2, x_2)),
-#                             ((q_2, p_2), p_2, (s_2, c_2))], x_1, c_2
-#         if r_2 == t_2:
-#             #            print("r=t")
-#             if p_2 == q_2:
-#                 return [], [((s_2, r_2), r_2, (p_2, x_2))], x_1, c_2
-#             else:
-#                 return [], [((s_2, r_2), r_2, (p_2, x_2)), ((p_2, r_2), r_2, (q_2, c_2)),
-#                             ((q_2, r_2), r_2, (s_2, x_2))], x_1, c_2
-#         if s_2 != t_2:
-#             #            print("s!=t")
-#             return [], [((s_2, r_2), r_2, (p_2, x_2)), ((p_2, r_2), r_2, (t_2, c_2)), ((t_2, r_2), r_2, (s_2, x_2)),
-#                         ((s_2, r_2), r_2, (q_2, w_2))], x_1, c_2
-#         else:
-#             #            print("other")
-#             return [], [((s_2, r_2), r_2, (p_2, x_2)), ((p_2, r_2), r_2, (s_2, c_2)),
-#                         ((s_2, r_2), r_2, (q_2, w_2))], x_1, c_2
-
-#         # Code used for case 3 in the head move red line algorithm
-
-
-# # returns moves1,moves2,addedNode1,addedNode2
-# def RL_Case3(N1, N2, x_1, isom_N1_N2, isom_N2_N1, randomNodes=False):
-#     """
-#     An implementation of Algorithm 8. Finds a sequence of head moves that makes it possible to add the highest reticulation x_1 to the up-closed isomrophism.
-
-#     :param N1: a phylogenetic network.
-#     :param N2: a phylogenetic network.
-#     :param x_1: a highest reticulation node in N1.
-#     :param isom_N1_N2: a dictionary, containing a partial (up-closed) isomorphism map from N1 to N2. The inverse of isom_N2_N1.
-#     :param isom_N2_N1: a dictionary, containing a partial (up-closed) isomorphism map from N2 to N1. The inverse of isom_N1_N2.
-#     :param randomNodes: a boolean value, determining whether the random version of this algorithm is used.
-#     :return: a list of head moves in N1, a list of head moves in N2, a node of N1, a node of N2. After applying the moves to the networks, the nodes can be added to the up-closed isomorphism.
-#     """
-#     p_1 = Parent(N1, x_1)
-#     q_1 = Parent(N1, x_1, exclude=[p_1])
-#     p_2 = isom_N1_N2[p_1]
-#     cp_2 = Child(N2, p_2, exclude=isom_N2_N1.keys(), randomNodes=randomNodes)
-#     q_2 = isom_N1_N2[q_1]
-#     cq_2 = Child(N2, q_2, exclude=isom_N2_N1.keys(), randomNodes=randomNodes)
-
-#     # at least one tree node, so give up
-#     if N2.out_degree(cp_2) == 2 or N2.out_degree(cq_2) == 2:
-#         # The proof does not provide a sequence when at least of the nodes cp_2 or cq_2 is a tree node
-#         # TODO: If one of (p_2,cp_2) or (q_2,cq_2) is movable, we can still do something quite similar to what follows in the last case
-#         return [], [], None, None
-#     # Case 3ai
-#     if cp_2 == cq_2:
-#         #        print("no move")
-#         return [], [], x_1, cp_2
-#     # Case 3av
-#     elif N2.out_degree(cp_2) == 0 and N2.out_degree(cq_2) == 0:
-#         #        print("both leaves")
-#         # Find a head-movable arc (s_2,r_2)
-#         # As each reticulation node has a movable arc, we pick a random reticulation, and then a random movable arc incident to this node
-#         r_2 = FindRetic(N2, excludedSet=isom_N2_N1.keys(), randomNodes=randomNodes)
-#         s_2 = None
-#         for parent in N2.predecessors(r_2):
-#             if check_movable(N2, (parent, r_2), r_2):
-#                 if not randomNodes:
-#                     s_2 = parent
-#                     break
-#                 elif s_2 == None or random.getrandbits(1):
-#                     s_2 = parent
-#         if s_2 == p_2:
-#             #            print("s=p")
-#             return [], [((s_2, r_2), r_2, (q_2, cq_2)), ((q_2, r_2), r_2, (p_2, cp_2))], x_1, r_2
-#         else:
-#             #            print("s!=p")
-#             return [], [((s_2, r_2), r_2, (p_2, cp_2)), ((p_2, r_2), r_2, (q_2, cq_2))], x_1, r_2
-#     # Cases 3a(ii, iii, iv)
-#     else:
-#         #        print("at least one non-leaf")
-#         if nx.has_path(N2, cq_2, cp_2) or N2.out_degree(cp_2) == 0:
-#             # Swap p and q
-#             q_2, p_2 = p_2, q_2
-#             cp_2, cq_2 = cq_2, cp_2
-#         #        print(p_2 , q_2, cp_2, cq_2)
-#         if check_movable(N2, (p_2, cp_2), cp_2):
-#             #            print("movable cp_2")
-#             return [], [((p_2, cp_2), cp_2, (q_2, cq_2))], x_1, cp_2
-#         else:
-#             #            print("immovable cp_2")
-#             z = Child(N2, cp_2)
-#             t = Parent(N2, cp_2, exclude=[p_2])
-#             if t == q_2:
-#                 return [], [], x_1, cp_2
-#             return [], [((cp_2, z), z, (q_2, cq_2)), ((t, cp_2), cp_2, (z, cq_2))], x_1, z
-
-
-# # Permutes the leaves of a network so that it becomes leaf isomorphic, provided the networks were already (non-labeled) ismorphic
-# def Permute_Leaves_Head(network1, network2, isom_1_2, isom_2_1, label_dict_1, label_dict_2):
-#     """
-#     An implementation of Algorithm 9. Determines a sequence of head moves that makes two isomorphic networks labeled isomorphic.
-
-#     :param network1: a phylogenetic network.
-#     :param network2: a phylogenetic network.
-#     :param isom_1_2: a dictionary, containing a partial (up-closed) isomorphism map from network1 to network2. The inverse of isom_2_1.
-#     :param isom_2_1: a dictionary, containing a partial (up-closed) isomorphism map from network2 to network1. The inverse of isom_1_2.
-#     :param label_dict_1: a dictionary, containing the correspondence of nodes of network1 with the leaf labels: keys are labels and values are nodes.
-#     :param label_dict_2: a dictionary, containing the correspondence of nodes of network2 with the leaf labels: keys are labels and values are nodes.
-#     :return: a list of head moves that turns network1 into network2.
-#     """
-#     #    for i,k in isom_1_2.items():
-#     #        print(i,k)
-#     sequence = []
-#     # labeldict[label]=leaf
-#     Y = list(label_dict_1.values())
-#     cycles = []
-#     while len(Y) > 0:
-#         y1_1 = Y.pop()
-#         y_2 = isom_1_2[y1_1]
-#         cycle = [y1_1]
-#         while network2.node[y_2].get('label') != network1.node[cycle[0]].get('label'):
-#             y_new_1 = label_dict_1[network2.node[y_2].get('label')]
-#             #            if len(set(network1.predecessors(cycle[-1]))&set(network1.predecessors(y_new_1)))==0:#cycle[-1] and y_new_1 have NO common parent
-#             #                cycle+=[y_new_1]
-#             cycle += [y_new_1]
-
-#             y_2 = isom_1_2[y_new_1]
-#             Y.remove(y_new_1)
-#         if len(cycle) > 1:
-#             cycles += [list(reversed(cycle))]
-#     #    print("cycles",cycles)
-
-#     t = None
-#     r = None
-#     for node in network1:
-#         if network1.in_degree(node) == 2:
-#             for parent in network1.predecessors(node):
-#                 if check_movable(network1, (parent, node), node):
-#                     t = parent
-#                     r = node
-#         if r:
-#             break
-#     c_last = Child(network1, r)  # In the proof: c', the child of r in N
-#     s_last = Parent(network1, r, exclude=[t])
-
-#     for cycle in cycles:
-#         c = cycle
-
-#         # shift the cycle by one of t is the parent of the last leaf in the cycle
-#         if t in network1.predecessors(cycle[-1]):
-#             c = [cycle[-1]] + cycle[:-1]
-
-#         # Skip the first move if the head r of the moving arc is already above the last leaf in the cycle
-#         p_last = Parent(network1, c[-1])
-#         if r != p_last:
-#             move = ((t, r), r, (p_last, c[-1]))
-#             sequence.append((move[0], move[1], From_Edge(network1, move[0], move[1]), move[2]))
-#             network1 = DoMove(network1, move[0], move[1], move[2], check_validity=False)
-#         moved_arc = (t, r)
-
-#         c_last_before = c_last
-
-#         for i in reversed(range(len(c))):
-#             p_i = Parent(network1, r, exclude=[moved_arc[0]])
-#             p_im1 = Parent(network1, c[i - 1])
-#             # if p_i==p_im1, then two consecutive leaves are in a cherry, and we can skip one of them.
-#             if p_i == p_im1:
-#                 continue
-#             #                print("do nothing, swapping a cherry")
-#             else:
-#                 move = ((p_i, r), r, (p_im1, c[i - 1]))
-#                 sequence.append((move[0], move[1], From_Edge(network1, move[0], move[1]), move[2]))
-#                 network1 = DoMove(network1, move[0], move[1], move[2], check_validity=False)
-#                 moved_arc = (p_i, r)
-#             # If c in the `original position' (s,c) of (t,r) is permuted by the cycle, then we need to change this original position accordingly
-#             if c[i] == c_last_before:
-#                 c_last = c[i - 1]
-
-#     # Put the moving arc back to its original position
-#     # The proof does this for every cycle, but can also be done once at the end
-#     if (s_last, c_last) in network1.edges():
-#         # (t,r) might already be back at this position
-#         move = ((t, r), r, (s_last, c_last))
-#         sequence.append((move[0], move[1], From_Edge(network1, move[0], move[1]), move[2]))
-#         network1 = DoMove(network1, move[0], move[1], move[2], check_validity=False)
-
-#     #    print("isomorphic", Isomorphic(network1,network2))
-#     #    for s in sequence:
-#     #        print(s[0])
-#     return sequence
-
-
-# # A heuristic for finding a head move sequence between two networks.
-# def Red_Line(network1, network2):
-#     """
-#     An implementation of Algorithm 10. Finds a sequence of head moves from network1 to network2 by building an up-closed isomorphism.
-
-#     :param network1: a phylogenetic network.
-#     :param network2: a phylogenetic network.
-#     :return: A list of head moves from network1 to network2.
-#     """
-#     # Find the root and labels of the networks
-#     root1 = Root(network1)
-#     root2 = Root(network2)
-#     label_dict_1 = Labels(network1)
-#     label_dict_2 = Labels(network2)
-
-#     # initialize isomorphism
-#     isom_1_2 = dict()
-#     isom_1_2[root1] = root2
-#     isom_2_1 = dict()
-#     isom_2_1[root2] = root1
-#     isom_size = 1
-
-#     # Check if the roots are of the same type
-#     if network1.out_degree(root1) != network2.out_degree(root2):
-#         return False
-
-#     # Keep track of the size of the isomorphism and the size it is at the end of the red line algorithm
-#     goal_size = len(network1) - len(label_dict_1)
-
-#     # init lists of sequence of moves
-#     # list of (moving_edge,moving_endpoint,from_edge,to_edge)
-#     seq_from_1 = []
-#     seq_from_2 = []
-#     # TODO keep track of highest nodes?
-
-#     # Do the red line algorithm
-#     while (isom_size < goal_size):
-#         highest_tree_node_network1, highest_retic_network1 = HighestNodesBelow(network1, isom_1_2.keys())
-#         highest_tree_node_network2, highest_retic_network2 = HighestNodesBelow(network2, isom_2_1.keys())
-
-#         # Case1
-#         if highest_tree_node_network1 != None:
-#             moves_network_1, moves_network_2, added_node_network1, added_node_network2 = RL_Case1(network1, network2,
-#                                                                                                   highest_tree_node_network1,
-#                                                                                                   isom_1_2, isom_2_1)
-#         # Case2
-#         elif highest_tree_node_network2 != None:
-#             moves_network_2, moves_network_1, added_node_network2, added_node_network1 = RL_Case1(network2, network1,
-#                                                                                                   highest_tree_node_network2,
-#                                                                                                   isom_2_1, isom_1_2)
-#         # Case3
-#         else:
-#             moves_network_1, moves_network_2, added_node_network1, added_node_network2 = RL_Case3(network1, network2,
-#                                                                                                   highest_retic_network1,
-#                                                                                                   isom_1_2, isom_2_1)
-
-#         # Now perform the moves and update the isomorphism
-#         isom_1_2[added_node_network1] = added_node_network2
-#         isom_2_1[added_node_network2] = added_node_network1
-#         for move in moves_network_1:
-#             seq_from_1.append((move[0], move[1], From_Edge(network1, move[0], move[1]), move[2]))
-#             network1 = DoMove(network1, move[0], move[1], move[2], check_validity=False)
-#         for move in moves_network_2:
-#             seq_from_2.append((move[0], move[1], From_Edge(network2, move[0], move[1]), move[2]))
-#             network2 = DoMove(network2, move[0], move[1], move[2], check_validity=False)
-#         isom_size += 1
-#     # TESTING FOR CORRECTNESS WHILE RUNNING
-#     #        if not nx.is_isomorphic(network1.subgraph(isom_1_2.keys()),network2.subgraph(isom_2_1.keys())):
-#     #            print("not unlabeled isom")
-#     #            print(seq_from_1)
-#     #            print(seq_from_2)
-#     #            print(network1.subgraph(isom_1_2.keys()).edges())
-#     #            print(network2.subgraph(isom_2_1.keys()).edges())
-
-#     # TODO Debugging, remove after for speed
-#     #    if not nx.is_isomorphic(network1,network2):
-#     #        print("not unlabeled isom")
-#     #        print(network1.edges())
-#     #        print(network2.edges())
-#     #    else:
-#     #        print("unlabeled isomorphic :)")
-
-#     # Add the leaves to the isomorphism
-#     for node_1 in network1.nodes():
-#         if network1.out_degree(node_1) == 0:
-#             parent_1 = Parent(network1, node_1)
-#             parent_2 = isom_1_2[parent_1]
-#             node_2 = Child(network2, parent_2, exclude=isom_2_1.keys())
-#             isom_1_2[node_1] = node_2
-#             isom_2_1[node_2] = node_1
-
-#     # Permute the leaves
-#     seq_permute = Permute_Leaves_Head(network1, network2, isom_1_2, isom_2_1, label_dict_1, label_dict_2)
-
-#     # invert seq_from_2, rename to node names of network1, and append to seq_from_1
-#     return seq_from_1 + seq_permute + ReplaceNodeNamesInMoveSequence(InvertMoveSequence(seq_from_2), isom_2_1)
-
-
-# def Red_Line_Random(network1, network2, repeats=1):
-#     """
-#     Finds a sequence of head moves from network1 to network2 by randomly building an up-closed isomorphism a number of times, and only keeping the shortest sequence.
-
-#     :param network1: a phylogenetic network.
-#     :param network2: a phylogenetic network.
-#     :param repeats: an integer, determining how many repeats of Red_Line_Random_Single are performed.
-#     :return: A list of head moves from network1 to network2.
-#     """
-#     best_seq = None
-#     for i in range(repeats):
-#         candidate_seq = Red_Line_Random_Single(network1, network2)
-#         if best_seq == None or len(best_seq) > len(candidate_seq):
-#             best_seq = candidate_seq
-#     return best_seq
-
-
-# def Red_Line_Random_Single(network1, network2):
-#     """
-#     An implementation of Algorithm 11. Finds a sequence of head moves from network1 to network2 by building randomly an up-closed isomorphism.
-
-#     :param network1: a phylogenetic network.
-#     :param network2: a phylogenetic network.
-#     :return: A list of head moves from network1 to network2.
-#     """
-#     # Find the root and labels of the networks
-#     root1 = Root(network1)
-#     root2 = Root(network2)
-#     label_dict_1 = Labels(network1)
-#     label_dict_2 = Labels(network2)
-
-#     # initialize isomorphism
-#     isom_1_2 = dict()
-#     isom_1_2[root1] = root2
-#     isom_2_1 = dict()
-#     isom_2_1[root2] = root1
-#     isom_size = 1
-
-#     # Check if the roots are of the same type
-#     if network1.out_degree(root1) != network2.out_degree(root2):
-#         return False
-
-#     # Keep track of the size of the isomorphism and the size it is at the end of the red line algorithm
-#     goal_size = len(network1) - len(label_dict_1)
-
-#     # init lists of sequence of moves
-#     # list of (moving_edge,moving_endpoint,from_edge,to_edge)
-#     seq_from_1 = []
-#     seq_from_2 = []
-#     # TODO keep track of highest nodes?
-
-#     # Do the red line algorithm
-#     while (isom_size < goal_size):
-#         highest_tree_node_network1, highest_retic_network1 = HighestNodesBelow(network1, isom_1_2.keys(), allnodes=True)
-#         highest_tree_node_network2, highest_retic_network2 = HighestNodesBelow(network2, isom_2_1.keys(), allnodes=True)
-
-#         # Construct a list of all highest nodes in a tuple with the corresponding network (in random order)
-#         # I.e. If u is a highest node of network one, it will appear in the list as (u,1)
-#         highest_nodes_network1 = [(u, 1) for u in highest_tree_node_network1 + highest_retic_network1]
-#         highest_nodes_network2 = [(u, 2) for u in highest_tree_node_network2 + highest_retic_network2]
-#         candidate_highest_nodes = highest_nodes_network1 + highest_nodes_network2
-#         random.shuffle(candidate_highest_nodes)
-
-#         # As some cases do not give an addition to the isom, we continue trying lowest nodes until we find one that does.
-#         for highest_node, network_number in candidate_highest_nodes:
-#             u = highest_node
-#             # Case1
-#             if network_number == 1 and network1.in_degree(u) == 1:
-#                 #                print("Case 1")
-#                 moves_network_1, moves_network_2, added_node_network1, added_node_network2 = RL_Case1(network1,
-#                                                                                                       network2, u,
-#                                                                                                       isom_1_2,
-#                                                                                                       isom_2_1,
-#                                                                                                       randomNodes=True)
-#                 break
-#             # Case2
-#             elif network_number == 2 and network2.in_degree(u) == 1:
-#                 #                print("Case 2")
-#                 moves_network_2, moves_network_1, added_node_network2, added_node_network1 = RL_Case1(network2,
-#                                                                                                       network1, u,
-#                                                                                                       isom_2_1,
-#                                                                                                       isom_1_2,
-#                                                                                                       randomNodes=True)
-#                 break
-#             # Case3
-#             elif network_number == 1 and network1.in_degree(u) == 2:
-#                 #                print("Case 3")
-#                 moves_network_1, moves_network_2, added_node_network1, added_node_network2 = RL_Case3(network1,
-#                                                                                                       network2, u,
-#                                                                                                       isom_1_2,
-#                                                                                                       isom_2_1,
-#                                                                                                       randomNodes=True)
-#                 if added_node_network2:
-#                     break
-#             # Case3'
-#             elif network_number == 2 and network2.in_degree(u) == 2:
-#                 #                print("Case 3'")
-#                 moves_network_2, moves_network_1, added_node_network2, added_node_network1 = RL_Case3(network2,
-#                                                                                                       network1, u,
-#                                                                                                       isom_2_1,
-#                                                                                                       isom_1_2,
-#                                                                                                       randomNodes=True)
-#                 if added_node_network2:
-#                     break
-
-#         # Now perform the moves and update the isomorphism
-#         isom_1_2[added_node_network1] = added_node_network2
-#         isom_2_1[added_node_network2] = added_node_network1
-#         for move in moves_network_1:
-#             seq_from_1.append((move[0], move[1], From_Edge(network1, move[0], move[1]), move[2]))
-#             network1 = DoMove(network1, move[0], move[1], move[2], check_validity=False)
-#         for move in moves_network_2:
-#             seq_from_2.append((move[0], move[1], From_Edge(network2, move[0], move[1]), move[2]))
-#             network2 = DoMove(network2, move[0], move[1], move[2], check_validity=False)
-#         isom_size += 1
-#     # TESTING FOR CORRECTNESS WHILE RUNNING
-#     #        if not nx.is_isomorphic(network1.subgraph(isom_1_2.keys()),network2.subgraph(isom_2_1.keys())):
-#     #            print("not unlabeled isom")
-#     #            print(seq_from_1)
-#     #            print(seq_from_2)
-#     #            print(network1.subgraph(isom_1_2.keys()).edges())
-#     #            print(network2.subgraph(isom_2_1.keys()).edges())
-#     #            print(network1.edges())
-#     #            print(network2.edges())
-
-#     # TODO Debugging, remove after for speed
-#     #    if not nx.is_isomorphic(network1,network2):
-#     #        print("not unlabeled isom")
-#     #        print(network1.edges())
-#     #        print(network2.edges())
-#     #    else:
-#     #        print("unlabeled isomorphic :)")
-
-#     # Add the leaves to the isomorphism
-#     for node_1 in network1.nodes():
-#         if network1.out_degree(node_1) == 0:
-#             parent_1 = Parent(network1, node_1)
-#             parent_2 = isom_1_2[parent_1]
-#             node_2 = Child(network2, parent_2, exclude=isom_2_1.keys())
-#             isom_1_2[node_1] = node_2
-#             isom_2_1[node_2] = node_1
-
-#     # Permute the leaves
-#     seq_permute = Permute_Leaves_Head(network1, network2, isom_1_2, isom_2_1, label_dict_1, label_dict_2)
-
-#     # invert seq_from_2, rename to node names of network1, and append to seq_from_1
-#     return seq_from_1 + seq_permute + ReplaceNodeNamesInMoveSequence(InvertMoveSequence(seq_from_2), isom_2_1)
+"""
+A module containing the Red Line heuristic and its random version.
+The Red Line heuristic is a heuristic to find a sequence of head moves between two phylogenetic networks.
+The algorithms referred to in the comments are from the R Janssen's PhD thesis, "Rearranging Phylogenetic Networks", 2021.
+
+The functions for the cases of the heuristic return the head moves as pairs (moving_edge, target),
+because the origin of a move depends on the moves that are applied before it.
+The heuristic turns them into moves (phylox.rearrangement.move.Move) when it applies them.
+"""
+
+from networkx.utils.decorators import py_random_state
+
+from phylox.classes.dinetwork import is_binary, is_leaf_labeled_single_root_network
+from phylox.constants import LABEL_ATTR
+from phylox.rearrangement.heuristics.utils import (
+    FindLeaf,
+    FindRetic,
+    FindTreeNode,
+    HighestNodeFrontier,
+    _working_copy,
+)
+from phylox.rearrangement.movability import check_movable
+from phylox.rearrangement.move import Move, MoveType, apply_move_inplace
+from phylox.rearrangement.reachability import has_path
+
+
+@py_random_state("seed")
+def RL_Case1(
+    N1,
+    N2,
+    x_1,
+    isom_N1_N2,
+    isom_N2_N1,
+    randomNodes=False,
+    seed=None,
+    frontier2=None,
+):
+    """
+    An implementation of Algorithm 7. Finds a sequence of head moves that makes it possible to add the highest tree node x_1 to the up-closed isomorphism.
+
+    :param N1: a phylogenetic network.
+    :param N2: a phylogenetic network.
+    :param x_1: a highest tree node of N1 below the isomorphism.
+    :param isom_N1_N2: a dictionary, containing a partial (up-closed) isomorphism map from N1 to N2. The inverse of isom_N2_N1.
+    :param isom_N2_N1: a dictionary, containing a partial (up-closed) isomorphism map from N2 to N1. The inverse of isom_N1_N2.
+    :param randomNodes: a boolean value, determining whether the random version of this algorithm is used.
+    :param seed: a seed for the random number generator.
+    :param frontier2: a HighestNodeFrontier of N2 and isom_N2_N1, used to find the tree nodes of N2 that are not in the isomorphism without scanning N2.
+    :return: a list of head moves in N1, a list of head moves in N2, a node of N1, a node of N2. After performing the lists of moves on the networks, the nodes can be added to the isomorphism.
+    """
+    p_1 = N1.parent(x_1)
+    p_2 = isom_N1_N2[p_1]
+    x_2 = N2.child(p_2, exclude=isom_N2_N1, randomNodes=randomNodes, seed=seed)
+    # Case tree node: x_2 can be added directly
+    if N2.out_degree(x_2) == 2:
+        return [], [], x_1, x_2
+    # Case reticulation
+    if N2.in_degree(x_2) == 2:
+        c_2 = _find_tree_node(N2, isom_N2_N1, frontier2, randomNodes, seed)
+        t_2 = N2.parent(c_2)
+        b_2 = N2.child(c_2, exclude=[x_2], randomNodes=randomNodes, seed=seed)
+        # Not in the algorithm, just a minor improvement:
+        # if the other child c_2 of p_2 is a tree node, then we can add it.
+        if p_2 == t_2:
+            return [], [], x_1, c_2
+        if check_movable(N2, (p_2, x_2), x_2):
+            q_2 = N2.parent(x_2, exclude=[p_2])
+            if x_2 == t_2:
+                return [], [((q_2, x_2), (c_2, b_2))], x_1, c_2
+            return [], [((p_2, x_2), (t_2, c_2)), ((t_2, x_2), (c_2, b_2))], x_1, c_2
+        # (p_2,x_2) is not movable, so x_2 is the side of a triangle with its other parent z_2 and child d_2
+        d_2 = N2.child(x_2)
+        z_2 = N2.parent(x_2, exclude=[p_2])
+        # Find a leaf with parent not equal to d_2
+        l_2 = FindLeaf(N2, excludedParents=[d_2], randomNodes=randomNodes, seed=seed)
+        w_2 = N2.parent(l_2)
+        if l_2 == b_2:
+            # after the first move, b_2 is not a child of c_2 anymore,
+            # so we take the other child of c_2 as b_2
+            b_2 = N2.child(c_2, exclude=[l_2, x_2], randomNodes=randomNodes, seed=seed)
+        if d_2 == t_2:
+            # after the first move, x_2 is the parent of c_2
+            return (
+                [],
+                [((z_2, d_2), (w_2, l_2)), ((z_2, x_2), (c_2, b_2))],
+                x_1,
+                c_2,
+            )
+        return (
+            [],
+            [
+                ((z_2, d_2), (w_2, l_2)),
+                ((p_2, x_2), (t_2, c_2)),
+                ((t_2, x_2), (c_2, b_2)),
+            ],
+            x_1,
+            c_2,
+        )
+    # Case leaf
+    c_2 = _find_tree_node(N2, isom_N2_N1, frontier2, randomNodes, seed)
+    t_2 = N2.parent(c_2)
+    if p_2 == t_2:
+        return [], [], x_1, c_2
+    # Find a reticulation arc (s_2,r_2) that can be moved to (p_2,x_2)
+    # No randomness required, because this arc will end up at its original position again.
+    s_2, r_2 = _movable_reticulation_arc(N2, exclude_parents=[p_2])
+    q_2 = N2.parent(r_2, exclude=[s_2])
+    w_2 = N2.child(r_2)
+    if r_2 == p_2:
+        if s_2 == t_2:
+            return [], [((q_2, p_2), (t_2, c_2))], x_1, c_2
+        if q_2 == t_2:
+            return [], [((s_2, p_2), (t_2, c_2))], x_1, c_2
+        return (
+            [],
+            [
+                ((s_2, p_2), (t_2, c_2)),
+                ((t_2, p_2), (q_2, x_2)),
+                ((q_2, p_2), (s_2, c_2)),
+            ],
+            x_1,
+            c_2,
+        )
+    if r_2 == t_2:
+        if p_2 == q_2:
+            return [], [((s_2, r_2), (p_2, x_2))], x_1, c_2
+        return (
+            [],
+            [
+                ((s_2, r_2), (p_2, x_2)),
+                ((p_2, r_2), (q_2, c_2)),
+                ((q_2, r_2), (s_2, x_2)),
+            ],
+            x_1,
+            c_2,
+        )
+    if s_2 != t_2:
+        return (
+            [],
+            [
+                ((s_2, r_2), (p_2, x_2)),
+                ((p_2, r_2), (t_2, c_2)),
+                ((t_2, r_2), (s_2, x_2)),
+                ((s_2, r_2), (q_2, w_2)),
+            ],
+            x_1,
+            c_2,
+        )
+    return (
+        [],
+        [
+            ((s_2, r_2), (p_2, x_2)),
+            ((p_2, r_2), (s_2, c_2)),
+            ((s_2, r_2), (q_2, w_2)),
+        ],
+        x_1,
+        c_2,
+    )
+
+
+@py_random_state("seed")
+def RL_Case3(N1, N2, x_1, isom_N1_N2, isom_N2_N1, randomNodes=False, seed=None):
+    """
+    An implementation of Algorithm 8. Finds a sequence of head moves that makes it possible to add the highest reticulation x_1 to the up-closed isomorphism.
+
+    :param N1: a phylogenetic network.
+    :param N2: a phylogenetic network.
+    :param x_1: a highest reticulation of N1 below the isomorphism.
+    :param isom_N1_N2: a dictionary, containing a partial (up-closed) isomorphism map from N1 to N2. The inverse of isom_N2_N1.
+    :param isom_N2_N1: a dictionary, containing a partial (up-closed) isomorphism map from N2 to N1. The inverse of isom_N1_N2.
+    :param randomNodes: a boolean value, determining whether the random version of this algorithm is used.
+    :param seed: a seed for the random number generator.
+    :return: a list of head moves in N1, a list of head moves in N2, a node of N1, a node of N2. After performing the lists of moves on the networks, the nodes can be added to the isomorphism. The nodes are None if this case does not give a sequence.
+    """
+    p_1 = N1.parent(x_1)
+    q_1 = N1.parent(x_1, exclude=[p_1])
+    p_2 = isom_N1_N2[p_1]
+    cp_2 = N2.child(p_2, exclude=isom_N2_N1, randomNodes=randomNodes, seed=seed)
+    q_2 = isom_N1_N2[q_1]
+    cq_2 = N2.child(q_2, exclude=isom_N2_N1, randomNodes=randomNodes, seed=seed)
+
+    # The proof does not provide a sequence when at least one of the nodes cp_2 or cq_2 is a tree node
+    # TODO: If one of (p_2,cp_2) or (q_2,cq_2) is movable, we can still do something quite similar to what follows in the last case
+    if N2.out_degree(cp_2) == 2 or N2.out_degree(cq_2) == 2:
+        return [], [], None, None
+    # Case3ai
+    if cp_2 == cq_2:
+        return [], [], x_1, cp_2
+    # Case3av: both are leaves
+    if N2.out_degree(cp_2) == 0 and N2.out_degree(cq_2) == 0:
+        # Find a head-movable arc (s_2,r_2),
+        # each reticulation has a movable incoming arc, so we pick a random reticulation and a random movable arc into it
+        r_2 = FindRetic(N2, excludedSet=isom_N2_N1, randomNodes=randomNodes, seed=seed)
+        s_2 = None
+        for parent in N2.predecessors(r_2):
+            if check_movable(N2, (parent, r_2), r_2):
+                if not randomNodes:
+                    s_2 = parent
+                    break
+                elif s_2 is None or seed.getrandbits(1):
+                    s_2 = parent
+        if s_2 == p_2:
+            return [], [((s_2, r_2), (q_2, cq_2)), ((q_2, r_2), (p_2, cp_2))], x_1, r_2
+        return [], [((s_2, r_2), (p_2, cp_2)), ((p_2, r_2), (q_2, cq_2))], x_1, r_2
+    # Cases 3a(ii, iii, iv): at least one of them is not a leaf
+    if has_path(N2, cq_2, cp_2) or N2.out_degree(cp_2) == 0:
+        # Swap p and q
+        q_2, p_2 = p_2, q_2
+        cp_2, cq_2 = cq_2, cp_2
+    if check_movable(N2, (p_2, cp_2), cp_2):
+        return [], [((p_2, cp_2), (q_2, cq_2))], x_1, cp_2
+    z = N2.child(cp_2)
+    t = N2.parent(cp_2, exclude=[p_2])
+    if t == q_2:
+        return [], [], x_1, cp_2
+    return [], [((cp_2, z), (q_2, cq_2)), ((t, cp_2), (z, cq_2))], x_1, z
+
+
+def _find_tree_node(network, isom, frontier, randomNodes, seed):
+    """
+    Finds a (random) tree node of the network that is not in the isomorphism,
+    with the frontier if it is given, and otherwise by scanning the network.
+    """
+    if frontier is None:
+        return FindTreeNode(
+            network, excludedSet=isom, randomNodes=randomNodes, seed=seed
+        )
+    return frontier.tree_node(randomNodes=randomNodes, seed=seed)
+
+
+def _movable_reticulation_arc(network, exclude_parents=[]):
+    """
+    Finds the first reticulation of the network with a movable incoming arc,
+    whose tail is not in exclude_parents.
+
+    :param network: a phylogenetic network.
+    :param exclude_parents: a set of nodes of the network.
+    :return: a reticulation arc (s,r) whose head r is movable, or (None, None) if there is none.
+    """
+    for node in network.nodes:
+        if network.in_degree(node) == 2:
+            arc = (None, None)
+            for parent in network.predecessors(node):
+                if parent not in exclude_parents and check_movable(
+                    network, (parent, node), node
+                ):
+                    arc = (parent, node)
+            if arc[0] is not None:
+                return arc
+    return None, None
+
+
+def Permute_Leaves_Head(network1, network2, isom_1_2, isom_2_1):
+    """
+    Based on Algorithm 9. Determines a sequence of head moves that makes two isomorphic networks labeled isomorphic.
+    The moves are applied to network1 in place.
+
+    The leaves are permuted with a movable reticulation arc (t,r): the head r is moved along each cycle of the permutation,
+    and each move drops the leaf below r into the place of the previous leaf of the cycle.
+    At the end, r is put back at its original position, so the other nodes keep their place in the isomorphism.
+
+    :param network1: a phylogenetic network, which is modified in place.
+    :param network2: a phylogenetic network.
+    :param isom_1_2: a dictionary, containing an isomorphism map from network1 to network2. The inverse of isom_2_1.
+    :param isom_2_1: a dictionary, containing an isomorphism map from network2 to network1. The inverse of isom_1_2.
+    :return: a list of head moves that turns network1 into a network that is labeled isomorphic to network2.
+    """
+    sequence = []
+
+    def move_head(moving_edge, target):
+        move = Move(
+            move_type=MoveType.HEAD,
+            moving_edge=moving_edge,
+            target=target,
+            network=network1,
+        )
+        apply_move_inplace(network1, move)
+        sequence.append(move)
+
+    # The arc (t,r) is used to permute the leaves, s is the other parent of r and c its child
+    t, r = _movable_reticulation_arc(network1)
+    s = network1.parent(r, exclude=[t])
+    c = network1.child(r)
+
+    # The place of a leaf is its parent in the network without r, so the place of c is s.
+    # The leaf that ends up below r is c_last.
+    leaves = [node for node in network1.nodes if network1.out_degree(node) == 0]
+    position = {}
+    destination = {}
+    c_last = c
+    for leaf in leaves:
+        parent = network1.parent(leaf)
+        position[leaf] = s if parent == r else parent
+        [leaf_2] = network2.labels[network1.nodes[leaf][LABEL_ATTR]]
+        parent = isom_2_1[network2.parent(leaf_2)]
+        if parent == r:
+            c_last = leaf
+        destination[leaf] = s if parent == r else parent
+    moving = [leaf for leaf in leaves if position[leaf] != destination[leaf]]
+
+    # Pair each moving leaf with the moving leaf that takes its place.
+    # Two leaves with the same parent can be swapped without moves, so a leaf never takes the place of its sibling.
+    incoming = {}
+    for leaf in moving:
+        incoming.setdefault(destination[leaf], []).append(leaf)
+    successor = {leaf: incoming[position[leaf]].pop() for leaf in moving}
+
+    # Find the cycles of the permutation, starting with the cycle of c, because r is already above c
+    cycles = []
+    in_cycle = set()
+    for start in ([c] if c in successor else []) + moving:
+        if start in in_cycle:
+            continue
+        cycle = [start]
+        while successor[cycle[-1]] != start:
+            cycle.append(successor[cycle[-1]])
+        in_cycle.update(cycle)
+        if start != c:
+            # r cannot be moved to the other child of t
+            first = [position[leaf] != t for leaf in cycle].index(True)
+            cycle = cycle[first:] + cycle[:first]
+        cycles.append(cycle)
+
+    for cycle in cycles:
+        # Move r above the first leaf of the cycle, the leaf that was below r drops into its place
+        if cycle[0] != c:
+            move_head((t, r), (network1.parent(cycle[0]), cycle[0]))
+        # Move r along the cycle, each leaf drops into the place of the previous leaf
+        for previous, leaf in zip(cycle, cycle[1:]):
+            move_head((position[previous], r), (network1.parent(leaf), leaf))
+        # Close the cycle by moving r back below t, above the first leaf of the cycle,
+        # unless the last leaf of the cycle is already below t
+        if position[cycle[-1]] != t:
+            move_head((position[cycle[-1]], r), (t, cycle[0]))
+
+    # Put the moving arc back to its original position, above c_last
+    if not (network1.child(r) == c_last and network1.has_edge(s, r)):
+        move_head((t, r), (s, c_last))
+    return sequence
+
+
+def _apply_head_moves(frontier, moves):
+    """
+    Applies head moves, given as pairs (moving_edge, target), to the network of a frontier in place.
+
+    :param frontier: a HighestNodeFrontier.
+    :param moves: a list of pairs (moving_edge, target).
+    :return: the list of applied moves (phylox.rearrangement.move.Move).
+    """
+    applied = []
+    for moving_edge, target in moves:
+        move = Move(
+            move_type=MoveType.HEAD,
+            moving_edge=moving_edge,
+            target=target,
+            network=frontier.network,
+        )
+        frontier.apply_move_sequence([move])
+        applied.append(move)
+    return applied
+
+
+class RedLineHeuristicMixin:
+    """
+    A class containing the Red Line heuristic and its random version.
+    Meant to be inherited by the RearrangementProblem class.
+    """
+
+    def check_red_line_requirements(self):
+        if not self.move_type in [MoveType.HEAD, MoveType.RSPR, MoveType.ALL]:
+            raise Exception("Move type not supported by Red Line heuristic")
+        if not is_binary(self.network1) or not is_binary(self.network2):
+            raise Exception("Red Line heuristic only works for binary networks")
+        if not is_leaf_labeled_single_root_network(
+            self.network1
+        ) or not is_leaf_labeled_single_root_network(self.network2):
+            raise Exception(
+                "Red Line heuristic only works for leaf-labeled networks with a single root"
+            )
+        if not len(self.network1.leaves) == len(self.network1.labels) or not len(
+            self.network2.leaves
+        ) == len(self.network2.labels):
+            raise Exception(
+                "Red Line heuristic only works for networks with unique labels"
+            )
+        if set(self.network1.labels) != set(self.network2.labels):
+            raise Exception(
+                "Red Line heuristic only works for networks with the same set of labels"
+            )
+        if self.network1.reticulation_number != self.network2.reticulation_number:
+            raise Exception(
+                "Red Line heuristic only works for networks with the same number of reticulations"
+            )
+        if self.network1.reticulation_number == 0:
+            raise Exception(
+                "Red Line heuristic only works for networks with at least one reticulation"
+            )
+
+    def heuristic_red_line(self):
+        """
+        An implementation of Algorithm 10. Finds a sequence of head moves from network1 to network2 by building an up-closed isomorphism.
+        Assumes the networks have the same leaf set, the same number of reticulations (at least one), are both binary, and all labels are unique.
+
+        :return: A list of head moves from network1 to network2. Returns False if such a sequence does not exist.
+
+        :example:
+        >>> from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+        >>> from phylox.rearrangement.movetype import MoveType
+        >>> from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+        >>> network1 = generate_network_random_tree_child_sequence(10, 3, seed=1)
+        >>> network2 = generate_network_random_tree_child_sequence(10, 3, seed=2)
+        >>> problem = RearrangementProblem(network1, network2, MoveType.HEAD)
+        >>> sequence = problem.heuristic_red_line()
+        >>> problem.check_solution(sequence)
+        True
+        """
+        return self._red_line()
+
+    @py_random_state("seed")
+    def heuristic_red_line_random(self, seed=None):
+        """
+        An implementation of Algorithm 11. Finds a sequence of head moves from network1 to network2 by randomly building an up-closed isomorphism.
+        Assumes the networks have the same leaf set, the same number of reticulations (at least one), are both binary, and all labels are unique.
+
+        :param seed: a seed for the random number generator.
+        :return: A list of head moves from network1 to network2. Returns False if such a sequence does not exist.
+        """
+        return self._red_line(randomNodes=True, seed=seed)
+
+    def _red_line(self, randomNodes=False, seed=None):
+        self.check_red_line_requirements()
+
+        # Find the root of the networks
+        root1 = list(self.network1.roots)[0]
+        root2 = list(self.network2.roots)[0]
+
+        # Check if the roots are of the same type
+        if self.network1.out_degree(root1) != self.network2.out_degree(root2):
+            return False
+
+        # initialize isomorphism
+        isom_1_2 = {root1: root2}
+        isom_2_1 = {root2: root1}
+        isom_size = 1
+
+        # Keep track of the size of the isomorphism and the size it is at the end of the red line algorithm
+        goal_size = len(self.network1) - len(self.network1.labels)
+
+        # lists of head moves
+        seq_from_1 = []
+        seq_from_2 = []
+
+        # keep track of the highest nodes below the isomorphism,
+        # the moves are applied in place to one copy of each network
+        frontier1 = HighestNodeFrontier(_working_copy(self.network1), isom_1_2)
+        frontier2 = HighestNodeFrontier(_working_copy(self.network2), isom_2_1)
+        network1 = frontier1.network
+        network2 = frontier2.network
+
+        # Do the red line algorithm
+        while isom_size < goal_size:
+            if randomNodes:
+                # Construct a list of all highest nodes in a tuple with the corresponding network (in random order)
+                # I.e. If u is a highest node of network one, it will appear in the list as (u,1)
+                candidate_highest_nodes = [
+                    (u, 1)
+                    for u in frontier1.highest_tree_nodes()
+                    + frontier1.highest_reticulations()
+                ] + [
+                    (u, 2)
+                    for u in frontier2.highest_tree_nodes()
+                    + frontier2.highest_reticulations()
+                ]
+                seed.shuffle(candidate_highest_nodes)
+            else:
+                # Take the first highest tree node of network1, then of network2, and otherwise the first highest reticulation of network1
+                candidate_highest_nodes = [
+                    (node, network_number)
+                    for node, network_number in [
+                        (frontier1.highest_tree_node(), 1),
+                        (frontier2.highest_tree_node(), 2),
+                        (frontier1.highest_reticulation(), 1),
+                    ]
+                    if node is not None
+                ][:1]
+
+            # As some cases do not give an addition to the isom, we continue trying highest nodes until we find one that does.
+            added_node_network1 = None
+            for highest_node, network_number in candidate_highest_nodes:
+                if network_number == 1:
+                    N1, N2, isom_N1_N2, isom_N2_N1 = network1, network2, isom_1_2, isom_2_1
+                    frontier_N2 = frontier2
+                else:
+                    N1, N2, isom_N1_N2, isom_N2_N1 = network2, network1, isom_2_1, isom_1_2
+                    frontier_N2 = frontier1
+                # Case1 and Case2: a highest tree node
+                if N1.in_degree(highest_node) == 1:
+                    (
+                        moves_network_1,
+                        moves_network_2,
+                        added_node_network1,
+                        added_node_network2,
+                    ) = RL_Case1(
+                        N1,
+                        N2,
+                        highest_node,
+                        isom_N1_N2,
+                        isom_N2_N1,
+                        randomNodes=randomNodes,
+                        seed=seed,
+                        frontier2=frontier_N2,
+                    )
+                # Case3 and Case3': a highest reticulation
+                else:
+                    (
+                        moves_network_1,
+                        moves_network_2,
+                        added_node_network1,
+                        added_node_network2,
+                    ) = RL_Case3(
+                        N1,
+                        N2,
+                        highest_node,
+                        isom_N1_N2,
+                        isom_N2_N1,
+                        randomNodes=randomNodes,
+                        seed=seed,
+                    )
+                if network_number == 2:
+                    moves_network_1, moves_network_2 = moves_network_2, moves_network_1
+                    added_node_network1, added_node_network2 = (
+                        added_node_network2,
+                        added_node_network1,
+                    )
+                if added_node_network1 is not None:
+                    break
+            if added_node_network1 is None:
+                return False
+
+            # Now perform the moves and update the isomorphism
+            seq_from_1 += _apply_head_moves(frontier1, moves_network_1)
+            seq_from_2 += _apply_head_moves(frontier2, moves_network_2)
+            isom_1_2[added_node_network1] = added_node_network2
+            isom_2_1[added_node_network2] = added_node_network1
+            frontier1.add(added_node_network1)
+            frontier2.add(added_node_network2)
+            isom_size += 1
+
+        # Add the leaves to the isomorphism
+        for node_1 in network1.nodes:
+            if network1.out_degree(node_1) == 0:
+                parent_2 = isom_1_2[network1.parent(node_1)]
+                node_2 = network2.child(parent_2, exclude=isom_2_1)
+                isom_1_2[node_1] = node_2
+                isom_2_1[node_2] = node_1
+
+        # Permute the leaves
+        seq_permute = Permute_Leaves_Head(network1, network2, isom_1_2, isom_2_1)
+        # After the permutation, the leaves of network2 correspond to the leaves of network1 with the same label
+        for label, [node_2] in network2.labels.items():
+            isom_2_1[node_2] = network1.labels[label][0]
+
+        # invert seq_from_2, rename to node names of network1, and append to seq_from_1
+        return (
+            seq_from_1
+            + seq_permute
+            + [move.invert().rename_nodes(isom_2_1) for move in reversed(seq_from_2)]
+        )
@@ -1,6 +1,13 @@
+import bisect
+import heapq
+from copy import deepcopy
+
 import networkx as nx
 from networkx.utils.decorators import py_random_state
 
+from phylox.rearrangement.move import apply_move_inplace
+from phylox.rearrangement.reachability import ReachabilityIndex
+
 
 # Returns all nodes below a given node (including the node itself)
 def AllBelow(network, node):
@@ -56,6 +63,266 @@ def LowestReticAndTreeNodeAbove(network, excludedSet, allnodes=False):
     return tree_node, retic
 
 
+def _working_copy(network):
+    """
+    Returns a copy of a network that a heuristic can modify in place,
+    with a reachability index for the validity checks of the moves.
+    """
+    copy = deepcopy(network)
+    ReachabilityIndex.attach(copy)
+    return copy
+
+
+class _NodeFrontier(object):
+    """
+    Keeps track of the nodes of a network that are not in a growing set of nodes,
+    but that have all their relatives (children or parents) in the set.
+    Subclasses set the relatives with `_relatives` and `_others`, the names of the networkx methods that
+    give the relatives of a node and the nodes it is a relative of, and `_changed`,
+    the index of the endpoint of the origin and target of a move whose relatives change.
+    """
+
+    _relatives = None
+    _others = None
+    _changed = None
+
+    def __init__(self, network, mapped):
+        self.network = network
+        self.mapped = mapped
+        # nodes are ordered as in the network, so that the first node is the one the scanning functions find
+        self._position = {node: position for position, node in enumerate(network.nodes)}
+        self._unmapped_relatives = {}
+        self._frontier = {}
+        self._queues = {"tree node": [], "reticulation": []}
+        for node in network.nodes:
+            if node not in mapped:
+                self._update(node)
+
+    def add(self, node):
+        """
+        Updates the frontier after node is added to the set of mapped nodes.
+
+        :param node: a node of the network that is now in mapped.
+        :return: None
+        """
+        self._unmapped_relatives.pop(node, None)
+        self._frontier.pop(node, None)
+        for other in getattr(self.network, self._others)(node):
+            if other not in self.mapped:
+                self._unmapped_relatives[other] -= 1
+                if self._unmapped_relatives[other] == 0:
+                    self._update_frontier(other)
+
+    def apply_move_sequence(self, moves):
+        """
+        Applies a sequence of tail and head moves to the network of the frontier in place, and updates the frontier.
+
+        :param moves: a list of moves (phylox.rearrangement.move.Move).
+        :return: None
+        """
+        for move in moves:
+            apply_move_inplace(self.network, move)
+            # the nodes whose relatives change
+            for node in [
+                move.origin[self._changed],
+                move.moving_node,
+                move.target[self._changed],
+            ]:
+                if node not in self.mapped:
+                    self._update(node)
+
+    def _update(self, node):
+        self._unmapped_relatives[node] = sum(
+            1
+            for relative in getattr(self.network, self._relatives)(node)
+            if relative not in self.mapped
+        )
+        self._update_frontier(node)
+
+    def _update_frontier(self, node):
+        kind = None
+        if self._unmapped_relatives[node] == 0:
+            if self.network.out_degree(node) == 2:
+                kind = "tree node"
+            elif self.network.in_degree(node) == 2:
+                kind = "reticulation"
+        if kind == self._frontier.get(node):
+            return
+        if kind is None:
+            del self._frontier[node]
+            return
+        self._frontier[node] = kind
+        if node not in self._position:
+            self._position[node] = len(self._position)
+        heapq.heappush(self._queues[kind], (self._position[node], node))
+
+    def _first(self, kind):
+        # entries of nodes that are no longer in the frontier as this kind are removed lazily
+        queue = self._queues[kind]
+        while queue:
+            node = queue[0][1]
+            if self._frontier.get(node) == kind:
+                return node
+            heapq.heappop(queue)
+        return None
+
+    def _all(self, kind):
+        return sorted(
+            [node for node, node_kind in self._frontier.items() if node_kind == kind],
+            key=self._position.get,
+        )
+
+
+class LowestNodeFrontier(_NodeFrontier):
+    """
+    Keeps track of the lowest tree nodes and lowest reticulations of a network above a growing set of nodes,
+    i.e., the nodes returned by LowestReticAndTreeNodeAbove, without scanning the whole network each time.
+    For each node not in the set, the number of its children that are not in the set is stored,
+    and the nodes for which this number is zero are the lowest nodes.
+    The frontier owns its network: moves are applied to it in place with `apply_move_sequence`,
+    and nodes are added to the set with `add`.
+
+    :param network: a phylogenetic network, which is modified by `apply_move_sequence`.
+    :param mapped: a set or dictionary of nodes of the network, must include all leaves.
+        It is not copied, so the frontier sees nodes that are added to it, which must then be passed to `add`.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.heuristics.utils import LowestNodeFrontier
+    >>> network = DiNetwork(edges=[(0,1),(1,2),(1,3),(2,3),(2,4),(3,5)])
+    >>> mapped = {4: None, 5: None}
+    >>> frontier = LowestNodeFrontier(network, mapped)
+    >>> frontier.lowest_tree_node(), frontier.lowest_reticulation()
+    (None, 3)
+    >>> mapped[3] = None
+    >>> frontier.add(3)
+    >>> frontier.lowest_tree_node(), frontier.lowest_reticulation()
+    (2, None)
+    """
+
+    _relatives = "successors"
+    _others = "predecessors"
+    _changed = 0
+
+    def lowest_tree_node(self):
+        """
+        Returns the first lowest tree node in the order of the nodes of the network, or None if there is none.
+        """
+        return self._first("tree node")
+
+    def lowest_reticulation(self):
+        """
+        Returns the first lowest reticulation in the order of the nodes of the network, or None if there is none.
+        """
+        return self._first("reticulation")
+
+    def lowest_tree_nodes(self):
+        """
+        Returns a list of all lowest tree nodes, in the order of the nodes of the network.
+        """
+        return self._all("tree node")
+
+    def lowest_reticulations(self):
+        """
+        Returns a list of all lowest reticulations, in the order of the nodes of the network.
+        """
+        return self._all("reticulation")
+
+
+class HighestNodeFrontier(_NodeFrontier):
+    """
+    Keeps track of the highest tree nodes and highest reticulations of a network below a growing set of nodes,
+    i.e., the nodes returned by HighestNodesBelow, without scanning the whole network each time.
+    For each node not in the set, the number of its parents that are not in the set is stored,
+    and the nodes for which this number is zero are the highest nodes.
+    The frontier owns its network: moves are applied to it in place with `apply_move_sequence`,
+    and nodes are added to the set with `add`.
+
+    :param network: a phylogenetic network, which is modified by `apply_move_sequence`.
+    :param mapped: a set or dictionary of nodes of the network, must include the root.
+        It is not copied, so the frontier sees nodes that are added to it, which must then be passed to `add`.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.heuristics.utils import HighestNodeFrontier
+    >>> network = DiNetwork(edges=[(0,1),(1,2),(1,3),(2,3),(2,4),(3,5)])
+    >>> mapped = {0: None, 1: None}
+    >>> frontier = HighestNodeFrontier(network, mapped)
+    >>> frontier.highest_tree_node(), frontier.highest_reticulation()
+    (2, None)
+    >>> mapped[2] = None
+    >>> frontier.add(2)
+    >>> frontier.highest_tree_node(), frontier.highest_reticulation()
+    (None, 3)
+    """
+
+    _relatives = "predecessors"
+    _others = "successors"
+    _changed = 1
+
+    def __init__(self, network, mapped):
+        super().__init__(network, mapped)
+        # the positions of the tree nodes that are not in the set, in increasing order
+        self._nodes = list(network.nodes)
+        self._unmapped_tree_nodes = [
+            position
+            for position, node in enumerate(self._nodes)
+            if node not in mapped
+            and network.out_degree(node) == 2
+            and network.in_degree(node) == 1
+        ]
+
+    def add(self, node):
+        super().add(node)
+        position = self._position[node]
+        index = bisect.bisect_left(self._unmapped_tree_nodes, position)
+        if (
+            index < len(self._unmapped_tree_nodes)
+            and self._unmapped_tree_nodes[index] == position
+        ):
+            del self._unmapped_tree_nodes[index]
+
+    @py_random_state("seed")
+    def tree_node(self, randomNodes=False, seed=None):
+        """
+        Finds a (random) tree node that is not in the set, like FindTreeNode,
+        without scanning the network: the tree nodes do not change when head moves are applied.
+
+        :param randomNodes: a boolean value.
+        :param seed: a seed for the random number generator.
+        :return: the first tree node not in the set in the order of the nodes of the network, or None if no such node exists. If randomNodes, then a tree node is selected from all candidates uniformly at random.
+        """
+        if not self._unmapped_tree_nodes:
+            return None
+        if randomNodes:
+            return self._nodes[seed.choice(self._unmapped_tree_nodes)]
+        return self._nodes[self._unmapped_tree_nodes[0]]
+
+    def highest_tree_node(self):
+        """
+        Returns the first highest tree node in the order of the nodes of the network, or None if there is none.
+        """
+        return self._first("tree node")
+
+    def highest_reticulation(self):
+        """
+        Returns the first highest reticulation in the order of the nodes of the network, or None if there is none.
+        """
+        return self._first("reticulation")
+
+    def highest_tree_nodes(self):
+        """
+        Returns a list of all highest tree nodes, in the order of the nodes of the network.
+        """
+        return self._all("tree node")
+
+    def highest_reticulations(self):
+        """
+        Returns a list of all highest reticulations, in the order of the nodes of the network.
+        """
+        return self._all("reticulation")
+
+
 def HighestNodesBelow(network, excludedSet, allnodes=False):
     """
     Finds a list of highest tree nodes and a list of highest reticulation nodes below a given set of nodes.
@@ -138,7 +405,7 @@ def FindLeaf(network, excludedSet=[], excludedParents=[], randomNodes=False, see
     """
     all_found = []
     for node in network.nodes():
-        parent = Parent(network, node)
+        parent = network.parent(node)
         if (
             network.out_degree(node) == 0
             and parent not in excludedParents
@@ -7,10 +7,9 @@ import time
 from collections import deque
 from copy import deepcopy
 
-import networkx as nx
-
 from phylox.exceptions import InvalidMoveDefinitionException, InvalidMoveException
 from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.reachability import has_path
 
 
 def check_valid(network, move):
@@ -51,13 +50,13 @@ def check_valid(network, move):
             raise InvalidMoveException("removal creates parallel edges")
 
         if move.is_type(MoveType.TAIL):
-            if nx.has_path(network, move.moving_edge[1], move.target[0]):
+            if has_path(network, move.moving_edge[1], move.target[0]):
                 raise InvalidMoveException("reattachment would create a cycle")
             if move.target[1] == move.moving_edge[1]:
                 raise InvalidMoveException("reattachment creates parallel edges")
             return
         # move.is_type(MoveType.HEAD)
-        if nx.has_path(network, move.target[1], move.moving_edge[0]):
+        if has_path(network, move.target[1], move.moving_edge[0]):
             raise InvalidMoveException("reattachment would create a cycle")
         if move.target[0] == move.moving_edge[0]:
             raise InvalidMoveException("reattachment creates parallel edges")
@@ -67,7 +66,7 @@ def check_valid(network, move):
         if move.end_node in network.nodes:
             raise InvalidMoveException("End node must not be in the network.")
         if (
-            nx.has_path(network, move.end_edge[1], move.start_edge[0])
+            has_path(network, move.end_edge[1], move.start_edge[0])
             or move.start_edge == move.end_edge
         ):
             raise InvalidMoveException("end node is reachable from start node")
@@ -1,4 +1,6 @@
+from bisect import bisect_right
 from copy import deepcopy
+from itertools import accumulate
 
 import numpy as np
 from networkx.utils.decorators import np_random_state
@@ -9,6 +11,13 @@ from phylox.exceptions import InvalidMoveDefinitionException, InvalidMoveExcepti
 from phylox.rearrangement.invertsequence import from_edge
 from phylox.rearrangement.movability import check_valid
 from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.reachability import (
+    REACHABILITY_INDEX_ATTR,
+    ReachabilityIndex,
+)
+
+# the tolerance of numpy's check that probabilities sum to 1
+_PROBABILITY_TOLERANCE = np.sqrt(np.finfo(np.float64).eps)
 
 
 def apply_move(network, move):
@@ -38,53 +47,295 @@ def apply_move(network, move):
     True
     """
     check_valid(network, move)
+    if _is_trivial_move(move):
+        return network
     new_network = deepcopy(network)
+    apply_move_inplace(new_network, move)
+    return new_network
+
+
+def apply_move_inplace(network, move):
+    """
+    Apply a move to the network in place.
+    Only the edges and nodes involved in the move are changed,
+    and the returned undo token can be used to revert the move with `undo_move`.
+
+    :param network: a phylogenetic network (phylox.DiNetwork).
+    :param move: a move (phylox.rearrangement.move.Move) to apply to the network.
+    :return: an undo token (phylox.rearrangement.move.UndoToken) for the move.
+    :exception: InvalidMoveException if the move is not valid, in which case the network is not changed.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.move import apply_move_inplace, undo_move, Move
+    >>> network = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,3),(2,4),(3,5)],
+    ... )
+    >>> move = Move(
+    ...     move_type=MoveType.VMIN,
+    ...     removed_edge=(2,3),
+    ... )
+    >>> token = apply_move_inplace(network, move)
+    >>> set(network.edges()) == {(0, 1), (1, 4), (1, 5)}
+    True
+    >>> undo_move(network, token)
+    >>> set(network.edges()) == {(0, 1), (1, 2), (1, 3), (2, 3), (2, 4), (3, 5)}
+    True
+    """
+    check_valid(network, move)
+    if _is_trivial_move(move):
+        return UndoToken(move)
 
     if move.move_type in [MoveType.TAIL, MoveType.HEAD]:
-        if move.moving_node in move.target:
-            # move does not impact the network
-            return network
-        new_network.remove_edges_from(
-            [
-                (move.origin[0], move.moving_node),
-                (move.moving_node, move.origin[1]),
-                move.target,
-            ]
-        )
-        new_network.add_edges_from(
-            [
-                (move.target[0], move.moving_node),
-                (move.moving_node, move.target[1]),
-                move.origin,
-            ]
+        removed_edges = [
+            (move.origin[0], move.moving_node),
+            (move.moving_node, move.origin[1]),
+            move.target,
+        ]
+        added_edges = [
+            (move.target[0], move.moving_node),
+            (move.moving_node, move.target[1]),
+            move.origin,
+        ]
+        token = UndoToken(
+            move,
+            removed_edges=[(u, v, network[u][v]) for u, v in removed_edges],
+            added_edges=added_edges,
         )
-        return new_network
+        network.remove_edges_from(removed_edges)
+        network.add_edges_from(added_edges)
+        return token
     elif move.move_type in [MoveType.VPLU]:
-        new_network.remove_edges_from([move.start_edge, move.end_edge])
-        new_network.add_edges_from(
-            [
-                (move.start_edge[0], move.start_node),
-                (move.start_node, move.start_edge[1]),
-                (move.end_edge[0], move.end_node),
-                (move.end_node, move.end_edge[1]),
-                (move.start_node, move.end_node),
-            ]
+        removed_edges = [move.start_edge, move.end_edge]
+        added_edges = [
+            (move.start_edge[0], move.start_node),
+            (move.start_node, move.start_edge[1]),
+            (move.end_edge[0], move.end_node),
+            (move.end_node, move.end_edge[1]),
+            (move.start_node, move.end_node),
+        ]
+        token = UndoToken(
+            move,
+            removed_edges=[(u, v, network[u][v]) for u, v in removed_edges],
+            added_edges=added_edges,
+            added_nodes=[move.start_node, move.end_node],
         )
-        if hasattr(new_network, "_reticulation_number"):
-            new_network._reticulation_number += 1
-        return new_network
+        network.remove_edges_from(removed_edges)
+        network.add_edges_from(added_edges)
+        return token
     elif move.move_type in [MoveType.VMIN]:
-        new_network.remove_edge(*move.removed_edge)
-        suppress_node(new_network, move.removed_edge[0])
-        suppress_node(new_network, move.removed_edge[1])
-        if hasattr(new_network, "_reticulation_number"):
-            new_network._reticulation_number -= 1
-        return new_network
-    elif move.move_type in [MoveType.NONE]:
-        return network
+        tail, head = move.removed_edge
+        parent_tail = network.parent(tail, exclude=[head])
+        child_tail = network.child(tail, exclude=[head])
+        parent_head = network.parent(head, exclude=[tail])
+        child_head = network.child(head, exclude=[tail])
+        removed_edges = [
+            (parent_tail, tail),
+            (tail, child_tail),
+            (parent_head, head),
+            (head, child_head),
+            move.removed_edge,
+        ]
+        token = UndoToken(
+            move,
+            removed_edges=[(u, v, network[u][v]) for u, v in removed_edges],
+            added_edges=[(parent_tail, child_tail), (parent_head, child_head)],
+            removed_nodes=[(tail, network.nodes[tail]), (head, network.nodes[head])],
+        )
+        network.remove_edge(tail, head)
+        suppress_node(network, tail)
+        suppress_node(network, head)
+        return token
     raise InvalidMoveException("only tail or head moves are currently valid.")
 
 
+def undo_move(network, token):
+    """
+    Reverts a move that was applied in place with `apply_move_inplace`.
+    The moves applied after this move must have been undone already.
+    Afterwards, the network has the same nodes, edges and attributes as before the move,
+    but the order in which they are iterated over may differ.
+
+    :param network: the phylogenetic network (phylox.DiNetwork) the move was applied to.
+    :param token: the undo token (phylox.rearrangement.move.UndoToken) returned by `apply_move_inplace`.
+    :return: void
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.move import apply_move_inplace, undo_move, Move
+    >>> network = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,4),(2,5),(3,6),(3,7)],
+    ... )
+    >>> move = Move(
+    ...     move_type=MoveType.VPLU,
+    ...     start_edge=(1,2),
+    ...     end_edge=(1,3),
+    ...     network=network,
+    ... )
+    >>> token = apply_move_inplace(network, move)
+    >>> network.reticulation_number
+    1
+    >>> undo_move(network, token)
+    >>> network.reticulation_number
+    0
+    """
+    network.remove_edges_from(token.added_edges)
+    network.remove_nodes_from(token.added_nodes)
+    network.add_nodes_from(token.removed_nodes)
+    network.add_edges_from(token.removed_edges)
+
+
+def _random_index(seed, n, p=None):
+    """
+    Draws a random index in range(n), with probabilities p if given.
+    For a numpy RandomState, the result is the same as that of seed.choice(n, p=p),
+    but without the overhead of the argument checks of choice.
+    """
+    if not isinstance(seed, np.random.RandomState):
+        return seed.choice(n, p=p)
+    if p is None:
+        return seed.randint(n)
+    cumulative = list(accumulate(p))
+    if len(cumulative) != n or abs(cumulative[-1] - 1) > _PROBABILITY_TOLERANCE:
+        return seed.choice(n, p=p)
+    total = cumulative[-1]
+    return bisect_right([value / total for value in cumulative], seed.random_sample())
+
+
+def _is_trivial_move(move):
+    """
+    Checks whether applying a (valid) move leaves the network unchanged.
+    """
+    return move.move_type == MoveType.NONE or (
+        move.move_type in [MoveType.TAIL, MoveType.HEAD]
+        and move.moving_node in move.target
+    )
+
+
+class UndoToken(object):
+    """
+    The changes made to a network by `apply_move_inplace`, used by `undo_move` to revert them.
+
+    :param move: the move (phylox.rearrangement.move.Move) that was applied.
+    :param removed_edges: the removed edges as tuples (u, v, attributes).
+    :param added_edges: the added edges as tuples (u, v).
+    :param removed_nodes: the removed nodes as tuples (node, attributes).
+    :param added_nodes: the added nodes.
+    """
+
+    __slots__ = ("move", "removed_edges", "added_edges", "removed_nodes", "added_nodes")
+
+    def __init__(
+        self,
+        move,
+        removed_edges=(),
+        added_edges=(),
+        removed_nodes=(),
+        added_nodes=(),
+    ):
+        self.move = move
+        self.removed_edges = removed_edges
+        self.added_edges = added_edges
+        self.removed_nodes = removed_nodes
+        self.added_nodes = added_nodes
+
+
+class EdgeIndex(object):
+    """
+    The edges of a network in an array, with the position of each edge in a dictionary,
+    so that an edge can be drawn by its index in constant time, e.g., by `Move.random_move`.
+    An edge is removed by moving the last edge of the array to its position,
+    so the index can be kept up to date with the moves applied to the network in constant time per move.
+
+    :param network: a phylogenetic network (phylox.DiNetwork).
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.move import EdgeIndex, Move, apply_move_inplace, undo_move
+    >>> network = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,3),(2,4),(3,5)],
+    ... )
+    >>> edges = EdgeIndex(network)
+    >>> len(edges), edges[0]
+    (6, (0, 1))
+    >>> move = Move(move_type=MoveType.VMIN, removed_edge=(2,3))
+    >>> token = apply_move_inplace(network, move)
+    >>> edges.apply(token)
+    >>> set(edges) == set(network.edges())
+    True
+    >>> undo_move(network, token)
+    >>> edges.undo(token)
+    >>> set(edges) == set(network.edges())
+    True
+    """
+
+    __slots__ = ("_edges", "_positions")
+
+    def __init__(self, network):
+        self._edges = list(network.edges())
+        self._positions = {edge: index for index, edge in enumerate(self._edges)}
+
+    def __len__(self):
+        return len(self._edges)
+
+    def __getitem__(self, index):
+        return self._edges[index]
+
+    def __iter__(self):
+        return iter(self._edges)
+
+    def __contains__(self, edge):
+        return edge in self._positions
+
+    def add(self, edge):
+        """
+        Adds an edge to the end of the array.
+
+        :param edge: a tuple (u, v).
+        :return: void
+        """
+        if edge not in self._positions:
+            self._positions[edge] = len(self._edges)
+            self._edges.append(edge)
+
+    def remove(self, edge):
+        """
+        Removes an edge, moving the last edge of the array to its position.
+
+        :param edge: a tuple (u, v).
+        :return: void
+        """
+        index = self._positions.pop(edge)
+        last = self._edges.pop()
+        if index < len(self._edges):
+            self._edges[index] = last
+            self._positions[last] = index
+
+    def apply(self, token):
+        """
+        Updates the index after a move is applied with `apply_move_inplace`.
+
+        :param token: the undo token (phylox.rearrangement.move.UndoToken) returned by `apply_move_inplace`.
+        :return: void
+        """
+        for u, v, _ in token.removed_edges:
+            self.remove((u, v))
+        for edge in token.added_edges:
+            self.add(edge)
+
+    def undo(self, token):
+        """
+        Updates the index after a move is reverted with `undo_move`.
+
+        :param token: the undo token (phylox.rearrangement.move.UndoToken) of the move.
+        :return: void
+        """
+        for edge in token.added_edges:
+            self.remove(edge)
+        for u, v, _ in token.removed_edges:
+            self.add((u, v))
+
+
 def apply_move_sequence(network, seq_moves):
     """
     Apply a sequence of moves to the network, not in place.
@@ -120,55 +371,143 @@ def apply_move_sequence(network, seq_moves):
     True
     """
 
+    network = deepcopy(network)
     for move in seq_moves:
-        network = apply_move(network, move)
+        apply_move_inplace(network, move)
     return network
 
 
-def _all_valid_tail_or_head_moves(network, move_type=MoveType.TAIL):
+def _reachability_bitsets(network):
+    """
+    Returns the descendant bitsets of a network (see `ReachabilityIndex.bitsets`),
+    from the reachability index attached to the network if it has one.
+    """
+    index = network.__dict__.get(REACHABILITY_INDEX_ATTR)
+    if index is None:
+        index = ReachabilityIndex(network)
+    return index.bitsets()
+
+
+def _ancestor_bitsets(network, bits):
+    """
+    Returns a dictionary mapping each node to the bitset of its ancestors (including itself).
+    """
+    ancestors = {}
+    remaining_parents = {node: len(parents) for node, parents in network._pred.items()}
+    order = [node for node, count in remaining_parents.items() if count == 0]
+    for node in order:
+        node_ancestors = 1 << bits[node]
+        for parent in network._pred[node]:
+            node_ancestors |= ancestors[parent]
+        ancestors[node] = node_ancestors
+        for child in network._succ[node]:
+            remaining_parents[child] -= 1
+            if remaining_parents[child] == 0:
+                order.append(child)
+    return ancestors
+
+
+def _weighted_size(bitset, weight_masks):
+    """
+    Returns the total weight of the nodes in a bitset,
+    where weight_masks maps each weight to the bitset of the nodes with that weight.
+    """
+    return sum(
+        weight * bin(bitset & mask).count("1") for weight, mask in weight_masks.items()
+    )
+
+
+def _degree_masks(degrees, bits):
+    """
+    Returns a dictionary mapping each degree to the bitset of the nodes with that degree.
+    """
+    masks = {}
+    for node, degree in degrees:
+        if degree:
+            masks[degree] = masks.get(degree, 0) | 1 << bits[node]
+    return masks
+
+
+def _movable_origin(network, moving_edge, move_type):
+    """
+    Returns the origin of a tail or head move of moving_edge,
+    or None if the endpoint cannot be moved (independent of the target).
+    """
+    moving_endpoint = moving_edge[0 if move_type == MoveType.TAIL else 1]
+    origin = from_edge(network, moving_edge, moving_endpoint=moving_endpoint)
+    if origin[0] is None or origin[1] is None or network.has_edge(*origin):
+        return None
+    return origin
+
+
+def _all_valid_tail_or_head_moves(network, move_type=MoveType.TAIL, as_tuples=False):
     if move_type not in [MoveType.TAIL, MoveType.HEAD]:
         raise InvalidMoveException("only tail or head moves are valid options.")
-    if move_type == MoveType.TAIL:
-        target_endpoint_index = 0
-    else:
-        target_endpoint_index = 1
-
-    for moving_edge in network.edges():
-        for target_edge in network.edges():
-            moving_endpoint_index = target_endpoint_index
-            moving_endpoint = moving_edge[moving_endpoint_index]
-            origin = from_edge(network, moving_edge, moving_endpoint=moving_endpoint)
-            try:
-                move = Move(
+
+    edges = list(network.edges())
+    bits, descendants = _reachability_bitsets(network)
+    for moving_edge in edges:
+        origin = _movable_origin(network, moving_edge, move_type)
+        if origin is None:
+            continue
+        if move_type == MoveType.TAIL:
+            # the target must not be below the moving edge
+            head = moving_edge[1]
+            head_descendants = descendants[head]
+            targets = [
+                target
+                for target in edges
+                if target[1] != head and not head_descendants >> bits[target[0]] & 1
+            ]
+        else:
+            # the target must not be above the moving edge
+            tail = moving_edge[0]
+            tail_bit = 1 << bits[tail]
+            targets = [
+                target
+                for target in edges
+                if target[0] != tail and not descendants[target[1]] & tail_bit
+            ]
+        for target in targets:
+            if as_tuples:
+                yield (move_type, origin, moving_edge, target)
+            else:
+                yield Move(
                     move_type=move_type,
                     origin=origin,
                     moving_edge=moving_edge,
-                    target=target_edge,
+                    target=target,
                 )
-                check_valid(network, move)
-            except (InvalidMoveException, InvalidMoveDefinitionException):
-                continue
-            yield move
 
 
-def _all_valid_vplu_moves(network):
-    for start_edge in network.edges:
-        for end_edge in network.edges:
-            try:
-                move = Move(
+def _all_valid_vplu_moves(network, as_tuples=False):
+    edges = list(network.edges())
+    bits, descendants = _reachability_bitsets(network)
+    start_node = network.find_unused_node()
+    end_node = network.find_unused_node(exclude=[start_node])
+    for start_edge in edges:
+        # the end edge must not be above the start edge
+        start_bit = 1 << bits[start_edge[0]]
+        end_edges = [
+            end_edge
+            for end_edge in edges
+            if end_edge != start_edge and not descendants[end_edge[1]] & start_bit
+        ]
+        for end_edge in end_edges:
+            if as_tuples:
+                yield (MoveType.VPLU, start_edge, end_edge, start_node, end_node)
+            else:
+                yield Move(
                     move_type=MoveType.VPLU,
                     start_edge=start_edge,
                     end_edge=end_edge,
-                    network=network,
+                    start_node=start_node,
+                    end_node=end_node,
                 )
-                check_valid(network, move)
-            except (InvalidMoveException, InvalidMoveDefinitionException) as e:
-                continue
-            yield move
 
 
-def _all_valid_vmin_moves(network):
-    for removed_edge in network.edges:
+def _all_valid_vmin_moves(network, as_tuples=False):
+    for removed_edge in list(network.edges):
         try:
             move = Move(
                 move_type=MoveType.VMIN,
@@ -177,16 +516,26 @@ def _all_valid_vmin_moves(network):
             check_valid(network, move)
         except (InvalidMoveException, InvalidMoveDefinitionException):
             continue
-        yield move
+        if as_tuples:
+            yield (MoveType.VMIN, removed_edge)
+        else:
+            yield move
 
 
-def all_valid_moves(network, move_type=MoveType.ALL):
+def all_valid_moves(network, move_type=MoveType.ALL, as_tuples=False):
     """
     Generates all possible valid moves for a given network and move type.
+    The moves are enumerated directly: the movable edges are determined once,
+    and the valid targets of each of them are found with descendant bitsets
+    (see phylox.rearrangement.reachability).
 
     :param network: a phylogenetic network (phylox.DiNetwork).
     :param move_type: the type of moves to generate (phylox.rearrangement.movetype.MoveType).
-    :yield: a move (phylox.rearrangement.move.Move).
+    :param as_tuples: if True, the moves are generated as tuples instead of Move objects:
+      (move_type, origin, moving_edge, target) for tail and head moves,
+      (move_type, start_edge, end_edge, start_node, end_node) for vplu moves,
+      and (move_type, removed_edge) for vmin moves. Use `Move.from_tuple` to convert such a tuple to a Move.
+    :yield: a move (phylox.rearrangement.move.Move), or a tuple if as_tuples is True.
 
     :example:
     >>> from phylox import DiNetwork
@@ -204,21 +553,95 @@ def all_valid_moves(network, move_type=MoveType.ALL):
     4
     >>> moves[0].is_type(MoveType.VPLU)
     True
+    >>> next(all_valid_moves(network, MoveType.TAIL, as_tuples=True))
+    (<MoveType.TAIL: 'TAIL'>, (0, 3), (1, 2), (0, 1))
     """
     if move_type in [MoveType.TAIL, MoveType.RSPR, MoveType.ALL]:
-        for move in _all_valid_tail_or_head_moves(network, move_type=MoveType.TAIL):
+        for move in _all_valid_tail_or_head_moves(
+            network, move_type=MoveType.TAIL, as_tuples=as_tuples
+        ):
             yield move
     if move_type in [MoveType.HEAD, MoveType.RSPR, MoveType.ALL]:
-        for move in _all_valid_tail_or_head_moves(network, move_type=MoveType.HEAD):
+        for move in _all_valid_tail_or_head_moves(
+            network, move_type=MoveType.HEAD, as_tuples=as_tuples
+        ):
             yield move
     if move_type in [MoveType.VPLU, MoveType.VERT, MoveType.ALL]:
-        for move in _all_valid_vplu_moves(network):
+        for move in _all_valid_vplu_moves(network, as_tuples=as_tuples):
             yield move
     if move_type in [MoveType.VMIN, MoveType.VERT, MoveType.ALL]:
-        for move in _all_valid_vmin_moves(network):
+        for move in _all_valid_vmin_moves(network, as_tuples=as_tuples):
             yield move
 
 
+def count_valid_moves(network, move_type=MoveType.ALL):
+    """
+    Counts the valid moves for a given network and move type,
+    i.e., the number of moves generated by `all_valid_moves`, without generating them.
+
+    :param network: a phylogenetic network (phylox.DiNetwork).
+    :param move_type: the type of moves to count (phylox.rearrangement.movetype.MoveType).
+    :return: the number of valid moves.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.move import count_valid_moves
+    >>> network = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3)],
+    ... )
+    >>> count_valid_moves(network, MoveType.TAIL)
+    4
+    >>> count_valid_moves(network, MoveType.VERT)
+    4
+    """
+    number_of_edges = network.number_of_edges()
+    if number_of_edges == 0:
+        return 0
+    bits, descendants = _reachability_bitsets(network)
+    count = 0
+    if move_type in [MoveType.TAIL, MoveType.RSPR, MoveType.ALL]:
+        # all edges except those into the head of the moving edge and those below it
+        out_degree_masks = _degree_masks(network.out_degree, bits)
+        for moving_edge in network.edges():
+            if _movable_origin(network, moving_edge, MoveType.TAIL) is not None:
+                head = moving_edge[1]
+                count += (
+                    number_of_edges
+                    - network.in_degree(head)
+                    - _weighted_size(descendants[head], out_degree_masks)
+                )
+    if move_type in [
+        MoveType.HEAD,
+        MoveType.VPLU,
+        MoveType.RSPR,
+        MoveType.VERT,
+        MoveType.ALL,
+    ]:
+        ancestors = _ancestor_bitsets(network, bits)
+        in_degree_masks = _degree_masks(network.in_degree, bits)
+    if move_type in [MoveType.HEAD, MoveType.RSPR, MoveType.ALL]:
+        # all edges except those out of the tail of the moving edge and those above it
+        for moving_edge in network.edges():
+            if _movable_origin(network, moving_edge, MoveType.HEAD) is not None:
+                tail = moving_edge[0]
+                count += (
+                    number_of_edges
+                    - network.out_degree(tail)
+                    - _weighted_size(ancestors[tail], in_degree_masks)
+                )
+    if move_type in [MoveType.VPLU, MoveType.VERT, MoveType.ALL]:
+        # all edges except the start edge and those above it
+        for start_edge in network.edges():
+            count += (
+                number_of_edges
+                - 1
+                - _weighted_size(ancestors[start_edge[0]], in_degree_masks)
+            )
+    if move_type in [MoveType.VMIN, MoveType.VERT, MoveType.ALL]:
+        count += sum(1 for _ in _all_valid_vmin_moves(network, as_tuples=True))
+    return count
+
+
 class Move(object):
     """
     A move is a rearrangement operation on a phylogenetic network.
@@ -321,6 +744,40 @@ class Move(object):
         else:
             raise InvalidMoveDefinitionException("Invalid move type.")
 
+    @classmethod
+    def from_tuple(cls, move_tuple):
+        """
+        Creates a move from a tuple, as generated by `all_valid_moves` with as_tuples=True.
+
+        :param move_tuple: a tuple describing a move.
+        :return: a move (phylox.rearrangement.move.Move).
+
+        :example:
+        >>> from phylox.rearrangement.move import Move
+        >>> move = Move.from_tuple((MoveType.TAIL, (0, 3), (1, 2), (0, 1)))
+        >>> move.moving_node
+        1
+        """
+        move_type = move_tuple[0]
+        if move_type in [MoveType.TAIL, MoveType.HEAD]:
+            return cls(
+                move_type=move_type,
+                origin=move_tuple[1],
+                moving_edge=move_tuple[2],
+                target=move_tuple[3],
+            )
+        if move_type == MoveType.VPLU:
+            return cls(
+                move_type=move_type,
+                start_edge=move_tuple[1],
+                end_edge=move_tuple[2],
+                start_node=move_tuple[3],
+                end_node=move_tuple[4],
+            )
+        if move_type == MoveType.VMIN:
+            return cls(move_type=move_type, removed_edge=move_tuple[1])
+        return cls(move_type=move_type)
+
     def is_type(self, move_type):
         """
         Checks if the move is of a given type.
@@ -420,7 +877,7 @@ class Move(object):
             )
         elif self.move_type == MoveType.VPLU:
             return Move(
-                move_type=self.VMIN,
+                move_type=MoveType.VMIN,
                 removed_edge=(self.start_node, self.end_node),
             )
         elif self.move_type == MoveType.VMIN:
@@ -431,7 +888,7 @@ class Move(object):
             start_edge = from_edge(network, self.removed_edge, self.removed_edge[0])
             end_edge = from_edge(network, self.removed_edge, self.removed_edge[1])
             return Move(
-                move_type=self.VPLU,
+                move_type=MoveType.VPLU,
                 start_edge=start_edge,
                 end_edge=end_edge,
                 start_node=self.removed_edge[0],
@@ -451,6 +908,7 @@ class Move(object):
             MoveType.VPLU: 0.1,
             MoveType.VMIN: 0.1,
         },
+        edges=None,
         seed=None,
     ):
         """
@@ -461,6 +919,9 @@ class Move(object):
         :param available_tree_nodes: a list of available tree nodes to use for the move.
         :param available_reticulations: a list of available reticulations to use for the move.
         :param move_type_probabilities: a dictionary of move type probabilities.
+        :param edges: the edges of the network as an indexable collection, e.g., an EdgeIndex
+            (phylox.rearrangement.move.EdgeIndex) that is kept up to date with the network.
+            If None, the edges are listed from the network.
         :return: a random move (phylox.rearrangement.move.Move).
 
         :example:
@@ -482,16 +943,19 @@ class Move(object):
 
         available_tree_nodes = available_tree_nodes or []
         available_reticulations = available_reticulations or []
-        edges = list(network.edges())
+        if edges is None:
+            edges = list(network.edges())
         num_edges = len(edges)
         move_type_probabilities_keys = list(move_type_probabilities.keys())
-        movetype_index = seed.choice(
-            len(move_type_probabilities_keys), p=tuple(move_type_probabilities.values())
+        movetype_index = _random_index(
+            seed,
+            len(move_type_probabilities_keys),
+            p=tuple(move_type_probabilities.values()),
         )
         movetype = move_type_probabilities_keys[movetype_index]
         if movetype in [MoveType.TAIL, MoveType.HEAD]:
-            moving_edge_index = seed.choice(num_edges)
-            target_index = seed.choice(num_edges - 1)
+            moving_edge_index = _random_index(seed, num_edges)
+            target_index = _random_index(seed, num_edges - 1)
             if target_index >= moving_edge_index:
                 target_index += 1
                 target_index %= num_edges
@@ -513,8 +977,8 @@ class Move(object):
             available_tree_nodes = list(available_tree_nodes) or [
                 network.find_unused_node(exclude=available_reticulations)
             ]
-            start_edge = edges[seed.choice(num_edges)]
-            end_edge = edges[seed.choice(num_edges)]
+            start_edge = edges[_random_index(seed, num_edges)]
+            end_edge = edges[_random_index(seed, num_edges)]
             start_node = seed.choice(available_tree_nodes)
             end_node = seed.choice(available_reticulations)
             return Move(
@@ -525,5 +989,5 @@ class Move(object):
                 end_node=end_node,
             )
         elif movetype == MoveType.VMIN:
-            removed_edge = edges[seed.choice(num_edges)]
+            removed_edge = edges[_random_index(seed, num_edges)]
             return Move(move_type=movetype, removed_edge=removed_edge)
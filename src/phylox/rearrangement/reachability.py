@@ -0,0 +1,213 @@
+"""
+A module with an index for reachability queries in phylogenetic networks.
+
+Checking whether a rearrangement move is valid requires checking whether the move creates a cycle,
+i.e., whether there is a path between two nodes of the network.
+Without an index, each such check is a graph search.
+A `ReachabilityIndex` attached to a network stores the set of descendants of each node as a bitset,
+so that each check is a single bit lookup.
+The index is updated incrementally when the network is modified:
+only the descendant sets of the ancestors of the modified nodes are recomputed, the next time the index is queried.
+"""
+
+import networkx as nx
+
+from phylox.dinetwork import DiNetwork
+
+#: The attribute of a DiNetwork in which an attached ReachabilityIndex is stored.
+REACHABILITY_INDEX_ATTR = "_reachability_index"
+
+
+class ReachabilityIndex(object):
+    """
+    An index with the set of descendants of each node of a network, stored as bitsets.
+    Use `ReachabilityIndex.attach` to attach an index to a network,
+    so that it is kept up to date when the network is modified,
+    and that it is used by `phylox.rearrangement.movability.check_valid`.
+
+    :param network: a phylogenetic network (phylox.DiNetwork).
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.reachability import ReachabilityIndex
+    >>> network = DiNetwork(
+    ...     edges=[(0,1),(1,2),(1,3),(2,3),(2,4),(3,5)],
+    ... )
+    >>> index = ReachabilityIndex.attach(network)
+    >>> index.has_path(2, 5), index.has_path(3, 4)
+    (True, False)
+    >>> network.add_edge(3, 6)
+    >>> index.has_path(1, 6)
+    True
+    """
+
+    def __init__(self, network):
+        self.network = network
+        self._bits = {}
+        self._free_bits = []
+        self._descendants = {}
+        self._changed = set()
+        self._rebuild_needed = True
+
+    @classmethod
+    def attach(cls, network):
+        """
+        Attaches a reachability index to a network, or returns the index that is already attached.
+
+        :param network: a phylogenetic network (phylox.DiNetwork).
+        :return: the ReachabilityIndex of the network.
+        """
+        if not isinstance(network, DiNetwork):
+            raise TypeError("A reachability index can only be attached to a DiNetwork.")
+        index = network.__dict__.get(REACHABILITY_INDEX_ATTR)
+        if index is None:
+            index = cls(network)
+            setattr(network, REACHABILITY_INDEX_ATTR, index)
+        return index
+
+    @staticmethod
+    def detach(network):
+        """
+        Removes the reachability index from a network, if it has one.
+
+        :param network: a phylogenetic network (phylox.DiNetwork).
+        :return: None
+        """
+        network.__dict__.pop(REACHABILITY_INDEX_ATTR, None)
+
+    def has_path(self, source, target):
+        """
+        Checks whether there is a directed path from source to target (which is the case if source == target).
+
+        :param source: a node of the network.
+        :param target: a node of the network.
+        :return: True if there is a path from source to target, False otherwise.
+        :exception: networkx.NodeNotFound if source or target is not in the network.
+        """
+        self._update()
+        try:
+            return bool(self._descendants[source] >> self._bits[target] & 1)
+        except KeyError:
+            raise nx.NodeNotFound(
+                f"Either source {source} or target {target} is not in the network."
+            )
+
+    def bitsets(self):
+        """
+        Returns the bitsets of the index, for callers that do many queries at once.
+        Bit bits[v] of descendants[u] is set if and only if there is a path from u to v.
+        The returned dictionaries must not be modified, and are only valid until the network is modified.
+
+        :return: a tuple (bits, descendants) of dictionaries mapping each node to its bit position,
+          and to the bitset of its descendants (including itself).
+        """
+        self._update()
+        return self._bits, self._descendants
+
+    def descendants(self, node):
+        """
+        Returns the descendants of a node, including the node itself.
+
+        :param node: a node of the network.
+        :return: a set of nodes.
+        """
+        self._update()
+        descendants = self._descendants[node]
+        return {v for v, bit in self._bits.items() if descendants >> bit & 1}
+
+    def _mark_changed(self, node):
+        """
+        Marks a node whose children have changed, or a new node.
+        The descendant sets of the node and its ancestors are recomputed on the next query.
+        """
+        self._changed.add(node)
+
+    def _mark_removed(self, node):
+        """
+        Marks a node that is removed from the network.
+        The parents of the node have to be marked as changed as well.
+        """
+        self._descendants.pop(node, None)
+        bit = self._bits.pop(node, None)
+        if bit is not None:
+            self._free_bits.append(bit)
+
+    def _mark_all_changed(self):
+        """
+        Marks the whole index as outdated, e.g., after the network is cleared.
+        """
+        self._rebuild_needed = True
+
+    def _bit(self, node):
+        bit = self._bits.get(node)
+        if bit is None:
+            bit = self._free_bits.pop() if self._free_bits else len(self._bits)
+            self._bits[node] = bit
+        return bit
+
+    def _update(self):
+        """
+        Recomputes the descendant sets of the marked nodes and their ancestors.
+        """
+        succ = self.network._succ
+        pred = self.network._pred
+        if self._rebuild_needed:
+            self._bits = {}
+            self._free_bits = []
+            self._descendants = {}
+            affected = set(succ)
+            self._rebuild_needed = False
+        elif self._changed:
+            affected = {node for node in self._changed if node in succ}
+            stack = list(affected)
+            while stack:
+                for parent in pred[stack.pop()]:
+                    if parent not in affected:
+                        affected.add(parent)
+                        stack.append(parent)
+        else:
+            return
+        self._changed = set()
+
+        # recompute bottom-up; all parents of affected nodes are affected
+        remaining_children = {
+            node: sum(1 for child in succ[node] if child in affected)
+            for node in affected
+        }
+        order = [node for node, count in remaining_children.items() if count == 0]
+        descendants = self._descendants
+        for node in order:
+            node_descendants = 1 << self._bit(node)
+            for child in succ[node]:
+                node_descendants |= descendants[child]
+            descendants[node] = node_descendants
+            for parent in pred[node]:
+                remaining_children[parent] -= 1
+                if remaining_children[parent] == 0:
+                    order.append(parent)
+        if len(order) != len(affected):
+            self._rebuild_needed = True
+            raise ValueError("The network contains a cycle.")
+
+
+def has_path(network, source, target):
+    """
+    Checks whether there is a directed path from source to target in a network,
+    using the reachability index of the network if it has one.
+
+    :param network: a phylogenetic network (phylox.DiNetwork).
+    :param source: a node of the network.
+    :param target: a node of the network.
+    :return: True if there is a path from source to target, False otherwise.
+
+    :example:
+    >>> from phylox import DiNetwork
+    >>> from phylox.rearrangement.reachability import has_path
+    >>> network = DiNetwork(edges=[(0,1),(1,2),(1,3)])
+    >>> has_path(network, 0, 3), has_path(network, 2, 3)
+    (True, False)
+    """
+    index = network.__dict__.get(REACHABILITY_INDEX_ATTR)
+    if index is None:
+        return nx.has_path(network, source, target)
+    return index.has_path(source, target)
@@ -1,13 +1,30 @@
+import math
+import os
+import tempfile
 import unittest
 
+import networkx as nx
+import numpy as np
 import pytest
 
 from phylox import DiNetwork
 from phylox.classes import is_orchard
-from phylox.classes.dinetwork import is_stack_free
-from phylox.generators.mcmc import sample_mcmc_networks
+from phylox.classes.dinetwork import is_stack_free, is_tree_child
+from phylox.generators.mcmc import (
+    HashSink,
+    NewickSink,
+    RestrictionEnergy,
+    iter_mcmc_networks,
+    sample_mcmc_networks,
+    sample_mcmc_networks_parallel,
+    sample_mcmc_networks_tempered,
+    swap_probability,
+)
+from phylox.generators.mcmc.base import _ChainState
+from phylox.generators.mcmc.tempering import _TemperedChainState
 from phylox.generators.randomTC import generate_network_random_tree_child_sequence
-from phylox.isomorphism import is_isomorphic
+from phylox.io import read_newick_file
+from phylox.isomorphism import count_automorphisms, is_isomorphic, network_hash
 from phylox.rearrangement.movetype import MoveType
 
 
@@ -162,7 +179,7 @@ class TestMCMCSamples(unittest.TestCase):
             move_type_probabilities=move_type_probabilities,
             number_of_samples=number_of_samples,
             burn_in=10,
-            seed=2,
+            seed=4,
         )
         self.assertEqual(len(samples1), number_of_samples)
         self.assertEqual(len(samples2), number_of_samples)
@@ -191,3 +208,401 @@ class TestMCMCSamples(unittest.TestCase):
         # with open("sampled_networks.nwk", "w") as f:
         #     for network in sampled_networks:
         #         f.write(network.newick() + "\n")
+
+    def test_inplace_chain(self):
+        network = generate_network_random_tree_child_sequence(10, 3, seed=1)
+        edges = set(network.edges)
+        restriction_map = lambda nw: nw.reticulation_number < 5
+        samples = sample_mcmc_networks(
+            network,
+            {
+                MoveType.TAIL: 0.4,
+                MoveType.HEAD: 0.4,
+                MoveType.VPLU: 0.1,
+                MoveType.VMIN: 0.1,
+            },
+            restriction_map=restriction_map,
+            number_of_samples=20,
+            burn_in=20,
+            seed=1,
+        )
+        # the starting network is not modified, and the samples are separate networks
+        self.assertEqual(set(network.edges), edges)
+        self.assertEqual(len({id(sample) for sample in samples}), 20)
+        for sample in samples:
+            sample.validate_cache()
+            self.assertTrue(restriction_map(sample))
+            self.assertEqual(len(sample.leaves), 10)
+            self.assertTrue(nx.is_directed_acyclic_graph(sample))
+
+
+class TestChainState(unittest.TestCase):
+    def test_bookkeeping(self):
+        network = generate_network_random_tree_child_sequence(6, 2, seed=1)
+        chain = _ChainState(network)
+        seed = np.random.RandomState(1)
+        move_type_probabilities = {
+            MoveType.TAIL: 0.3,
+            MoveType.HEAD: 0.3,
+            MoveType.VPLU: 0.2,
+            MoveType.VMIN: 0.2,
+        }
+        keys = {}
+        for _ in range(300):
+            chain.step(
+                move_type_probabilities,
+                restriction_map=lambda nw: nw.reticulation_number < 4,
+                seed=seed,
+            )
+            self.assertEqual(chain.reticulation_number, network.reticulation_number)
+            self.assertEqual(chain.number_of_edges, network.number_of_edges())
+            self.assertEqual(set(chain.edges), set(network.edges))
+            self.assertEqual(chain.automorphisms, count_automorphisms(network))
+            # the same key means the same network
+            edges = frozenset(network.edges)
+            self.assertEqual(keys.setdefault(chain.key, edges), edges)
+            # binary networks with a root edge have 2 * leaves + 3 * reticulations - 1 edges
+            self.assertEqual(
+                chain.number_of_edges,
+                2 * len(network.leaves) + 3 * network.reticulation_number - 1,
+            )
+
+
+def _reticulation_number_below_3(network):
+    return network.reticulation_number < 3
+
+
+def _at_most_one_reticulation(network):
+    return network.reticulation_number <= 1
+
+
+def _without_reticulations(network):
+    return network.reticulation_number == 0
+
+
+class TestMCMCParallel(unittest.TestCase):
+    def setUp(self):
+        self.network = generate_network_random_tree_child_sequence(6, 1, seed=1)
+        self.move_type_probabilities = {
+            MoveType.TAIL: 0.3,
+            MoveType.HEAD: 0.3,
+            MoveType.VPLU: 0.2,
+            MoveType.VMIN: 0.2,
+        }
+
+    def sample(self, **kwargs):
+        parameters = dict(
+            n_chains=3,
+            restriction_map=_reticulation_number_below_3,
+            warmup=0,
+            thin=5,
+            number_of_samples=12,
+            seed=1,
+        )
+        parameters.update(kwargs)
+        return sample_mcmc_networks_parallel(
+            self.network, self.move_type_probabilities, **parameters
+        )
+
+    def test_independent_of_workers(self):
+        streamed = []
+        samples1, statistics1 = self.sample(
+            check_every=5, callback=lambda chain, network: streamed.append(chain)
+        )
+        samples2, statistics2 = self.sample(workers=2)
+        self.assertEqual(sorted(streamed), sorted(12 * list(range(3))))
+        self.assertEqual(statistics1["summaries"], statistics2["summaries"])
+        self.assertEqual(statistics1["diagnostics"], statistics2["diagnostics"])
+        for chain_samples1, chain_samples2 in zip(samples1, samples2):
+            for sample1, sample2 in zip(chain_samples1, chain_samples2):
+                self.assertEqual(set(sample1.edges), set(sample2.edges))
+                self.assertTrue(_reticulation_number_below_3(sample1))
+        # the chains are different
+        self.assertNotEqual(
+            statistics1["summaries"]["b2_balance"][0],
+            statistics1["summaries"]["b2_balance"][1],
+        )
+
+    def test_statistics(self):
+        _, statistics = self.sample()
+        for chain in statistics["chains"]:
+            self.assertEqual(chain["steps"], 12 * 5)
+            self.assertEqual(
+                sum(chain["accepted"].values()) + chain["non_moves"], chain["steps"]
+            )
+            for move_type, rate in chain["acceptance_rates"].items():
+                self.assertLessEqual(0, rate)
+                self.assertLessEqual(rate, 1)
+        self.assertEqual(statistics["samples_per_chain"], 12)
+        self.assertFalse(statistics["stopped_early"])
+        self.assertEqual(
+            set(statistics["diagnostics"]),
+            {
+                "reticulation_number",
+                "level",
+                "b2_balance",
+                "cherries",
+                "reticulate_cherries",
+            },
+        )
+
+    def test_acceptance_rates_exclude_invalid_proposals(self):
+        # without symmetry correction and restriction, every valid horizontal move is accepted
+        _, statistics = sample_mcmc_networks_parallel(
+            generate_network_random_tree_child_sequence(6, 2, seed=1),
+            {MoveType.TAIL: 0.5, MoveType.HEAD: 0.5},
+            n_chains=1,
+            correct_symmetries=False,
+            warmup=0,
+            thin=2000,
+            seed=1,
+        )
+        chain = statistics["chains"][0]
+        self.assertGreater(chain["non_moves"], 0)
+        self.assertEqual(chain["proposed"], chain["accepted"])
+        self.assertEqual(
+            chain["acceptance_rates"], {MoveType.TAIL: 1.0, MoveType.HEAD: 1.0}
+        )
+
+    def test_warmup(self):
+        samples1, statistics1 = self.sample(warmup=7, check_every=5)
+        samples2, statistics2 = self.sample(warmup=7, workers=2)
+        for chain in statistics1["chains"]:
+            self.assertEqual(chain["steps"], 7 + 12 * 5)
+        self.assertEqual(statistics1["summaries"], statistics2["summaries"])
+        # the warmup steps are not sampled
+        samples3, _ = self.sample(warmup=0, thin=1, number_of_samples=12 * 5 + 7)
+        for chain_samples1, chain_samples3 in zip(samples1, samples3):
+            for sample1, sample3 in zip(chain_samples1, chain_samples3[7 + 4 :: 5]):
+                self.assertEqual(set(sample1.edges), set(sample3.edges))
+
+    def test_stop_early(self):
+        samples, statistics = self.sample(
+            number_of_samples=100, check_every=4, r_hat_threshold=100
+        )
+        self.assertTrue(statistics["stopped_early"])
+        self.assertEqual(statistics["samples_per_chain"], 4)
+        self.assertEqual([len(chain_samples) for chain_samples in samples], [4, 4, 4])
+        samples, statistics = self.sample(
+            number_of_samples=12, check_every=4, ess_threshold=10**6
+        )
+        self.assertFalse(statistics["stopped_early"])
+        self.assertEqual(statistics["samples_per_chain"], 12)
+
+
+class TestIterMCMCNetworks(unittest.TestCase):
+    def setUp(self):
+        self.network = generate_network_random_tree_child_sequence(6, 1, seed=1)
+        self.parameters = dict(
+            move_type_probabilities={
+                MoveType.TAIL: 0.3,
+                MoveType.HEAD: 0.3,
+                MoveType.VPLU: 0.2,
+                MoveType.VMIN: 0.2,
+            },
+            restriction_map=_reticulation_number_below_3,
+            burn_in=5,
+        )
+
+    def test_same_as_sample(self):
+        samples = sample_mcmc_networks(
+            self.network, number_of_samples=10, seed=3, **self.parameters
+        )
+        iterator = iter_mcmc_networks(self.network, seed=3, **self.parameters)
+        for sample, iterated in zip(samples, iterator):
+            self.assertEqual(set(sample.edges), set(iterated.edges))
+
+    def test_copy(self):
+        iterator = iter_mcmc_networks(
+            self.network, number_of_samples=2, copy=False, seed=3, **self.parameters
+        )
+        self.assertIs(next(iterator), next(iterator))
+
+    def test_sinks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            newick_path = os.path.join(directory, "samples.nwk")
+            hash_path = os.path.join(directory, "hashes.txt")
+            with NewickSink(newick_path, flush_every=3) as newick_sink, HashSink(
+                hash_path
+            ) as hash_sink:
+                samples = list(
+                    iter_mcmc_networks(
+                        self.network,
+                        number_of_samples=10,
+                        sinks=[newick_sink, hash_sink],
+                        seed=3,
+                        **self.parameters,
+                    )
+                )
+            networks = list(read_newick_file(newick_path))
+            with open(hash_path) as file:
+                hashes = file.read().split()
+        self.assertEqual(len(networks), 10)
+        self.assertEqual(len(hashes), 10)
+        for sample, network, hash in zip(samples, networks, hashes):
+            # the labels are read as strings
+            expected = DiNetwork.from_newick(sample.newick(simple=True))
+            self.assertTrue(is_isomorphic(expected, network))
+            self.assertEqual(network_hash(sample), hash)
+
+    def test_checkpoint(self):
+        samples = list(
+            iter_mcmc_networks(
+                self.network, number_of_samples=12, seed=3, **self.parameters
+            )
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chain.checkpoint")
+            iterator = iter_mcmc_networks(
+                self.network,
+                number_of_samples=12,
+                checkpoint_path=path,
+                checkpoint_every=4,
+                seed=3,
+                **self.parameters,
+            )
+            first = [next(iterator) for _ in range(6)]
+            # the checkpoint is saved when the generator is closed
+            iterator.close()
+            resumed = list(
+                iter_mcmc_networks(
+                    None,
+                    number_of_samples=12,
+                    resume_from=path,
+                    seed=4,
+                    **self.parameters,
+                )
+            )
+        self.assertEqual(len(resumed), 6)
+        for sample, other in zip(samples, first + resumed):
+            self.assertEqual(set(sample.edges), set(other.edges))
+
+
+class TestMCMCTempered(unittest.TestCase):
+    def setUp(self):
+        self.network = generate_network_random_tree_child_sequence(6, 1, seed=1)
+        self.move_type_probabilities = {
+            MoveType.TAIL: 0.3,
+            MoveType.HEAD: 0.3,
+            MoveType.VPLU: 0.2,
+            MoveType.VMIN: 0.2,
+        }
+
+    def sample(self, **kwargs):
+        parameters = dict(
+            inverse_temperatures=[math.inf, 2.0, 0.5],
+            restriction_map=is_tree_child,
+            support_map=_reticulation_number_below_3,
+            burn_in=10,
+            swap_every=3,
+            number_of_samples=12,
+            seed=1,
+        )
+        parameters.update(kwargs)
+        return sample_mcmc_networks_tempered(
+            self.network, self.move_type_probabilities, **parameters
+        )
+
+    def test_single_replica_same_as_sample(self):
+        samples, _ = self.sample(inverse_temperatures=[math.inf])
+        replica_seed = np.random.SeedSequence(1).spawn(2)[0].generate_state(1)[0]
+        expected = sample_mcmc_networks(
+            self.network,
+            self.move_type_probabilities,
+            restriction_map=lambda nw: _reticulation_number_below_3(nw)
+            and is_tree_child(nw),
+            burn_in=10,
+            number_of_samples=12,
+            seed=np.random.RandomState(int(replica_seed)),
+        )
+        for sample, other in zip(samples, expected):
+            self.assertEqual(set(sample.edges), set(other.edges))
+
+    def test_independent_of_workers(self):
+        samples1, statistics1 = self.sample()
+        samples2, statistics2 = self.sample(workers=2)
+        self.assertEqual(len(samples1), 12)
+        for sample1, sample2 in zip(samples1, samples2):
+            self.assertEqual(set(sample1.edges), set(sample2.edges))
+            self.assertTrue(is_tree_child(sample1))
+            self.assertTrue(_reticulation_number_below_3(sample1))
+        statistics1.pop("elapsed_time")
+        statistics2.pop("elapsed_time")
+        self.assertEqual(statistics1, statistics2)
+
+    def test_statistics(self):
+        _, statistics = self.sample()
+        self.assertEqual(len(statistics["replicas"]), 3)
+        for replica in statistics["replicas"]:
+            self.assertEqual(replica["steps"], 12 * 10)
+        self.assertEqual(
+            sorted(replica["inverse_temperature"] for replica in statistics["replicas"]),
+            [0.5, 2.0, math.inf],
+        )
+        # 4 rounds of exchanges per sample, alternating between the two pairs
+        self.assertEqual([swaps["proposed"] for swaps in statistics["swaps"]], [24, 24])
+        self.assertEqual(
+            sum(replica["swaps"] for replica in statistics["replicas"]),
+            2 * sum(swaps["accepted"] for swaps in statistics["swaps"]),
+        )
+        for swaps in statistics["swaps"]:
+            self.assertLessEqual(0, swaps["acceptance_rate"])
+            self.assertLessEqual(swaps["acceptance_rate"], 1)
+
+    def test_replica_energy(self):
+        energy = RestrictionEnergy(is_tree_child)
+        chain = _TemperedChainState(self.network.copy(), 0.5, energy)
+        seed = np.random.RandomState(1)
+        energies = set()
+        for _ in range(300):
+            chain.step(
+                self.move_type_probabilities,
+                restriction_map=_reticulation_number_below_3,
+                seed=seed,
+            )
+            self.assertEqual(chain.energy, energy(chain.network))
+            energies.add(chain.energy)
+        # the hot replica leaves the tree-child networks
+        self.assertEqual(energies, {0, 1})
+        # the cold replica does not
+        chain.inverse_temperature = math.inf
+        while chain.energy:
+            chain.step(self.move_type_probabilities, seed=seed)
+        for _ in range(300):
+            chain.step(self.move_type_probabilities, seed=seed)
+            self.assertTrue(is_tree_child(chain.network))
+
+    def test_hot_replica_distribution(self):
+        # a single replica at a finite temperature samples exp(-inverse_temperature * energy)
+        # relative to the unrestricted chain
+        network = generate_network_random_tree_child_sequence(3, 0, seed=1)
+        parameters = dict(burn_in=5, number_of_samples=4000, seed=1)
+        plain = sample_mcmc_networks(
+            network,
+            self.move_type_probabilities,
+            restriction_map=_at_most_one_reticulation,
+            **parameters,
+        )
+        plain_fraction = np.mean([sample.reticulation_number for sample in plain])
+        for inverse_temperature in [1.0, 3.0]:
+            samples, _ = sample_mcmc_networks_tempered(
+                network,
+                self.move_type_probabilities,
+                inverse_temperatures=[inverse_temperature],
+                restriction_map=_without_reticulations,
+                support_map=_at_most_one_reticulation,
+                **parameters,
+            )
+            weight = plain_fraction * math.exp(-inverse_temperature)
+            expected = weight / (weight + 1 - plain_fraction)
+            fraction = np.mean([sample.reticulation_number for sample in samples])
+            self.assertAlmostEqual(fraction, expected, delta=0.05)
+
+    def test_swap_probability(self):
+        self.assertEqual(swap_probability(math.inf, 0, math.inf, 1), 1.0)
+        self.assertEqual(swap_probability(1.0, 2, 0.5, 1), 1.0)
+        self.assertAlmostEqual(swap_probability(1.0, 1, 0.5, 2), math.exp(-0.5))
+
+    def test_increasing_temperatures(self):
+        with pytest.raises(ValueError, match="must be decreasing"):
+            self.sample(inverse_temperatures=[1.0, math.inf])
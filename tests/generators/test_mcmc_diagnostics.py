@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from phylox import DiNetwork
+from phylox.generators.mcmc.diagnostics import (
+    convergence_diagnostics,
+    effective_sample_size,
+    network_summaries,
+    potential_scale_reduction,
+)
+
+
+def _autoregressive_chains(phi, number_of_chains, length, rng):
+    chains = np.zeros((number_of_chains, length))
+    noise = rng.normal(size=(number_of_chains, length))
+    for t in range(1, length):
+        chains[:, t] = phi * chains[:, t - 1] + noise[:, t]
+    return chains
+
+
+class TestDiagnostics(unittest.TestCase):
+    def test_effective_sample_size(self):
+        rng = np.random.default_rng(1)
+        for phi in [0, 0.5, 0.8]:
+            chains = _autoregressive_chains(phi, 4, 4000, rng)
+            expected = 4 * 4000 * (1 - phi) / (1 + phi)
+            self.assertAlmostEqual(
+                effective_sample_size(chains) / expected, 1, delta=0.2
+            )
+
+    def test_potential_scale_reduction(self):
+        rng = np.random.default_rng(1)
+        chains = _autoregressive_chains(0.5, 4, 2000, rng)
+        self.assertLess(potential_scale_reduction(chains), 1.01)
+        # chains that have not mixed
+        self.assertGreater(potential_scale_reduction(chains + np.arange(4)[:, None]), 1.1)
+        # a trend within the chains is detected by splitting the chains
+        self.assertGreater(potential_scale_reduction(chains + np.arange(2000) / 200), 1.1)
+
+    def test_constant(self):
+        diagnostics = convergence_diagnostics(
+            {"constant": [[2] * 10] * 3, "different": [[1] * 10, [2] * 10, [1] * 10]}
+        )
+        self.assertEqual(diagnostics["constant"], {"r_hat": 1.0, "ess": 30.0})
+        self.assertEqual(diagnostics["different"]["r_hat"], float("inf"))
+
+    def test_network_summaries_tree(self):
+        tree = DiNetwork(edges=[(0, 1), (1, 2), (1, 3)])
+        summaries = network_summaries(tree)
+        self.assertEqual(summaries["level"], 0)
+        self.assertEqual(summaries["reticulation_number"], 0)
+        self.assertEqual(summaries["cherries"], 1)
@@ -0,0 +1,162 @@
+import random
+import unittest
+
+import networkx as nx
+
+from phylox import DiNetwork
+from phylox.constants import LABEL_ATTR
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.isomorphism import canonical_form, network_hash
+
+
+def _shuffled_copy(network, rng):
+    nodes = list(network.nodes)
+    names = nodes[:]
+    rng.shuffle(names)
+    rename = dict(zip(nodes, names))
+    copy = DiNetwork()
+    rng.shuffle(nodes)
+    for node in nodes:
+        copy.add_node(rename[node], **network.nodes[node])
+    edges = list(network.edges)
+    rng.shuffle(edges)
+    copy.add_edges_from((rename[u], rename[v]) for u, v in edges)
+    return copy
+
+
+def _random_dag(number_of_nodes, probability, rng):
+    order = list(range(number_of_nodes))
+    rng.shuffle(order)
+    network = DiNetwork()
+    network.add_nodes_from(range(number_of_nodes))
+    for i in range(number_of_nodes):
+        for j in range(i + 1, number_of_nodes):
+            if rng.random() < probability:
+                network.add_edge(order[i], order[j])
+    for node in range(number_of_nodes):
+        if rng.random() < 0.3:
+            network.add_node(node, **{LABEL_ATTR: rng.choice("xy")})
+    return network
+
+
+def _vf2_isomorphic(network1, network2, ignore_labels):
+    node_match = None
+    if not ignore_labels:
+        node_match = lambda x, y: x.get(LABEL_ATTR) == y.get(LABEL_ATTR)
+    return nx.is_isomorphic(network1, network2, node_match=node_match)
+
+
+class TestCanonicalForm(unittest.TestCase):
+    def test_tree(self):
+        network1 = DiNetwork(
+            edges=[(0, 1), (0, 2), (2, 3), (2, 4)],
+            labels=[(1, "a"), (3, "b"), (4, "c")],
+        )
+        network2 = DiNetwork(
+            edges=[(5, 6), (5, 7), (6, 8), (6, 9)],
+            labels=[(7, "a"), (8, "c"), (9, "b")],
+        )
+        network3 = DiNetwork(
+            edges=[(5, 6), (5, 7), (6, 8), (6, 9)],
+            labels=[(7, "b"), (8, "c"), (9, "a")],
+        )
+        self.assertEqual(canonical_form(network1), canonical_form(network2))
+        self.assertNotEqual(canonical_form(network1), canonical_form(network3))
+        self.assertEqual(
+            canonical_form(network1, ignore_labels=True),
+            canonical_form(network3, ignore_labels=True),
+        )
+
+    def test_network(self):
+        network1 = DiNetwork(
+            edges=[(0, 1), (1, 2), (1, 3), (2, 3), (2, 4), (3, 5)],
+            labels=[(4, "A"), (5, "B")],
+        )
+        network2 = DiNetwork(
+            edges=[(0, 1), (1, 2), (1, 3), (2, 3), (2, 5), (3, 6)],
+            labels=[(5, "B"), (6, "A")],
+        )
+        self.assertNotEqual(canonical_form(network1), canonical_form(network2))
+        self.assertEqual(
+            canonical_form(network1, ignore_labels=True),
+            canonical_form(network2, ignore_labels=True),
+        )
+
+    def test_label_types(self):
+        network1 = DiNetwork(edges=[(0, 1), (0, 2)], labels=[(1, 1), (2, 2)])
+        network2 = DiNetwork(edges=[(0, 1), (0, 2)], labels=[(1, "1"), (2, "2")])
+        self.assertNotEqual(canonical_form(network1), canonical_form(network2))
+
+    def test_empty_and_disconnected(self):
+        self.assertEqual(canonical_form(DiNetwork()), canonical_form(DiNetwork()))
+        network1 = DiNetwork(edges=[(0, 1), (2, 3), (2, 4), (5, 4)])
+        network2 = DiNetwork(edges=[(9, 8), (9, 7), (6, 8), (10, 11)])
+        self.assertEqual(canonical_form(network1), canonical_form(network2))
+
+    def test_cycle(self):
+        network = DiNetwork(edges=[(0, 1), (1, 2), (2, 1)])
+        with self.assertRaises(ValueError):
+            canonical_form(network)
+
+    def test_shuffled_random_networks(self):
+        rng = random.Random(1)
+        for seed in range(50):
+            network = generate_network_random_tree_child_sequence(
+                rng.randint(2, 10), rng.randint(0, 6), seed=seed
+            )
+            copy = _shuffled_copy(network, rng)
+            for ignore_labels in [False, True]:
+                self.assertEqual(
+                    canonical_form(network, ignore_labels=ignore_labels),
+                    canonical_form(copy, ignore_labels=ignore_labels),
+                )
+
+    def test_random_dags_against_vf2(self):
+        rng = random.Random(2)
+        networks = {}
+        for _ in range(200):
+            network = _random_dag(rng.randint(5, 6), rng.choice([0.2, 0.4]), rng)
+            key = (len(network), network.number_of_edges())
+            networks.setdefault(key, []).append(network)
+        for group in networks.values():
+            for i, network1 in enumerate(group):
+                for network2 in group[i + 1 :]:
+                    for ignore_labels in [False, True]:
+                        self.assertEqual(
+                            canonical_form(network1, ignore_labels=ignore_labels)
+                            == canonical_form(network2, ignore_labels=ignore_labels),
+                            _vf2_isomorphic(network1, network2, ignore_labels),
+                        )
+
+    def test_symmetric_blobs(self):
+        def network_with_blobs(number_of_blobs, twist):
+            network = DiNetwork()
+            for blob in range(number_of_blobs):
+                b = 10 * blob
+                network.add_edges_from(
+                    [("root", b), (b, b + 1), (b, b + 2), (b + 1, b + 3), (b + 2, b + 3)]
+                )
+                network.add_edges_from([(b + 1, b + 4), (b + 2, b + 5), (b + 3, b + 6)])
+            if twist:
+                network.remove_edge(0, 2)
+                network.add_edge(0, 15)
+            return network
+
+        self.assertEqual(
+            canonical_form(network_with_blobs(6, False)),
+            canonical_form(_shuffled_copy(network_with_blobs(6, False), random.Random(3))),
+        )
+        self.assertNotEqual(
+            canonical_form(network_with_blobs(6, False)),
+            canonical_form(network_with_blobs(6, True)),
+        )
+
+
+class TestNetworkHash(unittest.TestCase):
+    def test_hash(self):
+        network = generate_network_random_tree_child_sequence(10, 3, seed=1)
+        copy = _shuffled_copy(network, random.Random(1))
+        self.assertEqual(len(network_hash(network)), 32)
+        self.assertEqual(network_hash(network), network_hash(copy))
+        other = generate_network_random_tree_child_sequence(10, 3, seed=2)
+        self.assertNotEqual(network_hash(network), network_hash(other))
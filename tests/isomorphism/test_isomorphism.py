@@ -1,8 +1,13 @@
+import math
+import random
 import unittest
 
+from networkx.algorithms.isomorphism import DiGraphMatcher
+
 from phylox import DiNetwork
 from phylox.constants import LABEL_ATTR
 from phylox.isomorphism import count_automorphisms, is_isomorphic
+from tests.isomorphism.test_canonical import _random_dag
 
 
 class TestIsomorphism(unittest.TestCase):
@@ -114,6 +119,46 @@ class TestIsomorphism(unittest.TestCase):
             )
         )
 
+    def test_partial_isomorphism_does_not_modify_networks(self):
+        network1 = DiNetwork(
+            edges=[(1, 2), (2, 3), (2, 4), (3, 4), (3, 5), (4, 6)],
+            labels=[(5, "a"), (6, "b")],
+        )
+        network2 = DiNetwork(
+            edges=[(1, 2), (2, 3), (2, 4), (3, 4), (3, 5), (4, 6)],
+            labels=[(5, "a"), (6, "b")],
+        )
+        nodes = list(network1.nodes(data=True))
+        self.assertTrue(
+            is_isomorphic(network1, network2, partial_isomorphism=[(5, 5), (6, 6)])
+        )
+        self.assertEqual(list(network1.nodes(data=True)), nodes)
+
+    def test_isomorphism_different_invariants(self):
+        network = DiNetwork(
+            edges=[(1, 2), (2, 3), (2, 4), (3, 4), (3, 5), (4, 6)],
+            labels=[(5, "a"), (6, "b")],
+        )
+        # same degrees and labels, but different depths of the labelled leaves
+        network_depths = DiNetwork(
+            edges=[(1, 2), (2, 3), (2, 4), (3, 4), (3, 6), (4, 5)],
+            labels=[(5, "a"), (6, "b")],
+        )
+        network_labels = DiNetwork(
+            edges=[(1, 2), (2, 3), (2, 4), (3, 4), (3, 5), (4, 6)],
+            labels=[(5, "a"), (6, "a")],
+        )
+        network_degrees = DiNetwork(
+            edges=[(1, 2), (2, 3), (2, 4), (3, 5), (3, 6), (4, 7)],
+            labels=[(5, "a"), (6, "b")],
+        )
+        for other in [network_depths, network_labels, network_degrees]:
+            self.assertFalse(is_isomorphic(network, other))
+            self.assertFalse(
+                is_isomorphic(network, other, partial_isomorphism=[(1, 1)])
+            )
+        self.assertTrue(is_isomorphic(network, network_labels, ignore_labels=True))
+
 
 class TestAutomorphism(unittest.TestCase):
     def test_automorphism_simple(self):
@@ -159,3 +204,33 @@ class TestAutomorphism(unittest.TestCase):
         )
         self.assertEqual(count_automorphisms(network), 4)
         self.assertEqual(count_automorphisms(network, ignore_labels=True), 4)
+
+    def test_automorphism_symmetric_blobs(self):
+        network = DiNetwork()
+        network.add_edge("root", "top")
+        for blob in range(8):
+            b = 10 * blob
+            network.add_edges_from(
+                [("top", b), (b, b + 1), (b, b + 2), (b + 1, b + 3), (b + 2, b + 3)]
+            )
+            network.add_edges_from([(b + 1, b + 4), (b + 2, b + 5), (b + 3, b + 6)])
+        self.assertEqual(count_automorphisms(network), math.factorial(8) * 2**8)
+        network.add_node(6, label="a")
+        self.assertEqual(count_automorphisms(network), math.factorial(7) * 2**8)
+        self.assertEqual(
+            count_automorphisms(network, ignore_labels=True), math.factorial(8) * 2**8
+        )
+
+    def test_automorphism_random_dags_against_vf2(self):
+        rng = random.Random(4)
+        for _ in range(300):
+            network = _random_dag(rng.randint(2, 7), rng.choice([0.1, 0.3, 0.5]), rng)
+            for ignore_labels in [False, True]:
+                node_match = None
+                if not ignore_labels:
+                    node_match = lambda x, y: x.get(LABEL_ATTR) == y.get(LABEL_ATTR)
+                matcher = DiGraphMatcher(network, network, node_match=node_match)
+                self.assertEqual(
+                    count_automorphisms(network, ignore_labels=ignore_labels),
+                    sum(1 for _ in matcher.isomorphisms_iter()),
+                )
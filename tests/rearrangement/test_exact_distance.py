@@ -1,8 +1,16 @@
+import random
 import unittest
 
 import pytest
 
 from phylox import DiNetwork
+from phylox.exceptions import (
+    InvalidMoveException,
+    NoSolutionException,
+    TimeoutException,
+)
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.move import all_valid_moves, apply_move
 from phylox.rearrangement.movetype import MoveType
 from phylox.rearrangement.rearrangementproblem import RearrangementProblem
 
@@ -26,3 +34,140 @@ class TestRearrangementProblemExactDistance(unittest.TestCase):
         solution = problem.solve_depth_first()
         assert len(solution) == 1
         assert solution[0].move_type == MoveType.VMIN
+
+    def test_solve_depth_first_tail(self):
+        network1 = DiNetwork(
+            edges=[(0, 1), (1, 2), (1, 3), (2, 4), (2, 5), (3, 6), (3, 7)],
+            labels=[(4, "A"), (5, "B"), (6, "C"), (7, "D")],
+        )
+        network2 = DiNetwork(
+            edges=[(0, 1), (1, 2), (1, 3), (2, 4), (2, 5), (3, 6), (3, 7)],
+            labels=[(4, "A"), (5, "C"), (6, "B"), (7, "D")],
+        )
+        problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        solution = problem.solve_depth_first(show_bounds=False)
+        self.assertEqual(len(solution), 2)
+        self.assertTrue(problem.check_solution(solution))
+        statistics = problem.search_statistics
+        self.assertEqual(statistics["depth"], 2)
+        self.assertGreater(statistics["nodes_expanded"], 0)
+        self.assertGreaterEqual(statistics["nodes_visited"], statistics["nodes_expanded"])
+        # the search does not modify the networks
+        self.assertEqual(set(network1.edges), set(network2.edges))
+        self.assertEqual(network1.nodes[5]["label"], "B")
+
+    def test_solve_depth_first_random_moves(self):
+        rng = random.Random(1)
+        for seed in range(5):
+            network1 = generate_network_random_tree_child_sequence(4, 1, seed=seed)
+            network2 = network1
+            for _ in range(2):
+                moves = list(all_valid_moves(network2, MoveType.RSPR))
+                network2 = apply_move(network2, rng.choice(moves))
+            problem = RearrangementProblem(network1, network2, MoveType.RSPR)
+            solution = problem.solve_depth_first(show_bounds=False)
+            self.assertLessEqual(len(solution), 2)
+            self.assertTrue(problem.check_solution(solution))
+            if solution:
+                shorter = problem.solve_depth_first_bounded(max_depth=len(solution) - 1)
+                self.assertFalse(shorter)
+
+    def test_solve_depth_first_bounded_timeout(self):
+        problem = self.setup_simple_problem()
+        with self.assertRaises(TimeoutException):
+            problem.solve_depth_first_bounded(max_depth=3, stop_time=1)
+
+    def test_solve_depth_first_parallel(self):
+        rng = random.Random(3)
+        for move_type in [MoveType.TAIL, MoveType.RSPR]:
+            for seed in range(3):
+                network1 = generate_network_random_tree_child_sequence(4, 1, seed=seed)
+                network2 = network1
+                for _ in range(3):
+                    moves = list(all_valid_moves(network2, move_type))
+                    network2 = apply_move(network2, rng.choice(moves))
+                problem = RearrangementProblem(network1, network2, move_type)
+                serial = problem.solve_depth_first(show_bounds=False)
+                solutions = [
+                    problem.solve_depth_first(show_bounds=False, workers=workers, seed=1)
+                    for workers in [2, 3]
+                ]
+                for solution in solutions:
+                    self.assertEqual(len(solution), len(serial))
+                    self.assertTrue(problem.check_solution(solution))
+                self.assertEqual(
+                    [vars(move) for move in solutions[0]],
+                    [vars(move) for move in solutions[1]],
+                )
+
+    def test_solve_depth_first_parallel_timeout(self):
+        network1 = generate_network_random_tree_child_sequence(8, 2, seed=1)
+        network2 = generate_network_random_tree_child_sequence(8, 2, seed=2)
+        problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        with self.assertRaises(TimeoutException):
+            problem.solve_depth_first(max_time=0.5, show_bounds=False, workers=2)
+
+
+class TestRearrangementProblemIdaStar(unittest.TestCase):
+    def test_same_distance_as_depth_first(self):
+        rng = random.Random(4)
+        for move_type in [MoveType.TAIL, MoveType.RSPR]:
+            for seed in range(4):
+                network1 = generate_network_random_tree_child_sequence(5, 1, seed=seed)
+                network2 = network1
+                for _ in range(3):
+                    moves = list(all_valid_moves(network2, move_type))
+                    network2 = apply_move(network2, rng.choice(moves))
+                problem = RearrangementProblem(network1, network2, move_type)
+                solution = problem.solve_ida_star(show_bounds=False)
+                self.assertTrue(problem.check_solution(solution))
+                self.assertEqual(
+                    len(solution), len(problem.solve_depth_first(show_bounds=False))
+                )
+
+    def test_no_solution(self):
+        network1 = generate_network_random_tree_child_sequence(5, 1, seed=1)
+        network2 = generate_network_random_tree_child_sequence(5, 2, seed=1)
+        problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        with self.assertRaises(NoSolutionException):
+            problem.solve_ida_star(show_bounds=False)
+
+
+class TestRearrangementProblemBidirectional(unittest.TestCase):
+    def test_same_distance_as_depth_first(self):
+        rng = random.Random(2)
+        for move_type in [MoveType.TAIL, MoveType.HEAD, MoveType.RSPR]:
+            for seed in range(4):
+                network1 = generate_network_random_tree_child_sequence(4, 2, seed=seed)
+                network2 = network1
+                for _ in range(3):
+                    moves = list(all_valid_moves(network2, move_type))
+                    network2 = apply_move(network2, rng.choice(moves))
+                problem = RearrangementProblem(network1, network2, move_type)
+                solution = problem.solve_bidirectional()
+                self.assertTrue(problem.check_solution(solution))
+                self.assertEqual(
+                    len(solution), len(problem.solve_depth_first(show_bounds=False))
+                )
+
+    def test_isomorphic(self):
+        network = generate_network_random_tree_child_sequence(5, 1, seed=1)
+        problem = RearrangementProblem(network, network.copy(), MoveType.TAIL)
+        self.assertEqual(problem.solve_bidirectional(), [])
+
+    def test_limits(self):
+        network1 = generate_network_random_tree_child_sequence(8, 2, seed=1)
+        network2 = generate_network_random_tree_child_sequence(8, 2, seed=2)
+        problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        with self.assertRaises(NoSolutionException):
+            problem.solve_bidirectional(max_states=100)
+        with self.assertRaises(TimeoutException):
+            problem.solve_bidirectional(max_time=0.1)
+
+    def test_no_solution(self):
+        problem = TestRearrangementProblemExactDistance.setup_simple_problem()
+        with self.assertRaises(InvalidMoveException):
+            problem.solve_bidirectional()
+        problem.move_type = MoveType.RSPR
+        with self.assertRaises(NoSolutionException):
+            problem.solve_bidirectional()
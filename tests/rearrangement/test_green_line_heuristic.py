@@ -1,8 +1,16 @@
+import random
 import unittest
 
+import networkx as nx
 import pytest
 
 from phylox import DiNetwork
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.heuristics.utils import (
+    LowestNodeFrontier,
+    LowestReticAndTreeNodeAbove,
+)
+from phylox.rearrangement.move import all_valid_moves, apply_move
 from phylox.rearrangement.movetype import MoveType
 from phylox.rearrangement.rearrangementproblem import RearrangementProblem
 
@@ -85,3 +93,122 @@ class TestRearrangementProblemGreenLine(unittest.TestCase):
         assert [move.__dict__ for move in solution1] == [
             move.__dict__ for move in solution2
         ]
+
+    def test_random_networks(self):
+        for seed in range(20):
+            network1 = generate_network_random_tree_child_sequence(8, 3, seed=seed)
+            network2 = generate_network_random_tree_child_sequence(8, 3, seed=seed + 20)
+            network2 = nx.relabel_nodes(network2, {node: node + 100 for node in network2})
+            for move_type in [MoveType.TAIL, MoveType.RSPR]:
+                problem = RearrangementProblem(network1, network2, move_type)
+                for solution in [
+                    problem.heuristic_green_line(),
+                    problem.heuristic_green_line_random(seed=seed),
+                ]:
+                    self.assertTrue(problem.check_solution(solution))
+
+    def test_same_node_names(self):
+        network1 = generate_network_random_tree_child_sequence(10, 3, seed=1)
+        network2 = network1
+        rng = random.Random(1)
+        for _ in range(3):
+            network2 = apply_move(
+                network2, rng.choice(list(all_valid_moves(network2, MoveType.TAIL)))
+            )
+        edges1, edges2 = set(network1.edges), set(network2.edges)
+        problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+        self.assertTrue(problem.check_solution(problem.heuristic_green_line()))
+        self.assertTrue(
+            problem.check_solution(problem.heuristic_green_line_random(seed=1))
+        )
+        # the networks of the problem are not modified
+        self.assertEqual(set(network1.edges), edges1)
+        self.assertEqual(set(network2.edges), edges2)
+
+    def test_different_labels(self):
+        problem = self.setup_simple_problem()
+        problem.network2 = DiNetwork(
+            edges=[[0, 1], [1, 2], [1, 3], [2, 3], [2, 4], [3, 5]],
+            labels=[[5, 1], [4, 3]],
+        )
+        with self.assertRaises(Exception):
+            problem.heuristic_green_line()
+
+
+class TestGreenLineBestOf(unittest.TestCase):
+    def setUp(self):
+        network1 = generate_network_random_tree_child_sequence(10, 3, seed=1)
+        network2 = generate_network_random_tree_child_sequence(10, 3, seed=2)
+        network2 = nx.relabel_nodes(network2, {node: node + 100 for node in network2})
+        self.problem = RearrangementProblem(network1, network2, MoveType.TAIL)
+
+    def test_best_of(self):
+        results = [
+            self.problem.heuristic_green_line_best_of(repeats=12, workers=workers, seed=3)
+            for workers in [None, 2, 3]
+        ]
+        sequence, statistics = results[0]
+        self.assertTrue(self.problem.check_solution(sequence))
+        self.assertEqual(len(statistics["restarts"]), 12)
+        lengths = [restart["length"] for restart in statistics["restarts"]]
+        self.assertEqual(len(sequence), min(lengths))
+        self.assertEqual(statistics["best_restart"], lengths.index(min(lengths)))
+        for other_sequence, other_statistics in results[1:]:
+            self.assertEqual(
+                [vars(move) for move in other_sequence],
+                [vars(move) for move in sequence],
+            )
+            self.assertEqual(
+                [restart["seed"] for restart in other_statistics["restarts"]],
+                [restart["seed"] for restart in statistics["restarts"]],
+            )
+
+    def test_lower_bound(self):
+        _, statistics = self.problem.heuristic_green_line_best_of(repeats=12, seed=3)
+        length = statistics["restarts"][0]["length"]
+        sequence, statistics = self.problem.heuristic_green_line_best_of(
+            repeats=12, workers=2, seed=3, lower_bound=length
+        )
+        self.assertEqual(len(sequence), length)
+        self.assertEqual(len(statistics["restarts"]), 1)
+        self.assertTrue(statistics["reached_lower_bound"])
+
+    def test_time_limit(self):
+        sequence, statistics = self.problem.heuristic_green_line_best_of(
+            repeats=1000, time_limit=0.2
+        )
+        self.assertLess(len(statistics["restarts"]), 1000)
+        self.assertTrue(self.problem.check_solution(sequence))
+
+
+class TestLowestNodeFrontier(unittest.TestCase):
+    def test_against_scan(self):
+        rng = random.Random(1)
+        for seed in range(10):
+            network = generate_network_random_tree_child_sequence(10, 4, seed=seed)
+            mapped = {node: None for node in network.leaves}
+            frontier = LowestNodeFrontier(network, mapped)
+            while True:
+                tree_nodes, reticulations = LowestReticAndTreeNodeAbove(
+                    frontier.network, mapped, allnodes=True
+                )
+                self.assertEqual(frontier.lowest_tree_nodes(), tree_nodes)
+                self.assertEqual(frontier.lowest_reticulations(), reticulations)
+                self.assertEqual(
+                    (frontier.lowest_tree_node(), frontier.lowest_reticulation()),
+                    LowestReticAndTreeNodeAbove(frontier.network, mapped),
+                )
+                if not tree_nodes + reticulations:
+                    break
+                # move an edge between nodes that are not mapped yet, or map a lowest node
+                moves = [
+                    move
+                    for move in all_valid_moves(frontier.network, MoveType.RSPR)
+                    if not {move.origin[0], move.moving_node, move.target[0]} & set(mapped)
+                ]
+                if moves and rng.random() < 0.5:
+                    frontier.apply_move_sequence([rng.choice(moves)])
+                else:
+                    node = rng.choice(tree_nodes + reticulations)
+                    mapped[node] = None
+                    frontier.add(node)
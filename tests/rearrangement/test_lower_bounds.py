@@ -0,0 +1,142 @@
+import math
+import random
+import unittest
+
+from phylox import DiNetwork
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.exact_distance.lower_bounds import (
+    agreement_forest_bound,
+    displayed_trees,
+    displayed_trees_bound,
+    lower_bound,
+    reticulation_number_bound,
+    rspr_distance,
+)
+from phylox.rearrangement.move import all_valid_moves, apply_move
+from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+
+
+def _random_tree(labels, rng):
+    trees = list(labels)
+    while len(trees) > 1:
+        i, j = sorted(rng.sample(range(len(trees)), 2))
+        trees.append(frozenset([trees.pop(j), trees.pop(i)]))
+    return trees[0]
+
+
+def _subtrees(tree):
+    yield tree
+    if isinstance(tree, frozenset):
+        for child in tree:
+            yield from _subtrees(child)
+
+
+def _prune(tree, subtree):
+    if tree == subtree:
+        return None
+    if not isinstance(tree, frozenset):
+        return tree
+    children = [child for child in (_prune(c, subtree) for c in tree) if child]
+    return children[0] if len(children) == 1 else frozenset(children)
+
+
+def _regraft(tree, subtree):
+    yield frozenset([tree, subtree])
+    if isinstance(tree, frozenset):
+        for child in tree:
+            for new_child in _regraft(child, subtree):
+                yield (tree - {child}) | {new_child}
+
+
+def _rspr_distance_brute_force(tree1, tree2):
+    visited = {tree1}
+    frontier = [tree1]
+    distance = 0
+    while tree2 not in visited:
+        frontier = [
+            neighbour
+            for tree in frontier
+            for subtree in _subtrees(tree)
+            if subtree != tree
+            for neighbour in _regraft(_prune(tree, subtree), subtree)
+        ]
+        frontier = [tree for tree in set(frontier) if tree not in visited]
+        visited.update(frontier)
+        distance += 1
+    return distance
+
+
+class TestRsprDistance(unittest.TestCase):
+    def test_against_brute_force(self):
+        rng = random.Random(1)
+        for _ in range(100):
+            labels = "ABCDEF"[: rng.randint(2, 6)]
+            tree1, tree2 = _random_tree(labels, rng), _random_tree(labels, rng)
+            distance = _rspr_distance_brute_force(tree1, tree2)
+            self.assertEqual(rspr_distance(tree1, tree2), distance)
+            if distance > 0:
+                self.assertEqual(
+                    rspr_distance(tree1, tree2, max_distance=distance - 1), distance
+                )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            rspr_distance(frozenset({"A", "B"}), frozenset({"A", "C"}))
+        with self.assertRaises(ValueError):
+            rspr_distance(frozenset({"A", "B", "C"}), frozenset({"A", "B", "C"}))
+
+
+class TestLowerBounds(unittest.TestCase):
+    def test_displayed_trees(self):
+        network = DiNetwork(
+            edges=[(0, 1), (1, 2), (1, 3), (2, 4), (3, 4), (2, 5), (3, 6), (4, 7)],
+            labels=[(5, "A"), (6, "B"), (7, "C")],
+        )
+        self.assertEqual(
+            displayed_trees(network),
+            {
+                frozenset({"B", frozenset({"A", "C"})}),
+                frozenset({"A", frozenset({"B", "C"})}),
+            },
+        )
+
+    def test_reticulation_number_bound(self):
+        network1 = generate_network_random_tree_child_sequence(5, 1, seed=1)
+        network2 = generate_network_random_tree_child_sequence(5, 3, seed=1)
+        self.assertEqual(reticulation_number_bound(network1, network2, MoveType.ALL), 2)
+        self.assertEqual(reticulation_number_bound(network1, network2, MoveType.VPLU), 2)
+        self.assertEqual(
+            reticulation_number_bound(network1, network2, MoveType.VMIN), math.inf
+        )
+        self.assertEqual(
+            reticulation_number_bound(network1, network2, MoveType.RSPR), math.inf
+        )
+
+    def test_admissible(self):
+        rng = random.Random(2)
+        for move_type in [MoveType.TAIL, MoveType.HEAD, MoveType.RSPR]:
+            for seed in range(8):
+                network1 = generate_network_random_tree_child_sequence(
+                    5, rng.randint(1, 2), seed=seed
+                )
+                network2 = network1
+                for _ in range(rng.randint(1, 3)):
+                    moves = list(all_valid_moves(network2, move_type))
+                    network2 = apply_move(network2, rng.choice(moves))
+                problem = RearrangementProblem(network1, network2, move_type)
+                distance = len(problem.solve_bidirectional())
+                bound = lower_bound(network1, network2, move_type)
+                self.assertLessEqual(bound, distance)
+                self.assertLessEqual(displayed_trees_bound(network1, network2), bound)
+                self.assertLessEqual(
+                    agreement_forest_bound(network1, network2, move_type), bound
+                )
+                self.assertLessEqual(
+                    lower_bound(network1, network2, move_type, max_bound=1), 1
+                )
+
+    def test_different_labels(self):
+        network1 = DiNetwork(edges=[(0, 1), (1, 2), (1, 3)], labels=[(2, "A"), (3, "B")])
+        network2 = DiNetwork(edges=[(0, 1), (1, 2), (1, 3)], labels=[(2, "A"), (3, "C")])
+        self.assertEqual(lower_bound(network1, network2, MoveType.TAIL), math.inf)
@@ -1,10 +1,24 @@
+import random
 import unittest
 
 import pytest
 
 from phylox import DiNetwork
+from phylox.constants import LENGTH_ATTR
 from phylox.exceptions import InvalidMoveDefinitionException, InvalidMoveException
-from phylox.rearrangement.move import Move, apply_move, apply_move_sequence
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.isomorphism import is_isomorphic
+from phylox.rearrangement.movability import check_valid
+from phylox.rearrangement.move import (
+    EdgeIndex,
+    Move,
+    all_valid_moves,
+    apply_move,
+    apply_move_inplace,
+    apply_move_sequence,
+    count_valid_moves,
+    undo_move,
+)
 from phylox.rearrangement.movetype import MoveType
 
 
@@ -145,3 +159,189 @@ class TestMoveClass(unittest.TestCase):
                 ],
             )
             self.assertIn(m.moving_edge, network.edges)
+
+    def test_random_move_edges(self):
+        network = generate_network_random_tree_child_sequence(6, 3, seed=1)
+        edges = EdgeIndex(network)
+        for seed in range(100):
+            move1 = Move.random_move(network, seed=seed)
+            move2 = Move.random_move(network, edges=edges, seed=seed)
+            self.assertEqual(_move_tuple(move1), _move_tuple(move2))
+
+
+def _network_state(network):
+    return (
+        {node: dict(attributes) for node, attributes in network.nodes(data=True)},
+        {(u, v): dict(attributes) for u, v, attributes in network.edges(data=True)},
+    )
+
+
+class TestApplyMoveInplace(unittest.TestCase):
+    def setUp(self):
+        self.network = generate_network_random_tree_child_sequence(6, 3, seed=1)
+        for i, (u, v) in enumerate(self.network.edges):
+            self.network[u][v][LENGTH_ATTR] = i + 1
+
+    def test_same_as_apply_move_and_undo(self):
+        state = _network_state(self.network)
+        moves = list(all_valid_moves(self.network))
+        self.assertTrue(
+            {MoveType.TAIL, MoveType.HEAD, MoveType.VPLU, MoveType.VMIN}
+            <= {move.move_type for move in moves}
+        )
+        for move in moves:
+            expected = apply_move(self.network, move)
+            token = apply_move_inplace(self.network, move)
+            self.assertEqual(_network_state(self.network), _network_state(expected))
+            self.network.validate_cache()
+            undo_move(self.network, token)
+            self.assertEqual(_network_state(self.network), state)
+            self.network.validate_cache()
+
+    def test_undo_sequence(self):
+        state = _network_state(self.network)
+        rng = random.Random(1)
+        tokens = []
+        for _ in range(20):
+            moves = list(all_valid_moves(self.network))
+            tokens.append(apply_move_inplace(self.network, rng.choice(moves)))
+        for token in reversed(tokens):
+            undo_move(self.network, token)
+        self.assertEqual(_network_state(self.network), state)
+
+    def test_invalid_move_unchanged(self):
+        state = _network_state(self.network)
+        edge = next(iter(self.network.edges))
+        with self.assertRaises(InvalidMoveException):
+            apply_move_inplace(
+                self.network,
+                Move(move_type=MoveType.VMIN, removed_edge=edge),
+            )
+        self.assertEqual(_network_state(self.network), state)
+
+
+class TestEdgeIndex(unittest.TestCase):
+    def test_apply_and_undo(self):
+        network = generate_network_random_tree_child_sequence(6, 3, seed=1)
+        edges = EdgeIndex(network)
+        rng = random.Random(1)
+        tokens = []
+        for _ in range(50):
+            move = rng.choice(list(all_valid_moves(network)))
+            token = apply_move_inplace(network, move)
+            edges.apply(token)
+            if rng.random() < 0.3:
+                # a rejected proposal
+                undo_move(network, token)
+                edges.undo(token)
+                continue
+            tokens.append(token)
+            self.assertEqual(len(edges), network.number_of_edges())
+            self.assertEqual(set(edges), set(network.edges))
+            self.assertTrue(all(edges[i] in edges for i in range(len(edges))))
+        for token in reversed(tokens):
+            undo_move(network, token)
+            edges.undo(token)
+            self.assertEqual(len(edges), network.number_of_edges())
+            self.assertEqual(set(edges), set(network.edges))
+
+
+def _move_tuple(move):
+    if move.move_type in [MoveType.TAIL, MoveType.HEAD]:
+        return (move.move_type, move.origin, move.moving_edge, move.target)
+    if move.move_type == MoveType.VPLU:
+        return (
+            move.move_type,
+            move.start_edge,
+            move.end_edge,
+            move.start_node,
+            move.end_node,
+        )
+    return (move.move_type, move.removed_edge)
+
+
+def _generate_and_check_moves(network, move_type):
+    """
+    Generates all valid moves by checking all moves with check_valid.
+    """
+    edges = list(network.edges)
+    for edge1 in edges:
+        for edge2 in edges:
+            try:
+                if move_type in [MoveType.TAIL, MoveType.HEAD]:
+                    move = Move(
+                        move_type=move_type,
+                        moving_edge=edge1,
+                        target=edge2,
+                        network=network,
+                    )
+                elif move_type == MoveType.VPLU:
+                    move = Move(
+                        move_type=move_type,
+                        start_edge=edge1,
+                        end_edge=edge2,
+                        network=network,
+                    )
+                elif edge1 == edge2:
+                    move = Move(move_type=move_type, removed_edge=edge1)
+                else:
+                    continue
+                check_valid(network, move)
+            except (InvalidMoveException, InvalidMoveDefinitionException):
+                continue
+            yield _move_tuple(move)
+
+
+class TestAllValidMoves(unittest.TestCase):
+    def test_against_generate_and_check(self):
+        rng = random.Random(1)
+        for seed in range(20):
+            network = generate_network_random_tree_child_sequence(
+                rng.randint(2, 7), rng.randint(0, 4), seed=seed
+            )
+            # add some degree-2 nodes
+            for node in [-100, -101]:
+                u, v = rng.choice(list(network.edges))
+                network.remove_edge(u, v)
+                network.add_edges_from([(u, node), (node, v)])
+            for move_type in [
+                MoveType.TAIL,
+                MoveType.HEAD,
+                MoveType.VPLU,
+                MoveType.VMIN,
+            ]:
+                expected = list(_generate_and_check_moves(network, move_type))
+                moves = list(all_valid_moves(network, move_type))
+                self.assertEqual([_move_tuple(move) for move in moves], expected)
+                self.assertEqual(
+                    list(all_valid_moves(network, move_type, as_tuples=True)),
+                    expected,
+                )
+                self.assertEqual(count_valid_moves(network, move_type), len(expected))
+
+    def test_count_combined_types(self):
+        network = generate_network_random_tree_child_sequence(8, 3, seed=2)
+        for move_type in [MoveType.RSPR, MoveType.VERT, MoveType.ALL]:
+            self.assertEqual(
+                count_valid_moves(network, move_type),
+                len(list(all_valid_moves(network, move_type, as_tuples=True))),
+            )
+        self.assertEqual(count_valid_moves(DiNetwork()), 0)
+
+    def test_from_tuple(self):
+        network = generate_network_random_tree_child_sequence(5, 2, seed=3)
+        for move_tuple in all_valid_moves(network, as_tuples=True):
+            self.assertEqual(_move_tuple(Move.from_tuple(move_tuple)), move_tuple)
+
+
+class TestInvertMove(unittest.TestCase):
+    def test_invert(self):
+        network = generate_network_random_tree_child_sequence(5, 2, seed=1)
+        for move in all_valid_moves(network):
+            if move.move_type in [MoveType.TAIL, MoveType.HEAD] and (
+                move.moving_node in move.target
+            ):
+                continue
+            new_network = apply_move(network, move)
+            inverse = move.invert(network=network)
+            self.assertTrue(is_isomorphic(apply_move(new_network, inverse), network))
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+import networkx as nx
+
+from phylox import DiNetwork
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.move import all_valid_moves, apply_move_inplace, undo_move
+from phylox.rearrangement.reachability import ReachabilityIndex, has_path
+
+
+class TestReachabilityIndex(unittest.TestCase):
+    def assertIndexCorrect(self, network, index):
+        for node in network.nodes:
+            self.assertEqual(
+                index.descendants(node), nx.descendants(network, node) | {node}
+            )
+
+    def test_attach(self):
+        network = DiNetwork(edges=[(0, 1), (1, 2), (1, 3)])
+        index = ReachabilityIndex.attach(network)
+        self.assertIs(ReachabilityIndex.attach(network), index)
+        self.assertTrue(has_path(network, 0, 2))
+        self.assertFalse(has_path(network, 2, 3))
+        ReachabilityIndex.detach(network)
+        self.assertFalse(has_path(network, 2, 3))
+        with self.assertRaises(TypeError):
+            ReachabilityIndex.attach(nx.DiGraph())
+
+    def test_modifications(self):
+        network = DiNetwork(edges=[(0, 1), (1, 2), (1, 3), (2, 4), (2, 5)])
+        index = ReachabilityIndex.attach(network)
+        self.assertIndexCorrect(network, index)
+        network.add_edges_from([(3, 6), (6, 5), (3, 7)])
+        self.assertIndexCorrect(network, index)
+        network.remove_edge(2, 5)
+        self.assertIndexCorrect(network, index)
+        network.remove_node(2)
+        network.add_edges_from([(1, 8), (8, 9)])
+        self.assertIndexCorrect(network, index)
+        network.clear_edges()
+        self.assertIndexCorrect(network, index)
+        with self.assertRaises(nx.NodeNotFound):
+            index.has_path(2, 3)
+
+    def test_cycle(self):
+        network = DiNetwork(edges=[(0, 1), (1, 2)])
+        index = ReachabilityIndex.attach(network)
+        network.add_edge(2, 1)
+        with self.assertRaises(ValueError):
+            index.has_path(0, 2)
+
+    def test_moves(self):
+        rng = random.Random(1)
+        network = generate_network_random_tree_child_sequence(8, 3, seed=1)
+        expected_moves = [vars(move) for move in all_valid_moves(network)]
+        index = ReachabilityIndex.attach(network)
+        self.assertEqual(
+            [vars(move) for move in all_valid_moves(network)], expected_moves
+        )
+        tokens = []
+        for _ in range(50):
+            if tokens and rng.random() < 0.3:
+                undo_move(network, tokens.pop())
+            else:
+                move = rng.choice(list(all_valid_moves(network)))
+                tokens.append(apply_move_inplace(network, move))
+            self.assertIndexCorrect(network, index)
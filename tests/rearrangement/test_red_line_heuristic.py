@@ -0,0 +1,167 @@
+import random
+import unittest
+
+import networkx as nx
+
+from phylox import DiNetwork
+from phylox.constants import LABEL_ATTR
+from phylox.generators.lgt.base import generate_network_lgt
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.rearrangement.heuristics.red_line_heuristic import Permute_Leaves_Head
+from phylox.rearrangement.heuristics.utils import (
+    FindTreeNode,
+    HighestNodeFrontier,
+    HighestNodesBelow,
+)
+from phylox.rearrangement.move import all_valid_moves, apply_move
+from phylox.rearrangement.movetype import MoveType
+from phylox.rearrangement.rearrangementproblem import RearrangementProblem
+
+
+class TestRearrangementProblemRedLine(unittest.TestCase):
+    @staticmethod
+    def setup_simple_problem():
+        nw_1 = DiNetwork(
+            edges=[[0, 1], [1, 2], [1, 3], [2, 3], [2, 4], [3, 5]],
+            labels=[[4, 1], [5, 2]],
+        )
+        nw_2 = DiNetwork(
+            edges=[[0, 1], [1, 2], [1, 3], [2, 3], [2, 4], [3, 5]],
+            labels=[[5, 1], [4, 2]],
+        )
+        return RearrangementProblem(nw_1, nw_2, MoveType.HEAD)
+
+    def test_solve_red_line(self):
+        problem = self.setup_simple_problem()
+        solution = problem.heuristic_red_line()
+        self.assertTrue(problem.check_solution(solution))
+
+    def test_solve_red_line_random(self):
+        problem = self.setup_simple_problem()
+        solution1 = problem.heuristic_red_line_random(seed=1)
+        solution2 = problem.heuristic_red_line_random(seed=1)
+        self.assertTrue(problem.check_solution(solution1))
+        self.assertEqual(
+            [move.__dict__ for move in solution1], [move.__dict__ for move in solution2]
+        )
+
+    def test_random_networks(self):
+        for seed in range(20):
+            network1 = generate_network_random_tree_child_sequence(8, 3, seed=seed)
+            network2 = generate_network_random_tree_child_sequence(8, 3, seed=seed + 20)
+            network2 = nx.relabel_nodes(network2, {node: node + 100 for node in network2})
+            for move_type in [MoveType.HEAD, MoveType.RSPR]:
+                problem = RearrangementProblem(network1, network2, move_type)
+                for solution in [
+                    problem.heuristic_red_line(),
+                    problem.heuristic_red_line_random(seed=seed),
+                ]:
+                    self.assertTrue(problem.check_solution(solution))
+                    self.assertTrue(
+                        all(move.move_type == MoveType.HEAD for move in solution)
+                    )
+
+    def test_non_tree_child_networks(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            networks = []
+            for network_seed in [2 * seed, 2 * seed + 1]:
+                network = generate_network_lgt(6, 3, 1, 1, seed=network_seed)
+                leaves = [node for node in network if network.out_degree(node) == 0]
+                rng.shuffle(leaves)
+                for label, leaf in enumerate(leaves):
+                    network.nodes[leaf][LABEL_ATTR] = label
+                networks.append(network)
+            network1, network2 = networks
+            network2 = nx.relabel_nodes(network2, {node: -node - 1 for node in network2})
+            problem = RearrangementProblem(network1, network2, MoveType.HEAD)
+            self.assertTrue(problem.check_solution(problem.heuristic_red_line()))
+            self.assertTrue(
+                problem.check_solution(problem.heuristic_red_line_random(seed=seed))
+            )
+
+    def test_same_node_names(self):
+        network1 = generate_network_random_tree_child_sequence(10, 3, seed=1)
+        network2 = network1
+        rng = random.Random(1)
+        for _ in range(3):
+            network2 = apply_move(
+                network2, rng.choice(list(all_valid_moves(network2, MoveType.HEAD)))
+            )
+        edges1, edges2 = set(network1.edges), set(network2.edges)
+        problem = RearrangementProblem(network1, network2, MoveType.HEAD)
+        self.assertTrue(problem.check_solution(problem.heuristic_red_line()))
+        self.assertTrue(problem.check_solution(problem.heuristic_red_line_random(seed=1)))
+        # the networks of the problem are not modified
+        self.assertEqual(set(network1.edges), edges1)
+        self.assertEqual(set(network2.edges), edges2)
+
+    def test_requirements(self):
+        problem = self.setup_simple_problem()
+        problem.move_type = MoveType.TAIL
+        with self.assertRaises(Exception):
+            problem.heuristic_red_line()
+        tree = DiNetwork(edges=[[0, 1], [1, 2], [1, 3]], labels=[[2, 1], [3, 2]])
+        problem = RearrangementProblem(tree, tree, MoveType.HEAD)
+        with self.assertRaises(Exception):
+            problem.heuristic_red_line()
+
+
+class TestPermuteLeavesHead(unittest.TestCase):
+    def test_permutations(self):
+        rng = random.Random(1)
+        for seed in range(30):
+            network1 = generate_network_random_tree_child_sequence(7, 2, seed=seed)
+            network2 = nx.relabel_nodes(network1, {node: node + 100 for node in network1})
+            labels = [network2.nodes[leaf][LABEL_ATTR] for leaf in network2.leaves]
+            rng.shuffle(labels)
+            for leaf, label in zip(network2.leaves, labels):
+                network2.nodes[leaf][LABEL_ATTR] = label
+            network2._set_labels()
+            isom_1_2 = {node: node + 100 for node in network1}
+            isom_2_1 = {node + 100: node for node in network1}
+            problem = RearrangementProblem(network1, network2, MoveType.HEAD)
+            sequence = Permute_Leaves_Head(
+                network1.copy(), network2, isom_1_2, isom_2_1
+            )
+            self.assertTrue(problem.check_solution(sequence))
+
+
+class TestHighestNodeFrontier(unittest.TestCase):
+    def test_against_scan(self):
+        rng = random.Random(1)
+        for seed in range(10):
+            network = generate_network_random_tree_child_sequence(10, 4, seed=seed)
+            mapped = {node: None for node in network.roots}
+            frontier = HighestNodeFrontier(network, mapped)
+            while True:
+                tree_nodes, reticulations = HighestNodesBelow(
+                    frontier.network, mapped, allnodes=True
+                )
+                self.assertEqual(frontier.highest_tree_nodes(), tree_nodes)
+                self.assertEqual(frontier.highest_reticulations(), reticulations)
+                self.assertEqual(
+                    (frontier.highest_tree_node(), frontier.highest_reticulation()),
+                    HighestNodesBelow(frontier.network, mapped),
+                )
+                self.assertEqual(
+                    frontier.tree_node(), FindTreeNode(frontier.network, mapped)
+                )
+                self.assertEqual(
+                    frontier.tree_node(randomNodes=True, seed=seed),
+                    FindTreeNode(frontier.network, mapped, randomNodes=True, seed=seed),
+                )
+                if not tree_nodes + reticulations:
+                    break
+                # move an edge between nodes that are not mapped yet, or map a highest node
+                moves = [
+                    move
+                    for move in all_valid_moves(frontier.network, MoveType.HEAD)
+                    if not {move.origin[1], move.moving_node, move.target[1]} & set(mapped)
+                ]
+                if moves and rng.random() < 0.5:
+                    frontier.apply_move_sequence([rng.choice(moves)])
+                else:
+                    node = rng.choice(tree_nodes + reticulations)
+                    mapped[node] = None
+                    frontier.add(node)
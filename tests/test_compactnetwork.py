@@ -0,0 +1,145 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from phylox import CompactNetwork, DiNetwork
+from phylox.classes.dinetwork import (
+    is_binary,
+    is_leaf_labeled_single_root_network,
+    is_stack_free,
+    is_tree_child,
+)
+from phylox.constants import LABEL_ATTR, LENGTH_ATTR, PROBABILITY_ATTR
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.networkproperties.properties import (
+    b2_balance,
+    blob_properties,
+    count_reducible_pairs,
+)
+
+
+class TestCompactNetwork(unittest.TestCase):
+    def setUp(self):
+        self.network = DiNetwork(
+            edges=[
+                (0, 1),
+                (1, 2, {LENGTH_ATTR: 0.5}),
+                (1, 3, {LENGTH_ATTR: 1.5, PROBABILITY_ATTR: 0.3}),
+                (2, 3, {PROBABILITY_ATTR: 0.7}),
+                (2, 4),
+                (3, 5),
+            ],
+            labels=[(4, "a"), (5, "b"), (1, "internal")],
+        )
+
+    def test_roundtrip(self):
+        copy = self.network.to_compact().to_dinetwork()
+        self.assertEqual(list(copy.nodes(data=True)), list(self.network.nodes(data=True)))
+        self.assertEqual(list(copy.edges(data=True)), list(self.network.edges(data=True)))
+        self.assertEqual(copy.graph, self.network.graph)
+
+    def test_roundtrip_string_nodes(self):
+        network = DiNetwork(
+            edges=[("r", "x"), ("x", "y"), ("x", "z")],
+            labels=[("y", "a"), ("z", "b")],
+        )
+        compact = network.to_compact()
+        self.assertEqual(compact.node_ids.dtype, object)
+        self.assertEqual(compact.leaves, {"y", "z"})
+        copy = compact.to_dinetwork()
+        self.assertEqual(list(copy.edges), list(network.edges))
+
+    def test_arrays(self):
+        compact = self.network.to_compact()
+        self.assertEqual(compact.children.dtype, np.int32)
+        self.assertEqual(compact.parents.dtype, np.int32)
+        self.assertEqual(list(compact.out_degrees), [1, 2, 2, 1, 0, 0])
+        self.assertEqual(list(compact.in_degrees), [0, 1, 1, 2, 1, 1])
+        self.assertEqual(compact.number_of_edges(), 6)
+        self.assertEqual(
+            [np.isnan(length) for length in compact.lengths],
+            [True, False, False, True, True, True],
+        )
+        with self.assertRaises(ValueError):
+            compact.children[0] = 3
+        with self.assertRaises(AttributeError):
+            compact.children = np.zeros(6)
+
+    def test_parent_edges(self):
+        compact = self.network.to_compact()
+        for node in compact:
+            i = compact.index(node)
+            start, end = compact.parent_offsets[i], compact.parent_offsets[i + 1]
+            for parent, edge in zip(compact.parents[start:end], compact.parent_edges[start:end]):
+                self.assertEqual(compact.children[edge], i)
+                self.assertTrue(
+                    compact.child_offsets[parent] <= edge < compact.child_offsets[parent + 1]
+                )
+
+    def test_node_types(self):
+        compact = self.network.to_compact()
+        self.assertEqual(compact.leaves, self.network.leaves)
+        self.assertEqual(compact.roots, self.network.roots)
+        self.assertEqual(compact.reticulations, {3})
+        self.assertEqual(compact.reticulation_number, self.network.reticulation_number)
+        for node in self.network.nodes:
+            self.assertEqual(compact.is_leaf(node), self.network.is_leaf(node))
+            self.assertEqual(compact.is_root(node), self.network.is_root(node))
+            self.assertEqual(
+                compact.is_reticulation(node), self.network.is_reticulation(node)
+            )
+            self.assertEqual(compact.is_tree_node(node), self.network.is_tree_node(node))
+            self.assertCountEqual(
+                compact.successors(node), self.network.successors(node)
+            )
+            self.assertCountEqual(
+                compact.predecessors(node), self.network.predecessors(node)
+            )
+
+    def test_labels(self):
+        compact = self.network.to_compact()
+        self.assertEqual(compact.labels, self.network.labels)
+        self.assertEqual(compact.label_to_node_dict, self.network.label_to_node_dict)
+        self.assertEqual(compact.nodes[4][LABEL_ATTR], "a")
+        self.assertNotIn(LABEL_ATTR, compact.nodes[2])
+
+    def test_from_edges(self):
+        compact = CompactNetwork.from_edges(
+            [(0, 1), (1, 2), (1, 3)],
+            nodes=[7],
+            labels=[(3, "b"), (2, "a")],
+        )
+        self.assertEqual(compact.roots, {0, 7})
+        self.assertEqual(compact.leaves, {2, 3})
+        self.assertEqual(compact.label_to_node_dict, {"a": 2, "b": 3})
+
+    def test_read_only_functions(self):
+        for seed in range(5):
+            network = generate_network_random_tree_child_sequence(10, 3, seed=seed)
+            compact = network.to_compact()
+            self.assertEqual(is_binary(compact), is_binary(network))
+            self.assertEqual(is_tree_child(compact), is_tree_child(network))
+            self.assertEqual(is_stack_free(compact), is_stack_free(network))
+            self.assertEqual(
+                is_leaf_labeled_single_root_network(compact),
+                is_leaf_labeled_single_root_network(network),
+            )
+            self.assertEqual(
+                count_reducible_pairs(compact), count_reducible_pairs(network)
+            )
+            self.assertEqual(
+                sorted(blob_properties(compact)), sorted(blob_properties(network))
+            )
+            self.assertAlmostEqual(b2_balance(compact), b2_balance(network))
+
+    def test_memory(self):
+        network = generate_network_random_tree_child_sequence(200, 20, seed=1)
+        compact = network.to_compact()
+        self.assertLess(compact.nbytes(), 64 * len(network))
+
+    def test_pickle(self):
+        compact = pickle.loads(pickle.dumps(self.network.to_compact()))
+        self.assertEqual(compact.leaves, self.network.leaves)
+        with self.assertRaises(ValueError):
+            compact.children[0] = 3
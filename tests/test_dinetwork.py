@@ -148,3 +148,101 @@ class TestDiNetwork(unittest.TestCase):
         network = DiNetwork.from_newick("(a,b);")
         newick = network.newick()
         self.assertTrue(newick in ["(a,b);", "(b,a);"])
+
+
+class TestDiNetworkCache(unittest.TestCase):
+    def _network_with_caches(self):
+        network = DiNetwork(
+            edges=[(1, 2), (2, 3), (2, 4), (3, 4), (3, 5), (4, 6)],
+            labels=[(5, "a"), (6, "b")],
+        )
+        network.leaves, network.roots, network.reticulations
+        network.reticulation_number, network.labels, network.label_to_node_dict
+        network.debug_cache = True
+        return network
+
+    def test_reticulations_cached(self):
+        network = self._network_with_caches()
+        self.assertIs(network.reticulations, network.reticulations)
+        self.assertEqual(network.reticulations, {4})
+
+    def test_add_and_remove_edges(self):
+        network = self._network_with_caches()
+        network.add_edge(5, 7)
+        network.add_edges_from([(3, 6), (1, 8, {"length": 1})])
+        self.assertEqual(network.leaves, {6, 7, 8})
+        self.assertEqual(network.reticulations, {4, 6})
+        self.assertEqual(network.reticulation_number, 2)
+        network.remove_edge(3, 6)
+        network.remove_edges_from([(1, 8), (1, 9)])
+        self.assertEqual(network.leaves, {6, 7})
+        self.assertEqual(network.roots, {1, 8})
+        self.assertEqual(network.reticulation_number, 1)
+
+    def test_remove_node(self):
+        network = self._network_with_caches()
+        network.remove_node(3)
+        self.assertEqual(network.leaves, {6})
+        self.assertEqual(network.roots, {1, 5})
+        self.assertEqual(network.reticulations, set())
+        self.assertEqual(network.reticulation_number, 0)
+        self.assertEqual(network.labels, {"a": [5], "b": [6]})
+        network.remove_nodes_from([5, 10])
+        self.assertEqual(network.labels, {"b": [6]})
+        self.assertEqual(network.label_to_node_dict, {"b": 6})
+
+    def test_labels(self):
+        network = self._network_with_caches()
+        network.add_node(7, label="c")
+        network.add_node(5, label="b")
+        self.assertEqual(network.labels, {"b": [5, 6], "c": [7]})
+        self.assertEqual(network.label_to_node_dict, {"b": 6, "c": 7})
+        network.remove_node(6)
+        self.assertEqual(network.label_to_node_dict, {"b": 5, "c": 7})
+        network.add_nodes_from([(8, {"label": "d"}), 9])
+        self.assertEqual(network.labels, {"b": [5], "c": [7], "d": [8]})
+        self.assertEqual(network.roots, {1, 7, 8, 9})
+
+    def test_copy(self):
+        network = self._network_with_caches()
+        copy = network.copy()
+        copy.validate_cache()
+        self.assertEqual(copy.leaves, network.leaves)
+
+    def test_validate_cache(self):
+        network = self._network_with_caches()
+        network._leaves.add(1)
+        with self.assertRaises(AssertionError):
+            network.add_edge(6, 7)
+
+
+class TestFindUnusedNode(unittest.TestCase):
+    def test_monotone(self):
+        network = DiNetwork(edges=[(0, 1), (1, 2), (1, 3)])
+        self.assertEqual(network.find_unused_node(), -1)
+        self.assertEqual(network.find_unused_node(), -1)
+        network.add_edge(3, -1)
+        self.assertEqual(network.find_unused_node(), -2)
+        network.remove_node(-1)
+        self.assertEqual(network.find_unused_node(), -2)
+        network.add_node(-10)
+        self.assertEqual(network.find_unused_node(), -11)
+
+    def test_existing_negative_nodes(self):
+        network = DiNetwork(edges=[(-5, "a"), ("a", 2.5), ("a", -7.5)])
+        self.assertEqual(network.find_unused_node(), -9)
+
+    def test_exclude(self):
+        network = DiNetwork(edges=[(0, 1)])
+        self.assertEqual(network.find_unused_node(exclude={-1, -2, -4}), -3)
+        self.assertEqual(network.find_unused_node(exclude=[-1, -2, -3]), -4)
+
+    def test_allocate_nodes(self):
+        network = DiNetwork(edges=[(0, 1)])
+        self.assertEqual(network.allocate_nodes(2, exclude=[-2]), [-1, -3])
+        self.assertEqual(network.find_unused_node(), -4)
+        self.assertEqual(network.allocate_nodes(0), [])
+        for node in network.allocate_nodes(100):
+            self.assertNotIn(node, network)
+            network.add_node(node)
+        self.assertEqual(len(network), 102)
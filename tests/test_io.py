@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from phylox import CompactNetwork, DiNetwork
+from phylox.generators.randomTC import generate_network_random_tree_child_sequence
+from phylox.io import _split_newick_buffer, read_newick_file
+from phylox.isomorphism import is_isomorphic
+
+
+class TestReadNewickFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "networks.nwk")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content):
+        with open(self.path, "w") as file:
+            file.write(content)
+
+    def test_split(self):
+        buffer = b"(a,b);\n('x;y'[c;'],z);((a,b)\n,c)\n;  \n\n(q,r)"
+        strings = [buffer[start:end] for start, end in _split_newick_buffer(buffer)]
+        self.assertEqual(
+            strings,
+            [b"(a,b);", b"\n('x;y'[c;'],z);", b"((a,b)\n,c)\n;", b"  \n\n(q,r)"],
+        )
+
+    def test_read(self):
+        self.write("((a,b),c);\n('x;y'[c;'],z);((a,b)\n,c)\n;  \n\n(q,r)")
+        networks = list(read_newick_file(self.path))
+        self.assertTrue(all(isinstance(network, DiNetwork) for network in networks))
+        self.assertEqual(
+            [sorted(network.labels) for network in networks],
+            [["a", "b", "c"], ["x;y", "z"], ["a", "b", "c"], ["q", "r"]],
+        )
+
+    def test_empty_file(self):
+        self.write("")
+        self.assertEqual(list(read_newick_file(self.path)), [])
+        self.assertEqual(list(read_newick_file(self.path, workers=2)), [])
+
+    def test_lazy(self):
+        self.write("(a,b);(c,d);")
+        networks = read_newick_file(self.path)
+        self.assertEqual(set(next(networks).labels), {"a", "b"})
+        self.assertEqual(set(next(networks).labels), {"c", "d"})
+        with self.assertRaises(StopIteration):
+            next(networks)
+
+    def test_parallel(self):
+        newicks = [
+            generate_network_random_tree_child_sequence(10, 3, seed=seed).newick()
+            for seed in range(20)
+        ]
+        self.write("\n".join(newicks))
+        networks = [DiNetwork.from_newick(newick) for newick in newicks]
+        for compact in [False, True]:
+            parsed = list(
+                read_newick_file(self.path, workers=2, compact=compact, batch_size=3)
+            )
+            self.assertEqual(len(parsed), len(networks))
+            for network, parsed_network in zip(networks, parsed):
+                if compact:
+                    self.assertIsInstance(parsed_network, CompactNetwork)
+                    parsed_network = parsed_network.to_dinetwork()
+                self.assertTrue(is_isomorphic(network, parsed_network))
+
+    def test_compact(self):
+        self.write("((a:1.0,b:2.0)#H1:0.5,(#H1:0.5,c));")
+        (network,) = read_newick_file(self.path, compact=True)
+        self.assertIsInstance(network, CompactNetwork)
+        self.assertEqual(network.reticulation_number, 1)
+        with self.assertRaises(ValueError):
+            network.children[0] = 0
+
+    def test_add_root_edge(self):
+        self.write("(a,b);(c,d);")
+        for compact in [False, True]:
+            for network in read_newick_file(
+                self.path, compact=compact, add_root_edge=True
+            ):
+                (root,) = network.roots
+                self.assertEqual(network.out_degree(root), 1)
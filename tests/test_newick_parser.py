@@ -1,9 +1,15 @@
+import io
 import unittest
 
 from phylox import DiNetwork
 from phylox.constants import LABEL_ATTR
 from phylox.isomorphism import is_isomorphic
-from phylox.newick_parser import dinetwork_to_extended_newick, extended_newick_to_dinetwork
+from phylox.newick_parser import (
+    dinetwork_to_extended_newick,
+    extended_newick_to_compactnetwork,
+    extended_newick_to_dinetwork,
+    write_extended_newick,
+)
 
 
 class TestExtendedNewickToDiNetwork(unittest.TestCase):
@@ -79,6 +85,61 @@ class TestExtendedNewickToDiNetwork(unittest.TestCase):
         parent_a = network.parent(node_a)
         self.assertEqual(network[parent_a][node_a]["length"], 1.0)
 
+    def test_deep_caterpillar(self):
+        number_of_leaves = 5000
+        newick = (
+            "(" * (number_of_leaves - 1)
+            + "l0"
+            + "".join(f",l{i})" for i in range(1, number_of_leaves))
+            + ";"
+        )
+        network = extended_newick_to_dinetwork(newick)
+        self.assertEqual(len(network), 2 * number_of_leaves - 1)
+        self.assertEqual(len(network.leaves), number_of_leaves)
+        self.assertEqual(len(network.roots), 1)
+
+    def test_quoted_labels(self):
+        newick = "('a b':1.0,'it''s (c)',d);"
+        network = extended_newick_to_dinetwork(newick)
+        self.assertEqual(set(network.labels), {"a b", "it's (c)", "d"})
+        node = network.label_to_node_dict["a b"]
+        self.assertEqual(network[network.parent(node)][node]["length"], 1.0)
+
+    def test_comments_and_whitespace(self):
+        newick = "( a[&support=0.9] : 1.0 , (b,c)[&&NHX:S=x]:2.0 )[root comment] ;"
+        network = extended_newick_to_dinetwork(newick)
+        network2 = DiNetwork(
+            edges=[(1, 2), (1, 3), (3, 4), (3, 5)],
+            labels=[(2, "a"), (4, "b"), (5, "c")],
+        )
+        self.assertTrue(is_isomorphic(network, network2))
+        node_a = network.label_to_node_dict["a"]
+        self.assertEqual(network[network.parent(node_a)][node_a]["length"], 1.0)
+
+    def test_unlabeled_leaves(self):
+        network = extended_newick_to_dinetwork("(,(,a));")
+        self.assertEqual(len(network.leaves), 3)
+        self.assertEqual(set(network.labels), {"a"})
+
+    def test_node_numbering(self):
+        network = extended_newick_to_dinetwork("(a,(b)#H1,(#H1,c));")
+        self.assertEqual(list(network.nodes), [-1, -2, "__#R1", -3, -4, -5])
+
+    def test_invalid(self):
+        for newick in ["((a,b);", "(a,b));", "(a,b)(c,d);", "('a,b);", "(a[,b);"]:
+            with self.assertRaises(ValueError):
+                extended_newick_to_dinetwork(newick)
+
+    def test_compact(self):
+        newick = "(a:1.0,(b:1.1)#R1:1.2:0.9:0.3,(#H1:1.3::0.7,c:1.4):1.5);"
+        network = extended_newick_to_dinetwork(newick)
+        compact = extended_newick_to_compactnetwork(newick)
+        self.assertEqual(
+            list(compact.to_dinetwork().edges(data=True)),
+            list(network.edges(data=True)),
+        )
+        self.assertEqual(compact.labels, network.labels)
+
 
 class TestNetworkToNewick(unittest.TestCase):
     def test_multirooted(self):
@@ -224,6 +285,60 @@ class TestNetworkToNewick(unittest.TestCase):
         self.assertTrue("a:4.0:5.0:" in newick)
         self.assertTrue("#H0:2.0:3.0:0.2" in newick)
 
+    def test_does_not_modify_network(self):
+        network = DiNetwork(
+            edges=[(1, 2), (1, 3), (2, 4), (3, 4), (2, 5), (3, 6), (4, 7)],
+            labels=[(5, "a"), (6, "b"), (7, "c")],
+        )
+        network[2][4]["probability"] = 0.2
+        nodes = list(network.nodes(data=True))
+        edges = list(network.edges(data=True))
+        dinetwork_to_extended_newick(network)
+        self.assertEqual(list(network.nodes(data=True)), nodes)
+        self.assertEqual(list(network.edges(data=True)), edges)
+
+    def test_write_to_handle(self):
+        network = DiNetwork(
+            edges=[(1, 2), (1, 3), (2, 4), (3, 4), (2, 5), (3, 6), (4, 7)],
+            labels=[(5, "a"), (6, "b"), (7, "c")],
+        )
+        output = io.StringIO()
+        write_extended_newick(network, output)
+        write_extended_newick(network, output, simple=True)
+        newick = dinetwork_to_extended_newick(network)
+        self.assertEqual(output.getvalue(), newick + newick)
+
+    def test_string_nodes(self):
+        network = DiNetwork(
+            edges=[("r", "x"), ("r", "y"), ("x", "y"), ("x", "a"), ("y", "b")],
+            labels=[("a", "a"), ("b", "b")],
+        )
+        newick = dinetwork_to_extended_newick(network)
+        self.assertEqual(newick, "((a,#H0),(b)#R0);")
+
+    def test_quoted_labels(self):
+        network = DiNetwork(
+            edges=[(1, 2), (1, 3)],
+            labels=[(2, "a b"), (3, "it's (c)")],
+        )
+        newick = dinetwork_to_extended_newick(network)
+        self.assertEqual(newick, "('a b','it''s (c)');")
+        network2 = extended_newick_to_dinetwork(newick)
+        self.assertEqual(set(network2.labels), {"a b", "it's (c)"})
+
+    def test_deep_caterpillar(self):
+        number_of_leaves = 5000
+        edges = [(i, i + 1) for i in range(number_of_leaves - 1)]
+        edges += [(i, -i - 1) for i in range(number_of_leaves)]
+        network = DiNetwork(
+            edges=edges,
+            labels=[(-i - 1, f"l{i}") for i in range(number_of_leaves)],
+        )
+        newick = dinetwork_to_extended_newick(network)
+        self.assertEqual(newick.count("("), number_of_leaves)
+        network2 = extended_newick_to_dinetwork(newick)
+        self.assertEqual(len(network2.leaves), number_of_leaves)
+
 
 class TestNetworkToNewickAndBack(unittest.TestCase):
     def test_larger_network(self):